@@ -0,0 +1,305 @@
+"""
+Time and memory regression suite for the text extractors.
+
+Generates PDF, DOCX and TXT resumes from 1 to 200 pages and measures the
+best-of-N wall time and tracemalloc peak of extract_text_from_pdf,
+extract_text_from_docx and extract_text_from_file on each. Results are
+compared with the baselines committed in benchmarks/baselines/extractors.json
+and the run exits with status 1 when any case is slower, or uses more memory,
+than its baseline by more than the threshold.
+
+extract_text_from_file runs with the extraction cache and process pool
+disabled, so every repetition parses the document serially in this process;
+the default extraction budgets still apply, as they do in the app.
+tracemalloc does not see lxml's native allocations, so DOCX peaks are lower
+bounds.
+
+Usage:
+    python -m benchmarks.bench_extractors [--sizes 1 10 50 200] [--repeat 5]
+        [--threshold 0.25] [--update]
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from importlib import metadata
+
+from benchmarks.fixtures import make_docx, make_pdf, resume_lines
+from src.utils.extraction_cache import reset_extraction_cache
+from src.utils.extraction_pool import shutdown_extraction_pool
+from src.utils.text_extractor import (
+    LocalFile,
+    extract_text_from_docx,
+    extract_text_from_file,
+    extract_text_from_pdf,
+)
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines", "extractors.json")
+DEFAULT_SIZES = [1, 10, 50, 200]
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.25
+
+# Lines of text per generated page, for every format
+LINES_PER_PAGE = 40
+
+# Changes below these are noise whatever the relative change
+MIN_SECONDS_DELTA = 0.005
+MIN_BYTES_DELTA = 64 * 1024
+
+
+def make_txt(pages):
+    """
+    Build a plain-text resume.
+
+    Args:
+        pages (int): Number of pages of LINES_PER_PAGE lines
+
+    Returns:
+        bytes: UTF-8 text
+    """
+    lines = []
+    for page in range(pages):
+        lines.extend(resume_lines(LINES_PER_PAGE, page))
+    return "\n".join(lines).encode("utf-8")
+
+
+def build_cases(sizes, workdir):
+    """
+    Generate the documents and the extractor call for each benchmark case.
+
+    Args:
+        sizes (list): Document sizes in pages
+        workdir (str): Directory the files for extract_text_from_file go in
+
+    Returns:
+        list: (name, func) tuples; func runs one extraction
+    """
+    cases = []
+    for pages in sizes:
+        documents = {
+            "pdf": make_pdf(pages, LINES_PER_PAGE),
+            "docx": make_docx(pages * LINES_PER_PAGE),
+            "txt": make_txt(pages),
+        }
+        pdf, docx = documents["pdf"], documents["docx"]
+        cases.append(
+            (
+                f"extract_text_from_pdf[{pages}p]",
+                lambda data=pdf: extract_text_from_pdf(io.BytesIO(data)),
+            )
+        )
+        cases.append(
+            (
+                f"extract_text_from_docx[{pages}p]",
+                lambda data=docx: extract_text_from_docx(io.BytesIO(data)),
+            )
+        )
+        for extension, data in documents.items():
+            path = os.path.join(workdir, f"resume-{pages}p.{extension}")
+            with open(path, "wb") as f:
+                f.write(data)
+            cases.append(
+                (
+                    f"extract_text_from_file[{extension},{pages}p]",
+                    lambda path=path: extract_text_from_file(LocalFile(path)),
+                )
+            )
+    return cases
+
+
+def measure(func, repeat):
+    """
+    Measure one benchmark case.
+
+    A first untimed call warms up imports and lazily built state. The fastest
+    repetition is reported: on a busy machine it is far more stable than the
+    median, which keeps the regression gate from firing on scheduler noise.
+
+    Args:
+        func: Callable running one extraction
+        repeat (int): Timed repetitions
+
+    Returns:
+        dict: "seconds" (best wall time) and "peak_bytes" (tracemalloc peak)
+    """
+    func()
+    timings = []
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    # Measured separately: tracing slows allocation-heavy code considerably
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": min(timings), "peak_bytes": peak}
+
+
+def run_suite(sizes=DEFAULT_SIZES, repeat=DEFAULT_REPEAT):
+    """
+    Run every benchmark case.
+
+    Args:
+        sizes (list): Document sizes in pages
+        repeat (int): Timed repetitions per case
+
+    Returns:
+        dict: Measurements (see measure) keyed by case name, in run order
+    """
+    # Parse every repetition in this process instead of serving it from cache
+    os.environ["EXTRACTION_CACHE_MAX_CHARS"] = "0"
+    os.environ["EXTRACTION_POOL_SIZE"] = "0"
+    reset_extraction_cache()
+    shutdown_extraction_pool()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        return {
+            name: measure(func, repeat) for name, func in build_cases(sizes, workdir)
+        }
+
+
+def environment():
+    """Describe the interpreter and extraction libraries behind a run."""
+    info = {"python": platform.python_version(), "machine": platform.machine()}
+    for package in ("pypdf", "python-docx"):
+        try:
+            info[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            info[package] = None
+    return info
+
+
+def load_baselines(path=BASELINE_PATH):
+    """
+    Read committed baselines.
+
+    Args:
+        path (str): Baseline JSON file
+
+    Returns:
+        dict: Measurements keyed by case name (empty if the file is missing)
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)["cases"]
+    except FileNotFoundError:
+        return {}
+
+
+def save_baselines(results, path=BASELINE_PATH):
+    """
+    Write results as the new baselines, keeping cases that were not run.
+
+    Args:
+        results (dict): Measurements keyed by case name
+        path (str): Baseline JSON file
+    """
+    cases = load_baselines(path)
+    for name, result in results.items():
+        cases[name] = {
+            "seconds": round(result["seconds"], 6),
+            "peak_bytes": result["peak_bytes"],
+        }
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"environment": environment(), "cases": cases}, f, indent=2)
+        f.write("\n")
+
+
+def compare(results, baselines, threshold=DEFAULT_THRESHOLD):
+    """
+    Find cases that regressed past the threshold.
+
+    A metric regresses when it exceeds its baseline by more than ``threshold``
+    (a fraction) and by more than MIN_SECONDS_DELTA / MIN_BYTES_DELTA, which
+    keeps timer and allocator noise on tiny documents from failing the run.
+
+    Args:
+        results (dict): Measurements keyed by case name
+        baselines (dict): Baseline measurements keyed by case name
+        threshold (float): Allowed relative increase, e.g. 0.25 for 25%
+
+    Returns:
+        list: (case, metric, current, baseline) tuples for every regression;
+        cases without a baseline are skipped
+    """
+    regressions = []
+    for name, result in results.items():
+        baseline = baselines.get(name)
+        if baseline is None:
+            continue
+        for metric, min_delta in (
+            ("seconds", MIN_SECONDS_DELTA),
+            ("peak_bytes", MIN_BYTES_DELTA),
+        ):
+            current, base = result[metric], baseline[metric]
+            if current > base * (1 + threshold) and current - base > min_delta:
+                regressions.append((name, metric, current, base))
+    return regressions
+
+
+def _change(current, base):
+    return f"{(current - base) / base:+.0%}" if base else "new"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="allowed relative increase over the baseline (0.25 = 25%%)",
+    )
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument(
+        "--update", action="store_true", help="store this run as the new baseline"
+    )
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.sizes, args.repeat)
+    baselines = load_baselines(args.baseline)
+
+    print(
+        f"{'case':<38} {'ms':>9} {'base ms':>9} {'change':>7} "
+        f"{'peak KiB':>9} {'base KiB':>9} {'change':>7}"
+    )
+    for name, result in results.items():
+        base = baselines.get(name, {"seconds": 0, "peak_bytes": 0})
+        print(
+            f"{name:<38} {result['seconds'] * 1000:>9.2f} "
+            f"{base['seconds'] * 1000:>9.2f} "
+            f"{_change(result['seconds'], base['seconds']):>7} "
+            f"{result['peak_bytes'] / 1024:>9.0f} {base['peak_bytes'] / 1024:>9.0f} "
+            f"{_change(result['peak_bytes'], base['peak_bytes']):>7}"
+        )
+
+    if args.update:
+        save_baselines(results, args.baseline)
+        print(f"Baselines written to {args.baseline}")
+        return
+
+    regressions = compare(results, baselines, args.threshold)
+    for name, metric, current, base in regressions:
+        print(
+            f"REGRESSION {name} {metric}: {current:g} vs baseline {base:g} "
+            f"({_change(current, base)}, threshold {args.threshold:+.0%})",
+            file=sys.stderr,
+        )
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+"""
+Import-time regression suite for the app's entry points.
+
+Imports each entry point (the Streamlit script, the batch command, the
+extractor module extraction workers load and the analyzer) in a fresh
+interpreter under ``python -X importtime`` and reports the best-of-N
+cumulative import time, the number of modules it loads and its most
+expensive direct imports. Results are compared with the baselines committed
+in benchmarks/baselines/imports.json and the run exits with status 1 when an
+entry point got slower, or loads more modules, than its baseline by more than
+the threshold, or when it loads a package that must only be imported on first
+use (see DEFERRED_PACKAGES).
+
+Interpreter startup (site, .pth files) is not counted.
+
+Usage:
+    python -m benchmarks.bench_imports [--modules main src.batch] [--repeat 5]
+        [--threshold 0.25] [--update]
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+from importlib import metadata
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines", "imports.json")
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MODULES = [
+    "main",
+    "src.batch",
+    "src.utils.text_extractor",
+    "src.services.ai_analyzer",
+]
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_TOP = 5
+
+# Imported where they are first needed; loading any of them with an entry
+# point is a regression whatever the timings say
+DEFERRED_PACKAGES = ("openai", "httpx", "pypdf", "docx", "dotenv")
+
+# Changes below these are noise whatever the relative change
+MIN_SECONDS_DELTA = 0.02
+MIN_MODULES_DELTA = 5
+
+
+def parse_importtime(stderr):
+    """
+    Parse the report ``-X importtime`` writes to stderr.
+
+    Args:
+        stderr (str): Captured standard error of the interpreter
+
+    Returns:
+        list: (name, depth, self_us, cumulative_us) tuples in report order,
+        where each module follows the modules it imported
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(fields[0]), int(fields[1])
+        except ValueError:
+            # The column header
+            continue
+        name = fields[2].rstrip()
+        stripped = name.lstrip()
+        depth = (len(name) - len(stripped) - 1) // 2
+        entries.append((stripped, depth, self_us, cumulative_us))
+    return entries
+
+
+def _subtree(entries, index):
+    """Return the entries imported while entries[index] was being imported."""
+    depth = entries[index][1]
+    start = index
+    while start > 0 and entries[start - 1][1] > depth:
+        start -= 1
+    return entries[start : index + 1]
+
+
+def profile_import(entries, module):
+    """
+    Summarize what importing a module cost.
+
+    The module's parent packages are imported first and reported separately
+    by the interpreter, so they are counted too.
+
+    Args:
+        entries (list): Output of parse_importtime
+        module (str): Dotted name of the imported module
+
+    Returns:
+        dict: "seconds" (cumulative import time), "modules" (modules loaded),
+        "imports" (cumulative seconds of each direct import, by name) and
+        "deferred" (sorted DEFERRED_PACKAGES that were loaded)
+
+    Raises:
+        ValueError: If the report does not include the module
+    """
+    parts = module.split(".")
+    chain = {".".join(parts[: i + 1]) for i in range(len(parts))}
+    loaded = []
+    for index, (name, depth, _, _) in enumerate(entries):
+        if depth == 0 and name in chain:
+            loaded.extend(_subtree(entries, index))
+    if not any(name == module for name, _, _, _ in loaded):
+        raise ValueError(f"{module} was not imported")
+
+    imports = {}
+    for name, depth, _, cumulative_us in loaded:
+        if depth == 1:
+            imports[name] = cumulative_us / 1e6
+    deferred = {name.split(".")[0] for name, _, _, _ in loaded}
+    return {
+        "seconds": sum(entry[3] for entry in loaded if entry[1] == 0) / 1e6,
+        "modules": len(loaded),
+        "imports": imports,
+        "deferred": sorted(deferred.intersection(DEFERRED_PACKAGES)),
+    }
+
+
+def measure(module, repeat):
+    """
+    Measure the import of one module in fresh interpreters.
+
+    A first untimed run compiles any stale bytecode; the fastest of the timed
+    runs is reported, as in bench_extractors.
+
+    Args:
+        module (str): Dotted module name
+        repeat (int): Timed runs
+
+    Returns:
+        dict: profile_import result of the fastest run
+
+    Raises:
+        RuntimeError: If the import fails
+    """
+    profiles = []
+    for _ in range(max(1, repeat) + 1):
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+        )
+        if completed.returncode != 0:
+            raise RuntimeError(f"import {module} failed:\n{completed.stderr}")
+        profiles.append(profile_import(parse_importtime(completed.stderr), module))
+    return min(profiles[1:], key=lambda profile: profile["seconds"])
+
+
+def run_suite(modules=DEFAULT_MODULES, repeat=DEFAULT_REPEAT):
+    """
+    Measure every entry point.
+
+    Args:
+        modules (list): Dotted module names
+        repeat (int): Timed runs per module
+
+    Returns:
+        dict: Measurements (see measure) keyed by module, in run order
+    """
+    return {module: measure(module, repeat) for module in modules}
+
+
+def environment():
+    """Describe the interpreter and the heaviest dependencies behind a run."""
+    info = {"python": platform.python_version(), "machine": platform.machine()}
+    for package in ("streamlit", "openai"):
+        try:
+            info[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            info[package] = None
+    return info
+
+
+def load_baselines(path=BASELINE_PATH):
+    """
+    Read committed baselines.
+
+    Args:
+        path (str): Baseline JSON file
+
+    Returns:
+        dict: Measurements keyed by module (empty if the file is missing)
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)["modules"]
+    except FileNotFoundError:
+        return {}
+
+
+def save_baselines(results, path=BASELINE_PATH):
+    """
+    Write results as the new baselines, keeping modules that were not run.
+
+    Args:
+        results (dict): Measurements keyed by module
+        path (str): Baseline JSON file
+    """
+    modules = load_baselines(path)
+    for name, result in results.items():
+        modules[name] = {
+            "seconds": round(result["seconds"], 6),
+            "modules": result["modules"],
+        }
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"environment": environment(), "modules": modules}, f, indent=2)
+        f.write("\n")
+
+
+def compare(results, baselines, threshold=DEFAULT_THRESHOLD):
+    """
+    Find entry points that regressed.
+
+    A metric regresses when it exceeds its baseline by more than ``threshold``
+    (a fraction) and by more than MIN_SECONDS_DELTA / MIN_MODULES_DELTA.
+    Loading a deferred package is always a regression, with or without a
+    baseline.
+
+    Args:
+        results (dict): Measurements keyed by module
+        baselines (dict): Baseline measurements keyed by module
+        threshold (float): Allowed relative increase, e.g. 0.25 for 25%
+
+    Returns:
+        list: (module, metric, current, baseline) tuples for every regression;
+        a deferred package is reported as metric "imports <package>" with
+        current 1 and baseline 0
+    """
+    regressions = []
+    for name, result in results.items():
+        for package in result["deferred"]:
+            regressions.append((name, f"imports {package}", 1, 0))
+        baseline = baselines.get(name)
+        if baseline is None:
+            continue
+        for metric, min_delta in (
+            ("seconds", MIN_SECONDS_DELTA),
+            ("modules", MIN_MODULES_DELTA),
+        ):
+            current, base = result[metric], baseline[metric]
+            if current > base * (1 + threshold) and current - base > min_delta:
+                regressions.append((name, metric, current, base))
+    return regressions
+
+
+def _change(current, base):
+    return f"{(current - base) / base:+.0%}" if base else "new"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--modules", nargs="+", default=DEFAULT_MODULES)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=DEFAULT_TOP,
+        help="direct imports listed per entry point (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="allowed relative increase over the baseline (0.25 = 25%%)",
+    )
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument(
+        "--update", action="store_true", help="store this run as the new baseline"
+    )
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.modules, args.repeat)
+    baselines = load_baselines(args.baseline)
+
+    print(
+        f"{'module':<28} {'ms':>8} {'base ms':>8} {'change':>7} "
+        f"{'modules':>8} {'base':>6} {'change':>7}"
+    )
+    for name, result in results.items():
+        base = baselines.get(name, {"seconds": 0, "modules": 0})
+        print(
+            f"{name:<28} {result['seconds'] * 1000:>8.1f} "
+            f"{base['seconds'] * 1000:>8.1f} "
+            f"{_change(result['seconds'], base['seconds']):>7} "
+            f"{result['modules']:>8} {base['modules']:>6} "
+            f"{_change(result['modules'], base['modules']):>7}"
+        )
+        heaviest = sorted(result["imports"].items(), key=lambda item: -item[1])
+        for module, seconds in heaviest[: args.top]:
+            print(f"    {module:<40} {seconds * 1000:>8.1f}")
+
+    if args.update:
+        save_baselines(results, args.baseline)
+        print(f"Baselines written to {args.baseline}")
+        return
+
+    regressions = compare(results, baselines, args.threshold)
+    for name, metric, current, base in regressions:
+        if metric.startswith("imports "):
+            print(
+                f"REGRESSION {name} {metric}: the package must be imported on"
+                " first use",
+                file=sys.stderr,
+            )
+            continue
+        print(
+            f"REGRESSION {name} {metric}: {current:g} vs baseline {base:g} "
+            f"({_change(current, base)}, threshold {args.threshold:+.0%})",
+            file=sys.stderr,
+        )
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Compare serial and pool-parallel PDF extraction across document sizes.
+
+Usage:
+    python -m benchmarks.bench_pdf_extraction [--sizes 1 5 10 40 100] [--repeat 3]
+"""
+
+import argparse
+import io
+import os
+import statistics
+import time
+
+from benchmarks.fixtures import make_pdf
+from src.utils.extraction_pool import get_extraction_pool, shutdown_extraction_pool
+from src.utils.text_extractor import (
+    extract_text_from_pdf,
+    extract_text_from_pdf_parallel,
+)
+
+
+def _time(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 5, 10, 40, 100])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    # Always measure the pool path, even for short documents
+    os.environ["PDF_POOL_MIN_PAGES"] = "1"
+    pool = get_extraction_pool()
+    if pool is None:
+        raise SystemExit("Extraction pool is disabled (EXTRACTION_POOL_SIZE=0)")
+    # Start the workers before timing so spawn cost is not attributed to a size
+    extract_text_from_pdf_parallel(make_pdf(2))
+
+    print(f"{'pages':>6} {'serial ms':>10} {'parallel ms':>12} {'speedup':>8}")
+    try:
+        for pages in args.sizes:
+            data = make_pdf(pages)
+            serial, serial_text = _time(
+                lambda: extract_text_from_pdf(io.BytesIO(data)), args.repeat
+            )
+            parallel, parallel_text = _time(
+                lambda: extract_text_from_pdf_parallel(data), args.repeat
+            )
+            assert serial_text == parallel_text, "parallel output differs"
+            print(
+                f"{pages:>6} {serial * 1000:>10.1f} {parallel * 1000:>12.1f} "
+                f"{serial / parallel:>7.2f}x"
+            )
+    finally:
+        shutdown_extraction_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Measure how long a Streamlit rerun of the app script takes.
+
+Every widget interaction reruns main.py from the top, so the cost of a rerun
+is paid on each click. The app is driven through Streamlit's AppTest
+harness, in process, in two states: the empty form ("idle") and a finished
+analysis on screen ("result"). The analysis is produced once up front by a
+local mock OpenRouter server (see benchmarks.mock_openrouter); the reruns
+measured afterwards only render it.
+
+AppTest recompiles the script on every run, which a Streamlit server does
+only once, so the timed section is main() itself, called from a small
+driver script.
+
+Usage:
+    python -m benchmarks.bench_rerun [--reruns 50]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.fixtures import resume_lines
+from benchmarks.mock_openrouter import MockBehaviour, MockOpenRouter
+
+DEFAULT_RERUNS = 50
+SCENARIOS = ("idle", "result")
+
+# Session state entry the driver script appends main()'s durations to
+TIMINGS_KEY = "_bench_script_timings"
+
+
+def _driver():
+    import time
+
+    import streamlit as st
+
+    from main import main
+
+    start = time.perf_counter()
+    main()
+    timings = st.session_state.setdefault("_bench_script_timings", [])
+    timings.append(time.perf_counter() - start)
+
+
+def _finished_job_id():
+    """Run one analysis to completion and return its job ID."""
+    from main import submit_analysis
+    from src.utils.upload import BufferedUpload
+
+    resume = "\n".join(resume_lines(30)).encode("utf-8")
+    job = submit_analysis(BufferedUpload(resume, "resume.txt", "text/plain"), "")
+    if job.error is not None:
+        raise job.error
+    return job.id
+
+
+def time_reruns(scenario, reruns=DEFAULT_RERUNS):
+    """
+    Time repeated runs of the app script.
+
+    Args:
+        scenario (str): "idle" or "result"
+        reruns (int): Timed runs after one untimed warm-up run
+
+    Returns:
+        dict: "median" and "min" seconds per run
+    """
+    from main import JOB_ID_KEY
+
+    app = AppTest.from_function(_driver, default_timeout=30)
+    if scenario == "result":
+        app.session_state[JOB_ID_KEY] = _finished_job_id()
+    app.run()
+    if app.exception:
+        raise RuntimeError(app.exception[0].message)
+
+    for _ in range(max(1, reruns)):
+        app.run()
+    timings = app.session_state[TIMINGS_KEY][1:]
+    return {"median": statistics.median(timings), "min": min(timings)}
+
+
+def run_benchmark(reruns=DEFAULT_RERUNS):
+    """
+    Time reruns in every scenario against a local mock server.
+
+    Args:
+        reruns (int): Timed runs per scenario
+
+    Returns:
+        dict: time_reruns results keyed by scenario
+    """
+    # Jobs run inline so the analysis is finished before the reruns start
+    os.environ["JOB_WORKERS"] = "0"
+    os.environ["OPENROUTER_API_KEY"] = "mock-key"
+    os.environ["OPENROUTER_REQUESTS_PER_MINUTE"] = "0"
+    # The script runner installs each script as __main__; spawned extraction
+    # workers would re-run the driver script instead of the real entry point
+    main_module = sys.modules["__main__"]
+    try:
+        with MockOpenRouter(MockBehaviour(latency=0)) as server:
+            os.environ["OPENROUTER_BASE_URL"] = server.base_url
+            return {scenario: time_reruns(scenario, reruns) for scenario in SCENARIOS}
+    finally:
+        sys.modules["__main__"] = main_module
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reruns", type=int, default=DEFAULT_RERUNS)
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.reruns)
+    print(f"{'scenario':<10} {'median ms':>10} {'min ms':>8}")
+    for scenario, result in results.items():
+        print(
+            f"{scenario:<10} {result['median'] * 1000:>10.2f} "
+            f"{result['min'] * 1000:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
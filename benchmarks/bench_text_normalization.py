@@ -0,0 +1,79 @@
+"""
+Measure the token reduction and cost of text normalization on a resume corpus.
+
+The corpus mixes text extracted from generated PDFs (with and without a
+repeated header and footer) and synthetic extraction output with bullet
+glyphs, doubled spaces and hyphenated line breaks.
+
+Usage:
+    python -m benchmarks.bench_text_normalization [--repeat 20]
+"""
+
+import argparse
+import io
+import statistics
+import time
+
+from benchmarks.fixtures import CONTACT_HEADER, make_pdf, noisy_resume_text
+from src.services.prompt_builder import estimate_tokens
+from src.utils.text_extractor import extract_text_from_pdf
+from src.utils.text_normalizer import PAGE_BREAK, normalize_text
+
+FOOTER = "Page {page} of {pages}"
+
+
+def build_corpus():
+    """
+    Returns:
+        list: (name, extracted text) pairs
+    """
+
+    def pdf_text(pages, **kwargs):
+        return extract_text_from_pdf(io.BytesIO(make_pdf(pages, **kwargs)))
+
+    return [
+        ("pdf, 1 page, clean", pdf_text(1)),
+        (
+            "pdf, 3 pages, header+footer",
+            pdf_text(3, header=CONTACT_HEADER, footer=FOOTER),
+        ),
+        (
+            "pdf, 10 pages, header+footer",
+            pdf_text(10, header=CONTACT_HEADER, footer=FOOTER),
+        ),
+        ("noisy, 2 pages", noisy_resume_text(2)),
+        ("noisy, 5 pages", noisy_resume_text(5)),
+        ("noisy, 20 pages", noisy_resume_text(20)),
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    print(f"{'document':<30} {'tokens':>7} {'after':>7} {'saved':>7} {'us/page':>8}")
+    total_before = total_after = 0
+    for name, text in build_corpus():
+        pages = text.count(PAGE_BREAK) or 1
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            normalized = normalize_text(text)
+            timings.append(time.perf_counter() - start)
+        before, after = estimate_tokens(text), estimate_tokens(normalized)
+        total_before += before
+        total_after += after
+        per_page = statistics.median(timings) / pages * 1e6
+        print(
+            f"{name:<30} {before:>7} {after:>7} "
+            f"{(before - after) / before:>6.1%} {per_page:>8.1f}"
+        )
+    print(
+        f"{'total':<30} {total_before:>7} {total_after:>7} "
+        f"{(total_before - total_after) / total_before:>6.1%}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Push concurrent analyses through analyze_resume and report throughput.
+
+By default a local mock server (see benchmarks.mock_openrouter) stands in for
+OpenRouter, so no API quota is used. Each analysis runs on its own thread
+through the real synchronous entry point, as Streamlit sessions do, with a
+distinct resume so that the cache and request coalescing do not hide work.
+
+Usage:
+    python -m benchmarks.load_test [--requests 200] [--concurrency 20]
+        [--stream] [--latency 0.5 --latency-sigma 0.5 --error-rate 0.02 ...]
+    python -m benchmarks.load_test --base-url https://openrouter.ai/api/v1
+"""
+
+import argparse
+import collections
+import concurrent.futures
+import os
+import time
+
+from benchmarks.fixtures import resume_lines
+from benchmarks.mock_openrouter import (
+    MockOpenRouter,
+    add_behaviour_arguments,
+    behaviour_from_args,
+)
+from src.services.ai_analyzer import analyze_resume, analyze_resume_stream
+from src.services.client_pool import get_pool_stats, reset_client_manager
+from src.services.rate_limiter import get_rate_limiter
+from src.utils.metrics import PERCENTILES, percentile
+
+# Settings applied for the run unless already set in the environment; the rate
+# limiter's defaults would otherwise pace a load test at 20 requests a minute
+MOCK_ENVIRONMENT = {
+    "OPENROUTER_API_KEY": "mock-key",
+    "OPENROUTER_REQUESTS_PER_MINUTE": "0",
+    "OPENROUTER_MAX_CONCURRENCY": "100",
+}
+
+
+def _resume(index, lines=30):
+    return "\n".join(resume_lines(lines, page=index))
+
+
+def _analyze(index, stream):
+    start = time.perf_counter()
+    if not stream:
+        analyze_resume(_resume(index))
+        return time.perf_counter() - start, None
+    metrics = {}
+    for _ in analyze_resume_stream(_resume(index), metrics=metrics):
+        pass
+    return time.perf_counter() - start, metrics.get("time_to_first_token")
+
+
+def _summary(samples):
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+    return {f"p{pct}": percentile(ordered, pct) for pct in PERCENTILES}
+
+
+def run_load_test(requests, concurrency, stream=False):
+    """
+    Run analyses concurrently against the configured OPENROUTER_BASE_URL.
+
+    Args:
+        requests (int): Total number of analyses
+        concurrency (int): Analyses in flight at once
+        stream (bool): Use analyze_resume_stream instead of analyze_resume
+
+    Returns:
+        dict: "requests", "succeeded", "errors" (count by exception type),
+        "wall_time", "throughput" (successful analyses per second), and
+        "latency" / "first_token" percentiles in seconds
+    """
+    # Isolate the run from cached results and in-flight duplicates
+    os.environ["RESUME_CACHE_ENABLED"] = "false"
+    os.environ["ANALYSIS_SINGLE_FLIGHT"] = "false"
+
+    latencies = []
+    first_tokens = []
+    errors = collections.Counter()
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(_analyze, i, stream) for i in range(requests)]
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                latency, first_token = future.result()
+            except Exception as e:
+                errors[type(e).__name__] += 1
+                continue
+            latencies.append(latency)
+            if first_token is not None:
+                first_tokens.append(first_token)
+    wall_time = time.perf_counter() - start
+
+    return {
+        "requests": requests,
+        "succeeded": len(latencies),
+        "errors": dict(errors),
+        "wall_time": wall_time,
+        "throughput": len(latencies) / wall_time if wall_time else 0.0,
+        "latency": _summary(latencies),
+        "first_token": _summary(first_tokens),
+    }
+
+
+def _format_percentiles(summary):
+    return "  ".join(f"{name} {seconds:.3f}s" for name, seconds in summary.items())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--stream", action="store_true")
+    parser.add_argument(
+        "--base-url",
+        help="send requests to this API instead of a local mock (uses quota)",
+    )
+    add_behaviour_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.base_url:
+        os.environ["OPENROUTER_BASE_URL"] = args.base_url
+    else:
+        server = MockOpenRouter(behaviour_from_args(args)).start()
+        os.environ["OPENROUTER_BASE_URL"] = server.base_url
+        for name, value in MOCK_ENVIRONMENT.items():
+            os.environ.setdefault(name, value)
+
+    try:
+        result = run_load_test(args.requests, args.concurrency, args.stream)
+        pool = get_pool_stats()
+        limiter = get_rate_limiter().stats()
+    finally:
+        reset_client_manager()
+        if server is not None:
+            server.stop()
+
+    failed = result["requests"] - result["succeeded"]
+    errors = ", ".join(f"{name} x{count}" for name, count in result["errors"].items())
+    print(f"target       {os.environ['OPENROUTER_BASE_URL']}")
+    print(
+        f"requests     {result['requests']} at concurrency {args.concurrency} "
+        f"({result['succeeded']} ok, {failed} failed{': ' + errors if errors else ''})"
+    )
+    print(f"wall time    {result['wall_time']:.2f}s")
+    print(f"throughput   {result['throughput']:.2f} analyses/s")
+    print(f"latency      {_format_percentiles(result['latency'])}")
+    if result["first_token"]:
+        print(f"first token  {_format_percentiles(result['first_token'])}")
+    print(
+        f"limiter      {limiter['throttled']} throttled, "
+        f"final concurrency limit {limiter['limit']}"
+    )
+    print(f"connections  {pool.get('open', 0)} open, {pool.get('requests', 0)} sent")
+    if server is not None:
+        stats = server.stats()
+        print(
+            f"mock server  {stats['requests']} requests, "
+            f"{stats['errors']} injected errors"
+        )
+
+
+if __name__ == "__main__":
+    main()
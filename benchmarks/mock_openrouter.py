@@ -0,0 +1,351 @@
+"""
+Local OpenRouter-compatible server for load tests.
+
+Implements the chat completions endpoint, streamed (server-sent events) and
+non-streamed, plus the models listing used by the connection warm-up. Latency,
+error rate and token throughput are configurable, so the analyzer can be
+driven at scale without spending API quota.
+
+Usage:
+    python -m benchmarks.mock_openrouter [--port 8999] [--latency 0.5]
+        [--latency-sigma 0.5] [--error-rate 0.02] [--tokens-per-second 80]
+
+Point the app at it with OPENROUTER_BASE_URL=http://127.0.0.1:8999/v1 (any
+OPENROUTER_API_KEY is accepted).
+"""
+
+import argparse
+import itertools
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_PORT = 8999
+DEFAULT_LATENCY = 0.5
+DEFAULT_COMPLETION_TOKENS = 150
+
+# Words the canned analysis is built from; one word is one token
+ANALYSIS_WORDS = (
+    "## Strengths Clear structure and quantified achievements. "
+    "## Areas for Improvement Add metrics to older roles and tighten the "
+    "summary. ## Recommendations Match keywords to the job description."
+).split()
+
+
+class MockBehaviour:
+    """
+    How the mock server responds.
+
+    Attributes:
+        latency (float): Median seconds before the first token
+        latency_sigma (float): Spread of the log-normal latency distribution
+            (0 makes every request wait exactly ``latency``)
+        error_rate (float): Fraction of requests answered with an error
+        error_status (int): HTTP status of injected errors
+        retry_after (float): Retry-After sent with injected 429 responses
+        tokens_per_second (float): Output throughput (0 sends instantly)
+        completion_tokens (int): Tokens generated per response, capped by the
+            request's max_tokens
+    """
+
+    def __init__(
+        self,
+        latency=DEFAULT_LATENCY,
+        latency_sigma=0.0,
+        error_rate=0.0,
+        error_status=429,
+        retry_after=1.0,
+        tokens_per_second=0.0,
+        completion_tokens=DEFAULT_COMPLETION_TOKENS,
+        seed=None,
+    ):
+        self.latency = max(0.0, latency)
+        self.latency_sigma = max(0.0, latency_sigma)
+        self.error_rate = min(1.0, max(0.0, error_rate))
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.tokens_per_second = max(0.0, tokens_per_second)
+        self.completion_tokens = max(1, completion_tokens)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def first_token_delay(self):
+        """Draw the seconds to wait before the first token."""
+        if not self.latency or not self.latency_sigma:
+            return self.latency
+        with self._lock:
+            return self.latency * math.exp(self._random.gauss(0, self.latency_sigma))
+
+    def should_fail(self):
+        """Decide whether the next request gets an injected error."""
+        if not self.error_rate:
+            return False
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+    def token_interval(self):
+        """Return the seconds between output tokens."""
+        return 1 / self.tokens_per_second if self.tokens_per_second else 0.0
+
+
+def _completion_words(max_tokens, behaviour):
+    count = min(behaviour.completion_tokens, max_tokens or behaviour.completion_tokens)
+    return list(itertools.islice(itertools.cycle(ANALYSIS_WORDS), count))
+
+
+def _prompt_tokens(messages):
+    text = "".join(str(message.get("content", "")) for message in messages)
+    return max(1, len(text) // 4)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # Keep-alive, so clients reuse pooled connections as they would upstream
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, body, headers=None):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            self._send_json(200, {"data": [{"id": "mock/model"}]})
+        else:
+            self._send_json(404, {"error": {"message": "Not found", "code": 404}})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "Not found", "code": 404}})
+            return
+
+        server = self.server.mock
+        behaviour = server.behaviour
+        stream = bool(payload.get("stream"))
+        server.count("requests")
+        time.sleep(behaviour.first_token_delay())
+
+        if behaviour.should_fail():
+            server.count("errors")
+            status = behaviour.error_status
+            headers = {}
+            if status == 429:
+                headers["Retry-After"] = f"{behaviour.retry_after:g}"
+            self._send_json(
+                status,
+                {"error": {"message": "Injected mock error", "code": status}},
+                headers,
+            )
+            return
+
+        words = _completion_words(payload.get("max_tokens"), behaviour)
+        model = payload.get("model", "mock/model")
+        if stream:
+            server.count("streamed")
+            self._stream(model, words, behaviour.token_interval())
+        else:
+            time.sleep(len(words) * behaviour.token_interval())
+            prompt_tokens = _prompt_tokens(payload.get("messages", []))
+            self._send_json(
+                200,
+                {
+                    "id": "mock-completion",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {
+                                "role": "assistant",
+                                "content": " ".join(words),
+                            },
+                            "finish_reason": "stop",
+                        }
+                    ],
+                    "usage": {
+                        "prompt_tokens": prompt_tokens,
+                        "completion_tokens": len(words),
+                        "total_tokens": prompt_tokens + len(words),
+                    },
+                },
+            )
+
+    def _stream(self, model, words, interval):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def event(delta, finish_reason=None):
+            chunk = {
+                "id": "mock-completion",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [
+                    {"index": 0, "delta": delta, "finish_reason": finish_reason}
+                ],
+            }
+            self._send_chunk(f"data: {json.dumps(chunk)}\n\n".encode())
+
+        try:
+            for i, word in enumerate(words):
+                if i:
+                    time.sleep(interval)
+                event({"role": "assistant", "content": word + " "})
+            event({}, "stop")
+            self._send_chunk(b"data: [DONE]\n\n")
+            self._send_chunk(b"")
+        except (BrokenPipeError, ConnectionResetError):
+            # The client closed the stream early (e.g. a cancelled hedge)
+            self.close_connection = True
+
+
+class MockOpenRouter:
+    """
+    A mock OpenRouter server running on a background thread.
+
+    Use it as a context manager, or call start() and stop().
+
+    Attributes:
+        behaviour (MockBehaviour): How requests are answered
+    """
+
+    def __init__(self, behaviour=None, host="127.0.0.1", port=0):
+        """
+        Args:
+            behaviour (MockBehaviour, optional): Response behaviour
+            host (str): Interface to listen on
+            port (int): Port to listen on (0 picks a free port)
+        """
+        self.behaviour = behaviour or MockBehaviour()
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.mock = self
+        self._thread = None
+        self._stats = {"requests": 0, "streamed": 0, "errors": 0}
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        """The OpenAI-compatible base URL to put in OPENROUTER_BASE_URL."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def count(self, name):
+        """Increment a request counter (see stats)."""
+        with self._lock:
+            self._stats[name] += 1
+
+    def stats(self):
+        """
+        Return request counters.
+
+        Returns:
+            dict: "requests" received, of which "streamed" and injected
+            "errors"
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def start(self):
+        """Start serving on a daemon thread and return self."""
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="mock-openrouter", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the listening socket."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.stop()
+
+
+def add_behaviour_arguments(parser):
+    """Add the MockBehaviour options to an argument parser."""
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=DEFAULT_LATENCY,
+        help="median seconds before the first token",
+    )
+    parser.add_argument(
+        "--latency-sigma",
+        type=float,
+        default=0.0,
+        help="log-normal spread of the latency (0 for fixed)",
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=429)
+    parser.add_argument(
+        "--tokens-per-second",
+        type=float,
+        default=0.0,
+        help="output throughput per response (0 for instant)",
+    )
+    parser.add_argument(
+        "--completion-tokens", type=int, default=DEFAULT_COMPLETION_TOKENS
+    )
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def behaviour_from_args(args):
+    """Build a MockBehaviour from parsed add_behaviour_arguments options."""
+    return MockBehaviour(
+        latency=args.latency,
+        latency_sigma=args.latency_sigma,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        tokens_per_second=args.tokens_per_second,
+        completion_tokens=args.completion_tokens,
+        seed=args.seed,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    add_behaviour_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server = MockOpenRouter(behaviour_from_args(args), args.host, args.port)
+    server.start()
+    print(f"Mock OpenRouter listening on {server.base_url} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(f"Served {server.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,389 @@
+import re
+
 import streamlit as st
+from src.config import env_float, load_environment
 from src.utils.text_extractor import extract_text_from_file
-from src.services.ai_analyzer import analyze_resume
-from src.utils.ui_utils import setup_ui
+from src.utils.upload import BufferedUpload, UploadTooLargeError
+from src.services.ai_analyzer import (
+    analyze_resume_multi_role,
+    analyze_resume_stream,
+    normalize_job_roles,
+    warm_up_openai_client,
+)
+from src.services.jobs import QUEUED, get_job_queue, make_job_key
+from src.services.rate_limiter import RateLimitTimeout
+from src.utils.deadline import Deadline, DeadlineExceeded
+from src.utils.metrics import (
+    export_metrics,
+    get_stage_timings,
+    start_metrics_exporter,
+)
+from src.utils.ui_utils import setup_ui, show_footer, show_header
+
+# Session state entry holding the ID of the session's analysis job
+JOB_ID_KEY = "analysis_job_id"
+
+# How often a page showing a running job refreshes its progress
+DEFAULT_POLL_SECONDS = 1.0
+
+
+def budget_caption(deadline):
+    """Describe how much of the request's time budget each stage used."""
+    parts = []
+    for stage, seconds, share in deadline.report():
+        used = f"{seconds:.2f}s"
+        if share is not None:
+            used += f" ({share:.0%})"
+        parts.append(f"{stage} {used}")
+    if deadline.budget is not None:
+        parts.append(f"budget {deadline.budget:g}s")
+    return "⏱️ " + " · ".join(parts)
+
+
+class EmptyResumeError(Exception):
+    """Raised when an upload contains no extractable text."""
+
+
+def parse_job_roles(job_role):
+    """
+    Split the job role field into the roles it lists.
+
+    Args:
+        job_role (str): Field contents; several roles are separated by
+            semicolons or line breaks. Commas are kept, since titles such as
+            "VP, Sales" contain them
+
+    Returns:
+        list: The roles (empty when none was entered)
+    """
+    return normalize_job_roles(re.split(r"[;\n]", job_role or ""))
+
+
+def run_analysis(job, upload, job_role):
+    """
+    Extract and analyze one resume; runs on a job queue worker.
+
+    Progress is published through ``job.info`` ("stage", "file_name",
+    "job_roles", "text_chars", "stream_metrics", "deadline") and the streamed
+    analysis through ``job.append``, so the page can show it while polling.
+    Several job roles are analyzed together in one request and not streamed.
+
+    Args:
+        job (Job): The job being run
+        upload (BufferedUpload): The resume file
+        job_role (str): Target job role(s) (may be empty; see parse_job_roles)
+
+    Returns:
+        str or dict: The analysis text, or the analysis of each role when
+        several were given
+
+    Raises:
+        EmptyResumeError: If no text could be extracted
+        Exception: Whatever extraction or analysis failed with
+    """
+    # One time budget covers extraction and analysis
+    deadline = Deadline.from_env()
+    roles = parse_job_roles(job_role)
+    job.info.update(
+        stage="extraction",
+        file_name=upload.name,
+        job_role=", ".join(roles),
+        job_roles=roles,
+        deadline=deadline,
+    )
+    try:
+        with deadline.stage("extraction"):
+            file_content = extract_text_from_file(upload, deadline=deadline)
+        if not file_content or not file_content.strip():
+            raise EmptyResumeError("⚠️ File does not have any content...")
+
+        stream_metrics = {}
+        job.info.update(
+            stage="analysis",
+            text_chars=len(file_content),
+            stream_metrics=stream_metrics,
+        )
+        with deadline.stage("analysis"):
+            if len(roles) > 1:
+                return analyze_resume_multi_role(
+                    file_content, roles, metrics=stream_metrics, deadline=deadline
+                )
+            for chunk in analyze_resume_stream(
+                file_content,
+                roles[0] if roles else "",
+                metrics=stream_metrics,
+                deadline=deadline,
+            ):
+                job.append(chunk)
+        return job.partial()
+    finally:
+        get_stage_timings().observe("request", deadline.elapsed())
+        export_metrics()
+
+
+def submit_analysis(uploaded_file, job_role):
+    """
+    Queue the analysis of an upload, or find the identical one already queued.
+
+    Args:
+        uploaded_file: The Streamlit upload
+        job_role (str): Target job role(s) (may be empty)
+
+    Returns:
+        Job: The analysis job
+    """
+    upload = BufferedUpload.from_upload(uploaded_file)
+    roles = "\n".join(parse_job_roles(job_role))
+    job_id = make_job_key(upload.getvalue(), upload.type, roles)
+    return get_job_queue().submit(job_id, run_analysis, upload, job_role)
+
+
+def show_job(job_id):
+    """
+    Render the results area for a job as an isolated fragment.
+
+    Interactions inside the fragment rerun only the fragment. While the job
+    runs, the fragment also reruns on a timer to show its progress.
+
+    Args:
+        job_id (str): ID of the session's current job
+    """
+    job = get_job_queue().get(job_id)
+    if job is None:
+        # Its result expired (or the server restarted): show the form afresh
+        st.session_state.pop(JOB_ID_KEY, None)
+        return
+    polling = not job.finished
+    run_every = env_float("JOB_POLL_SECONDS", DEFAULT_POLL_SECONDS) if polling else None
+    st.fragment(show_job_panel, run_every=run_every)(job_id, polling)
+
+
+def show_job_panel(job_id, polling):
+    """
+    Render a job: its result once finished, live progress until then.
+
+    Args:
+        job_id (str): ID of the job
+        polling (bool): Whether the fragment is rerunning on a timer
+    """
+    job = get_job_queue().get(job_id)
+    if job is None or (polling and job.finished):
+        # Redraw the whole page once, without the timer, to show the outcome
+        st.rerun()
+        return
+    if job.finished:
+        with get_stage_timings().span("render"):
+            show_job_result(job)
+    else:
+        show_job_progress(job)
+
+
+def show_job_progress(job):
+    """
+    Render the state of a running job.
+
+    Args:
+        job (Job): A QUEUED or RUNNING job
+    """
+    if job.status == QUEUED:
+        st.info("⏳ Waiting for a free analysis worker...")
+        st.progress(10)
+    elif job.info.get("stage") == "extraction":
+        st.info("📄 Extracting text from your resume...")
+        st.progress(30)
+    elif len(job.info.get("job_roles", ())) > 1:
+        st.info(
+            f"🧠 Analyzing your resume for {len(job.info['job_roles'])} job roles..."
+        )
+        st.progress(50)
+    else:
+        st.info("🧠 Analyzing your resume with AI...")
+        st.progress(50)
+        st.markdown("### 📊 Analysis Results")
+        st.markdown(job.partial())
+
+
+def show_job_result(job):
+    """
+    Render a finished job's analysis, or the error it failed with.
+
+    Args:
+        job (Job): A DONE or FAILED job
+    """
+    info = job.info
+    error = job.error
+    deadline = info["deadline"]
+
+    if isinstance(error, EmptyResumeError):
+        # Make sure to show error and stop execution for empty files
+        st.error(str(error))
+        st.stop()
+        return
+    if info["stage"] == "extraction":
+        if isinstance(error, UploadTooLargeError):
+            st.error(f"⚠️ {str(error)}")
+        elif isinstance(error, DeadlineExceeded):
+            st.error(f"⏱️ {str(error)}")
+            st.caption(budget_caption(deadline))
+        else:
+            st.error(f"An error occurred: {str(error)}")
+        return
+
+    # Show file info
+    file_info = f"File: {info['file_name']} ({round(info['text_chars'] / 1024, 2)} KB of text extracted)"
+    st.success(f"✅ Text extraction complete! {file_info}")
+    if info["job_role"]:
+        st.info(f"🎯 Tailoring analysis for: {info['job_role']}")
+    st.markdown("### 📊 Analysis Results")
+
+    if error is None:
+        analysis_result = job.result
+        if isinstance(analysis_result, dict):
+            analysis_result = show_role_tabs(analysis_result)
+        else:
+            st.markdown(analysis_result)
+
+        # Check if the result contains error info
+        if "Error Encountered" in analysis_result:
+            st.warning("⚠️ Analysis completed with limited functionality")
+        show_stream_captions(info["stream_metrics"])
+        st.caption(budget_caption(deadline))
+
+    elif isinstance(error, RateLimitTimeout):
+        # Too many analyses queued: ask the user to retry instead of falling
+        # back to generic tips
+        st.warning(f"⏳ {str(error)}")
+        analysis_result = str(error)
+
+    elif isinstance(error, DeadlineExceeded):
+        # Out of time: report where the budget went instead of falling back
+        # to generic tips
+        st.error(f"⏱️ {str(error)}")
+        st.caption(budget_caption(deadline))
+        analysis_result = str(error)
+
+    elif isinstance(error, ValueError):
+        st.error(f"Configuration Error: {str(error)}")
+        st.error(
+            "Please check your .env file and make sure the OPENROUTER_API_KEY is set correctly."
+        )
+
+        # Provide a fallback result instead of stopping
+        analysis_result = f"""
+        # Resume Analysis (Offline Mode)
+
+        We couldn't connect to our AI service due to a configuration error: {str(error)}
+
+        ## General Resume Tips
+        1. Use clear, concise language to describe your experience
+        2. Quantify achievements with metrics when possible
+        3. Tailor your resume for each job application
+        4. Ensure proper formatting and organization
+        5. Proofread carefully for errors
+
+        Please check your API key configuration and try again.
+        """
+        st.markdown(analysis_result)
+
+    else:
+        st.error(f"An error occurred during analysis: {str(error)}")
+
+        # Provide a fallback result
+        analysis_result = f"""
+        # Resume Analysis (Offline Mode)
+
+        We encountered an unexpected error: {str(error)}
+
+        ## General Resume Tips
+        1. Use clear, concise language to describe your experience
+        2. Quantify achievements with metrics when possible
+        3. Tailor your resume for each job application
+        4. Ensure proper formatting and organization
+        5. Proofread carefully for errors
+
+        Please try again later.
+        """
+        st.markdown(analysis_result)
+
+    # Add download button for results
+    st.download_button(
+        label="📥 Download Analysis",
+        data=analysis_result,
+        file_name="resume_analysis.txt",
+        mime="text/plain",
+        on_click="ignore",
+    )
+
+
+def show_role_tabs(analyses):
+    """
+    Render one tab per job role.
+
+    Args:
+        analyses (dict): Analysis keyed by job role
+
+    Returns:
+        str: All analyses under their role headings, for the download
+    """
+    for tab, analysis in zip(st.tabs(list(analyses)), analyses.values()):
+        with tab:
+            st.markdown(analysis)
+    return "\n\n".join(f"# {role}\n\n{analysis}" for role, analysis in analyses.items())
+
+
+def show_stream_captions(stream_metrics):
+    """Describe how the analysis was produced (cache, latency, fallbacks)."""
+    if stream_metrics.get("cached"):
+        st.caption("⚡ Served from cache")
+    elif stream_metrics.get("coalesced"):
+        st.caption("⚡ Shared with an identical analysis in progress")
+    elif "time_to_first_token" in stream_metrics:
+        st.caption(
+            f"⚡ First token in {stream_metrics['time_to_first_token']:.2f}s"
+            f" · completed in {stream_metrics['total_time']:.2f}s"
+        )
+    if stream_metrics.get("roles"):
+        st.caption(
+            f"🧩 {stream_metrics['roles']} job roles:"
+            f" {stream_metrics['cached_roles']} from cache,"
+            f" {stream_metrics['role_requests']} shared request(s)"
+            f" in {stream_metrics['total_time']:.2f}s"
+        )
+    if stream_metrics.get("hedged"):
+        st.caption(
+            f"🔀 Served by {stream_metrics['model']}"
+            " (the primary model was slow or unavailable)"
+        )
+    if stream_metrics.get("sections"):
+        st.caption(
+            f"📚 Long resume: {stream_metrics['sections']} sections"
+            " reviewed in parallel in"
+            f" {stream_metrics['section_time']:.2f}s"
+        )
+    if stream_metrics.get("input_trimmed"):
+        st.caption(
+            "✂️ Resume trimmed from ~"
+            f"{stream_metrics['input_tokens_before_trim']} to ~"
+            f"{stream_metrics['input_tokens_after_trim']} input tokens"
+            " to fit the model's budget"
+        )
 
 
 def main():
+    # Settings from .env (variables already in the environment win)
+    load_environment()
+
     # Initialize UI (includes sidebar setup)
     setup_ui()
 
+    # Open the upstream connection early (no-op unless OPENROUTER_WARMUP is set)
+    warm_up_openai_client()
+
+    # Serve stage timings at /metrics (no-op unless METRICS_PORT is set)
+    start_metrics_exporter()
+
     # Header section
-    st.markdown('<div class="main-header">', unsafe_allow_html=True)
-    st.markdown("<h1>📃 AI Resume Analyzer</h1>", unsafe_allow_html=True)
-    st.markdown(
-        "<p>Upload your resume and get AI-powered feedback tailored to your needs!</p>",
-        unsafe_allow_html=True,
-    )
-    st.markdown("</div>", unsafe_allow_html=True)
+    show_header()
 
     # Info section
     with st.expander("ℹ️ How it works", expanded=False):
@@ -30,126 +398,37 @@ def main():
             - Targeted improvements for specific roles
         """)
 
-    # Upload section
-    uploaded_file = st.file_uploader(
-        "📤 Upload your resume", type=["pdf", "docx", "txt"]
-    )
+    # Inputs live in a form: choosing a file or typing the role does not rerun
+    # the script, only submitting does
+    with st.form("analysis_form", border=False):
+        # Upload section
+        uploaded_file = st.file_uploader(
+            "📤 Upload your resume", type=["pdf", "docx", "txt"]
+        )
 
-    # Job role input
-    job_role = st.text_input("💼 Enter the job role you are applying for (optional)")
+        # Job role input
+        job_role = st.text_input(
+            "💼 Enter the job role you are applying for (optional;"
+            " separate several roles with semicolons)"
+        )
 
-    # Analyze button
-    col1, col2, col3 = st.columns([1, 2, 1])
-    with col2:
-        analyze = st.button("🔍 Analyze Resume")
+        # Analyze button
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col2:
+            analyze = st.form_submit_button("🔍 Analyze Resume")
 
-    # Main application logic
+    # Main application logic: the analysis runs as a background job, so
+    # reruns only read its state back instead of redoing or blocking on it
     if analyze and uploaded_file:
-        try:
-            # Extract text from the uploaded file first
-            file_content = extract_text_from_file(uploaded_file)
-            # Make sure to show error and stop execution for empty files
-            if not file_content or not file_content.strip():
-                st.error("⚠️ File does not have any content...")
-                st.stop()
-
-            with st.spinner("Analyzing your resume... This may take a moment."):
-                # Show progress bar
-                progress_bar = st.progress(0)
-
-                st.info("📄 Extracting text from your resume...")
-                progress_bar.progress(30)
-
-                # Show file info
-                file_info = f"File: {uploaded_file.name} ({round(len(file_content) / 1024, 2)} KB of text extracted)"
-                st.success(f"✅ Text extraction complete! {file_info}")
-                progress_bar.progress(50)
-
-                # Analyze the resume using AI
-                st.info("🧠 Analyzing your resume with AI...")
-                if job_role:
-                    st.info(f"🎯 Tailoring analysis for: {job_role}")
-
-                try:
-                    # Process the resume with the AI service
-                    analysis_result = analyze_resume(file_content, job_role)
-                    progress_bar.progress(100)
-
-                    # Check if the result contains error info
-                    if "Error Encountered" in analysis_result:
-                        st.warning("⚠️ Analysis completed with limited functionality")
-
-                except ValueError as e:
-                    st.error(f"Configuration Error: {str(e)}")
-                    st.error(
-                        "Please check your .env file and make sure the OPENROUTER_API_KEY is set correctly."
-                    )
-
-                    # Provide a fallback result instead of stopping
-                    analysis_result = f"""
-                    # Resume Analysis (Offline Mode)
-                    
-                    We couldn't connect to our AI service due to a configuration error: {str(e)}
-                    
-                    ## General Resume Tips
-                    1. Use clear, concise language to describe your experience
-                    2. Quantify achievements with metrics when possible 
-                    3. Tailor your resume for each job application
-                    4. Ensure proper formatting and organization
-                    5. Proofread carefully for errors
-                    
-                    Please check your API key configuration and try again.
-                    """
-                    progress_bar.progress(100)
-
-                except Exception as e:
-                    st.error(f"An error occurred during analysis: {str(e)}")
-
-                    # Provide a fallback result
-                    analysis_result = f"""
-                    # Resume Analysis (Offline Mode)
-                    
-                    We encountered an unexpected error: {str(e)}
-                    
-                    ## General Resume Tips
-                    1. Use clear, concise language to describe your experience
-                    2. Quantify achievements with metrics when possible
-                    3. Tailor your resume for each job application
-                    4. Ensure proper formatting and organization
-                    5. Proofread carefully for errors
-                    
-                    Please try again later.
-                    """
-                    progress_bar.progress(100)
-
-                # Display results
-                st.markdown("### 📊 Analysis Results")
-
-                st.markdown(analysis_result)
-
-                # Add download button for results
-                st.download_button(
-                    label="📥 Download Analysis",
-                    data=analysis_result,
-                    file_name="resume_analysis.txt",
-                    mime="text/plain",
-                )
+        job = submit_analysis(uploaded_file, job_role)
+        st.session_state[JOB_ID_KEY] = job.id
 
-        except Exception as e:
-            st.error(f"An error occurred: {str(e)}")
+    job_id = st.session_state.get(JOB_ID_KEY)
+    if job_id:
+        show_job(job_id)
 
     # Footer
-    st.markdown(
-        """
-        <div class="footer">
-            <p>Made with ❤️ by <a href="https://github.com/RYZHAIEV-SERHII" target="_blank">Serhii Ryzhaiev</a></p>
-            <p>Powered by <a href="https://streamlit.io" target="_blank">Streamlit</a> and
-            <a href="https://openrouter.ai" target="_blank">OpenRouter</a> (Gemini 2.0)</p>
-            <p><a href="https://github.com/RYZHAIEV-SERHII/resume-analyzer" target="_blank">GitHub Repository</a></p>
-        </div>
-        """,
-        unsafe_allow_html=True,
-    )
+    show_footer()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,415 @@
+"""
+HTTP analysis service.
+
+Serves resume extraction and analysis over HTTP for integrations that cannot
+drive the Streamlit UI. Requests are handled on one asyncio event loop:
+extraction runs on a bounded worker pool (large PDFs fan out further to the
+shared extraction process pool) and the analysis awaits the async OpenRouter
+client, so a slow upstream call holds no thread. The service keeps no state
+between requests beyond the shared caches, so replicas can run side by side
+behind a load balancer.
+
+Endpoints:
+    POST /v1/analyze  A multipart upload (a "file" field and an optional
+                      "job_role" field), or JSON ``{"text": ..., "job_role":
+                      ...}``. Returns the analysis as JSON, or streams it as
+                      plain text with ``?stream=true``. Several roles
+                      ("job_roles" fields, or a JSON list) are analyzed
+                      together and returned per role.
+    GET  /healthz     Liveness: the process is serving requests.
+    GET  /readyz      Readiness: the service can analyze (503 otherwise).
+    GET  /metrics     Stage timings in the Prometheus text format.
+
+Requires the optional "api" dependencies (starlette, uvicorn and
+python-multipart).
+
+Usage:
+    resume-api --host 0.0.0.0 --port 8000 --workers 2
+"""
+
+import argparse
+import asyncio
+import contextlib
+import functools
+import logging
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from starlette.applications import Starlette
+    from starlette.exceptions import HTTPException
+    from starlette.formparsers import MultiPartException
+    from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+    from starlette.routing import Route
+except ImportError as e:
+    raise ImportError(
+        "The HTTP service needs the optional 'api' dependencies: "
+        "pip install 'resume-analyzer[api]'"
+    ) from e
+
+from src.config import env_int, env_str, load_environment
+from src.services.ai_analyzer import (
+    analyze_resume_async,
+    analyze_resume_multi_role_async,
+    analyze_resume_stream_async,
+    normalize_job_roles,
+)
+from src.services.rate_limiter import RateLimitTimeout
+from src.utils.deadline import Deadline, DeadlineExceeded
+from src.utils.metrics import export_metrics, get_stage_timings, render_prometheus
+from src.utils.text_extractor import (
+    SUPPORTED_EXTENSIONS,
+    TEXT_MIME_TYPE,
+    extract_text_from_file,
+)
+from src.utils.upload import BufferedUpload, UploadTooLargeError, get_max_upload_bytes
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+DEFAULT_EXTRACT_WORKERS = 4
+
+# Room for the multipart framing on top of the upload size limit
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+logger = logging.getLogger(__name__)
+
+
+class ApiError(Exception):
+    """An error reported to the client with an HTTP status."""
+
+    def __init__(self, status_code, message, headers=None):
+        """
+        Args:
+            status_code (int): HTTP status of the response
+            message (str): Error description returned to the client
+            headers (dict, optional): Extra response headers
+        """
+        super().__init__(message)
+        self.status_code = status_code
+        self.headers = headers
+
+
+def error_response(error):
+    """
+    Map an exception to the JSON error response the client receives.
+
+    Args:
+        error (Exception): What the request failed with
+
+    Returns:
+        JSONResponse: ``{"error": ...}`` with a status describing the failure
+    """
+    if not isinstance(error, ApiError):
+        if isinstance(error, UploadTooLargeError):
+            error = ApiError(413, str(error))
+        elif isinstance(error, RateLimitTimeout):
+            retry_after = str(max(1, round(error.wait)))
+            error = ApiError(429, str(error), {"Retry-After": retry_after})
+        elif isinstance(error, DeadlineExceeded):
+            error = ApiError(504, str(error))
+        elif isinstance(error, ValueError):
+            # Raised by the analyzer when the API key is missing or invalid
+            error = ApiError(503, f"Configuration error: {str(error)}")
+        else:
+            error = ApiError(502, f"Analysis failed: {str(error)}")
+    return JSONResponse(
+        {"error": str(error)}, status_code=error.status_code, headers=error.headers
+    )
+
+
+def resolve_file_type(file_name, content_type):
+    """
+    Determine the MIME type extraction should use for an upload.
+
+    The file extension wins over the declared content type, which clients
+    often send as application/octet-stream.
+
+    Args:
+        file_name (str or None): Name of the uploaded file
+        content_type (str or None): Content type declared for the file part
+
+    Returns:
+        str: A supported MIME type
+
+    Raises:
+        ApiError: If the file is not a PDF, DOCX or TXT file
+    """
+    extension = os.path.splitext(file_name or "")[1].lower()
+    if extension in SUPPORTED_EXTENSIONS:
+        return SUPPORTED_EXTENSIONS[extension]
+    content_type = (content_type or "").split(";")[0].strip()
+    if content_type in SUPPORTED_EXTENSIONS.values():
+        return content_type
+    raise ApiError(415, "Unsupported file type; upload a PDF, DOCX or TXT file.")
+
+
+async def read_upload(request):
+    """
+    Read the resume and job roles from a request body.
+
+    Args:
+        request (Request): A multipart or JSON request
+
+    Returns:
+        tuple: (BufferedUpload, job roles); JSON text is wrapped as a TXT
+        upload so it goes through the same extraction budget and
+        normalization, and the roles are those of "job_role" and
+        "job_roles" (see normalize_job_roles)
+
+    Raises:
+        ApiError: If the body is missing, malformed or too large
+    """
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("multipart/form-data"):
+        max_bytes = get_max_upload_bytes()
+        length = request.headers.get("content-length", "")
+        if max_bytes and length.isdigit():
+            if int(length) > max_bytes + MULTIPART_OVERHEAD_BYTES:
+                raise UploadTooLargeError(int(length), max_bytes)
+        try:
+            form = await request.form()
+        except (HTTPException, MultiPartException):
+            # Starlette raises HTTPException inside an app, MultiPartException
+            # outside one
+            raise ApiError(400, "The request body is not valid multipart/form-data.")
+        try:
+            file = form.get("file")
+            if file is None or isinstance(file, str):
+                raise ApiError(400, 'Expected the resume in a "file" field.')
+            file_type = resolve_file_type(file.filename, file.content_type)
+            upload = BufferedUpload(await file.read(), file.filename, file_type)
+            roles = [form.get("job_role"), *form.getlist("job_roles")]
+        finally:
+            await form.close()
+        if not all(role is None or isinstance(role, str) for role in roles):
+            raise ApiError(400, "Job roles must be text fields.")
+        return upload, normalize_job_roles(roles)
+
+    if content_type.startswith("application/json"):
+        try:
+            body = await request.json()
+        except ValueError:
+            raise ApiError(400, "The request body is not valid JSON.")
+        text = body.get("text") if isinstance(body, dict) else None
+        if not isinstance(text, str):
+            raise ApiError(400, 'Expected the resume as a "text" string.')
+        job_roles = body.get("job_roles") or []
+        if not isinstance(job_roles, list):
+            raise ApiError(400, 'Expected "job_roles" as a list of strings.')
+        roles = [body.get("job_role"), *job_roles]
+        if not all(role is None or isinstance(role, str) for role in roles):
+            raise ApiError(400, 'Expected "job_roles" as a list of strings.')
+        upload = BufferedUpload(text.encode("utf-8"), "resume.txt", TEXT_MIME_TYPE)
+        return upload, normalize_job_roles(roles)
+
+    raise ApiError(
+        415, "Send the resume as multipart/form-data or as application/json."
+    )
+
+
+async def extract_text(request, upload, deadline):
+    """
+    Extract an upload's text on the app's extraction pool.
+
+    Args:
+        request (Request): The current request
+        upload (BufferedUpload): The resume file
+        deadline (Deadline): The request's time budget
+
+    Returns:
+        str: The extracted text
+
+    Raises:
+        ApiError: If the file contains no text
+    """
+    loop = asyncio.get_running_loop()
+    with deadline.stage("extraction"):
+        text = await loop.run_in_executor(
+            request.app.state.executor,
+            functools.partial(extract_text_from_file, upload, deadline=deadline),
+        )
+    if not text or not text.strip():
+        raise ApiError(422, "The file does not have any text content.")
+    return text
+
+
+async def analyze(request):
+    """Handle POST /v1/analyze."""
+    deadline = Deadline.from_env()
+    streaming = False
+    try:
+        upload, job_roles = await read_upload(request)
+        stream = request.query_params.get("stream", "").lower() in ("1", "true", "yes")
+        if stream and len(job_roles) > 1:
+            raise ApiError(400, "Streaming supports a single job role.")
+        text = await extract_text(request, upload, deadline)
+        job_role = job_roles[0] if job_roles else ""
+        if stream:
+            response = await stream_analysis(text, job_role, deadline)
+            streaming = True
+            return response
+
+        metrics = {}
+        with deadline.stage("analysis"):
+            if len(job_roles) > 1:
+                # One shared request covers several roles
+                result = {
+                    "analyses": await analyze_resume_multi_role_async(
+                        text, job_roles, metrics=metrics, deadline=deadline
+                    ),
+                    "job_roles": job_roles,
+                }
+            else:
+                result = {
+                    "analysis": await analyze_resume_async(
+                        text, job_role, metrics=metrics, deadline=deadline
+                    ),
+                    "job_role": job_role,
+                }
+    except Exception as e:
+        return error_response(e)
+    finally:
+        if not streaming:
+            get_stage_timings().observe("request", deadline.elapsed())
+
+    result.update(text_chars=len(text), metrics=metrics, stages=deadline.stages)
+    return JSONResponse(result)
+
+
+async def stream_analysis(text, job_role, deadline):
+    """
+    Start a streamed analysis.
+
+    The first chunk is awaited before the response starts, so failures to
+    start (missing API key, rate limit, deadline) still get an error status.
+    Later failures can only end the stream early.
+
+    Args:
+        text (str): The resume text
+        job_role (str): Target job role (may be empty)
+        deadline (Deadline): The request's time budget
+
+    Returns:
+        StreamingResponse: The analysis as plain text, as it is generated
+    """
+    chunks = analyze_resume_stream_async(text, job_role, deadline=deadline)
+    try:
+        first = await chunks.__anext__()
+    except StopAsyncIteration:
+        first = ""
+    except BaseException:
+        await chunks.aclose()
+        raise
+
+    async def body():
+        try:
+            yield first
+            async for chunk in chunks:
+                yield chunk
+        except Exception as e:
+            logger.error("Error during streamed analysis: %s", e)
+        finally:
+            await chunks.aclose()
+            get_stage_timings().observe("request", deadline.elapsed())
+
+    return StreamingResponse(body(), media_type="text/plain; charset=utf-8")
+
+
+async def health(request):
+    """Handle GET /healthz."""
+    return JSONResponse({"status": "ok"})
+
+
+async def ready(request):
+    """Handle GET /readyz."""
+    reasons = []
+    if not os.getenv("OPENROUTER_API_KEY"):
+        reasons.append("OPENROUTER_API_KEY is not set")
+    if getattr(request.app.state, "executor", None) is None:
+        reasons.append("the extraction pool is not running")
+    if reasons:
+        return JSONResponse(
+            {"status": "unavailable", "reasons": reasons}, status_code=503
+        )
+    return JSONResponse({"status": "ready"})
+
+
+async def prometheus_metrics(request):
+    """Handle GET /metrics."""
+    return PlainTextResponse(
+        render_prometheus(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+def create_app(executor=None):
+    """
+    Build the service.
+
+    Args:
+        executor (concurrent.futures.Executor, optional): Pool to extract text
+            on instead of creating one of API_EXTRACT_WORKERS threads
+
+    Returns:
+        Starlette: The ASGI application
+    """
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        load_environment()
+        app.state.executor = executor or ThreadPoolExecutor(
+            max_workers=max(1, env_int("API_EXTRACT_WORKERS", DEFAULT_EXTRACT_WORKERS)),
+            thread_name_prefix="api-extract",
+        )
+        try:
+            yield
+        finally:
+            if executor is None:
+                app.state.executor.shutdown(cancel_futures=True)
+            app.state.executor = None
+            export_metrics()
+
+    return Starlette(
+        routes=[
+            Route("/v1/analyze", analyze, methods=["POST"]),
+            Route("/healthz", health),
+            Route("/readyz", ready),
+            Route("/metrics", prometheus_metrics),
+        ],
+        lifespan=lifespan,
+    )
+
+
+def main(argv=None):
+    """
+    Command-line entry point: serve the API with uvicorn.
+
+    Args:
+        argv (list, optional): Arguments to parse instead of sys.argv
+    """
+    # Before the parser, whose defaults may come from .env
+    load_environment()
+    parser = argparse.ArgumentParser(description="Serve the resume analysis API.")
+    parser.add_argument("--host", default=env_str("API_HOST", DEFAULT_HOST))
+    parser.add_argument("--port", type=int, default=env_int("API_PORT", DEFAULT_PORT))
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=env_int("API_WORKERS", 1),
+        help="Server processes (default: %(default)s)",
+    )
+    args = parser.parse_args(argv)
+
+    import uvicorn
+
+    uvicorn.run(
+        "src.api:create_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
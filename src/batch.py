@@ -0,0 +1,307 @@
+"""
+Headless batch analysis of resumes.
+
+Walks a directory (or reads a manifest), extracts text in a process pool,
+runs the AI analysis with bounded concurrency and appends one JSON line per
+resume to the output file as soon as it finishes. Items already recorded as
+successful in the output are skipped, so an interrupted run can be restarted
+with the same arguments and picks up where it stopped.
+
+Usage:
+    resume-batch resumes/ --output results.jsonl --job-role "Data Scientist"
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import time
+
+from src.config import load_environment
+from src.services.ai_analyzer import analyze_resume_async
+from src.utils.extraction_pool import create_process_pool
+from src.utils.text_extractor import (
+    SUPPORTED_EXTENSIONS,
+    LocalFile,
+    extract_text_from_file,
+)
+
+DEFAULT_CONCURRENCY = 4
+
+
+def discover_inputs(source, job_role=None):
+    """
+    Collect the resumes to analyze from a directory or a manifest file.
+
+    A directory is walked recursively for supported extensions. A manifest
+    lists one path per line (relative paths are resolved against the manifest's
+    directory) or one JSON object per line with "path" and optional "job_role".
+
+    Args:
+        source (str): Directory or manifest path
+        job_role (str, optional): Default job role for every item
+
+    Returns:
+        list: Dicts with "path" and "job_role", in a stable order
+    """
+    items = []
+    if os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for name in sorted(files):
+                if os.path.splitext(name)[1].lower() in SUPPORTED_EXTENSIONS:
+                    items.append(
+                        {"path": os.path.join(root, name), "job_role": job_role}
+                    )
+        return items
+
+    base_dir = os.path.dirname(os.path.abspath(source))
+    with open(source, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("{"):
+                entry = json.loads(line)
+                path, role = entry["path"], entry.get("job_role", job_role)
+            else:
+                path, role = line, job_role
+            if not os.path.isabs(path):
+                path = os.path.join(base_dir, path)
+            items.append({"path": path, "job_role": role})
+    return items
+
+
+def load_completed(output_path):
+    """
+    Read the output file and return the items that already succeeded.
+
+    Args:
+        output_path (str): JSONL results file (may not exist yet)
+
+    Returns:
+        set: (path, job_role) pairs recorded with status "ok"
+    """
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A partially written last line from an interrupted run
+                continue
+            if record.get("status") == "ok":
+                completed.add((record["path"], record.get("job_role")))
+    return completed
+
+
+def extract_path(path):
+    """
+    Extract text from a file on disk (runs inside the extraction pool).
+
+    The file is hashed in chunks rather than read whole, since extraction
+    maps or reads it again anyway.
+
+    Args:
+        path (str): Path to a PDF, DOCX or TXT file
+
+    Returns:
+        tuple: (text, sha256 of the file bytes)
+    """
+    with open(path, "rb") as f:
+        digest = hashlib.file_digest(f, "sha256").hexdigest()
+    return extract_text_from_file(LocalFile(path)), digest
+
+
+class BatchStats:
+    """Counters for a batch run and the derived throughput figures."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.succeeded = 0
+        self.failed = 0
+        self.skipped = 0
+        self.cached = 0
+        self.tokens = 0
+
+    def summary(self):
+        """
+        Returns:
+            dict: Counts, elapsed seconds, resumes per minute and tokens per second
+        """
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        processed = self.succeeded + self.failed
+        return {
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "cached": self.cached,
+            "tokens": self.tokens,
+            "elapsed_seconds": round(elapsed, 2),
+            "resumes_per_minute": round(processed / elapsed * 60, 2),
+            "tokens_per_second": round(self.tokens / elapsed, 2),
+        }
+
+
+async def run_batch(
+    items,
+    output_path,
+    concurrency=DEFAULT_CONCURRENCY,
+    extract_workers=None,
+    executor=None,
+):
+    """
+    Analyze the given resumes and append results to a JSONL file.
+
+    Args:
+        items (list): Dicts with "path" and "job_role" (see discover_inputs)
+        output_path (str): JSONL file that receives one record per resume
+        concurrency (int): Number of resumes processed at the same time
+        extract_workers (int, optional): Size of the extraction process pool
+        executor (concurrent.futures.Executor, optional): Pool to use instead
+            of creating a process pool
+
+    Returns:
+        BatchStats: Counters for the run
+    """
+    stats = BatchStats()
+    completed = load_completed(output_path)
+    pending = []
+    for item in items:
+        if (item["path"], item["job_role"]) in completed:
+            stats.skipped += 1
+        else:
+            pending.append(item)
+
+    queue = asyncio.Queue()
+    for item in pending:
+        queue.put_nowait(item)
+
+    loop = asyncio.get_running_loop()
+    owns_executor = executor is None
+    if owns_executor:
+        executor = create_process_pool(extract_workers or os.cpu_count() or 1)
+
+    needs_newline = False
+    if os.path.exists(output_path) and os.path.getsize(output_path):
+        with open(output_path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            needs_newline = f.read(1) != b"\n"
+
+    with open(output_path, "a", encoding="utf-8") as output:
+        if needs_newline:
+            # Terminate a line left half-written by an interrupted run
+            output.write("\n")
+
+        def write_record(record):
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            output.flush()
+
+        async def worker():
+            while True:
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                record = {"path": item["path"], "job_role": item["job_role"]}
+                metrics = {}
+                started = time.perf_counter()
+                try:
+                    text, digest = await loop.run_in_executor(
+                        executor, extract_path, item["path"]
+                    )
+                    record["sha256"] = digest
+                    analysis = await analyze_resume_async(
+                        text, item["job_role"], metrics=metrics
+                    )
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    record.update(status="error", error=str(e))
+                    stats.failed += 1
+                else:
+                    record.update(status="ok", analysis=analysis)
+                    stats.succeeded += 1
+                    stats.cached += bool(metrics.get("cached"))
+                    stats.tokens += metrics.get("total_tokens", 0)
+                record["seconds"] = round(time.perf_counter() - started, 3)
+                record["tokens"] = metrics.get("total_tokens")
+                write_record(record)
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+        finally:
+            if owns_executor:
+                executor.shutdown(cancel_futures=True)
+
+    return stats
+
+
+def main(argv=None):
+    """
+    Command-line entry point for batch analysis.
+
+    Args:
+        argv (list, optional): Arguments to parse instead of sys.argv
+
+    Returns:
+        int: Process exit code (1 if any resume failed)
+    """
+    parser = argparse.ArgumentParser(
+        description="Analyze a directory or manifest of resumes without the UI."
+    )
+    parser.add_argument("source", help="Directory of resumes or a manifest file")
+    parser.add_argument(
+        "-o", "--output", default="results.jsonl", help="JSONL results file"
+    )
+    parser.add_argument("-r", "--job-role", help="Job role applied to every resume")
+    parser.add_argument(
+        "-c",
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help="Resumes processed at the same time (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-w",
+        "--extract-workers",
+        type=int,
+        default=None,
+        help="Processes used for text extraction (default: CPU count)",
+    )
+    args = parser.parse_args(argv)
+    load_environment()
+
+    items = discover_inputs(args.source, args.job_role)
+    try:
+        stats = asyncio.run(
+            run_batch(
+                items,
+                args.output,
+                concurrency=args.concurrency,
+                extract_workers=args.extract_workers,
+            )
+        )
+    except KeyboardInterrupt:
+        print("Interrupted; re-run the same command to resume.", file=sys.stderr)
+        return 130
+
+    summary = stats.summary()
+    print(
+        f"Analyzed {summary['succeeded']} resumes "
+        f"({summary['failed']} failed, {summary['skipped']} skipped, "
+        f"{summary['cached']} from cache) in {summary['elapsed_seconds']}s"
+    )
+    print(
+        f"Throughput: {summary['resumes_per_minute']} resumes/min, "
+        f"{summary['tokens_per_second']} tokens/s"
+    )
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
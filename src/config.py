@@ -0,0 +1,107 @@
+"""
+Configuration helpers for the Resume Analyzer.
+Settings are read from environment variables (optionally loaded from a .env file).
+
+Importing this package has no side effects: entry points call
+``load_environment()`` before reading any settings.
+"""
+
+import functools
+import os
+
+
+@functools.lru_cache(maxsize=1)
+def load_environment():
+    """
+    Load variables from the project's .env file into the environment, once.
+
+    Variables that are already set take precedence over the file. python-dotenv
+    is imported here, so only entry points that load settings pay for it.
+
+    Returns:
+        bool: Whether a .env file was found and loaded
+    """
+    from dotenv import load_dotenv
+
+    return load_dotenv()
+
+
+def env_str(name, default=None):
+    """
+    Read a string setting from the environment.
+
+    Args:
+        name (str): Environment variable name
+        default (str, optional): Value used when the variable is unset or empty
+
+    Returns:
+        str: The configured value or the default
+    """
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    return value.strip()
+
+
+def env_int(name, default):
+    """
+    Read an integer setting from the environment.
+
+    Args:
+        name (str): Environment variable name
+        default (int): Value used when the variable is unset or invalid
+
+    Returns:
+        int: The configured value or the default
+    """
+    value = env_str(name)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        return default
+
+
+def env_float(name, default):
+    """
+    Read a float setting from the environment.
+
+    Args:
+        name (str): Environment variable name
+        default (float): Value used when the variable is unset or invalid
+
+    Returns:
+        float: The configured value or the default
+    """
+    value = env_str(name)
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+def env_bool(name, default):
+    """
+    Read a boolean setting from the environment.
+
+    Accepts 1/0, true/false, yes/no and on/off (case-insensitive).
+
+    Args:
+        name (str): Environment variable name
+        default (bool): Value used when the variable is unset or invalid
+
+    Returns:
+        bool: The configured value or the default
+    """
+    value = env_str(name)
+    if value is None:
+        return default
+    value = value.lower()
+    if value in ("1", "true", "yes", "on"):
+        return True
+    if value in ("0", "false", "no", "off"):
+        return False
+    return default
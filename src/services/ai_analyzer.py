@@ -2,16 +2,88 @@
 AI-powered resume analysis services using OpenRouter.
 """
 
+import asyncio
+import contextlib
+import functools
+import inspect
 import os
-from openai import OpenAI
-from dotenv import load_dotenv
+import time
 
-load_dotenv()
+from src.config import env_bool, env_float, env_int, env_str
+from src.services.cache import get_analysis_cache, make_cache_key
+from src.services.client_pool import get_client_manager
+from src.services.event_loop import iterate_sync, run_sync
+from src.services.rate_limiter import (
+    get_rate_limiter,
+    is_overload_error,
+    retry_after_seconds,
+)
+from src.services.single_flight import get_single_flight
+from src.services.prompt_builder import (
+    build_merge_prompt,
+    build_multi_role_prompt,
+    build_prompt,
+    build_section_prompts,
+    estimate_tokens,
+    split_role_sections,
+)
+from src.utils.deadline import DeadlineExceeded, remaining_time
+from src.utils.metrics import get_latency_stats, get_stage_timings
+
+MODEL = "google/gemini-2.0-flash-exp:free"  # Gemini 2.0 Flash model from OpenRouter
+# Seconds without a first token (streams) or a response before the next model
+# in the chain is tried in parallel
+DEFAULT_HEDGE_AFTER = 4.0
+DEFAULT_HEDGE_AFTER_RESPONSE = 20.0
+# Retries of a request that failed with 429 or 5xx, and the first backoff
+# after a server error that gave no Retry-After (doubled on each retry)
+DEFAULT_MAX_RETRIES = 2
+RETRY_BACKOFF_SECONDS = 0.5
+TEMPERATURE = 0.7
+MAX_TOKENS = 1000
+# Bump whenever the prompt wording changes so cached results are not reused
+PROMPT_VERSION = "1"
+# Resumes estimated above this many tokens are analyzed section by section
+DEFAULT_LONG_RESUME_MIN_TOKENS = 3000
+# Preferred maximum number of concurrent section reviews per resume
+DEFAULT_MAX_SECTIONS = 6
+# Output budget of each section review; the merge request uses MAX_TOKENS
+SECTION_MAX_TOKENS = 400
+# Job roles analyzed together in one request (each gets MAX_TOKENS of output);
+# longer role lists are split into requests sent concurrently
+DEFAULT_ROLES_PER_REQUEST = 4
+
+# Stage name reported when the analysis runs out of time
+ANALYSIS_STAGE = "analysis"
+
+# Returned when the API responds without any usable content
+DEFAULT_ANALYSIS = """
+# Resume Analysis
+
+## Strengths
+- Your resume appears to have a professional structure
+- The document format was processed successfully
+
+## Areas for Improvement
+- Consider adding more quantifiable achievements
+- Tailor your skills section to match the job requirements
+- Ensure your resume is optimized for ATS systems
+
+## Recommendations
+1. Use specific metrics to highlight your accomplishments
+2. Match your keywords to those in the job description
+3. Maintain consistent formatting throughout your document
+
+(Note: This is a basic analysis. For a more detailed analysis, please try again later.)
+"""
 
 
 def get_openai_client():
     """
-    Initialize and return an OpenAI client using the OpenRouter API key from environment variables.
+    Return the shared OpenAI client configured for OpenRouter.
+
+    The client and its HTTP connection pool are created once per process and
+    reused across sessions (see src.services.client_pool).
 
     Returns:
         OpenAI: Initialized OpenAI client configured for OpenRouter
@@ -28,124 +100,1135 @@ def get_openai_client():
         )
 
     try:
-        # Configure the client to use OpenRouter's API
-        client = OpenAI(
-            api_key=api_key,
-            base_url="https://openrouter.ai/api/v1",
-        )
-        return client
+        # Reuse the process-wide client and its connection pool
+        return get_client_manager(api_key).get_client()
     except Exception as e:
         print(f"Error initializing OpenAI client: {str(e)}")
         # Re-raise the exception with more context
         raise ValueError(f"Failed to initialize OpenAI client: {str(e)}")
 
 
-def analyze_resume(resume_text, job_role=None):
+def get_async_openai_client():
     """
-    Analyze a resume using AI and provide feedback.
+    Return the shared AsyncOpenAI client for the running event loop.
+
+    Returns:
+        AsyncOpenAI: Initialized async client configured for OpenRouter
+
+    Raises:
+        ValueError: If the OPENROUTER_API_KEY environment variable is not set
+    """
+    api_key = os.getenv("OPENROUTER_API_KEY")
+
+    if not api_key:
+        raise ValueError(
+            "OPENROUTER_API_KEY environment variable is not set. "
+            "Please add it to your .env file or environment variables."
+        )
+
+    try:
+        return get_client_manager(api_key).get_async_client()
+    except Exception as e:
+        print(f"Error initializing OpenAI client: {str(e)}")
+        raise ValueError(f"Failed to initialize OpenAI client: {str(e)}")
+
+
+def warm_up_openai_client():
+    """
+    Open a connection to OpenRouter in the background if warm-up is enabled.
+
+    Does nothing when OPENROUTER_WARMUP is off or the API key is missing, so it
+    is safe to call on every Streamlit rerun.
+    """
+    api_key = os.getenv("OPENROUTER_API_KEY")
+    if api_key and env_bool("OPENROUTER_WARMUP", False):
+        get_client_manager(api_key)
+
+
+def get_models():
+    """
+    Return the ordered chain of models analyses are sent to.
+
+    OPENROUTER_MODELS ("model,model,...") overrides the default of MODEL
+    alone. The first model is the primary; the others are tried in order when
+    an earlier one is slow (a hedged request) or fails.
+
+    Returns:
+        list: OpenRouter model identifiers
+    """
+    models = (env_str("OPENROUTER_MODELS") or "").split(",")
+    return [model.strip() for model in models if model.strip()] or [MODEL]
+
+
+def get_latency_report():
+    """
+    Return per-model counters and latency percentiles.
+
+    Returns:
+        dict: See LatencyStats.snapshot; "served", "failed", "hedged" and
+        "retried" count requests won, failed, overtaken by a hedged request
+        and sent again after a 429 or 5xx
+    """
+    return get_latency_stats().snapshot()
+
+
+# Stage histogram (see src.utils.metrics) each per-model latency feeds
+_LATENCY_STAGES = {"first_token": "first_token", "total": "generation"}
+
+
+def _record_latency(model, stage, seconds):
+    """Record a model latency in its percentiles and its stage histogram."""
+    get_latency_stats().record(model, stage, seconds)
+    get_stage_timings().observe(_LATENCY_STAGES[stage], seconds)
+
+
+async def _run_all(coroutines):
+    """
+    Run coroutines concurrently, cancelling the others as soon as one fails.
+
+    Unlike a bare asyncio.gather, a failure does not leave sibling requests
+    running (and holding rate-limiter permits) in the background: they are
+    cancelled and waited for before the error is raised.
+
+    Args:
+        coroutines: Iterable of coroutines to run
+
+    Raises:
+        Exception: The first error raised by any of the coroutines
+    """
+    tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _within(deadline, awaitable):
+    """
+    Await something within the time left on the request deadline.
+
+    Args:
+        deadline (Deadline or None): The request deadline
+        awaitable: Coroutine or future to await
+
+    Returns:
+        The awaitable's result
+
+    Raises:
+        DeadlineExceeded: If the deadline passes first
+    """
+    remaining = remaining_time(deadline)
+    if remaining is None:
+        return await awaitable
+    timeout = asyncio.timeout(remaining)
+    try:
+        async with timeout:
+            return await awaitable
+    except TimeoutError:
+        # Other timeouts (e.g. RateLimitTimeout) propagate unchanged
+        if timeout.expired():
+            raise DeadlineExceeded(ANALYSIS_STAGE, deadline.budget) from None
+        raise
+
+
+def _request_options(deadline):
+    """Per-request API options: the time left becomes the HTTP timeout."""
+    remaining = remaining_time(deadline)
+    return {} if remaining is None else {"timeout": max(remaining, 0.001)}
+
+
+class _EmptyResponse(Exception):
+    """Raised when a model answers without any content."""
+
+
+def _discard_late_result(discard, task):
+    if task.cancelled() or task.exception() is not None:
+        return
+    if discard is not None:
+        asyncio.ensure_future(discard(task.result()))
+
+
+async def _race(models, attempt, hedge_after, metrics, discard=None):
+    """
+    Run attempt(model) along the model chain until one attempt succeeds.
+
+    The primary starts immediately. The next model starts when every running
+    attempt has been going for hedge_after seconds without success (a hedged
+    request) or has failed (a fallback). The first success wins. The remaining
+    attempts are cancelled, and a success that arrives after that is passed to
+    discard.
+
+    Args:
+        models (list): Ordered model chain
+        attempt (callable): Coroutine function taking a model identifier
+        hedge_after (float): Seconds before hedging (0 disables hedging)
+        metrics (dict): Receives "model" (the model that served the request)
+            and "hedged"
+        discard (callable, optional): Coroutine function releasing a result
+            that lost the race
+
+    Returns:
+        The winning attempt's result
+
+    Raises:
+        Exception: The last error, if every model failed
+    """
+    stats = get_latency_stats()
+    remaining = list(models)
+    running = {}
+    last_error = None
+    metrics.setdefault("hedged", False)
+
+    def launch():
+        model = remaining.pop(0)
+        running[asyncio.ensure_future(attempt(model))] = model
+
+    launch()
+    try:
+        while running:
+            timeout = hedge_after if remaining and hedge_after > 0 else None
+            done, _ = await asyncio.wait(
+                set(running), timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                for model in running.values():
+                    stats.count(model, "hedged")
+                metrics["hedged"] = True
+                launch()
+                continue
+            for task in done:
+                model = running.pop(task)
+                error = task.exception()
+                if error is None:
+                    metrics["model"] = model
+                    stats.count(model, "served")
+                    return task.result()
+                stats.count(model, "failed")
+                last_error = error
+            if not running and remaining:
+                launch()
+        raise last_error
+    finally:
+        for task in running:
+            task.add_done_callback(functools.partial(_discard_late_result, discard))
+            task.cancel()
+
+
+async def _close_stream(stream):
+    close = getattr(stream, "close", None) or getattr(stream, "aclose", None)
+    if close is not None:
+        result = close()
+        if inspect.isawaitable(result):
+            await result
+
+
+class _ModelStream:
+    """A streamed response whose first content chunk has arrived."""
+
+    def __init__(self, model, permit, stream, chunks, first_delta, started):
+        self.model = model
+        self.permit = permit
+        self.stream = stream
+        self.chunks = chunks
+        self.first_delta = first_delta
+        self.started = started
+
+    async def discard(self):
+        self.permit.release()
+        await _close_stream(self.stream)
+
+
+async def _retrying(model, attempt):
+    """
+    Run attempt() again after a 429 or 5xx, up to OPENROUTER_MAX_RETRIES times.
+
+    Only the last model in the chain (by default the only one) retries; an
+    earlier model fails over to the next one at once (see _race). Each try
+    acquires its own rate-limiter permit, so a retry goes through the request
+    and token buckets and waits out the Retry-After pause the failure set
+    (see rate_limiter.Permit.release). A server error without Retry-After
+    backs off exponentially from RETRY_BACKOFF_SECONDS.
+
+    Args:
+        model (str): Model the attempts go to, for the latency statistics
+        attempt (callable): Coroutine function sending one request
+
+    Returns:
+        The attempt's result
+
+    Raises:
+        Exception: The last error, or the first one that is not an overload
+    """
+    retries = 0
+    if model == get_models()[-1]:
+        retries = max(0, env_int("OPENROUTER_MAX_RETRIES", DEFAULT_MAX_RETRIES))
+    for retry in range(retries + 1):
+        try:
+            return await attempt()
+        except Exception as e:
+            if retry == retries or not is_overload_error(e):
+                raise
+            get_latency_stats().count(model, "retried")
+            if e.status_code != 429 and retry_after_seconds(e) is None:
+                await asyncio.sleep(RETRY_BACKOFF_SECONDS * 2**retry)
+
+
+async def _open_stream(client, model, prompt, metrics, deadline=None):
+    """
+    Start a streamed request and wait for its first content chunk.
+
+    A request that fails before its first chunk is retried (see _retrying).
+
+    Args:
+        client (AsyncOpenAI): Client to send the request with
+        model (str): Model to send the request to
+        prompt (Prompt): The request
+        metrics (dict): Receives "queue_time"
+        deadline (Deadline, optional): Bounds the HTTP timeout
+
+    Returns:
+        _ModelStream: The open stream; its rate-limiter permit is held
+
+    Raises:
+        _EmptyResponse: If the stream ended without content
+    """
+    return await _retrying(
+        model,
+        lambda: _open_stream_once(client, model, prompt, metrics, deadline),
+    )
+
+
+async def _open_stream_once(client, model, prompt, metrics, deadline=None):
+    """Send one streamed request (see _open_stream)."""
+    started = time.perf_counter()
+    permit = await get_rate_limiter().acquire(prompt.tokens_after_trim + MAX_TOKENS)
+    _record_queue_time(permit, metrics)
+    try:
+        stream = await client.chat.completions.create(
+            model=model,
+            messages=prompt.messages,
+            temperature=TEMPERATURE,
+            max_tokens=MAX_TOKENS,
+            stream=True,
+            **_request_options(deadline),
+        )
+        chunks = stream.__aiter__()
+        async for chunk in chunks:
+            delta = _extract_stream_delta(chunk)
+            if delta:
+                _record_latency(model, "first_token", time.perf_counter() - started)
+                return _ModelStream(model, permit, stream, chunks, delta, started)
+    except BaseException as exc:
+        permit.release(exc)
+        raise
+    permit.release()
+    raise _EmptyResponse(model)
+
+
+async def _complete(
+    client,
+    model,
+    prompt,
+    max_tokens,
+    metrics,
+    deadline=None,
+    with_finish_reason=False,
+):
+    """
+    Send a non-streamed request to one model, retrying overloads (see
+    _retrying).
+
+    Args:
+        client (AsyncOpenAI): Client to send the request with
+        model (str): Model to send the request to
+        prompt (Prompt): The request
+        max_tokens (int): Output budget
+        metrics (dict): Receives "queue_time" and token usage
+        deadline (Deadline, optional): Bounds the HTTP timeout
+        with_finish_reason (bool): Also return why generation stopped
+
+    Returns:
+        str or tuple: The response content, or (content, finish reason) with
+        with_finish_reason; the reason is "length" when max_tokens cut the
+        response off
+
+    Raises:
+        _EmptyResponse: If the response has no content
+    """
+    response, seconds = await _retrying(
+        model,
+        lambda: _complete_once(client, model, prompt, max_tokens, metrics, deadline),
+    )
+    _record_usage(response, metrics)
+
+    content = _extract_response_content(response)
+    if not content:
+        raise _EmptyResponse(model)
+    _record_latency(model, "total", seconds)
+    if with_finish_reason:
+        return content, _extract_finish_reason(response)
+    return content
+
+
+async def _complete_once(client, model, prompt, max_tokens, metrics, deadline):
+    """Send one non-streamed request; returns (response, seconds taken)."""
+    started = time.perf_counter()
+    async with _limit_request(prompt, max_tokens) as permit:
+        _record_queue_time(permit, metrics)
+        response = await client.chat.completions.create(
+            model=model,
+            messages=prompt.messages,
+            temperature=TEMPERATURE,
+            max_tokens=max_tokens,
+            **_request_options(deadline),
+        )
+        permit.record_usage(_reported_tokens(response))
+    return response, time.perf_counter() - started
+
+
+async def _complete_hedged(
+    client, prompt, max_tokens, metrics, deadline=None, with_finish_reason=False
+):
+    """Send a non-streamed request along the model chain (see _race)."""
+    return await _race(
+        get_models(),
+        lambda model: _complete(
+            client, model, prompt, max_tokens, metrics, deadline, with_finish_reason
+        ),
+        env_float("OPENROUTER_HEDGE_AFTER_RESPONSE", DEFAULT_HEDGE_AFTER_RESPONSE),
+        metrics,
+    )
+
+
+def _limit_request(prompt, max_tokens):
+    """Hold a rate-limiter permit for a request of the prompt's size."""
+    return get_rate_limiter().limit_request(prompt.tokens_after_trim + max_tokens)
+
+
+def _record_queue_time(permit, metrics):
+    metrics["queue_time"] = metrics.get("queue_time", 0.0) + permit.waited
+
+
+def _reported_tokens(response):
+    """Total tokens the API reports for a response, if any."""
+    return getattr(getattr(response, "usage", None), "total_tokens", None)
+
+
+def _record_usage(response, metrics):
+    """Add token usage from a completion response to the metrics dict."""
+    usage = getattr(response, "usage", None)
+    for field in ("prompt_tokens", "completion_tokens", "total_tokens"):
+        value = getattr(usage, field, None)
+        if isinstance(value, int):
+            metrics[field] = metrics.get(field, 0) + value
+
+
+def get_coalescing_stats():
+    """
+    Return counters for analyses coalesced onto identical in-flight requests.
+
+    Returns:
+        dict: See SingleFlight.stats
+    """
+    return get_single_flight().stats()
+
+
+def is_long_resume(resume_text):
+    """
+    Decide whether a resume is analyzed section by section.
+
+    Controlled by LONG_RESUME_MIN_TOKENS (estimated tokens; 0 disables the
+    long-resume mode).
+
+    Args:
+        resume_text (str): The text content of the resume
+
+    Returns:
+        bool: True if the resume is at or above the threshold
+    """
+    threshold = env_int("LONG_RESUME_MIN_TOKENS", DEFAULT_LONG_RESUME_MIN_TOKENS)
+    return threshold > 0 and estimate_tokens(resume_text) >= threshold
+
+
+def _prepare_request(resume_text, job_role, metrics):
+    """
+    Choose between a single request and section-by-section analysis.
 
     Args:
         resume_text (str): The text content of the resume
         job_role (str, optional): The job role the user is applying for
+        metrics (dict): Receives "long_resume" and, for a single request, the
+            estimated input size (see Prompt.record)
+
+    Returns:
+        tuple: (prompt, cache_key); prompt is None for a long resume
+    """
+    models = get_models()
+    # Results depend on the whole chain, since any model in it may serve them
+    chain = ",".join(models)
+    if is_long_resume(resume_text):
+        metrics["long_resume"] = True
+        cache_key = make_cache_key(
+            resume_text, job_role, chain, TEMPERATURE, f"{PROMPT_VERSION}-sections"
+        )
+        return None, cache_key
+
+    metrics["long_resume"] = False
+    # Prompts are sized for the primary model
+    with get_stage_timings().span("prompt_build"):
+        prompt = build_prompt(resume_text, job_role, models[0])
+    prompt.record(metrics)
+    cache_key = make_cache_key(
+        prompt.resume_text, job_role, chain, TEMPERATURE, PROMPT_VERSION
+    )
+    return prompt, cache_key
+
+
+async def _review_sections(client, resume_text, job_role, metrics, deadline=None):
+    """
+    Review the sections of a long resume concurrently.
+
+    All section requests are issued at once (still subject to the rate
+    limiter), so the elapsed time is that of the slowest section. A failed
+    section is left out of the merged analysis rather than failing it.
+
+    Args:
+        client (AsyncOpenAI): Client to send the requests with
+        resume_text (str): The text content of the resume
+        job_role (str, optional): The job role the user is applying for
+        metrics (dict): Receives "sections", "sections_failed" and
+            "section_time" (seconds), plus token usage
+        deadline (Deadline, optional): Bounds the HTTP timeouts
+
+    Returns:
+        list: (title, review) tuples in document order
+
+    Raises:
+        Exception: The first error, if every section failed
+    """
+    max_sections = env_int("LONG_RESUME_MAX_SECTIONS", DEFAULT_MAX_SECTIONS)
+    prompts = build_section_prompts(
+        resume_text, job_role, get_models()[0], max_sections
+    )
+
+    async def review(title, prompt):
+        try:
+            content = await _complete_hedged(
+                client, prompt, SECTION_MAX_TOKENS, metrics, deadline
+            )
+        except _EmptyResponse:
+            content = None
+        return title, content
+
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(review(title, prompt) for title, prompt in prompts),
+        return_exceptions=True,
+    )
+    errors = [result for result in results if isinstance(result, BaseException)]
+    metrics["sections"] = len(prompts)
+    metrics["sections_failed"] = len(errors)
+    metrics["section_time"] = time.perf_counter() - start
+
+    reviews = [
+        result
+        for result in results
+        if not isinstance(result, BaseException) and result[1]
+    ]
+    if not reviews and errors:
+        raise errors[0]
+    return reviews
+
+
+async def analyze_resume_async(resume_text, job_role=None, metrics=None, deadline=None):
+    """
+    Analyze a resume using AI and provide feedback, without blocking a thread.
+
+    The resume is trimmed to the model's input budget before sending (see
+    src.services.prompt_builder). Resumes above LONG_RESUME_MIN_TOKENS are
+    instead split into sections that are reviewed concurrently, and a final
+    request merges the reviews. Upstream requests are paced and their
+    concurrency adapted by the process-wide limiter (see
+    src.services.rate_limiter). Cancelling the awaiting task aborts the
+    in-flight HTTP request and releases its slot.
+
+    Callers that miss the cache while an identical analysis (same cache key)
+    is in flight wait for that request instead of sending their own (see
+    src.services.single_flight).
+
+    Requests go to the model chain from get_models(): when the primary has
+    not answered within OPENROUTER_HEDGE_AFTER_RESPONSE seconds, or fails,
+    the next model is tried and the first good response wins.
+
+    Args:
+        resume_text (str): The text content of the resume
+        job_role (str, optional): The job role the user is applying for
+        metrics (dict, optional): Filled with "cached", "coalesced",
+            "model", "hedged", "total_time", "queue_time", "long_resume", the
+            estimated input size (see Prompt.record) or the section
+            statistics (see _review_sections) and, when the API reports them,
+            "prompt_tokens", "completion_tokens" and "total_tokens" summed
+            over all requests
+        deadline (Deadline, optional): Time budget for the whole request;
+            also bounds each HTTP call's timeout
 
     Returns:
         str: AI-generated analysis and feedback
 
     Raises:
         ValueError: If resume text is empty
+        RateLimitTimeout: If the rate limiter could not start the request
+            within OPENROUTER_MAX_QUEUE_WAIT
+        DeadlineExceeded: If the deadline passes before the analysis is done
         Exception: For any API or processing errors
     """
+    if metrics is None:
+        metrics = {}
     if not resume_text.strip():
         raise ValueError("Resume text is empty")
 
-    job_context = job_role if job_role else "general job applications"
+    start = time.perf_counter()
+    prompt, cache_key = _prepare_request(resume_text, job_role, metrics)
+    cache = get_analysis_cache()
+    cached_result = cache.get(cache_key)
+    if cached_result is not None:
+        metrics["cached"] = True
+        get_stage_timings().increment("analysis_cached")
+        metrics["total_time"] = time.perf_counter() - start
+        return cached_result
+
+    metrics["cached"] = False
+    flight, result = await _within(deadline, get_single_flight().acquire(cache_key))
+    metrics["coalesced"] = flight is None
+    if flight is None:
+        get_stage_timings().increment("analysis_coalesced")
+    else:
+        with flight:
+            result = await _within(
+                deadline,
+                _request_analysis(
+                    resume_text, job_role, prompt, cache_key, metrics, deadline
+                ),
+            )
+            flight.set_result(result)
+    metrics["total_time"] = time.perf_counter() - start
+    return result
+
 
-    prompt = f"""Please analyze this resume and provide constructive feedback.
-    Focus on the following aspects:
-    1. Content clarity and impact
-    2. Skills presentation
-    3. Experience descriptions
-    4. Specific improvements for {job_context}
+async def _request_analysis(
+    resume_text, job_role, prompt, cache_key, metrics, deadline=None
+):
+    """
+    Send the analysis request(s) for a cache miss and cache the result.
 
-    Resume content:
-    {resume_text}
+    Args:
+        resume_text (str): The text content of the resume
+        job_role (str, optional): The job role the user is applying for
+        prompt (Prompt or None): The single request, or None for a long
+            resume reviewed section by section
+        cache_key (str): Key the result is cached under
+        metrics (dict): Receives token usage and section statistics
+        deadline (Deadline, optional): Bounds the HTTP timeouts
 
-    Please provide your analysis in a clear, structured format with specific recommendations."""
+    Returns:
+        str: AI-generated analysis, or DEFAULT_ANALYSIS without usable output
+    """
+    client = get_async_openai_client()
+
+    complete = True
+    if prompt is None:
+        reviews = await _review_sections(
+            client, resume_text, job_role, metrics, deadline
+        )
+        if not reviews:
+            return DEFAULT_ANALYSIS
+        complete = not metrics["sections_failed"]
+        prompt = build_merge_prompt(reviews, job_role, get_models()[0])
 
     try:
-        # Get OpenAI client
-        client = get_openai_client()
-
-        # Make the API call
-        response = client.chat.completions.create(
-            model="google/gemini-2.0-flash-exp:free",  # Using Gemini 2.0 Flash model from OpenRouter
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an expert resume reviewer with years of experience in HR and recruitment.",
-                },
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.7,
-            max_tokens=1000,
+        content = await _complete_hedged(client, prompt, MAX_TOKENS, metrics, deadline)
+    except _EmptyResponse:
+        # No model produced content: return a default analysis
+        return DEFAULT_ANALYSIS
+
+    # Only real model output is cached, never the fallback analysis or a merge
+    # that is missing failed sections
+    if complete:
+        get_analysis_cache().set(cache_key, content)
+    return content
+
+
+def analyze_resume(resume_text, job_role=None, deadline=None):
+    """
+    Analyze a resume using AI and provide feedback.
+
+    Thin synchronous wrapper over analyze_resume_async, run on the shared
+    background event loop.
+
+    Args:
+        resume_text (str): The text content of the resume
+        job_role (str, optional): The job role the user is applying for
+        deadline (Deadline, optional): Time budget for the whole request
+
+    Returns:
+        str: AI-generated analysis and feedback
+
+    Raises:
+        ValueError: If resume text is empty
+        RateLimitTimeout: If the rate limiter could not start the request
+            within OPENROUTER_MAX_QUEUE_WAIT
+        DeadlineExceeded: If the deadline passes before the analysis is done
+        Exception: For any API or processing errors
+    """
+    return run_sync(analyze_resume_async(resume_text, job_role, deadline=deadline))
+
+
+def normalize_job_roles(job_roles):
+    """
+    Clean up a list of job roles.
+
+    Args:
+        job_roles (list): Job role names as entered
+
+    Returns:
+        list: The roles stripped of whitespace, without blanks or
+        case-insensitive duplicates, in their original order
+    """
+    roles = {}
+    for role in job_roles:
+        role = (role or "").strip()
+        if role:
+            roles.setdefault(role.lower(), role)
+    return list(roles.values())
+
+
+def _add_usage(metrics, other):
+    """Add the token usage recorded in one metrics dict to another."""
+    for field in ("prompt_tokens", "completion_tokens", "total_tokens"):
+        if field in other:
+            metrics[field] = metrics.get(field, 0) + other[field]
+
+
+async def analyze_resume_multi_role_async(
+    resume_text, job_roles, metrics=None, deadline=None
+):
+    """
+    Analyze a resume against several job roles with as few requests as possible.
+
+    Up to MULTI_ROLE_BATCH_SIZE roles share one request, so the resume and
+    instructions are sent once for all of them rather than once per role. The
+    response is split by role (see prompt_builder.split_role_sections), and
+    longer role lists are split into requests sent concurrently. Each role's
+    analysis is cached under the key a single-role analysis uses, so roles
+    already analyzed, alone or with others, are not requested again; a
+    response cut off by max_tokens or missing some roles is not cached. A
+    role missing from a response is then analyzed on its own, as is a single
+    uncached role or every role of a long resume (see is_long_resume).
+
+    Each role is registered with single-flight like a single-role analysis:
+    a role already being analyzed by another caller is waited for rather
+    than requested again, and single-role callers wait for this request. If
+    any request fails, the others are cancelled and its error is raised.
+
+    Args:
+        resume_text (str): The text content of the resume
+        job_roles (list): The job roles to analyze the resume for
+        metrics (dict, optional): Filled with "roles", "cached_roles",
+            "coalesced_roles" (roles that waited on another caller's
+            request), "role_requests" (multi-role requests sent),
+            "role_fallbacks" (roles missing from a response and analyzed on
+            their own), "long_resume", "total_time" and,
+            when the API reports them, token usage summed over all requests
+        deadline (Deadline, optional): Time budget for the whole request
+
+    Returns:
+        dict: Analysis keyed by job role, in the order of normalize_job_roles
+
+    Raises:
+        ValueError: If resume text is empty or no job role is given
+        RateLimitTimeout: If the rate limiter could not start a request
+            within OPENROUTER_MAX_QUEUE_WAIT
+        DeadlineExceeded: If the deadline passes before the analysis is done
+        Exception: For any API or processing errors
+    """
+    if metrics is None:
+        metrics = {}
+    roles = normalize_job_roles(job_roles)
+    if not resume_text.strip():
+        raise ValueError("Resume text is empty")
+    if not roles:
+        raise ValueError("No job roles given")
+
+    start = time.perf_counter()
+    metrics.update(
+        roles=len(roles),
+        cached_roles=0,
+        coalesced_roles=0,
+        role_requests=0,
+        role_fallbacks=0,
+    )
+    cache = get_analysis_cache()
+    results, prompts, cache_keys, pending = {}, {}, {}, []
+    for role in roles:
+        prompts[role], cache_keys[role] = _prepare_request(resume_text, role, {})
+        cached_result = cache.get(cache_keys[role])
+        if cached_result is None:
+            pending.append(role)
+        else:
+            results[role] = cached_result
+            metrics["cached_roles"] += 1
+            get_stage_timings().increment("analysis_cached")
+    metrics["long_resume"] = prompts[roles[-1]] is None
+    flights = {}
+
+    async def analyze_alone(role):
+        role_metrics = {}
+        results[role] = await analyze_resume_async(
+            resume_text, role, metrics=role_metrics, deadline=deadline
+        )
+        metrics["coalesced_roles"] += bool(role_metrics.get("coalesced"))
+        _add_usage(metrics, role_metrics)
+
+    async def request_alone(role):
+        # For a role whose flight this call already leads
+        role_metrics = {}
+        results[role] = await _request_analysis(
+            resume_text, role, prompts[role], cache_keys[role], role_metrics, deadline
         )
+        flights[role].set_result(results[role])
+        _add_usage(metrics, role_metrics)
 
-        # Try to access the content in the standard OpenAI API format
+    async def analyze_together(batch):
+        with get_stage_timings().span("prompt_build"):
+            prompt = build_multi_role_prompt(resume_text, batch, get_models()[0])
+        metrics["role_requests"] += 1
+        request_metrics = {}
         try:
-            return response.choices[0].message.content
-        except (AttributeError, IndexError, TypeError):
-            # Try alternate formats without printing errors
-            try:
-                # If response is a dictionary or has a dict-like interface
-                if (
-                    hasattr(response, "choices")
-                    and isinstance(response.choices, list)
-                    and len(response.choices) > 0
-                ):
-                    choice = response.choices[0]
-                    if hasattr(choice, "message") and hasattr(
-                        choice.message, "content"
-                    ):
-                        return choice.message.content
-
-                # Try dictionary-style access
-                if hasattr(response, "__getitem__"):
-                    try:
-                        return response["choices"][0]["message"]["content"]
-                    except (KeyError, TypeError):
-                        pass
-
-                # Try to convert to string as a last resort
-                return str(response)
-
-            except Exception:
-                # Fall through to the default response without printing errors
-                pass
-
-        # If we get here, return a default analysis
-        return """
-# Resume Analysis
+            content, finish_reason = await _complete_hedged(
+                client,
+                prompt,
+                MAX_TOKENS * len(batch),
+                request_metrics,
+                deadline,
+                with_finish_reason=True,
+            )
+        except _EmptyResponse:
+            content, finish_reason = "", None
+        _add_usage(metrics, request_metrics)
+        sections = split_role_sections(content, batch)
+        missing = [role for role in batch if role not in sections]
+        # A response cut off by max_tokens ends in a partial section, and one
+        # missing roles may have been split wrongly: neither is cached
+        cacheable = not missing and finish_reason != "length"
+        for role, analysis in sections.items():
+            results[role] = analysis
+            flights[role].set_result(analysis)
+            if cacheable:
+                cache.set(cache_keys[role], analysis)
+        metrics["role_fallbacks"] += len(missing)
+        await _run_all(request_alone(role) for role in missing)
 
-## Strengths
-- Your resume appears to have a professional structure
-- The document format was processed successfully
+    if metrics["long_resume"] or len(pending) == 1:
+        await _run_all(analyze_alone(role) for role in pending)
+    elif pending:
+        client = get_async_openai_client()
+        # Roles another caller is already analyzing are waited for instead
+        single_flight = get_single_flight()
+        for role in pending:
+            flight = single_flight.lead(cache_keys[role])
+            if flight is not None:
+                flights[role] = flight
+        led = list(flights)
+        size = max(1, env_int("MULTI_ROLE_BATCH_SIZE", DEFAULT_ROLES_PER_REQUEST))
+        batches = [led[i : i + size] for i in range(0, len(led), size)]
+        with contextlib.ExitStack() as stack:
+            for flight in flights.values():
+                stack.enter_context(flight)
+            await _within(
+                deadline,
+                _run_all(
+                    [
+                        *(analyze_together(batch) for batch in batches),
+                        *(analyze_alone(r) for r in pending if r not in flights),
+                    ]
+                ),
+            )
 
-## Areas for Improvement
-- Consider adding more quantifiable achievements
-- Tailor your skills section to match the job requirements
-- Ensure your resume is optimized for ATS systems
+    metrics["total_time"] = time.perf_counter() - start
+    return {role: results[role] for role in roles}
 
-## Recommendations
-1. Use specific metrics to highlight your accomplishments
-2. Match your keywords to those in the job description
-3. Maintain consistent formatting throughout your document
 
-(Note: This is a basic analysis. For a more detailed analysis, please try again later.)
-"""
+def analyze_resume_multi_role(resume_text, job_roles, metrics=None, deadline=None):
+    """
+    Analyze a resume against several job roles.
 
-    except ValueError as e:
-        # Re-raise configuration errors
-        raise e
-    except Exception as e:
-        # Re-raise the exception
-        raise e
+    Thin synchronous wrapper over analyze_resume_multi_role_async, run on the
+    shared background event loop.
+
+    Args:
+        resume_text (str): The text content of the resume
+        job_roles (list): The job roles to analyze the resume for
+        metrics (dict, optional): See analyze_resume_multi_role_async
+        deadline (Deadline, optional): Time budget for the whole request
+
+    Returns:
+        dict: Analysis keyed by job role
+
+    Raises:
+        ValueError: If resume text is empty or no job role is given
+        RateLimitTimeout: If the rate limiter could not start a request
+            within OPENROUTER_MAX_QUEUE_WAIT
+        DeadlineExceeded: If the deadline passes before the analysis is done
+        Exception: For any API or processing errors
+    """
+    return run_sync(
+        analyze_resume_multi_role_async(resume_text, job_roles, metrics, deadline)
+    )
+
+
+async def analyze_resume_stream_async(
+    resume_text, job_role=None, metrics=None, deadline=None
+):
+    """
+    Analyze a resume and yield the feedback incrementally as it is generated.
+
+    The complete text is cached once the stream finishes, so a repeated
+    analysis is served from the cache as a single chunk. The rate-limiter
+    permit is held until the stream is exhausted or closed. For a long resume
+    the section reviews run first (see analyze_resume_async) and the merge
+    request is streamed. A caller coalesced onto an identical in-flight
+    analysis receives its result as a single chunk.
+
+    If the primary model has not produced a first token within
+    OPENROUTER_HEDGE_AFTER seconds, the request is hedged to the next model in
+    the chain; the first stream to produce content is used and the other is
+    cancelled.
+
+    Args:
+        resume_text (str): The text content of the resume
+        job_role (str, optional): The job role the user is applying for
+        metrics (dict, optional): Filled with "cached", "coalesced",
+            "time_to_first_token" and "total_time" (seconds) as the stream
+            progresses, plus "model", "hedged", "queue_time", "long_resume"
+            and the estimated input size (see Prompt.record) or the section
+            statistics (see _review_sections)
+        deadline (Deadline, optional): Time budget for the whole request,
+            including reading the stream; also bounds each HTTP call's timeout
+
+    Yields:
+        str: Chunks of the AI-generated analysis
+
+    Raises:
+        ValueError: If resume text is empty
+        RateLimitTimeout: If the rate limiter could not start the request
+            within OPENROUTER_MAX_QUEUE_WAIT
+        DeadlineExceeded: If the deadline passes before the stream ends
+        Exception: For any API or processing errors
+    """
+    if metrics is None:
+        metrics = {}
+    if not resume_text.strip():
+        raise ValueError("Resume text is empty")
+
+    start = time.perf_counter()
+    prompt, cache_key = _prepare_request(resume_text, job_role, metrics)
+    cache = get_analysis_cache()
+    cached_result = cache.get(cache_key)
+    if cached_result is not None:
+        metrics["cached"] = True
+        get_stage_timings().increment("analysis_cached")
+        metrics["time_to_first_token"] = metrics["total_time"] = (
+            time.perf_counter() - start
+        )
+        yield cached_result
+        return
+
+    metrics["cached"] = False
+    flight, result = await _within(deadline, get_single_flight().acquire(cache_key))
+    metrics["coalesced"] = flight is None
+    if flight is None:
+        get_stage_timings().increment("analysis_coalesced")
+        metrics["time_to_first_token"] = metrics["total_time"] = (
+            time.perf_counter() - start
+        )
+        yield result
+        return
+
+    with flight:
+        client = get_async_openai_client()
+
+        complete = True
+        if prompt is None:
+            reviews = await _within(
+                deadline,
+                _review_sections(client, resume_text, job_role, metrics, deadline),
+            )
+            if not reviews:
+                metrics["time_to_first_token"] = metrics["total_time"] = (
+                    time.perf_counter() - start
+                )
+                flight.set_result(DEFAULT_ANALYSIS)
+                yield DEFAULT_ANALYSIS
+                return
+            complete = not metrics["sections_failed"]
+            prompt = build_merge_prompt(reviews, job_role, get_models()[0])
+
+        try:
+            opened = await _within(
+                deadline,
+                _race(
+                    get_models(),
+                    lambda model: _open_stream(
+                        client, model, prompt, metrics, deadline
+                    ),
+                    env_float("OPENROUTER_HEDGE_AFTER", DEFAULT_HEDGE_AFTER),
+                    metrics,
+                    discard=_ModelStream.discard,
+                ),
+            )
+        except _EmptyResponse:
+            metrics["time_to_first_token"] = metrics["total_time"] = (
+                time.perf_counter() - start
+            )
+            flight.set_result(DEFAULT_ANALYSIS)
+            yield DEFAULT_ANALYSIS
+            return
+
+        metrics["time_to_first_token"] = time.perf_counter() - start
+        chunks = [opened.first_delta]
+        error = None
+        try:
+            yield opened.first_delta
+            while True:
+                try:
+                    chunk = await _within(deadline, opened.chunks.__anext__())
+                except StopAsyncIteration:
+                    break
+                delta = _extract_stream_delta(chunk)
+                if delta:
+                    chunks.append(delta)
+                    yield delta
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            # Streams carry no usage; estimate the completion instead
+            opened.permit.record_usage(
+                prompt.tokens_after_trim + estimate_tokens("".join(chunks))
+            )
+            opened.permit.release(error)
+            if error is not None:
+                await _close_stream(opened.stream)
+
+        metrics["total_time"] = time.perf_counter() - start
+        _record_latency(opened.model, "total", time.perf_counter() - opened.started)
+        content = "".join(chunks)
+        if complete:
+            cache.set(cache_key, content)
+        flight.set_result(content)
+
+
+def analyze_resume_stream(resume_text, job_role=None, metrics=None, deadline=None):
+    """
+    Synchronous generator over analyze_resume_stream_async.
+
+    Chunks are produced on the shared background event loop. Closing the
+    generator early (e.g. when a Streamlit script is stopped) closes the
+    upstream stream.
+
+    Args:
+        resume_text (str): The text content of the resume
+        job_role (str, optional): The job role the user is applying for
+        metrics (dict, optional): See analyze_resume_stream_async
+        deadline (Deadline, optional): See analyze_resume_stream_async
+
+    Yields:
+        str: Chunks of the AI-generated analysis
+
+    Raises:
+        ValueError: If resume text is empty
+        RateLimitTimeout: If the rate limiter could not start the request
+            within OPENROUTER_MAX_QUEUE_WAIT
+        DeadlineExceeded: If the deadline passes before the stream ends
+        Exception: For any API or processing errors
+    """
+    yield from iterate_sync(
+        analyze_resume_stream_async(
+            resume_text, job_role, metrics=metrics, deadline=deadline
+        )
+    )
+
+
+def _extract_stream_delta(chunk):
+    """
+    Pull the text delta out of a streamed chat completion chunk.
+
+    Args:
+        chunk: Streamed chat completion chunk
+
+    Returns:
+        str or None: The new text, or None if the chunk carries no content
+    """
+    try:
+        return chunk.choices[0].delta.content
+    except (AttributeError, IndexError, TypeError):
+        return None
+
+
+def _extract_finish_reason(response):
+    """
+    Read why the model stopped generating.
+
+    Args:
+        response: Completion response from the API
+
+    Returns:
+        str or None: e.g. "stop", or "length" when max_tokens was reached
+    """
+    try:
+        return response.choices[0].finish_reason
+    except (AttributeError, IndexError, TypeError):
+        return None
+
+
+def _extract_response_content(response):
+    """
+    Pull the analysis text out of a chat completion response.
+
+    Args:
+        response: Chat completion response in OpenAI (or compatible) format
+
+    Returns:
+        str or None: The message content, or None if it could not be found
+    """
+    # Try to access the content in the standard OpenAI API format
+    try:
+        return response.choices[0].message.content
+    except (AttributeError, IndexError, TypeError):
+        # Try alternate formats without printing errors
+        try:
+            # If response is a dictionary or has a dict-like interface
+            if (
+                hasattr(response, "choices")
+                and isinstance(response.choices, list)
+                and len(response.choices) > 0
+            ):
+                choice = response.choices[0]
+                if hasattr(choice, "message") and hasattr(choice.message, "content"):
+                    return choice.message.content
+
+            # Try dictionary-style access
+            if hasattr(response, "__getitem__"):
+                try:
+                    return response["choices"][0]["message"]["content"]
+                except (KeyError, TypeError):
+                    pass
+
+            # Try to convert to string as a last resort
+            return str(response)
+
+        except Exception:
+            # Fall through to the default response without printing errors
+            return None
@@ -0,0 +1,304 @@
+"""
+Content-addressed cache for AI resume analyses.
+
+Results are keyed on a hash of the normalized resume text, job role, model,
+temperature and prompt version. Lookups go through a bounded in-process LRU
+tier first and fall back to an on-disk tier that survives restarts.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from src.config import env_bool, env_float, env_int
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "resume-analyzer")
+DEFAULT_MAX_ENTRIES = 128
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
+DEFAULT_MAX_DISK_MB = 50
+
+
+def normalize_resume_text(text):
+    """
+    Normalize resume text so that cosmetic whitespace changes share a cache entry.
+
+    Args:
+        text (str): Raw resume text
+
+    Returns:
+        str: Text with line endings unified and runs of whitespace collapsed
+    """
+    lines = (" ".join(line.split()) for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def make_cache_key(resume_text, job_role, model, temperature, prompt_version):
+    """
+    Build a content-addressed cache key for an analysis request.
+
+    Args:
+        resume_text (str): The text content of the resume
+        job_role (str, optional): The job role the analysis is tailored to
+        model (str): Model identifier used for the request
+        temperature (float): Sampling temperature used for the request
+        prompt_version (str): Version of the prompt template
+
+    Returns:
+        str: Hex-encoded SHA-256 digest identifying the request
+    """
+    payload = json.dumps(
+        {
+            "text": normalize_resume_text(resume_text),
+            "job_role": (job_role or "").strip().lower(),
+            "model": model,
+            "temperature": temperature,
+            "prompt_version": prompt_version,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AnalysisCache:
+    """
+    Two-tier (memory + disk) cache for analysis results.
+
+    The memory tier is an LRU bounded by entry count. The disk tier stores one
+    JSON file per key and is bounded by total size, evicting the least recently
+    used files first. Both tiers honour the same TTL.
+    """
+
+    def __init__(
+        self,
+        max_entries=DEFAULT_MAX_ENTRIES,
+        cache_dir=DEFAULT_CACHE_DIR,
+        ttl_seconds=DEFAULT_TTL_SECONDS,
+        max_disk_bytes=DEFAULT_MAX_DISK_MB * 1024 * 1024,
+        enabled=True,
+    ):
+        """
+        Args:
+            max_entries (int): Maximum number of results kept in memory
+            cache_dir (str, optional): Directory for the disk tier (None disables it)
+            ttl_seconds (float): Lifetime of a cached result in seconds
+            max_disk_bytes (int): Upper bound for the disk tier size
+            enabled (bool): When False, every lookup is a miss and nothing is stored
+        """
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_disk_bytes = max_disk_bytes
+        self.enabled = enabled
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "writes": 0,
+            "evictions": 0,
+        }
+
+    def _is_expired(self, created):
+        return self.ttl_seconds > 0 and time.time() - created > self.ttl_seconds
+
+    def _path_for(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _remember(self, key, created, value):
+        """Store an entry in the memory tier, evicting the oldest if needed."""
+        self._memory[key] = (created, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _read_disk(self, key):
+        """Return (created, value) from the disk tier or None."""
+        if not self.cache_dir:
+            return None
+        path = self._path_for(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+            created, value = entry["created"], entry["value"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+        if self._is_expired(created):
+            self._remove_file(path)
+            return None
+
+        # Touch the file so size-based eviction keeps recently used entries
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return created, value
+
+    def _write_disk(self, key, created, value):
+        if not self.cache_dir:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"created": created, "value": value}, f)
+            os.replace(tmp_path, self._path_for(key))
+        except OSError:
+            # The disk tier is best effort; the memory tier still holds the result
+            return
+        self._enforce_disk_limit()
+
+    def _remove_file(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _enforce_disk_limit(self):
+        """Drop the least recently used files until the tier fits its size bound."""
+        try:
+            names = [n for n in os.listdir(self.cache_dir) if n.endswith(".json")]
+        except OSError:
+            return
+
+        entries = []
+        total = 0
+        for name in names:
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_disk_bytes:
+                break
+            self._remove_file(path)
+            self._stats["evictions"] += 1
+            total -= size
+
+    def get(self, key):
+        """
+        Look up a cached analysis.
+
+        Args:
+            key (str): Cache key from make_cache_key
+
+        Returns:
+            str or None: The cached analysis, or None on a miss
+        """
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created, value = entry
+                if not self._is_expired(created):
+                    self._memory.move_to_end(key)
+                    self._stats["hits"] += 1
+                    self._stats["memory_hits"] += 1
+                    return value
+                del self._memory[key]
+
+            entry = self._read_disk(key)
+            if entry is not None:
+                created, value = entry
+                self._remember(key, created, value)
+                self._stats["hits"] += 1
+                self._stats["disk_hits"] += 1
+                return value
+
+            self._stats["misses"] += 1
+            return None
+
+    def set(self, key, value):
+        """
+        Store an analysis in both tiers.
+
+        Args:
+            key (str): Cache key from make_cache_key
+            value (str): Analysis text to cache
+        """
+        if not self.enabled:
+            return
+
+        created = time.time()
+        with self._lock:
+            self._remember(key, created, value)
+            self._write_disk(key, created, value)
+            self._stats["writes"] += 1
+
+    def clear(self):
+        """Remove every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            if not self.cache_dir or not os.path.isdir(self.cache_dir):
+                return
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".json"):
+                    self._remove_file(os.path.join(self.cache_dir, name))
+
+    def stats(self):
+        """
+        Return hit/miss counters for the cache.
+
+        Returns:
+            dict: Counters plus the current number of in-memory entries
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+        return stats
+
+
+_analysis_cache = None
+_analysis_cache_lock = threading.Lock()
+
+
+def get_analysis_cache():
+    """
+    Return the process-wide analysis cache, creating it from the environment.
+
+    Environment variables:
+        RESUME_CACHE_ENABLED: Set to "false" to disable caching
+        RESUME_CACHE_DIR: Directory for the disk tier (empty disables it)
+        RESUME_CACHE_MAX_ENTRIES: Size of the in-memory LRU tier
+        RESUME_CACHE_TTL_SECONDS: Lifetime of cached results
+        RESUME_CACHE_MAX_DISK_MB: Size bound for the disk tier
+
+    Returns:
+        AnalysisCache: The shared cache instance
+    """
+    global _analysis_cache
+    with _analysis_cache_lock:
+        if _analysis_cache is None:
+            _analysis_cache = AnalysisCache(
+                max_entries=env_int("RESUME_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES),
+                cache_dir=os.getenv("RESUME_CACHE_DIR", DEFAULT_CACHE_DIR) or None,
+                ttl_seconds=env_float("RESUME_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS),
+                max_disk_bytes=int(
+                    env_float("RESUME_CACHE_MAX_DISK_MB", DEFAULT_MAX_DISK_MB)
+                    * 1024
+                    * 1024
+                ),
+                enabled=env_bool("RESUME_CACHE_ENABLED", True),
+            )
+        return _analysis_cache
+
+
+def reset_analysis_cache():
+    """Drop the shared cache so the next access re-reads the configuration."""
+    global _analysis_cache
+    with _analysis_cache_lock:
+        _analysis_cache = None
@@ -0,0 +1,315 @@
+"""
+Process-wide pooled OpenRouter client.
+
+A single OpenAI client (and therefore a single HTTP connection pool) is shared
+by every Streamlit session in the process, so analyses reuse warm keep-alive
+connections instead of paying for a new TLS handshake on each call. Async
+clients are pooled the same way, one per event loop.
+
+The SDK's own retries are off: a retry made inside the SDK would bypass the
+request and token buckets and the shared Retry-After pause of the rate
+limiter. The analyzer retries 429 and 5xx responses itself, taking a new
+permit for each attempt (see src.services.ai_analyzer).
+
+httpx and the OpenAI SDK are imported when the first pool or client is
+created rather than with this module, since importing them takes longer
+than the rest of the app's startup.
+"""
+
+import asyncio
+import threading
+import weakref
+
+from src.config import env_bool, env_float, env_int, env_str
+from src.services.event_loop import get_background_loop
+
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 10
+DEFAULT_KEEPALIVE_EXPIRY = 60.0
+DEFAULT_TIMEOUT = 60.0
+DEFAULT_CONNECT_TIMEOUT = 10.0
+DEFAULT_MAX_RETRIES = 0
+
+
+class OpenRouterClientManager:
+    """
+    Thread-safe owner of the shared OpenRouter client and its connection pool.
+    """
+
+    def __init__(
+        self,
+        api_key,
+        base_url=OPENROUTER_BASE_URL,
+        max_connections=DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections=DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=DEFAULT_KEEPALIVE_EXPIRY,
+        timeout=DEFAULT_TIMEOUT,
+        connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+        max_retries=DEFAULT_MAX_RETRIES,
+    ):
+        """
+        Args:
+            api_key (str): OpenRouter API key
+            base_url (str): OpenAI-compatible API base URL
+            max_connections (int): Upper bound on open connections in the pool
+            max_keepalive_connections (int): Idle connections kept for reuse
+            keepalive_expiry (float): Seconds an idle connection is kept open
+            timeout (float): Default read/write timeout for API calls in seconds
+            connect_timeout (float): Timeout for establishing a connection
+            max_retries (int): Retries the OpenAI SDK makes on its own
+        """
+        import httpx
+
+        self.api_key = api_key
+        self.base_url = base_url
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.max_retries = max(0, max_retries)
+        self._client = None
+        self._http_client = None
+        # httpx.AsyncClient is bound to the loop it was first used on
+        self._async_clients = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._warmed_up = False
+
+    def _count_request(self, request):
+        with self._lock:
+            self._requests += 1
+
+    def get_client(self):
+        """
+        Return the shared OpenAI client, creating it on first use.
+
+        Returns:
+            OpenAI: Client configured for OpenRouter with the pooled HTTP client
+        """
+        import httpx
+        from openai import OpenAI
+
+        with self._lock:
+            if self._client is None:
+                self._http_client = httpx.Client(
+                    limits=self.limits,
+                    timeout=self.timeout,
+                    follow_redirects=True,
+                    event_hooks={"request": [self._count_request]},
+                )
+                self._client = OpenAI(
+                    api_key=self.api_key,
+                    base_url=self.base_url,
+                    http_client=self._http_client,
+                    max_retries=self.max_retries,
+                )
+            return self._client
+
+    def get_async_client(self):
+        """
+        Return the shared AsyncOpenAI client for the running event loop.
+
+        Returns:
+            AsyncOpenAI: Client configured for OpenRouter with a pooled
+            httpx.AsyncClient bound to the current loop
+
+        Raises:
+            RuntimeError: If called outside a running event loop
+        """
+        import httpx
+        from openai import AsyncOpenAI
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            entry = self._async_clients.get(loop)
+            if entry is None:
+                http_client = httpx.AsyncClient(
+                    limits=self.limits,
+                    timeout=self.timeout,
+                    follow_redirects=True,
+                    event_hooks={"request": [self._count_request_async]},
+                )
+                client = AsyncOpenAI(
+                    api_key=self.api_key,
+                    base_url=self.base_url,
+                    http_client=http_client,
+                    max_retries=self.max_retries,
+                )
+                entry = (client, http_client)
+                self._async_clients[loop] = entry
+            return entry[0]
+
+    async def _count_request_async(self, request):
+        self._count_request(request)
+
+    async def _warm_up_async(self):
+        import httpx
+
+        self.get_async_client()
+        _, http_client = self._async_clients[asyncio.get_running_loop()]
+        try:
+            await http_client.get(
+                f"{self.base_url}/models",
+                headers={"Authorization": f"Bearer {self.api_key}"},
+            )
+            return True
+        except httpx.HTTPError:
+            return False
+
+    def warm_up(self, background=True):
+        """
+        Open a connection to the API ahead of the first analysis.
+
+        The connection is opened from the shared background event loop, whose
+        pool serves the synchronous analysis entry points. The request only
+        establishes a keep-alive connection (DNS, TCP and TLS); its response is
+        ignored and it does not consume any tokens.
+
+        Args:
+            background (bool): Return immediately instead of waiting
+
+        Returns:
+            concurrent.futures.Future or bool: The pending warm-up, or whether
+            it succeeded
+        """
+        with self._lock:
+            if self._warmed_up:
+                return True
+            self._warmed_up = True
+
+        future = asyncio.run_coroutine_threadsafe(
+            self._warm_up_async(), get_background_loop()
+        )
+        if background:
+            return future
+        return future.result()
+
+    def pool_stats(self):
+        """
+        Report the state of the HTTP connection pool.
+
+        Returns:
+            dict: Open, idle and in-use connection counts, the pool limit and
+            the number of requests sent through the pool
+        """
+        with self._lock:
+            stats = {
+                "open": 0,
+                "idle": 0,
+                "in_use": 0,
+                "max_connections": self.limits.max_connections,
+                "requests": self._requests,
+            }
+            http_clients = [entry[1] for entry in self._async_clients.values()]
+            if self._http_client is not None:
+                http_clients.append(self._http_client)
+
+            for http_client in http_clients:
+                # httpx does not expose pool state publicly, so read it from httpcore
+                pool = getattr(http_client._transport, "_pool", None)
+                for connection in getattr(pool, "connections", []):
+                    if connection.is_closed():
+                        continue
+                    stats["open"] += 1
+                    if connection.is_idle():
+                        stats["idle"] += 1
+                    else:
+                        stats["in_use"] += 1
+            return stats
+
+    def close(self):
+        """Close the pooled HTTP clients and drop the shared OpenAI clients."""
+        with self._lock:
+            if self._http_client is not None:
+                self._http_client.close()
+            for loop, (_, http_client) in list(self._async_clients.items()):
+                # Async clients can only be closed on the loop that owns them
+                if loop.is_running() and not loop.is_closed():
+                    asyncio.run_coroutine_threadsafe(http_client.aclose(), loop)
+            self._client = None
+            self._http_client = None
+            self._async_clients = weakref.WeakKeyDictionary()
+            self._warmed_up = False
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_client_manager(api_key):
+    """
+    Return the process-wide client manager, configured from the environment.
+
+    The manager is rebuilt if the API key or base URL changes.
+
+    Environment variables:
+        OPENROUTER_BASE_URL: OpenAI-compatible API base URL, e.g. a local
+            mock server for load tests (defaults to OpenRouter)
+        OPENROUTER_MAX_CONNECTIONS: Maximum open connections in the pool
+        OPENROUTER_MAX_KEEPALIVE: Idle connections kept for reuse
+        OPENROUTER_KEEPALIVE_EXPIRY: Seconds an idle connection is kept open
+        OPENROUTER_TIMEOUT: Read/write timeout for API calls in seconds
+        OPENROUTER_CONNECT_TIMEOUT: Timeout for establishing a connection
+        OPENROUTER_WARMUP: Open a connection in the background on creation
+
+    Args:
+        api_key (str): OpenRouter API key
+
+    Returns:
+        OpenRouterClientManager: The shared manager
+    """
+    global _manager
+    base_url = env_str("OPENROUTER_BASE_URL", OPENROUTER_BASE_URL).rstrip("/")
+    with _manager_lock:
+        if (
+            _manager is None
+            or _manager.api_key != api_key
+            or _manager.base_url != base_url
+        ):
+            if _manager is not None:
+                _manager.close()
+            _manager = OpenRouterClientManager(
+                api_key,
+                base_url=base_url,
+                max_connections=env_int(
+                    "OPENROUTER_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS
+                ),
+                max_keepalive_connections=env_int(
+                    "OPENROUTER_MAX_KEEPALIVE", DEFAULT_MAX_KEEPALIVE_CONNECTIONS
+                ),
+                keepalive_expiry=env_float(
+                    "OPENROUTER_KEEPALIVE_EXPIRY", DEFAULT_KEEPALIVE_EXPIRY
+                ),
+                timeout=env_float("OPENROUTER_TIMEOUT", DEFAULT_TIMEOUT),
+                connect_timeout=env_float(
+                    "OPENROUTER_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT
+                ),
+            )
+            if env_bool("OPENROUTER_WARMUP", False):
+                _manager.warm_up()
+        return _manager
+
+
+def get_pool_stats():
+    """
+    Return connection pool statistics for the shared client.
+
+    Returns:
+        dict: See OpenRouterClientManager.pool_stats; empty if no client exists yet
+    """
+    with _manager_lock:
+        manager = _manager
+    return manager.pool_stats() if manager is not None else {}
+
+
+def reset_client_manager():
+    """Close and drop the shared manager (used on shutdown and in tests)."""
+    global _manager
+    with _manager_lock:
+        if _manager is not None:
+            _manager.close()
+        _manager = None
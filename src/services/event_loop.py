@@ -0,0 +1,100 @@
+"""
+Shared background event loop for running async services from sync code.
+
+Streamlit scripts run on plain threads, so the synchronous entry points submit
+their coroutines to a single long-lived loop instead of creating a new loop per
+call. All sync callers in the process therefore share one async client and one
+concurrency limit.
+"""
+
+import asyncio
+import threading
+
+_loop = None
+_thread = None
+_lock = threading.Lock()
+
+
+def get_background_loop():
+    """
+    Return the process-wide background event loop, starting it on first use.
+
+    Returns:
+        asyncio.AbstractEventLoop: A running loop owned by a daemon thread
+    """
+    global _loop, _thread
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            _thread = threading.Thread(
+                target=_loop.run_forever, name="resume-analyzer-loop", daemon=True
+            )
+            _thread.start()
+        return _loop
+
+
+def run_sync(coro, timeout=None):
+    """
+    Run a coroutine on the background loop and wait for its result.
+
+    If the wait is interrupted (timeout, KeyboardInterrupt or a Streamlit
+    rerun/stop exception), the coroutine is cancelled on the loop.
+
+    Args:
+        coro: Coroutine to run
+        timeout (float, optional): Maximum seconds to wait for the result
+
+    Returns:
+        The coroutine's result
+
+    Raises:
+        RuntimeError: If called from the background loop thread itself
+        TimeoutError: If the timeout elapses first
+    """
+    loop = get_background_loop()
+    if threading.current_thread() is _thread:
+        coro.close()
+        raise RuntimeError("run_sync() cannot be called from the background loop")
+
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    try:
+        return future.result(timeout)
+    except BaseException:
+        future.cancel()
+        raise
+
+
+_EXHAUSTED = object()
+
+
+async def _next_item(iterator):
+    try:
+        return await iterator.__anext__()
+    except StopAsyncIteration:
+        return _EXHAUSTED
+
+
+def iterate_sync(async_iterable):
+    """
+    Consume an async iterator on the background loop from synchronous code.
+
+    Closing the returned generator early (e.g. when a Streamlit script is
+    stopped) closes the async iterator on the loop as well.
+
+    Args:
+        async_iterable: Async generator or other async iterable
+
+    Yields:
+        Items produced by the async iterable
+    """
+    iterator = async_iterable.__aiter__()
+    try:
+        while True:
+            item = run_sync(_next_item(iterator))
+            if item is _EXHAUSTED:
+                return
+            yield item
+    finally:
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            run_sync(aclose())
@@ -0,0 +1,266 @@
+"""
+Background job queue for resume analyses.
+
+Streamlit reruns the whole script on every interaction, so work started from
+the script thread is repeated, or blocks it, unless it lives outside the
+session. Jobs run on a bounded thread pool shared by every session: the pool
+size, not the number of open browser tabs, governs how many analyses run at
+once. A job's ID is derived from its content, so submitting the same work
+again returns the existing job, and finished jobs keep their result for a
+TTL so that reruns and repeated clicks only read it back.
+"""
+
+import concurrent.futures
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from src.config import env_float, env_int
+from src.utils.metrics import get_stage_timings
+
+DEFAULT_WORKERS = 4
+DEFAULT_RESULT_TTL_SECONDS = 3600.0
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+def make_job_key(data, *parts):
+    """
+    Build the job ID for a piece of work from its content.
+
+    Args:
+        data (bytes-like): The input document
+        *parts: Further inputs that change the result (e.g. the job role)
+
+    Returns:
+        str: Hex digest identifying the work
+    """
+    digest = hashlib.sha256(data)
+    for part in parts:
+        digest.update(b"\0" + str(part or "").encode("utf-8"))
+    return digest.hexdigest()
+
+
+class Job:
+    """
+    One unit of work and its outcome.
+
+    Attributes:
+        id (str): Content-derived job ID
+        status (str): QUEUED, RUNNING, DONE or FAILED
+        result: Return value of the job function once DONE
+        error (Exception or None): What the job failed with once FAILED
+        info (dict): Progress details the job function publishes for the page
+        submitted_at (float): Clock time the job was queued
+        started_at (float or None): Clock time a worker picked it up
+        finished_at (float or None): Clock time it completed
+    """
+
+    def __init__(self, job_id, submitted_at):
+        self.id = job_id
+        self.status = QUEUED
+        self.result = None
+        self.error = None
+        self.info = {}
+        self.submitted_at = submitted_at
+        self.started_at = None
+        self.finished_at = None
+        self._chunks = []
+
+    @property
+    def finished(self):
+        """Whether the job is DONE or FAILED."""
+        return self.status in (DONE, FAILED)
+
+    def append(self, chunk):
+        """
+        Publish a piece of partial output (e.g. a streamed token).
+
+        Args:
+            chunk (str): Text to append
+        """
+        self._chunks.append(chunk)
+
+    def partial(self):
+        """
+        Returns:
+            str: The output published so far
+        """
+        return "".join(self._chunks)
+
+
+class JobQueue:
+    """
+    Deduplicating job queue executed by a bounded thread pool.
+
+    Attributes:
+        max_workers (int): Jobs run at once; 0 runs each job in the
+            submitting thread
+        ttl_seconds (float): How long finished jobs are kept (0 keeps them
+            until the queue is reset)
+    """
+
+    def __init__(
+        self,
+        max_workers=DEFAULT_WORKERS,
+        ttl_seconds=DEFAULT_RESULT_TTL_SECONDS,
+        clock=time.monotonic,
+    ):
+        """
+        Args:
+            max_workers (int): Size of the worker pool (0 disables it)
+            ttl_seconds (float): Retention of finished jobs in seconds
+            clock: Monotonic time source, replaceable in tests
+        """
+        self.max_workers = max(0, max_workers)
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"submitted": 0, "deduplicated": 0, "expired": 0}
+        self._executor = None
+        if self.max_workers:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="analysis-job"
+            )
+
+    def _purge(self):
+        """Drop finished jobs past their TTL (call with the lock held)."""
+        if self.ttl_seconds <= 0:
+            return
+        now = self._clock()
+        for job_id, job in list(self._jobs.items()):
+            if job.finished and now - job.finished_at > self.ttl_seconds:
+                del self._jobs[job_id]
+                self._stats["expired"] += 1
+
+    def submit(self, job_id, func, *args, **kwargs):
+        """
+        Queue work under a job ID, or return the job already holding that ID.
+
+        A queued, running or retained finished job is reused as is; a failed
+        one is replaced so that resubmitting retries the work.
+
+        Args:
+            job_id (str): Content-derived ID (see make_job_key)
+            func: Called as ``func(job, *args, **kwargs)`` on a worker; its
+                return value becomes the job's result
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Job: The job for this ID
+        """
+        with self._lock:
+            self._purge()
+            job = self._jobs.get(job_id)
+            if job is not None and job.status != FAILED:
+                self._stats["deduplicated"] += 1
+                get_stage_timings().increment("job_deduplicated")
+                return job
+            job = Job(job_id, self._clock())
+            self._jobs[job_id] = job
+            self._stats["submitted"] += 1
+
+        if self._executor is None:
+            self._run(job, func, args, kwargs)
+        else:
+            self._executor.submit(self._run, job, func, args, kwargs)
+        return job
+
+    def _run(self, job, func, args, kwargs):
+        job.started_at = self._clock()
+        job.status = RUNNING
+        get_stage_timings().observe("job_queue", job.started_at - job.submitted_at)
+        try:
+            job.result = func(job, *args, **kwargs)
+        except Exception as e:
+            job.error = e
+            job.finished_at = self._clock()
+            job.status = FAILED
+        else:
+            job.finished_at = self._clock()
+            job.status = DONE
+
+    def get(self, job_id):
+        """
+        Look up a job.
+
+        Args:
+            job_id (str): The job's ID
+
+        Returns:
+            Job or None: The job, or None if it is unknown or has expired
+        """
+        with self._lock:
+            self._purge()
+            return self._jobs.get(job_id)
+
+    def stats(self):
+        """
+        Return queue counters.
+
+        Returns:
+            dict: "submitted" (jobs created), "deduplicated" (submissions
+            answered by an existing job), "expired", and the number of
+            retained jobs per status
+        """
+        with self._lock:
+            self._purge()
+            stats = dict(self._stats)
+            for status in (QUEUED, RUNNING, DONE, FAILED):
+                stats[status] = 0
+            for job in self._jobs.values():
+                stats[job.status] += 1
+        return stats
+
+    def shutdown(self, wait=False):
+        """
+        Stop the worker pool; queued jobs that have not started are cancelled.
+
+        Args:
+            wait (bool): Block until running jobs complete
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_job_queue = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue():
+    """
+    Return the process-wide job queue, creating it from the environment.
+
+    Environment variables:
+        JOB_WORKERS: Analyses run at once (0 runs them in the script thread)
+        JOB_RESULT_TTL_SECONDS: How long finished jobs and their results are
+            kept (0 keeps them until restart)
+
+    Returns:
+        JobQueue: The shared queue
+    """
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is None:
+            _job_queue = JobQueue(
+                max_workers=env_int("JOB_WORKERS", DEFAULT_WORKERS),
+                ttl_seconds=env_float(
+                    "JOB_RESULT_TTL_SECONDS", DEFAULT_RESULT_TTL_SECONDS
+                ),
+            )
+        return _job_queue
+
+
+def reset_job_queue():
+    """Stop the shared queue so the next access re-reads the configuration."""
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is not None:
+            _job_queue.shutdown()
+        _job_queue = None
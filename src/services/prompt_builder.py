@@ -0,0 +1,576 @@
+"""
+Prompt construction with a local input-token budget.
+
+Token counts are estimated without a tokenizer dependency, so the size of
+every request is known before it is sent. When the estimated prompt exceeds
+the model's input budget, low-value content is removed first (redundant
+whitespace, repeated lines such as per-page headers, extraction noise) and
+only then is the middle of the resume cut.
+
+Long resumes can instead be reviewed section by section (build_section_prompts)
+and the reviews merged by a final request (build_merge_prompt).
+
+Several job roles can share one request (build_multi_role_prompt): the model
+writes one section per role under a numbered marker line, which
+split_role_sections uses to split the response back up by role.
+"""
+
+import math
+import re
+
+from src.config import env_int, env_str
+from src.utils.sections import split_sections
+
+SYSTEM_PROMPT = (
+    "You are an expert resume reviewer with years of experience in HR and recruitment."
+)
+
+# Input budgets (estimated prompt tokens) for known models
+MODEL_INPUT_BUDGETS = {
+    "google/gemini-2.0-flash-exp:free": 12000,
+}
+DEFAULT_INPUT_BUDGET = 8000
+
+# Chat formatting overhead per message and per request
+MESSAGE_OVERHEAD_TOKENS = 4
+REQUEST_OVERHEAD_TOKENS = 2
+
+# Share of the remaining budget kept from the start of the resume when the
+# middle has to be cut; the rest is kept from the end (skills, education)
+HEAD_SHARE = 2 / 3
+
+TRUNCATION_MARKER = "[... {count} lines omitted to fit the input budget ...]"
+
+# Line that opens each role's section in a multi-role response
+ROLE_MARKER = "=== ROLE {number} ==="
+
+# Words, symbols, line breaks and runs of whitespace
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]|[^\S\n]*\n\s*|\s{2,}")
+_SPACE_RUN = re.compile(r"[ \t\f\v]+")
+# ROLE_MARKER as models actually write it: bolded, as a heading, with the
+# role's name appended
+_ROLE_MARKER_LINE = re.compile(r"^[\s#*]*=+\s*ROLE\s+(\d+)\b[^\n]*$", re.I | re.M)
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def estimate_tokens(text):
+    """
+    Estimate the number of tokens a BPE tokenizer produces for the text.
+
+    Each punctuation mark, line break and run of several spaces counts as one
+    token and each ASCII word as one token per five characters. Non-ASCII
+    words count one token per character, which matches how CJK text
+    tokenizes. The estimate errs on the high side for typical resume text.
+
+    Args:
+        text (str): Text to measure
+
+    Returns:
+        int: Estimated token count
+    """
+    tokens = 0
+    for match in _TOKEN_PATTERN.finditer(text):
+        word = match.group()
+        if word.isspace():
+            tokens += 1
+        elif word.isascii():
+            tokens += math.ceil(len(word) / 5)
+        else:
+            tokens += len(word)
+    return tokens
+
+
+def estimate_message_tokens(messages):
+    """
+    Estimate the prompt tokens of a list of chat messages.
+
+    Args:
+        messages (list): Chat messages with "content" strings
+
+    Returns:
+        int: Estimated token count including formatting overhead
+    """
+    return REQUEST_OVERHEAD_TOKENS + sum(
+        MESSAGE_OVERHEAD_TOKENS + estimate_tokens(message["content"])
+        for message in messages
+    )
+
+
+def get_input_budget(model):
+    """
+    Return the input-token budget for a model.
+
+    PROMPT_MODEL_INPUT_BUDGETS ("model=tokens,model=tokens") takes precedence
+    over PROMPT_MAX_INPUT_TOKENS, which takes precedence over the built-in
+    per-model budgets. A budget of 0 disables trimming.
+
+    Args:
+        model (str): OpenRouter model identifier
+
+    Returns:
+        int: Budget in estimated prompt tokens
+    """
+    for entry in (env_str("PROMPT_MODEL_INPUT_BUDGETS") or "").split(","):
+        name, _, value = entry.rpartition("=")
+        if name.strip() == model:
+            try:
+                return max(0, int(value))
+            except ValueError:
+                break
+    default = MODEL_INPUT_BUDGETS.get(model, DEFAULT_INPUT_BUDGET)
+    return max(0, env_int("PROMPT_MAX_INPUT_TOKENS", default))
+
+
+def build_messages(resume_text, job_role=None):
+    """
+    Build the chat messages for a resume analysis request.
+
+    Args:
+        resume_text (str): The text content of the resume
+        job_role (str, optional): The job role the user is applying for
+
+    Returns:
+        list: System and user messages for the chat completions API
+    """
+    job_context = job_role if job_role else "general job applications"
+
+    prompt = f"""Please analyze this resume and provide constructive feedback.
+    Focus on the following aspects:
+    1. Content clarity and impact
+    2. Skills presentation
+    3. Experience descriptions
+    4. Specific improvements for {job_context}
+
+    Resume content:
+    {resume_text}
+
+    Please provide your analysis in a clear, structured format with specific recommendations."""
+
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def _collapse_whitespace(text):
+    lines = [_SPACE_RUN.sub(" ", line).strip() for line in text.splitlines()]
+    return _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+
+
+def _drop_repeated_lines(text):
+    seen = set()
+    kept = []
+    for line in text.splitlines():
+        key = line.strip().lower()
+        if key and key in seen:
+            continue
+        seen.add(key)
+        kept.append(line)
+    return "\n".join(kept)
+
+
+def _is_noise(line):
+    stripped = line.strip()
+    if not stripped:
+        return False
+    letters = sum(char.isalpha() for char in stripped)
+    # Page numbers, separators, bullets-only lines and binary garbage
+    return letters < 2 or letters / len(stripped) < 0.4
+
+
+def _drop_noise_lines(text):
+    return "\n".join(line for line in text.splitlines() if not _is_noise(line))
+
+
+def _cut_middle(text, max_tokens):
+    lines = text.splitlines()
+    separator = "\n"
+    if len(lines) < 3:
+        # No line structure to work with (e.g. a PDF without line breaks)
+        lines = text.split()
+        separator = " "
+    # Joining lines costs a line-break token each
+    join_cost = 1 if separator == "\n" else 0
+    costs = [estimate_tokens(line) + join_cost for line in lines]
+    marker_cost = estimate_tokens(TRUNCATION_MARKER.format(count=0)) + join_cost
+    available = max_tokens - marker_cost
+
+    head_end, used = 0, 0
+    head_budget = available * HEAD_SHARE
+    while head_end < len(lines) and used + costs[head_end] <= head_budget:
+        used += costs[head_end]
+        head_end += 1
+
+    tail_start = len(lines)
+    while tail_start > head_end and used + costs[tail_start - 1] <= available:
+        tail_start -= 1
+        used += costs[tail_start]
+
+    omitted = tail_start - head_end
+    if not omitted:
+        return text
+    marker = TRUNCATION_MARKER.format(count=omitted)
+    return separator.join([*lines[:head_end], marker, *lines[tail_start:]])
+
+
+# Low-value content removed, in order, before any lines are cut
+_TRIM_STEPS = (_collapse_whitespace, _drop_repeated_lines, _drop_noise_lines)
+
+
+def trim_to_budget(text, max_tokens):
+    """
+    Shrink text until its estimated size fits the budget.
+
+    Low-value content goes first: redundant whitespace, then repeated lines,
+    then lines that are mostly symbols. If that is not enough, lines are cut
+    from the middle, keeping the start and the end of the resume.
+
+    Args:
+        text (str): Resume text
+        max_tokens (int): Token budget for the text (0 means unlimited)
+
+    Returns:
+        str: The text, unchanged if it already fits
+    """
+    if not max_tokens or estimate_tokens(text) <= max_tokens:
+        return text
+    for step in _TRIM_STEPS:
+        text = step(text)
+        if estimate_tokens(text) <= max_tokens:
+            return text
+    return _cut_middle(text, max_tokens)
+
+
+class Prompt:
+    """
+    Chat messages for one analysis request and their token accounting.
+
+    Attributes:
+        messages (list): Messages to send
+        resume_text (str): The resume text as included in the prompt
+        tokens_before_trim (int): Estimated prompt tokens for the full resume
+        tokens_after_trim (int): Estimated prompt tokens actually sent
+        budget (int): Input budget that applied (0 for unlimited)
+    """
+
+    def __init__(self, messages, resume_text, tokens_before_trim, budget):
+        self.messages = messages
+        self.resume_text = resume_text
+        self.tokens_before_trim = tokens_before_trim
+        self.tokens_after_trim = estimate_message_tokens(messages)
+        self.budget = budget
+
+    @property
+    def trimmed(self):
+        return self.tokens_after_trim < self.tokens_before_trim
+
+    def record(self, metrics):
+        """
+        Copy the token accounting into a metrics dict.
+
+        Args:
+            metrics (dict): Receives "input_tokens_before_trim",
+                "input_tokens_after_trim" and "input_trimmed"
+        """
+        metrics["input_tokens_before_trim"] = self.tokens_before_trim
+        metrics["input_tokens_after_trim"] = self.tokens_after_trim
+        metrics["input_trimmed"] = self.trimmed
+
+
+def _fit_prompt(build, text, budget):
+    """
+    Build messages around text, trimming the text until they fit the budget.
+
+    Args:
+        build (callable): Returns the messages for a given text
+        text (str): The variable part of the prompt
+        budget (int): Input budget (0 for unlimited)
+
+    Returns:
+        Prompt: The messages and their estimated token counts
+    """
+    messages = build(text)
+    tokens = estimate_message_tokens(messages)
+    if not budget or tokens <= budget:
+        return Prompt(messages, text, tokens, budget)
+
+    # Whitespace around the text can merge with the template's, so the
+    # overhead is approximate; tighten the text budget until the prompt fits
+    text_budget = budget - (tokens - estimate_tokens(text))
+    while True:
+        trimmed_text = trim_to_budget(text, max(text_budget, 1))
+        messages = build(trimmed_text)
+        excess = estimate_message_tokens(messages) - budget
+        if excess <= 0 or text_budget <= 1:
+            return Prompt(messages, trimmed_text, tokens, budget)
+        text_budget -= excess
+
+
+def build_prompt(resume_text, job_role, model):
+    """
+    Build the messages for an analysis request within the model's budget.
+
+    Args:
+        resume_text (str): The text content of the resume
+        job_role (str, optional): The job role the user is applying for
+        model (str): Model the request is sent to
+
+    Returns:
+        Prompt: The messages and their estimated token counts
+    """
+    return _fit_prompt(
+        lambda text: build_messages(text, job_role),
+        resume_text,
+        get_input_budget(model),
+    )
+
+
+def build_section_messages(title, section_text, job_role=None):
+    """
+    Build the chat messages for reviewing one section of a long resume.
+
+    Args:
+        title (str): Section title, e.g. "Publications"
+        section_text (str): The text of the section
+        job_role (str, optional): The job role the user is applying for
+
+    Returns:
+        list: System and user messages for the chat completions API
+    """
+    job_context = job_role if job_role else "general job applications"
+
+    prompt = f"""Please review the "{title}" section of a resume for {job_context}.
+    Cover:
+    1. Strengths
+    2. Weaknesses and missing information
+    3. Specific improvements
+
+    Section content:
+    {section_text}
+
+    Keep the review brief; it will be combined with reviews of the other sections."""
+
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def build_merge_messages(reviews_text, job_role=None):
+    """
+    Build the chat messages that merge section reviews into one analysis.
+
+    Args:
+        reviews_text (str): The section reviews, each under its title
+        job_role (str, optional): The job role the user is applying for
+
+    Returns:
+        list: System and user messages for the chat completions API
+    """
+    job_context = job_role if job_role else "general job applications"
+
+    prompt = f"""Below are reviews of the individual sections of one resume.
+    Combine them into a single analysis with constructive feedback.
+    Focus on the following aspects:
+    1. Content clarity and impact
+    2. Skills presentation
+    3. Experience descriptions
+    4. Specific improvements for {job_context}
+
+    Section reviews:
+    {reviews_text}
+
+    Please provide your analysis in a clear, structured format with specific recommendations, without repeating points made for several sections."""
+
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def _split_lines(text, max_tokens):
+    """Split text at line boundaries into chunks of at most max_tokens."""
+    chunks, lines, used = [], [], 0
+    for line in text.splitlines():
+        cost = estimate_tokens(line) + 1
+        if lines and used + cost > max_tokens:
+            chunks.append("\n".join(lines))
+            lines, used = [], 0
+        lines.append(line)
+        used += cost
+    chunks.append("\n".join(lines))
+    return chunks
+
+
+def plan_sections(resume_text, max_parts, max_tokens=0):
+    """
+    Group a resume's sections into parts of similar size for parallel review.
+
+    Sections larger than max_tokens are split at line boundaries. Adjacent
+    sections are then packed together, smallest pairs first, until there are
+    at most max_parts parts or no pair fits within max_tokens. Balanced parts
+    keep the slowest review, which bounds the wall-clock time, short.
+
+    Args:
+        resume_text (str): The text content of the resume
+        max_parts (int): Preferred maximum number of parts
+        max_tokens (int, optional): Size limit per part (0 for unlimited)
+
+    Returns:
+        list: (title, text) tuples in document order
+    """
+    parts = []  # [names, text, tokens]
+    for name, text in split_sections(resume_text):
+        chunks = _split_lines(text, max_tokens) if max_tokens else [text]
+        for number, chunk in enumerate(chunks, 1):
+            title = name.capitalize()
+            if len(chunks) > 1:
+                title = f"{title} (part {number})"
+            parts.append([[title], chunk, estimate_tokens(chunk)])
+
+    while len(parts) > max(max_parts, 1):
+        sizes = [parts[i][2] + parts[i + 1][2] for i in range(len(parts) - 1)]
+        smallest = min(range(len(sizes)), key=sizes.__getitem__)
+        if max_tokens and sizes[smallest] > max_tokens:
+            break
+        names, text, tokens = parts.pop(smallest + 1)
+        merged = parts[smallest]
+        merged[0] += [name for name in names if name not in merged[0]]
+        merged[1] += "\n\n" + text
+        merged[2] = sizes[smallest]
+
+    return [(" / ".join(names), text) for names, text, _ in parts]
+
+
+def build_section_prompts(resume_text, job_role, model, max_parts):
+    """
+    Build one review prompt per part of a long resume.
+
+    Args:
+        resume_text (str): The text content of the resume
+        job_role (str, optional): The job role the user is applying for
+        model (str): Model the requests are sent to
+        max_parts (int): Preferred maximum number of parts
+
+    Returns:
+        list: (title, Prompt) tuples in document order
+    """
+    budget = get_input_budget(model)
+    overhead = estimate_message_tokens(build_section_messages("", "", job_role))
+    max_tokens = max(budget - overhead, 1) if budget else 0
+    return [
+        (
+            title,
+            _fit_prompt(
+                lambda text, title=title: build_section_messages(title, text, job_role),
+                text,
+                budget,
+            ),
+        )
+        for title, text in plan_sections(resume_text, max_parts, max_tokens)
+    ]
+
+
+def build_merge_prompt(reviews, job_role, model):
+    """
+    Build the request that merges section reviews into the final analysis.
+
+    Args:
+        reviews (list): (title, review) tuples
+        job_role (str, optional): The job role the user is applying for
+        model (str): Model the request is sent to
+
+    Returns:
+        Prompt: The messages and their estimated token counts
+    """
+    reviews_text = "\n\n".join(f"### {title}\n{review}" for title, review in reviews)
+    return _fit_prompt(
+        lambda text: build_merge_messages(text, job_role),
+        reviews_text,
+        get_input_budget(model),
+    )
+
+
+def build_multi_role_messages(resume_text, job_roles):
+    """
+    Build the chat messages for analyzing a resume against several job roles.
+
+    Args:
+        resume_text (str): The text content of the resume
+        job_roles (list): The job roles, in the order the sections are wanted
+
+    Returns:
+        list: System and user messages for the chat completions API
+    """
+    roles = "\n    ".join(
+        f"{number}. {role}" for number, role in enumerate(job_roles, 1)
+    )
+    markers = "\n    ".join(
+        ROLE_MARKER.format(number=number) for number in range(1, len(job_roles) + 1)
+    )
+
+    prompt = f"""Please analyze this resume and provide constructive feedback for each of these job roles:
+    {roles}
+
+    For each role, focus on the following aspects:
+    1. Content clarity and impact
+    2. Skills presentation
+    3. Experience descriptions
+    4. Specific improvements for that role
+
+    Resume content:
+    {resume_text}
+
+    Write one section per role, in the order listed. Start each section with its marker on a line of its own, exactly as shown:
+    {markers}
+
+    Under each marker, provide the analysis for that role in a clear, structured format with specific recommendations."""
+
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def build_multi_role_prompt(resume_text, job_roles, model):
+    """
+    Build one request covering several job roles within the model's budget.
+
+    Args:
+        resume_text (str): The text content of the resume
+        job_roles (list): The job roles
+        model (str): Model the request is sent to
+
+    Returns:
+        Prompt: The messages and their estimated token counts
+    """
+    return _fit_prompt(
+        lambda text: build_multi_role_messages(text, job_roles),
+        resume_text,
+        get_input_budget(model),
+    )
+
+
+def split_role_sections(response_text, job_roles):
+    """
+    Split a multi-role response into the analysis for each role.
+
+    Args:
+        response_text (str): Model output for a build_multi_role_prompt request
+        job_roles (list): The job roles, in the order they were listed
+
+    Returns:
+        dict: Analysis text keyed by role, for the roles whose section is
+        present and not empty
+    """
+    matches = list(_ROLE_MARKER_LINE.finditer(response_text))
+    sections = {}
+    for index, match in enumerate(matches):
+        number = int(match.group(1))
+        if not 1 <= number <= len(job_roles) or job_roles[number - 1] in sections:
+            continue
+        end = matches[index + 1].start() if index + 1 < len(matches) else None
+        text = response_text[match.end() : end].strip()
+        if text:
+            sections[job_roles[number - 1]] = text
+    return sections
@@ -0,0 +1,470 @@
+"""
+Client-side rate limiting and adaptive concurrency for OpenRouter requests.
+
+Free models have tight per-minute limits, and bursts past them come back as
+429 errors. Every upstream request therefore goes through one process-wide
+limiter:
+
+- token buckets pace requests per minute and prompt+completion tokens per
+  minute, serving queued callers in arrival order;
+- a Retry-After (or a 429 without one) pauses all new requests;
+- the number of concurrent requests adapts AIMD-style: it is halved on a 429
+  or 5xx response and grows back by about one per round of successes;
+- callers queue for at most a bounded time before RateLimitTimeout is raised.
+"""
+
+import asyncio
+import collections
+import contextlib
+import email.utils
+import threading
+import time
+
+from src.config import env_float, env_int
+
+# Free OpenRouter models allow 20 requests per minute
+DEFAULT_REQUESTS_PER_MINUTE = 20
+# 0 leaves tokens per minute unlimited
+DEFAULT_TOKENS_PER_MINUTE = 0
+DEFAULT_MAX_CONCURRENCY = 10
+DEFAULT_MIN_CONCURRENCY = 1
+DEFAULT_MAX_QUEUE_WAIT = 30.0
+
+# Pause after a 429 that carries no Retry-After header
+DEFAULT_BACKOFF_SECONDS = 1.0
+# Retry-After values are capped so a bad header cannot stall the app
+MAX_RETRY_AFTER_SECONDS = 120.0
+# Multiplicative decrease factor and the minimum time between decreases, so a
+# burst of failures from one round of requests halves the limit only once
+DECREASE_FACTOR = 0.5
+DECREASE_INTERVAL = 1.0
+
+
+class RateLimitTimeout(TimeoutError):
+    """Raised when a request cannot start within the maximum queue wait."""
+
+    def __init__(self, wait):
+        """
+        Args:
+            wait (float): Estimated seconds until the request could start
+        """
+        super().__init__(
+            "The AI service is busy (rate limit reached); "
+            f"please try again in about {max(1, round(wait))} seconds."
+        )
+        self.wait = wait
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at a per-minute rate.
+
+    Attributes:
+        rate (float): Tokens added per second (0 means unlimited)
+        capacity (float): Maximum tokens held, i.e. the largest burst
+    """
+
+    def __init__(self, per_minute, now):
+        self.rate = max(0.0, per_minute) / 60.0
+        self.capacity = max(0.0, per_minute)
+        self._tokens = self.capacity
+        self._updated = now
+
+    def _refill(self, now):
+        elapsed = max(0.0, now - self._updated)
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def delay(self, amount, now):
+        """
+        Return the seconds until amount tokens are available.
+
+        Amounts above the capacity are treated as a full bucket.
+        """
+        if not self.rate:
+            return 0.0
+        self._refill(now)
+        missing = min(amount, self.capacity) - self._tokens
+        return max(0.0, missing / self.rate)
+
+    def take(self, amount, now):
+        """Remove tokens; the balance may go negative to record overuse."""
+        if self.rate:
+            self._refill(now)
+            self._tokens -= min(amount, self.capacity)
+
+    def give(self, amount, now):
+        """Return tokens that were reserved but not used."""
+        if self.rate:
+            self._refill(now)
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+
+def retry_after_seconds(error):
+    """
+    Read the server-requested delay from an API error.
+
+    Looks at the "retry-after-ms" and "retry-after" (seconds or HTTP date)
+    headers of the error's response.
+
+    Args:
+        error (Exception): Error raised by the API client
+
+    Returns:
+        float or None: Delay in seconds, or None if the server gave none
+    """
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    seconds = None
+    try:
+        milliseconds = headers.get("retry-after-ms")
+        if milliseconds is not None:
+            seconds = float(milliseconds) / 1000
+    except (TypeError, ValueError):
+        pass
+    value = headers.get("retry-after")
+    if seconds is None and value is not None:
+        try:
+            seconds = float(value)
+        except (TypeError, ValueError):
+            try:
+                retry_at = email.utils.parsedate_to_datetime(value)
+                seconds = retry_at.timestamp() - time.time()
+            except (TypeError, ValueError):
+                return None
+    if seconds is None:
+        return None
+    return min(max(0.0, seconds), MAX_RETRY_AFTER_SECONDS)
+
+
+def is_overload_error(error):
+    """
+    Tell whether an error means the upstream is overloaded (429 or 5xx).
+
+    Args:
+        error (BaseException): Error raised while a request was in flight
+
+    Returns:
+        bool: True for rate-limit and server errors
+    """
+    status = getattr(error, "status_code", None)
+    return isinstance(status, int) and (status == 429 or status >= 500)
+
+
+class _Waiter:
+    """A caller queued for a concurrency slot on its own event loop."""
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.future = loop.create_future()
+        self.granted = False
+
+
+def _wake(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class Permit:
+    """
+    Permission to send one request; released when the request finishes.
+
+    Attributes:
+        tokens (int): Tokens reserved from the tokens-per-minute bucket
+        waited (float): Seconds spent queueing for the permit
+    """
+
+    def __init__(self, limiter, tokens, waited):
+        self._limiter = limiter
+        self.tokens = tokens
+        self.waited = waited
+        self._released = False
+
+    def record_usage(self, tokens):
+        """
+        Correct the reservation with the tokens the request actually used.
+
+        Args:
+            tokens (int): Prompt plus completion tokens reported or estimated
+        """
+        if isinstance(tokens, int) and tokens >= 0:
+            self._limiter._adjust_tokens(self.tokens - tokens)
+            self.tokens = tokens
+
+    def release(self, error=None):
+        """
+        Free the concurrency slot and feed the outcome to the adaptive limit.
+
+        Args:
+            error (BaseException, optional): The error the request failed
+                with; cancellation and other non-API errors leave the limit
+                unchanged
+        """
+        if self._released:
+            return
+        self._released = True
+        if error is None:
+            self._limiter._on_success()
+        elif is_overload_error(error):
+            self._limiter._on_overload(retry_after_seconds(error), error)
+        self._limiter._release_slot()
+
+
+class RateLimiter:
+    """
+    Process-wide pacing and adaptive concurrency limit for upstream requests.
+
+    Callers may run on different event loops and threads; waiting happens on
+    the caller's own loop.
+
+    Attributes:
+        max_concurrency (int): Upper bound of the adaptive limit
+        min_concurrency (int): Lower bound of the adaptive limit
+        max_wait (float): Longest time a caller queues before giving up
+    """
+
+    def __init__(
+        self,
+        requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE,
+        tokens_per_minute=DEFAULT_TOKENS_PER_MINUTE,
+        max_concurrency=DEFAULT_MAX_CONCURRENCY,
+        min_concurrency=DEFAULT_MIN_CONCURRENCY,
+        max_wait=DEFAULT_MAX_QUEUE_WAIT,
+        clock=time.monotonic,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.max_wait = max(0.0, max_wait)
+        self._clock = clock
+        now = clock()
+        self._requests = TokenBucket(requests_per_minute, now)
+        self._tokens = TokenBucket(tokens_per_minute, now)
+        self._limit = float(self.max_concurrency)
+        self._in_flight = 0
+        self._waiters = collections.deque()
+        self._paused_until = 0.0
+        self._last_decrease = float("-inf")
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "throttled": 0, "timeouts": 0}
+
+    @property
+    def limit(self):
+        """Current number of requests allowed in flight."""
+        with self._lock:
+            return int(self._limit)
+
+    async def _wait_for_rate(self, tokens, deadline):
+        # The send slot is reserved from the buckets on arrival (their balance
+        # goes negative), so later callers are scheduled after it and waiters
+        # are paced in arrival order instead of racing for each new token
+        with self._lock:
+            now = self._clock()
+            send_at = now + max(
+                self._requests.delay(1, now), self._tokens.delay(tokens, now)
+            )
+            delay = max(send_at, self._paused_until) - now
+            if now + delay > deadline:
+                raise RateLimitTimeout(delay)
+            self._requests.take(1, now)
+            self._tokens.take(tokens, now)
+
+        try:
+            while True:
+                with self._lock:
+                    now = self._clock()
+                    # A Retry-After pause may have started while waiting
+                    delay = max(send_at, self._paused_until) - now
+                if delay <= 0:
+                    return
+                if now + delay > deadline:
+                    raise RateLimitTimeout(delay)
+                await asyncio.sleep(delay)
+        except BaseException:
+            # Give the unused reservation back
+            with self._lock:
+                now = self._clock()
+                self._requests.give(1, now)
+                self._tokens.give(tokens, now)
+            raise
+
+    async def _acquire_slot(self, deadline):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if not self._waiters and self._in_flight < int(self._limit):
+                self._in_flight += 1
+                return
+            waiter = _Waiter(loop)
+            self._waiters.append(waiter)
+
+        try:
+            await asyncio.wait_for(
+                asyncio.shield(waiter.future), max(0.0, deadline - self._clock())
+            )
+        except BaseException as exc:
+            with self._lock:
+                granted = waiter.granted
+                if not granted:
+                    self._waiters.remove(waiter)
+            if granted:
+                # The slot was handed over as the wait ended; pass it on
+                self._release_slot()
+            if isinstance(exc, asyncio.TimeoutError):
+                raise RateLimitTimeout(self.max_wait) from None
+            raise
+
+    def _grant_locked(self):
+        while self._waiters and self._in_flight < int(self._limit):
+            waiter = self._waiters.popleft()
+            try:
+                waiter.loop.call_soon_threadsafe(_wake, waiter.future)
+            except RuntimeError:
+                # The waiter's event loop is closed
+                continue
+            waiter.granted = True
+            self._in_flight += 1
+
+    def _release_slot(self):
+        with self._lock:
+            self._in_flight -= 1
+            self._grant_locked()
+
+    def _on_success(self):
+        with self._lock:
+            # Additive increase: about one more slot per round of successes
+            self._limit = min(
+                float(self.max_concurrency), self._limit + 1 / max(self._limit, 1)
+            )
+            self._grant_locked()
+
+    def _on_overload(self, retry_after, error):
+        with self._lock:
+            now = self._clock()
+            if getattr(error, "status_code", None) == 429:
+                self._stats["throttled"] += 1
+                if retry_after is None:
+                    retry_after = DEFAULT_BACKOFF_SECONDS
+            if retry_after:
+                self._paused_until = max(self._paused_until, now + retry_after)
+            if now - self._last_decrease >= DECREASE_INTERVAL:
+                self._last_decrease = now
+                self._limit = max(
+                    float(self.min_concurrency), self._limit * DECREASE_FACTOR
+                )
+
+    def _adjust_tokens(self, unused):
+        with self._lock:
+            now = self._clock()
+            if unused >= 0:
+                self._tokens.give(unused, now)
+            else:
+                self._tokens.take(-unused, now)
+
+    async def acquire(self, tokens=0):
+        """
+        Wait until a request may be sent.
+
+        Args:
+            tokens (int, optional): Estimated prompt plus completion tokens
+
+        Returns:
+            Permit: Must be released once the request has finished
+
+        Raises:
+            RateLimitTimeout: If the request could not start within max_wait
+        """
+        start = self._clock()
+        deadline = start + self.max_wait
+        try:
+            await self._wait_for_rate(tokens, deadline)
+            await self._acquire_slot(deadline)
+        except RateLimitTimeout:
+            with self._lock:
+                self._stats["timeouts"] += 1
+            raise
+        with self._lock:
+            self._stats["requests"] += 1
+        return Permit(self, tokens, self._clock() - start)
+
+    @contextlib.asynccontextmanager
+    async def limit_request(self, tokens=0):
+        """
+        Hold a permit for the duration of a request.
+
+        The outcome is taken from the exception leaving the block, if any.
+
+        Args:
+            tokens (int, optional): Estimated prompt plus completion tokens
+
+        Yields:
+            Permit: The permit, for recording actual token usage
+        """
+        permit = await self.acquire(tokens)
+        try:
+            yield permit
+        except BaseException as exc:
+            permit.release(exc)
+            raise
+        permit.release()
+
+    def stats(self):
+        """
+        Return limiter counters and state.
+
+        Returns:
+            dict: "requests" started, "throttled" (429 responses seen),
+            "timeouts" (callers that gave up queueing), the current "limit",
+            "in_flight" and "queued"
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["limit"] = int(self._limit)
+            stats["in_flight"] = self._in_flight
+            stats["queued"] = len(self._waiters)
+        return stats
+
+
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter():
+    """
+    Return the process-wide limiter, creating it from the environment.
+
+    Environment variables:
+        OPENROUTER_REQUESTS_PER_MINUTE: Request rate (0 for unlimited)
+        OPENROUTER_TOKENS_PER_MINUTE: Token rate (0 for unlimited)
+        OPENROUTER_MAX_CONCURRENCY: Upper bound of the adaptive limit
+        OPENROUTER_MIN_CONCURRENCY: Lower bound of the adaptive limit
+        OPENROUTER_MAX_QUEUE_WAIT: Seconds a request may queue
+
+    Returns:
+        RateLimiter: The shared limiter
+    """
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = RateLimiter(
+                requests_per_minute=env_float(
+                    "OPENROUTER_REQUESTS_PER_MINUTE", DEFAULT_REQUESTS_PER_MINUTE
+                ),
+                tokens_per_minute=env_float(
+                    "OPENROUTER_TOKENS_PER_MINUTE", DEFAULT_TOKENS_PER_MINUTE
+                ),
+                max_concurrency=env_int(
+                    "OPENROUTER_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY
+                ),
+                min_concurrency=env_int(
+                    "OPENROUTER_MIN_CONCURRENCY", DEFAULT_MIN_CONCURRENCY
+                ),
+                max_wait=env_float("OPENROUTER_MAX_QUEUE_WAIT", DEFAULT_MAX_QUEUE_WAIT),
+            )
+        return _rate_limiter
+
+
+def reset_rate_limiter():
+    """Drop the shared limiter so the next access re-reads the configuration."""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        _rate_limiter = None
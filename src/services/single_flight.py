@@ -0,0 +1,196 @@
+"""
+Single-flight coalescing of identical in-flight analyses.
+
+When several sessions analyze the same resume for the same role at the same
+time, only the first caller (the leader) sends the upstream request. The
+others wait for it and receive its result. The shared state is a
+``concurrent.futures.Future``, so callers on different event loops and
+threads can wait on the same request.
+
+Errors that belong to the leader alone, such as its own deadline running out
+or its own rate-limit queue wait, are not passed on: a waiting caller takes
+over the request instead, as when the leader is cancelled.
+"""
+
+import asyncio
+import concurrent.futures
+import threading
+
+from src.config import env_bool
+from src.services.rate_limiter import RateLimitTimeout
+from src.utils.deadline import DeadlineExceeded
+
+
+class _Abandoned(Exception):
+    """Set on a flight whose leader was cancelled; followers start over."""
+
+
+class Flight:
+    """
+    The leader's handle on an in-flight request.
+
+    Use it as a context manager around the request and call set_result()
+    once the result is known. Leaving the block with an error passes the
+    error to the waiting callers; leaving it because the leader was cancelled,
+    or with one of the registry's caller errors, lets one of them take over
+    instead.
+    """
+
+    def __init__(self, group, key, future):
+        self._group = group
+        self._key = key
+        self._future = future
+
+    def set_result(self, result):
+        """
+        Publish the result to every caller waiting on this flight.
+
+        Args:
+            result: The value the waiting callers receive
+        """
+        if not self._future.done():
+            self._future.set_result(result)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if not self._future.done():
+            if isinstance(exc, Exception) and not isinstance(
+                exc, self._group.caller_errors
+            ):
+                self._future.set_exception(exc)
+            else:
+                # Cancelled, closed generator, the leader's own timeout or no
+                # result: not an answer
+                self._future.set_exception(_Abandoned())
+        self._group._release(self._key, self._future)
+
+
+class SingleFlight:
+    """
+    Registry of in-flight requests keyed by request identity.
+
+    Attributes:
+        enabled (bool): When False every caller leads its own request
+        caller_errors (tuple): Exception types that only concern the caller
+            that raised them; a follower takes over instead of failing
+    """
+
+    def __init__(self, enabled=True, caller_errors=()):
+        self.enabled = enabled
+        self.caller_errors = tuple(caller_errors)
+        self._flights = {}
+        self._lock = threading.Lock()
+        self._stats = {"leaders": 0, "coalesced": 0}
+
+    def _join(self, key):
+        with self._lock:
+            future = self._flights.get(key)
+            if future is not None:
+                return future, False
+            future = concurrent.futures.Future()
+            if self.enabled:
+                self._flights[key] = future
+            self._stats["leaders"] += 1
+            return future, True
+
+    def _release(self, key, future):
+        with self._lock:
+            if self._flights.get(key) is future:
+                del self._flights[key]
+
+    async def acquire(self, key):
+        """
+        Lead the request for a key, or wait for the one already in flight.
+
+        Args:
+            key (str): Identity of the request (e.g. its cache key)
+
+        Returns:
+            tuple: (flight, None) when the caller leads and must send the
+            request, or (None, result) with the leader's result
+
+        Raises:
+            Exception: The error the leader's request failed with
+        """
+        while True:
+            future, leader = self._join(key)
+            if leader:
+                return Flight(self, key, future), None
+            try:
+                # Shielded so that a cancelled follower leaves the flight alone
+                result = await asyncio.shield(asyncio.wrap_future(future))
+            except _Abandoned:
+                continue
+            except Exception:
+                self._count_coalesced()
+                raise
+            self._count_coalesced()
+            return None, result
+
+    def lead(self, key):
+        """
+        Lead the request for a key unless an identical one is in flight.
+
+        Unlike acquire() this never waits, so a caller can send the requests
+        it leads together and wait for the others separately.
+
+        Args:
+            key (str): Identity of the request (e.g. its cache key)
+
+        Returns:
+            Flight or None: The flight to complete, or None if the key is
+            already in flight
+        """
+        future, leader = self._join(key)
+        return Flight(self, key, future) if leader else None
+
+    def _count_coalesced(self):
+        with self._lock:
+            self._stats["coalesced"] += 1
+
+    def stats(self):
+        """
+        Return coalescing counters.
+
+        Returns:
+            dict: "leaders" (requests actually sent), "coalesced" (callers that
+            waited on another caller's request) and "in_flight"
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_flight"] = len(self._flights)
+        return stats
+
+
+_single_flight = None
+_single_flight_lock = threading.Lock()
+
+
+def get_single_flight():
+    """
+    Return the process-wide single-flight registry for analyses.
+
+    Coalescing is on unless ANALYSIS_SINGLE_FLIGHT is set to "false". A
+    leader's DeadlineExceeded or RateLimitTimeout is not shared with its
+    followers, whose budgets may differ.
+
+    Returns:
+        SingleFlight: The shared registry
+    """
+    global _single_flight
+    with _single_flight_lock:
+        if _single_flight is None:
+            _single_flight = SingleFlight(
+                enabled=env_bool("ANALYSIS_SINGLE_FLIGHT", True),
+                caller_errors=(DeadlineExceeded, RateLimitTimeout),
+            )
+        return _single_flight
+
+
+def reset_single_flight():
+    """Drop the shared registry so the next access re-reads the configuration."""
+    global _single_flight
+    with _single_flight_lock:
+        _single_flight = None
@@ -0,0 +1,153 @@
+"""
+End-to-end time budget for one analysis request.
+
+A Deadline is created when the user starts an analysis and passed down
+through extraction and the upstream API calls. Each stage checks the
+remaining budget and fails fast with DeadlineExceeded once it is used up,
+so a pathological file or a hung connection cannot pin a session.
+"""
+
+import contextlib
+import time
+
+from src.config import env_float
+
+DEFAULT_REQUEST_TIMEOUT = 120.0
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a request runs out of its time budget."""
+
+    def __init__(self, stage, budget):
+        """
+        Args:
+            stage (str): Stage that was running when the budget ran out
+            budget (float): Total budget in seconds
+        """
+        super().__init__(
+            f"The request timed out during {stage}: "
+            f"the {budget:g}s time budget was used up."
+        )
+        self.stage = stage
+        self.budget = budget
+
+
+class Deadline:
+    """
+    A time budget measured from creation.
+
+    Attributes:
+        budget (float or None): Total seconds allowed (None for unlimited)
+        stages (dict): Seconds spent in each stage run through stage()
+    """
+
+    def __init__(self, budget, clock=time.monotonic):
+        self.budget = budget if budget and budget > 0 else None
+        self.stages = {}
+        self._clock = clock
+        self._start = clock()
+
+    @classmethod
+    def from_env(cls):
+        """
+        Create a deadline from REQUEST_TIMEOUT_SECONDS (0 means unlimited).
+
+        Returns:
+            Deadline: A deadline starting now
+        """
+        return cls(env_float("REQUEST_TIMEOUT_SECONDS", DEFAULT_REQUEST_TIMEOUT))
+
+    def elapsed(self):
+        """Return the seconds since the deadline was created."""
+        return self._clock() - self._start
+
+    def remaining(self):
+        """
+        Return the seconds left in the budget.
+
+        Returns:
+            float or None: Seconds left (never negative), or None if unlimited
+        """
+        if self.budget is None:
+            return None
+        return max(0.0, self.budget - self.elapsed())
+
+    def expired(self):
+        """Return True once the budget is used up."""
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def check(self, stage):
+        """
+        Fail if the budget is used up.
+
+        Args:
+            stage (str): Name of the running stage, for the error message
+
+        Raises:
+            DeadlineExceeded: If no time is left
+        """
+        if self.expired():
+            raise DeadlineExceeded(stage, self.budget)
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """
+        Time a stage of the request.
+
+        The stage fails up front if the budget is already used up. Its
+        duration is recorded in ``stages`` however it ends.
+
+        Args:
+            name (str): Stage name, e.g. "extraction" or "analysis"
+
+        Raises:
+            DeadlineExceeded: If no time is left when the stage starts
+        """
+        self.check(name)
+        start = self._clock()
+        try:
+            yield self
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + self._clock() - start
+
+    def report(self):
+        """
+        Describe how much of the budget each stage used.
+
+        Returns:
+            list: (stage, seconds, share) tuples in the order the stages ran;
+            share is the fraction of the budget (None if unlimited)
+        """
+        return [
+            (name, seconds, seconds / self.budget if self.budget else None)
+            for name, seconds in self.stages.items()
+        ]
+
+
+def check_deadline(deadline, stage):
+    """
+    Call deadline.check(stage) when a deadline is given.
+
+    Args:
+        deadline (Deadline or None): The request deadline
+        stage (str): Name of the running stage
+
+    Raises:
+        DeadlineExceeded: If the budget is used up
+    """
+    if deadline is not None:
+        deadline.check(stage)
+
+
+def remaining_time(deadline):
+    """
+    Return the seconds left on an optional deadline.
+
+    Args:
+        deadline (Deadline or None): The request deadline
+
+    Returns:
+        float or None: Seconds left, or None when there is no limit
+    """
+    return None if deadline is None else deadline.remaining()
@@ -0,0 +1,140 @@
+"""
+Streaming DOCX text reader.
+
+Reads ``word/document.xml`` (plus headers and footers) straight from the
+DOCX zip with an event parser instead of building the python-docx object
+model. Text is produced in document order with constant memory, and table
+rows are kept together so skills grids survive extraction.
+"""
+
+import re
+import zipfile
+from xml.etree import ElementTree
+
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+_PARAGRAPH = W_NS + "p"
+_TEXT = W_NS + "t"
+_TAB = W_NS + "tab"
+_BREAKS = (W_NS + "br", W_NS + "cr")
+_HYPHEN = W_NS + "noBreakHyphen"
+_ROW = W_NS + "tr"
+_CELL = W_NS + "tc"
+_TABLE = W_NS + "tbl"
+# Containers whose finished children are discarded while parsing
+_FLUSHED_PARENTS = (W_NS + "body", _TABLE)
+
+# Separator between the cells of a table row
+CELL_SEPARATOR = " | "
+
+_PART_NUMBER = re.compile(r"(\d+)")
+
+
+def _part_order(name):
+    match = _PART_NUMBER.search(name)
+    return int(match.group(1)) if match else 0
+
+
+def _iter_part(archive, name):
+    """
+    Yield the text of one WordprocessingML part, paragraph by paragraph.
+
+    Args:
+        archive (zipfile.ZipFile): The open DOCX archive
+        name (str): Part name inside the archive
+
+    Yields:
+        str: Paragraph text, or the cells of a table row joined together,
+        followed by a newline
+    """
+    with archive.open(name) as part:
+        paragraphs = []  # text buffers of the open (possibly nested) paragraphs
+        rows = []  # cell lists of the open (possibly nested) table rows
+        cells = []  # paragraph lists of the open table cells
+        parents = []
+
+        for event, elem in ElementTree.iterparse(part, events=("start", "end")):
+            tag = elem.tag
+            if event == "start":
+                parents.append(elem)
+                if tag == _PARAGRAPH:
+                    paragraphs.append([])
+                elif tag == _ROW:
+                    rows.append([])
+                elif tag == _CELL:
+                    cells.append([])
+                continue
+
+            parents.pop()
+            if tag == _TEXT:
+                if paragraphs and elem.text:
+                    paragraphs[-1].append(elem.text)
+            elif tag == _TAB:
+                if paragraphs:
+                    paragraphs[-1].append("\t")
+            elif tag in _BREAKS:
+                if paragraphs:
+                    paragraphs[-1].append("\n")
+            elif tag == _HYPHEN:
+                if paragraphs:
+                    paragraphs[-1].append("-")
+            elif tag == _PARAGRAPH:
+                text = "".join(paragraphs.pop())
+                if cells:
+                    cells[-1].append(text)
+                else:
+                    yield text + "\n"
+            elif tag == _CELL:
+                cell_text = " ".join(p for p in cells.pop() if p)
+                if rows:
+                    rows[-1].append(cell_text)
+            elif tag == _ROW:
+                row_text = CELL_SEPARATOR.join(c for c in rows.pop() if c)
+                if cells:
+                    # Nested table: the row becomes text of the outer cell
+                    cells[-1].append(row_text)
+                else:
+                    yield row_text + "\n"
+
+            # Drop processed paragraphs and rows so memory stays constant
+            if parents and parents[-1].tag in _FLUSHED_PARENTS:
+                parents[-1].clear()
+
+
+def iter_docx_xml_text(docx_file):
+    """
+    Stream text from a DOCX file without python-docx.
+
+    The archive and its main document part are opened eagerly, so an invalid
+    file fails here rather than part-way through iteration.
+
+    Args:
+        docx_file: A seekable file-like object containing DOCX data
+
+    Returns:
+        generator: Chunks of text (headers, body, then footers), each ending
+        with a newline
+
+    Raises:
+        zipfile.BadZipFile: If the data is not a zip archive
+        KeyError: If the archive has no word/document.xml
+    """
+    archive = zipfile.ZipFile(docx_file)
+    names = archive.namelist()
+    if "word/document.xml" not in names:
+        archive.close()
+        raise KeyError("word/document.xml")
+
+    headers = sorted(
+        (n for n in names if re.fullmatch(r"word/header\d*\.xml", n)), key=_part_order
+    )
+    footers = sorted(
+        (n for n in names if re.fullmatch(r"word/footer\d*\.xml", n)), key=_part_order
+    )
+
+    def chunks():
+        with archive:
+            for name in [*headers, "word/document.xml", *footers]:
+                yield from _iter_part(archive, name)
+
+    return chunks()
@@ -0,0 +1,137 @@
+"""
+Process-wide cache of extracted text, keyed by upload content.
+
+Streamlit re-executes the whole script on every interaction, and the same
+file is often analyzed against several job roles. Caching the extracted text
+by a hash of the file bytes lets those reruns skip PDF/DOCX parsing entirely.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+from src.config import env_int
+
+DEFAULT_MAX_CHARS = 10_000_000
+
+
+def make_extraction_key(file_content, file_type, extractor_version, *options):
+    """
+    Build a cache key for an extraction request.
+
+    Args:
+        file_content (bytes-like): Raw file data
+        file_type (str): MIME type used to pick the extractor
+        extractor_version (str): Version of the extraction logic
+        *options: Extraction parameters that affect the output (e.g. budgets)
+
+    Returns:
+        str: Cache key
+    """
+    digest = hashlib.blake2b(file_content, digest_size=16).hexdigest()
+    parts = [digest, str(file_type), extractor_version, *map(str, options)]
+    return ":".join(parts)
+
+
+class ExtractionCache:
+    """
+    Thread-safe LRU cache of extracted text bounded by total stored characters.
+    """
+
+    def __init__(self, max_chars=DEFAULT_MAX_CHARS):
+        """
+        Args:
+            max_chars (int): Upper bound on the total length of cached texts
+                (0 disables the cache)
+        """
+        self.max_chars = max_chars
+        self._entries = OrderedDict()
+        self._total_chars = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key):
+        """
+        Args:
+            key (str): Key from make_extraction_key
+
+        Returns:
+            str or None: The cached text, or None on a miss
+        """
+        with self._lock:
+            text = self._entries.get(key)
+            if text is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return text
+
+    def set(self, key, text):
+        """
+        Store extracted text, evicting least recently used entries to fit.
+
+        Texts larger than the whole cache are not stored.
+
+        Args:
+            key (str): Key from make_extraction_key
+            text (str): Extracted text
+        """
+        if not self.max_chars or len(text) > self.max_chars:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_chars -= len(previous)
+            self._entries[key] = text
+            self._total_chars += len(text)
+            while self._total_chars > self.max_chars:
+                _, evicted = self._entries.popitem(last=False)
+                self._total_chars -= len(evicted)
+                self._stats["evictions"] += 1
+
+    def clear(self):
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._total_chars = 0
+
+    def stats(self):
+        """
+        Returns:
+            dict: Hit/miss/eviction counters, entry count and stored characters
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["chars"] = self._total_chars
+        return stats
+
+
+_extraction_cache = None
+_extraction_cache_lock = threading.Lock()
+
+
+def get_extraction_cache():
+    """
+    Return the process-wide extraction cache.
+
+    Sized by EXTRACTION_CACHE_MAX_CHARS (0 disables caching).
+
+    Returns:
+        ExtractionCache: The shared cache instance
+    """
+    global _extraction_cache
+    with _extraction_cache_lock:
+        if _extraction_cache is None:
+            _extraction_cache = ExtractionCache(
+                env_int("EXTRACTION_CACHE_MAX_CHARS", DEFAULT_MAX_CHARS)
+            )
+        return _extraction_cache
+
+
+def reset_extraction_cache():
+    """Drop the shared cache so the next access re-reads the configuration."""
+    global _extraction_cache
+    with _extraction_cache_lock:
+        _extraction_cache = None
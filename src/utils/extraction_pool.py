@@ -0,0 +1,94 @@
+"""
+Shared process pool for CPU-bound text extraction.
+
+Parsing runs in worker processes so that it neither blocks the Streamlit
+script thread nor competes for the GIL with other sessions.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from src.config import env_int
+
+DEFAULT_MAX_POOL_SIZE = 4
+
+_pool = None
+_pool_lock = threading.Lock()
+_in_worker = False
+
+
+def mark_worker_process():
+    """
+    Flag the current process as an extraction worker.
+
+    Used as the pool initializer so that code running inside a worker never
+    tries to fan out into a nested pool.
+    """
+    global _in_worker
+    _in_worker = True
+
+
+def get_pool_size():
+    """
+    Return the configured number of extraction worker processes.
+
+    Controlled by EXTRACTION_POOL_SIZE; 0 disables the pool and extraction runs
+    in the calling thread.
+
+    Returns:
+        int: Number of worker processes
+    """
+    default = min(DEFAULT_MAX_POOL_SIZE, os.cpu_count() or 1)
+    return max(0, env_int("EXTRACTION_POOL_SIZE", default))
+
+
+def create_process_pool(max_workers):
+    """
+    Create a process pool suitable for extraction work.
+
+    Workers are spawned rather than forked because the app already runs
+    background threads (event loop, connection warm-up) by the time a pool is
+    needed, and forking a multi-threaded process can deadlock.
+
+    Args:
+        max_workers (int): Number of worker processes
+
+    Returns:
+        ProcessPoolExecutor: The new pool
+    """
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=mark_worker_process,
+    )
+
+
+def get_extraction_pool():
+    """
+    Return the process-wide extraction pool, creating it on first use.
+
+    Returns:
+        ProcessPoolExecutor or None: The shared pool, or None when the pool is
+        disabled or when called from inside a worker process
+    """
+    global _pool
+    if _in_worker:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            size = get_pool_size()
+            if size == 0:
+                return None
+            _pool = create_process_pool(size)
+        return _pool
+
+
+def shutdown_extraction_pool():
+    """Shut down the shared pool (used on exit and in tests)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+        _pool = None
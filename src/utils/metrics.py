@@ -0,0 +1,432 @@
+"""
+In-process latency statistics.
+
+Each model keeps a bounded window of recent latency samples per stage (time
+to first token, total time) plus event counters, so percentiles reflect
+current behaviour and memory stays constant.
+
+Pipeline stages (upload read, extraction per page, prompt build, time to
+first token, generation, render) are timed into cumulative histograms that
+are exported in the Prometheus text format, from a local HTTP endpoint
+(METRICS_PORT) and/or a file for a node_exporter textfile collector
+(METRICS_FILE).
+"""
+
+import collections
+import contextlib
+import http.server
+import logging
+import math
+import os
+import tempfile
+import threading
+import time
+
+from src.config import env_int, env_str
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW = 1000
+PERCENTILES = (50, 90, 99)
+
+# Histogram bucket upper bounds in seconds, from a single PDF page to a long
+# generation
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+)
+
+METRIC_PREFIX = "resume_analyzer"
+
+
+def percentile(sorted_samples, pct):
+    """
+    Return the nearest-rank percentile of sorted samples.
+
+    Args:
+        sorted_samples (list): Samples in ascending order (not empty)
+        pct (float): Percentile between 0 and 100
+
+    Returns:
+        float: The sample at that rank
+    """
+    rank = max(1, math.ceil(pct / 100 * len(sorted_samples)))
+    return sorted_samples[rank - 1]
+
+
+class LatencyStats:
+    """
+    Recent latency samples and event counters keyed by model.
+
+    Attributes:
+        window (int): Number of samples kept per model and stage
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        self.window = max(1, window)
+        self._samples = {}
+        self._counters = collections.defaultdict(collections.Counter)
+        self._lock = threading.Lock()
+
+    def record(self, model, stage, seconds):
+        """
+        Add a latency sample.
+
+        Args:
+            model (str): Model that produced the response
+            stage (str): What was measured, e.g. "first_token" or "total"
+            seconds (float): The latency
+        """
+        with self._lock:
+            samples = self._samples.get((model, stage))
+            if samples is None:
+                samples = collections.deque(maxlen=self.window)
+                self._samples[(model, stage)] = samples
+            samples.append(seconds)
+
+    def count(self, model, event):
+        """
+        Increment an event counter, e.g. "served", "failed" or "hedged".
+
+        Args:
+            model (str): Model the event is about
+            event (str): Counter name
+        """
+        with self._lock:
+            self._counters[model][event] += 1
+
+    def snapshot(self):
+        """
+        Return counters and latency percentiles for every model.
+
+        Returns:
+            dict: {model: {event: count, ..., stage: {"count": n, "p50": s,
+            "p90": s, "p99": s}, ...}}
+        """
+        with self._lock:
+            samples = {key: sorted(values) for key, values in self._samples.items()}
+            counters = {model: dict(c) for model, c in self._counters.items()}
+        result = {model: dict(c) for model, c in counters.items()}
+        for (model, stage), values in samples.items():
+            summary = {"count": len(values)}
+            for pct in PERCENTILES:
+                summary[f"p{pct}"] = percentile(values, pct)
+            result.setdefault(model, {})[stage] = summary
+        return result
+
+
+_latency_stats = None
+_latency_stats_lock = threading.Lock()
+
+
+def get_latency_stats():
+    """
+    Return the process-wide per-model latency statistics.
+
+    The sample window per model and stage is read from LATENCY_WINDOW.
+
+    Returns:
+        LatencyStats: The shared instance
+    """
+    global _latency_stats
+    with _latency_stats_lock:
+        if _latency_stats is None:
+            _latency_stats = LatencyStats(env_int("LATENCY_WINDOW", DEFAULT_WINDOW))
+        return _latency_stats
+
+
+def reset_latency_stats():
+    """Drop the shared statistics (used in tests)."""
+    global _latency_stats
+    with _latency_stats_lock:
+        _latency_stats = None
+
+
+class StageTimings:
+    """
+    Cumulative latency histograms and error counts per pipeline stage, plus
+    free-form event counters.
+
+    Attributes:
+        buckets (tuple): Histogram bucket upper bounds in seconds
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._histograms = {}
+        self._errors = collections.Counter()
+        self._events = collections.Counter()
+        self._lock = threading.Lock()
+
+    def observe(self, stage, seconds):
+        """
+        Add a stage duration to its histogram.
+
+        Args:
+            stage (str): Stage name, e.g. "extraction_page"
+            seconds (float): The duration
+        """
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+                self._histograms[stage] = histogram
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    histogram["counts"][i] += 1
+                    break
+            histogram["sum"] += seconds
+            histogram["count"] += 1
+
+    @contextlib.contextmanager
+    def span(self, stage):
+        """
+        Time a block as one run of a stage.
+
+        The duration is recorded however the block ends; a block that raises
+        is also counted as a stage error.
+
+        Args:
+            stage (str): Stage name
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            with self._lock:
+                self._errors[stage] += 1
+            raise
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def increment(self, event, amount=1):
+        """
+        Increment an event counter, e.g. "analysis_cached".
+
+        Args:
+            event (str): Counter name
+            amount (int): Increment
+        """
+        with self._lock:
+            self._events[event] += amount
+
+    def snapshot(self):
+        """
+        Return the histograms and counters.
+
+        Returns:
+            dict: "stages" ({stage: {"buckets": [(bound, cumulative count),
+            ...], "sum": s, "count": n, "errors": n}}) and "events"
+            ({event: count})
+        """
+        with self._lock:
+            stages = {}
+            for stage, histogram in self._histograms.items():
+                cumulative = 0
+                buckets = []
+                for bound, count in zip(self.buckets, histogram["counts"]):
+                    cumulative += count
+                    buckets.append((bound, cumulative))
+                stages[stage] = {
+                    "buckets": buckets,
+                    "sum": histogram["sum"],
+                    "count": histogram["count"],
+                    "errors": self._errors[stage],
+                }
+            return {"stages": stages, "events": dict(self._events)}
+
+
+def _label(value):
+    escaped = str(value).replace("\\", "\\\\").replace("\n", "\\n")
+    return escaped.replace('"', '\\"')
+
+
+def _number(value):
+    return f"{value:.17g}" if isinstance(value, float) else str(value)
+
+
+def render_prometheus(timings=None, latency_stats=None):
+    """
+    Render the collected metrics in the Prometheus text exposition format.
+
+    Args:
+        timings (StageTimings, optional): Defaults to get_stage_timings()
+        latency_stats (LatencyStats, optional): Defaults to
+            get_latency_stats(); its per-model event counters are included
+
+    Returns:
+        str: The exposition text
+    """
+    timings = timings or get_stage_timings()
+    latency_stats = latency_stats or get_latency_stats()
+    snapshot = timings.snapshot()
+    duration = f"{METRIC_PREFIX}_stage_duration_seconds"
+    lines = [
+        f"# HELP {duration} Time spent in each stage of an analysis.",
+        f"# TYPE {duration} histogram",
+    ]
+    for stage, histogram in sorted(snapshot["stages"].items()):
+        label = f'stage="{_label(stage)}"'
+        for bound, count in histogram["buckets"]:
+            lines.append(f'{duration}_bucket{{{label},le="{bound:g}"}} {count}')
+        lines.append(f'{duration}_bucket{{{label},le="+Inf"}} {histogram["count"]}')
+        lines.append(f"{duration}_sum{{{label}}} {_number(histogram['sum'])}")
+        lines.append(f"{duration}_count{{{label}}} {histogram['count']}")
+
+    errors = f"{METRIC_PREFIX}_stage_errors_total"
+    lines += [
+        f"# HELP {errors} Stage runs that ended with an error.",
+        f"# TYPE {errors} counter",
+    ]
+    for stage, histogram in sorted(snapshot["stages"].items()):
+        lines.append(f'{errors}{{stage="{_label(stage)}"}} {histogram["errors"]}')
+
+    events = f"{METRIC_PREFIX}_events_total"
+    lines += [f"# HELP {events} Pipeline events.", f"# TYPE {events} counter"]
+    for event, count in sorted(snapshot["events"].items()):
+        lines.append(f'{events}{{event="{_label(event)}"}} {count}')
+
+    model_events = f"{METRIC_PREFIX}_model_events_total"
+    lines += [
+        f"# HELP {model_events} Requests served, failed or hedged per model.",
+        f"# TYPE {model_events} counter",
+    ]
+    for model, stats in sorted(latency_stats.snapshot().items()):
+        for event, value in sorted(stats.items()):
+            if isinstance(value, int):
+                lines.append(
+                    f'{model_events}{{model="{_label(model)}",'
+                    f'event="{_label(event)}"}} {value}'
+                )
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics_file(path):
+    """
+    Write the exposition text to a file, atomically.
+
+    Args:
+        path (str): Destination, e.g. a node_exporter textfile collector
+            directory entry ending in ".prom"
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(render_prometheus())
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+class _MetricsHandler(http.server.BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_metrics_server(port, host="127.0.0.1"):
+    """
+    Serve the exposition text at /metrics from a daemon thread.
+
+    Args:
+        port (int): Port to listen on (0 picks a free port)
+        host (str): Interface to listen on
+
+    Returns:
+        http.server.ThreadingHTTPServer: The running server
+    """
+    server = http.server.ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(
+        target=server.serve_forever, name="metrics-server", daemon=True
+    ).start()
+    return server
+
+
+_stage_timings = None
+_metrics_server = None
+_stage_timings_lock = threading.Lock()
+
+
+def get_stage_timings():
+    """
+    Return the process-wide stage timings.
+
+    Returns:
+        StageTimings: The shared instance
+    """
+    global _stage_timings
+    with _stage_timings_lock:
+        if _stage_timings is None:
+            _stage_timings = StageTimings()
+        return _stage_timings
+
+
+def start_metrics_exporter():
+    """
+    Start the /metrics endpoint once per process if METRICS_PORT is set.
+
+    Safe to call on every Streamlit rerun. The endpoint listens on
+    METRICS_HOST (default 127.0.0.1).
+
+    Returns:
+        http.server.ThreadingHTTPServer or None: The server, if enabled
+    """
+    global _metrics_server
+    port = env_int("METRICS_PORT", 0)
+    with _stage_timings_lock:
+        if _metrics_server is None and port > 0:
+            _metrics_server = start_metrics_server(
+                port, env_str("METRICS_HOST", "127.0.0.1")
+            )
+        return _metrics_server
+
+
+def export_metrics():
+    """
+    Write the metrics to METRICS_FILE, if set (e.g. after each analysis).
+
+    The export is best-effort: a file that cannot be written is logged, never
+    raised, so it cannot fail the analysis or shutdown it runs after.
+    """
+    path = env_str("METRICS_FILE")
+    if path:
+        try:
+            write_metrics_file(path)
+        except OSError as e:
+            logger.error("Could not write metrics to %s: %s", path, e)
+
+
+def reset_stage_timings():
+    """Drop the shared stage timings and stop the endpoint (used in tests)."""
+    global _stage_timings, _metrics_server
+    with _stage_timings_lock:
+        _stage_timings = None
+        if _metrics_server is not None:
+            _metrics_server.shutdown()
+            _metrics_server.server_close()
+            _metrics_server = None
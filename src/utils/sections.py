@@ -0,0 +1,114 @@
+"""
+Splitting of resume text into its conventional sections.
+
+Resumes and academic CVs are organised under a small set of headings
+("Experience", "Education", "Publications", "Skills", ...). Splitting on them
+lets long documents be analyzed section by section.
+"""
+
+import re
+
+# Canonical section name for each recognised heading (lower case, without
+# trailing colon)
+SECTION_HEADINGS = {
+    "experience": "experience",
+    "work experience": "experience",
+    "professional experience": "experience",
+    "relevant experience": "experience",
+    "employment": "experience",
+    "employment history": "experience",
+    "work history": "experience",
+    "career history": "experience",
+    "research experience": "experience",
+    "teaching experience": "experience",
+    "education": "education",
+    "education and training": "education",
+    "academic background": "education",
+    "qualifications": "education",
+    "publications": "publications",
+    "selected publications": "publications",
+    "journal articles": "publications",
+    "conference papers": "publications",
+    "papers": "publications",
+    "presentations": "publications",
+    "talks": "publications",
+    "skills": "skills",
+    "technical skills": "skills",
+    "key skills": "skills",
+    "core competencies": "skills",
+    "competencies": "skills",
+    "languages": "skills",
+    "tools and technologies": "skills",
+    "projects": "projects",
+    "selected projects": "projects",
+    "certifications": "certifications",
+    "certificates": "certifications",
+    "licenses and certifications": "certifications",
+    "awards": "awards",
+    "honors": "awards",
+    "honours": "awards",
+    "awards and honors": "awards",
+    "grants": "awards",
+    "fellowships": "awards",
+    "summary": "summary",
+    "professional summary": "summary",
+    "profile": "summary",
+    "objective": "summary",
+    "about me": "summary",
+}
+
+# Name given to text before the first heading (name, contact details)
+PREAMBLE = "overview"
+
+# Headings are short lines; longer lines are body text
+_MAX_HEADING_LENGTH = 40
+
+_HEADING_DECORATION = re.compile(r"^[\W_]+|[\W_]+$")
+_AMPERSAND = re.compile(r"\s*&\s*")
+_SPACES = re.compile(r"\s+")
+
+
+def section_name(line):
+    """
+    Return the canonical section a heading line introduces.
+
+    Args:
+        line (str): A line of resume text
+
+    Returns:
+        str or None: Canonical section name, or None if the line is not a
+        recognised heading
+    """
+    if len(line) > _MAX_HEADING_LENGTH:
+        return None
+    key = _HEADING_DECORATION.sub("", line.strip()).lower()
+    key = _SPACES.sub(" ", _AMPERSAND.sub(" and ", key))
+    return SECTION_HEADINGS.get(key)
+
+
+def split_sections(text):
+    """
+    Split resume text into sections at recognised headings.
+
+    Each section keeps its heading line. Text before the first heading is
+    returned as the PREAMBLE section. Sections sharing a canonical name (e.g.
+    "Journal Articles" and "Conference Papers") stay separate, in document
+    order.
+
+    Args:
+        text (str): Resume text
+
+    Returns:
+        list: (name, text) tuples in document order; empty sections are
+        omitted
+    """
+    sections = []
+    name, lines = PREAMBLE, []
+    for line in text.splitlines():
+        heading = section_name(line)
+        if heading is not None:
+            sections.append((name, "\n".join(lines).strip()))
+            name, lines = heading, []
+        lines.append(line)
+    sections.append((name, "\n".join(lines).strip()))
+    return [(name, body) for name, body in sections if body]
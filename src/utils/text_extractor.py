@@ -1,80 +1,520 @@
 """
 Text extraction utilities for different file formats.
+
+pypdf and python-docx are imported on first use, so processes that never
+parse that format (the app before its first upload, extraction workers,
+DOCX-only runs) do not pay for importing them.
 """
 
+import collections
+import concurrent.futures
 import io
-from pypdf import PdfReader
-from docx import Document
+import itertools
+import math
+import mmap
+import os
+import time
+import zipfile
+
+from src.config import env_bool, env_int
+from src.utils.deadline import DeadlineExceeded, check_deadline, remaining_time
+from src.utils.docx_reader import iter_docx_xml_text
+from src.utils.extraction_cache import get_extraction_cache, make_extraction_key
+from src.utils.extraction_pool import get_extraction_pool, get_pool_size
+from src.utils.metrics import get_stage_timings
+from src.utils.text_normalizer import PAGE_BREAK, normalize_text
+from src.utils.upload import Upload, open_upload
+
+PDF_MIME_TYPE = "application/pdf"
+DOCX_MIME_TYPE = (
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+)
+TEXT_MIME_TYPE = "text/plain"
+
+# Bump whenever extraction output changes so cached texts are not reused
+EXTRACTOR_VERSION = "5"
+
+# PDFs shorter than this are parsed inline: the IPC round trip to the pool
+# costs more than extracting a page or two
+DEFAULT_PDF_POOL_MIN_PAGES = 3
+
+# Default extraction budget; far more text than a single prompt can use
+DEFAULT_MAX_CHARS = 100_000
+
+# Stage name reported when extraction runs out of time
+EXTRACTION_STAGE = "extraction"
+
+# File extensions accepted by the app, mapped to the MIME type used for dispatch
+SUPPORTED_EXTENSIONS = {
+    ".pdf": PDF_MIME_TYPE,
+    ".docx": DOCX_MIME_TYPE,
+    ".txt": TEXT_MIME_TYPE,
+}
+
+
+def limit_chunks(chunks, max_chars=None):
+    """
+    Pass chunks through until a character budget is used up.
+
+    The chunk that crosses the budget is truncated and the source iterator is
+    not advanced any further, so lazy producers stop doing work.
+
+    Args:
+        chunks: Iterable of text chunks
+        max_chars (int, optional): Character budget (None or 0 for unlimited)
+
+    Yields:
+        str: Chunks whose total length is at most max_chars
+    """
+    if not max_chars:
+        yield from chunks
+        return
+    remaining = max_chars
+    for chunk in chunks:
+        if len(chunk) >= remaining:
+            yield chunk[:remaining]
+            return
+        remaining -= len(chunk)
+        yield chunk
 
 
-def extract_text_from_pdf(pdf_file):
+def check_chunks(chunks, deadline=None):
+    """
+    Pass chunks through, checking the deadline before producing each one.
+
+    Args:
+        chunks: Iterable of text chunks
+        deadline (Deadline, optional): Request deadline
+
+    Yields:
+        str: The chunks
+
+    Raises:
+        DeadlineExceeded: If the deadline passes during extraction
+    """
+    if deadline is None:
+        yield from chunks
+        return
+    for chunk in chunks:
+        deadline.check(EXTRACTION_STAGE)
+        yield chunk
+
+
+def open_pdf(pdf_file):
+    """
+    Open a PDF with pypdf, importing it on first use.
+
+    Args:
+        pdf_file: A file-like object containing PDF data
+
+    Returns:
+        PdfReader: Reader over the document
+    """
+    from pypdf import PdfReader
+
+    return PdfReader(pdf_file)
+
+
+def iter_pdf_text(
+    pdf_file, max_chars=None, max_pages=None, deadline=None, page_breaks=False
+):
+    """
+    Lazily extract text from a PDF file, one page at a time.
+
+    Args:
+        pdf_file: A file-like object containing PDF data
+        max_chars (int, optional): Stop once this many characters are produced
+        max_pages (int, optional): Parse at most this many pages
+        deadline (Deadline, optional): Checked before each page
+        page_breaks (bool): End each page with PAGE_BREAK after its newline,
+            marking page edges for the normalizer
+
+    Yields:
+        str: Text of each non-empty page followed by a newline; each page's
+        parse time is recorded as an "extraction_page" stage
+
+    Raises:
+        DeadlineExceeded: If the deadline passes between pages
+    """
+    pdf_reader = open_pdf(pdf_file)
+    timings = get_stage_timings()
+    page_end = "\n" + PAGE_BREAK if page_breaks else "\n"
+
+    def page_chunks():
+        for page in itertools.islice(pdf_reader.pages, max_pages or None):
+            check_deadline(deadline, EXTRACTION_STAGE)
+            start = time.perf_counter()
+            page_text = page.extract_text()
+            timings.observe("extraction_page", time.perf_counter() - start)
+            if page_text:  # Only add non-empty text
+                yield page_text + page_end
+
+    yield from limit_chunks(page_chunks(), max_chars)
+
+
+def extract_text_from_pdf(
+    pdf_file, max_chars=None, max_pages=None, deadline=None, page_breaks=False
+):
     """
     Extract text from a PDF file.
 
     Args:
         pdf_file: A file-like object containing PDF data
+        max_chars (int, optional): Stop once this many characters are extracted
+        max_pages (int, optional): Parse at most this many pages
+        deadline (Deadline, optional): Checked before each page
+        page_breaks (bool): See iter_pdf_text
 
     Returns:
         str: Extracted text from the PDF
+
+    Raises:
+        DeadlineExceeded: If the deadline passes between pages
     """
-    pdf_reader = PdfReader(pdf_file)
-    text = ""
-    for page in pdf_reader.pages:
-        page_text = page.extract_text()
-        if page_text:  # Only add non-empty text
-            text += page_text + "\n"
-    return text
+    return "".join(iter_pdf_text(pdf_file, max_chars, max_pages, deadline, page_breaks))
+
+
+def _extract_pdf_page_range(pdf_source, start, stop):
+    """
+    Extract the text of pages [start, stop) of a PDF (runs in a pool worker).
+
+    Args:
+        pdf_source (bytes or str): Raw PDF data, or the path of a file holding
+            it (mapped instead of read, so workers share the page cache)
+        start (int): Index of the first page
+        stop (int): Index one past the last page
+
+    Returns:
+        list: Text of each page, in order ("" for pages without text)
+    """
+    return [text for text, _ in _extract_timed_pdf_page_range(pdf_source, start, stop)]
+
+
+def _extract_timed_pdf_page_range(pdf_source, start, stop):
+    """
+    Extract a range of PDF pages, timing each one.
+
+    Runs in the extraction pool workers, which cannot record stage timings
+    themselves; the parent records the returned durations.
+
+    Args:
+        pdf_source (bytes or str): See _extract_pdf_page_range
+        start (int): Index of the first page
+        stop (int): Index one past the last page
+
+    Returns:
+        list: (text, seconds) for each page, in order
+    """
+    if isinstance(pdf_source, str):
+        with open(pdf_source, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+                return _extract_timed_pdf_page_range(mapping, start, stop)
+    if isinstance(pdf_source, bytes):
+        pdf_source = io.BytesIO(pdf_source)
+    pdf_reader = open_pdf(pdf_source)
+    pages = []
+    for i in range(start, stop):
+        page_start = time.perf_counter()
+        text = pdf_reader.pages[i].extract_text() or ""
+        pages.append((text, time.perf_counter() - page_start))
+    return pages
+
+
+def split_page_ranges(page_count, workers, pages_per_task=0):
+    """
+    Split a document into contiguous page ranges for parallel extraction.
+
+    Args:
+        page_count (int): Number of pages in the document
+        workers (int): Number of pool workers available
+        pages_per_task (int): Fixed range size; 0 spreads pages evenly
+
+    Returns:
+        list: (start, stop) tuples covering every page in order
+    """
+    if pages_per_task <= 0:
+        pages_per_task = math.ceil(page_count / max(workers, 1))
+    pages_per_task = max(pages_per_task, 1)
+    return [
+        (start, min(start + pages_per_task, page_count))
+        for start in range(0, page_count, pages_per_task)
+    ]
+
+
+def extract_text_from_pdf_parallel(
+    pdf_data, max_chars=None, max_pages=None, deadline=None, page_breaks=False
+):
+    """
+    Extract text from a PDF using the shared process pool.
+
+    The page list is split into ranges that are extracted in parallel and
+    reassembled in order. At most one range per worker is in flight, so once
+    the character budget is reached no further ranges are submitted. Short
+    documents, or any document when the pool is disabled
+    (EXTRACTION_POOL_SIZE=0), are extracted inline. File-backed uploads are
+    passed to workers by path rather than pickled.
+
+    Environment variables:
+        PDF_POOL_MIN_PAGES: Smallest page count sent to the pool
+        PDF_PAGES_PER_TASK: Pages per pool task (0 spreads pages evenly)
+
+    Args:
+        pdf_data (Upload or bytes): Raw PDF data
+        max_chars (int, optional): Stop once this many characters are extracted
+        max_pages (int, optional): Parse at most this many pages
+        deadline (Deadline, optional): Checked between pages, and bounds the
+            wait for each pool task
+        page_breaks (bool): See iter_pdf_text
 
+    Returns:
+        str: Extracted text from the PDF
+
+    Raises:
+        DeadlineExceeded: If the deadline passes during extraction
+    """
+    upload = pdf_data if isinstance(pdf_data, Upload) else Upload.from_bytes(pdf_data)
+    pool = get_extraction_pool()
+    if pool is None:
+        return extract_text_from_pdf(
+            upload.stream(), max_chars, max_pages, deadline, page_breaks
+        )
+
+    page_count = len(open_pdf(upload.stream()).pages)
+    if max_pages:
+        page_count = min(page_count, max_pages)
+    if page_count < env_int("PDF_POOL_MIN_PAGES", DEFAULT_PDF_POOL_MIN_PAGES):
+        return extract_text_from_pdf(
+            upload.stream(), max_chars, max_pages, deadline, page_breaks
+        )
+
+    pdf_source = upload.path or upload.tobytes()
+    workers = get_pool_size()
+    timings = get_stage_timings()
+    ranges = iter(
+        split_page_ranges(page_count, workers, env_int("PDF_PAGES_PER_TASK", 0))
+    )
+    in_flight = collections.deque()
+    page_end = "\n" + PAGE_BREAK if page_breaks else "\n"
 
-def extract_text_from_docx(docx_file):
+    def page_chunks():
+        while True:
+            while len(in_flight) < workers:
+                page_range = next(ranges, None)
+                if page_range is None:
+                    break
+                in_flight.append(
+                    pool.submit(_extract_timed_pdf_page_range, pdf_source, *page_range)
+                )
+            if not in_flight:
+                return
+            try:
+                pages = in_flight.popleft().result(remaining_time(deadline))
+            except concurrent.futures.TimeoutError:
+                raise DeadlineExceeded(EXTRACTION_STAGE, deadline.budget) from None
+            for text, seconds in pages:
+                timings.observe("extraction_page", seconds)
+                if text:
+                    yield text + page_end
+
+    try:
+        return "".join(limit_chunks(page_chunks(), max_chars))
+    finally:
+        for future in in_flight:
+            future.cancel()
+
+
+def iter_docx_text(docx_file, max_chars=None, deadline=None):
+    """
+    Lazily extract text from a DOCX file, one paragraph at a time.
+
+    The document XML is streamed straight from the zip (see docx_reader), which
+    also picks up tables, headers and footers. Files that are not a readable
+    DOCX archive fall back to python-docx.
+
+    Args:
+        docx_file: A file-like object containing DOCX data
+        max_chars (int, optional): Stop once this many characters are produced
+        deadline (Deadline, optional): Checked before each paragraph
+
+    Yields:
+        str: Text of each paragraph or table row followed by a newline
+
+    Raises:
+        DeadlineExceeded: If the deadline passes during extraction
+    """
+    try:
+        chunks = iter_docx_xml_text(docx_file)
+    except (zipfile.BadZipFile, KeyError):
+        from docx import Document
+
+        docx_file.seek(0)
+        doc = Document(docx_file)
+        chunks = (paragraph.text + "\n" for paragraph in doc.paragraphs)
+    yield from limit_chunks(check_chunks(chunks, deadline), max_chars)
+
+
+def extract_text_from_docx(docx_file, max_chars=None, deadline=None):
     """
     Extract text from a DOCX file.
 
     Args:
         docx_file: A file-like object containing DOCX data
+        max_chars (int, optional): Stop once this many characters are extracted
+        deadline (Deadline, optional): Checked before each paragraph
 
     Returns:
         str: Extracted text from the DOCX
+
+    Raises:
+        DeadlineExceeded: If the deadline passes during extraction
     """
-    doc = Document(docx_file)
-    text = ""
-    for paragraph in doc.paragraphs:
-        text += paragraph.text + "\n"
-    return text
+    return "".join(iter_docx_text(docx_file, max_chars, deadline))
 
 
-def extract_text_from_file(uploaded_file):
+def extract_text_from_file(
+    uploaded_file, max_chars=None, max_pages=None, metrics=None, deadline=None
+):
     """
     Extract text from supported file formats (PDF, DOCX, TXT).
 
+    Parsing stops once the text budget is reached, so oversized uploads only
+    cost as much as the analysis will actually use. The upload is read through
+    open_upload, which enforces UPLOAD_MAX_MB before parsing starts. Unless
+    TEXT_NORMALIZATION is off, the text is then cleaned of page boilerplate
+    and formatting noise (see text_normalizer). The upload read, extraction
+    and normalization are timed as stages (see src.utils.metrics).
+
     Args:
         uploaded_file: A file object (typically from Streamlit's file_uploader)
+        max_chars (int, optional): Character budget; defaults to
+            EXTRACTION_MAX_CHARS (0 means unlimited)
+        max_pages (int, optional): PDF page budget; defaults to
+            EXTRACTION_MAX_PAGES (0 means unlimited)
+        metrics (dict, optional): Filled with "upload_bytes", "spooled",
+            "copied_bytes" and, when tracemalloc is tracing (see
+            UPLOAD_TRACE_MEMORY), "peak_memory_bytes"
+        deadline (Deadline, optional): Request deadline, checked between
+            pages and paragraphs
 
     Returns:
         str: Extracted text from the file
+
+    Raises:
+        UploadTooLargeError: If the upload exceeds the size limit
+        DeadlineExceeded: If the deadline passes during extraction
     """
-    # Get the file content
-    file_content = uploaded_file.read()
+    if max_chars is None:
+        max_chars = env_int("EXTRACTION_MAX_CHARS", DEFAULT_MAX_CHARS)
+    if max_pages is None:
+        max_pages = env_int("EXTRACTION_MAX_PAGES", 0)
+    if metrics is None:
+        metrics = {}
+    normalize = env_bool("TEXT_NORMALIZATION", True)
+    timings = get_stage_timings()
+
+    with timings.span("upload_read"):
+        upload = open_upload(uploaded_file)
+    with upload:
+        # Identical uploads (reruns, other job roles) skip parsing entirely
+        cache = get_extraction_cache()
+        cache_key = make_extraction_key(
+            upload.buffer,
+            uploaded_file.type,
+            EXTRACTOR_VERSION,
+            max_chars,
+            max_pages,
+            normalize,
+        )
+        text = cache.get(cache_key)
+        if text is None:
+            with timings.span("extraction"):
+                text = _extract_text(
+                    upload,
+                    uploaded_file.type,
+                    max_chars,
+                    max_pages,
+                    deadline,
+                    page_breaks=normalize,
+                )
+            check_deadline(deadline, EXTRACTION_STAGE)
+            if normalize:
+                with timings.span("normalization"):
+                    text = normalize_text(text)
+            cache.set(cache_key, text)
+        else:
+            timings.increment("extraction_cached")
+
+    metrics["upload_bytes"] = upload.size
+    metrics["spooled"] = upload.spooled
+    metrics["copied_bytes"] = upload.copied_bytes
+    if upload.peak_memory_bytes is not None:
+        metrics["peak_memory_bytes"] = upload.peak_memory_bytes
+    return text
 
-    # Reset the file pointer for potential reuse
-    if hasattr(uploaded_file, 'seek'):
-        uploaded_file.seek(0)
 
+def _extract_text(
+    upload, file_type, max_chars, max_pages, deadline=None, page_breaks=False
+):
+    """
+    Dispatch raw file data to the extractor for its type.
+
+    Args:
+        upload (Upload): The file data
+        file_type (str): MIME type of the upload
+        max_chars (int): Character budget (0 means unlimited)
+        max_pages (int): PDF page budget (0 means unlimited)
+        deadline (Deadline, optional): Request deadline
+        page_breaks (bool): Mark PDF page edges with PAGE_BREAK for the
+            normalizer
+
+    Returns:
+        str: Extracted text
+    """
     # Handle different file types
-    if uploaded_file.type == "application/pdf":
-        pdf_file = io.BytesIO(file_content)
-        return extract_text_from_pdf(pdf_file)
+    if file_type == PDF_MIME_TYPE:
+        return extract_text_from_pdf_parallel(
+            upload, max_chars, max_pages, deadline, page_breaks
+        )
 
-    elif (
-        uploaded_file.type
-        == "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-    ):
-        return extract_text_from_docx(io.BytesIO(file_content))
+    elif file_type == DOCX_MIME_TYPE:
+        return extract_text_from_docx(upload.stream(), max_chars, deadline)
 
     # Default case: assume it's a text file
     try:
-        return file_content.decode("utf-8")
+        return "".join(limit_chunks([str(upload.buffer, "utf-8")], max_chars))
     except UnicodeDecodeError:
         return (
             "Could not decode the file. Please upload a valid text, PDF, or DOCX file."
         )
+
+
+class LocalFile:
+    """
+    Minimal stand-in for a Streamlit upload backed by a file on disk.
+
+    Exposes the ``name``, ``type``, ``size``, ``read`` and ``seek`` members
+    that extract_text_from_file relies on, so headless tools can reuse it.
+    Large files are mapped from ``path`` instead of being read.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Path to a PDF, DOCX or TXT file
+        """
+        self.path = path
+        self.name = os.path.basename(path)
+        extension = os.path.splitext(path)[1].lower()
+        self.type = SUPPORTED_EXTENSIONS.get(extension, TEXT_MIME_TYPE)
+        self.size = os.path.getsize(path)
+        self._position = 0
+
+    def read(self):
+        with open(self.path, "rb") as f:
+            f.seek(self._position)
+            data = f.read()
+        self._position += len(data)
+        return data
+
+    def seek(self, position):
+        self._position = position
@@ -0,0 +1,158 @@
+"""
+Normalization of extracted resume text before it is sent for analysis.
+
+Everything in the extracted text is paid for as prompt tokens, including the
+parts that carry no information: the name and phone number repeated at the
+top of every page, "Page 3 of 5" footers, words split across lines by
+hyphenation, bullet glyphs from symbol fonts and runs of whitespace. This
+stage removes them with a handful of precompiled regular expressions so it
+costs only microseconds per page.
+"""
+
+import math
+import re
+from collections import Counter
+
+# Page separator emitted by the PDF extractor
+PAGE_BREAK = "\f"
+
+_PAGE_SEPARATOR = "\n" + PAGE_BREAK + "\n"
+
+# Lines within this distance of a page's top or bottom may be boilerplate
+EDGE_LINES = 3
+# A header/footer line must recur on at least this share of the pages
+MIN_PAGE_SHARE = 0.5
+
+_BULLET_GLYPHS = (
+    "[\u2022\u2023\u2043\u2219\u25aa\u25ab\u25cf\u25cb\u25e6\u25a0\u25a1"
+    "\u25ba\u27a2\u2713\u2714\u2013\u00b7\uf0a7\uf0b7\uf0d8\uf076*]+"
+)
+
+# Soft hyphen, zero-width characters, BOM and the replacement character
+_INVISIBLE = re.compile("[\u00ad\u200b-\u200d\u2060\ufeff\ufffd]")
+# Horizontal whitespace other than a plain space
+_OTHER_SPACE = "\t\v\u00a0\u2000-\u200a\u202f\u3000"
+# The whitespace patterns only match text that actually changes
+_OTHER_SPACE_RUN = re.compile(f"[{_OTHER_SPACE}][ {_OTHER_SPACE}]*")
+_SPACE_RUN = re.compile("  +")
+# Bullet glyphs, including the private-use code points of Symbol/Wingdings;
+# the group is set when nothing follows the glyphs
+_BULLET = re.compile(f"^{_BULLET_GLYPHS} ?($)?", re.MULTILINE)
+# Matched against whole lines at the top and bottom of PDF pages only: a bare
+# number elsewhere (or in DOCX/TXT) is more likely a count than a page number
+_PAGE_NUMBER = re.compile(
+    r"(?:page ?)?[-–— ]*\d{1,3}(?: ?(?:of|/) ?\d{1,3})?[-–— ]*", re.IGNORECASE
+)
+# Starts with a literal so the engine can scan for candidates quickly; a letter
+# must precede the hyphen so that ranges like "2019-\npresent" are kept
+_HYPHENATED = re.compile(r"-(?<=[^\W\d_]-)\n(?=[a-z])")
+_BLANK_LINES = re.compile("\n\n\n+")
+_PAGE_REFERENCE = re.compile(r"\bpage\s*\d|\b\d{1,3}\s*(?:of|/)\s*\d{1,3}\b")
+_DIGITS = re.compile(r"\d+")
+
+
+def _replace_bullet(match):
+    # Bullets with no text after them are dropped
+    return "" if match.group(1) is not None else "- "
+
+
+def _line_key(line):
+    """Identity of a line for boilerplate detection."""
+    key = line.lower()
+    # "Jane Doe - Page 2 of 5" differs on every page only by its numbers
+    if _PAGE_REFERENCE.search(key):
+        key = _DIGITS.sub("#", key)
+    return key
+
+
+def _edges(lines):
+    """Indexes of the non-blank lines nearest the top and bottom of a page."""
+    indexes = [i for i, line in enumerate(lines) if line]
+    return set(indexes[:EDGE_LINES] + indexes[-EDGE_LINES:])
+
+
+def _drop_page_numbers(lines):
+    """Blank out bare page numbers on the first and last lines of a page."""
+    indexes = [i for i, line in enumerate(lines) if line]
+    for i in {indexes[0], indexes[-1]} if indexes else ():
+        if _PAGE_NUMBER.fullmatch(lines[i]):
+            lines[i] = None
+
+
+def _boilerplate_keys(pages):
+    """Keys of lines that recur at the edges of most pages."""
+    if len(pages) < 2:
+        return set()
+    counts = Counter()
+    for lines in pages:
+        counts.update({_line_key(lines[i]) for i in _edges(lines)})
+    threshold = max(2, math.ceil(len(pages) * MIN_PAGE_SHARE))
+    return {key for key, count in counts.items() if count >= threshold}
+
+
+def normalize_text(text):
+    """
+    Remove repeated page boilerplate and formatting noise from extracted text.
+
+    Pages are separated by PAGE_BREAK. A line near the top or bottom of a page
+    that recurs on at least half of the pages is a header or footer: its first
+    occurrence is kept (it often holds contact details) and the rest are
+    dropped, as are bare page numbers ("3", "Page 3 of 5", "- 3 -") on the
+    first or last line of a page. Text without page breaks (DOCX, TXT) has no
+    page edges, so neither pass applies to it. Words hyphenated across line breaks are rejoined, bullet glyphs
+    become "- ", invisible characters are removed and whitespace is collapsed.
+
+    Args:
+        text (str): Extracted text
+
+    Returns:
+        str: Normalized text, ending with a newline if the input did
+    """
+    # Whole-text passes, each skipped when a substring check shows there is
+    # nothing to do: even a regex that matches nothing costs tens of
+    # microseconds per page
+    normalized = text
+    ascii_only = normalized.isascii()
+    if not ascii_only:
+        normalized = _INVISIBLE.sub("", normalized)
+    if not ascii_only or "\t" in normalized or "\v" in normalized:
+        normalized = _OTHER_SPACE_RUN.sub(" ", normalized)
+    if "  " in normalized:
+        normalized = _SPACE_RUN.sub(" ", normalized)
+    # Give page breaks lines of their own so that ^ and $ see page edges
+    normalized = normalized.replace(PAGE_BREAK, "\n" + PAGE_BREAK + "\n")
+    # Runs are single spaces by now, so one replace removes the padding
+    normalized = normalized.replace(" \n", "\n").replace("\n ", "\n")
+    if not ascii_only or "*" in normalized:
+        normalized = _BULLET.sub(_replace_bullet, normalized)
+
+    pages = [page.split("\n") for page in normalized.split(_PAGE_SEPARATOR)]
+    if len(pages) > 1:
+        for lines in pages:
+            _drop_page_numbers(lines)
+    boilerplate = _boilerplate_keys(pages)
+    if boilerplate:
+        seen = set()
+        for lines in pages:
+            for i in sorted(_edges(lines)):
+                key = _line_key(lines[i])
+                if key in boilerplate:
+                    if key in seen:
+                        lines[i] = None
+                    seen.add(key)
+
+    # A page break is not a paragraph break: join pages with a single newline
+    page_texts = (
+        "\n".join(line for line in lines if line is not None).strip("\n")
+        for lines in pages
+    )
+    normalized = "\n".join(page for page in page_texts if page)
+    if "-\n" in normalized:
+        normalized = _HYPHENATED.sub("", normalized)
+    if "\n\n\n" in normalized:
+        normalized = _BLANK_LINES.sub("\n\n", normalized)
+    normalized = normalized.strip()
+    # Keep the line terminator of extractor output
+    if normalized and text.rstrip(PAGE_BREAK).endswith("\n"):
+        normalized += "\n"
+    return normalized
@@ -3,56 +3,121 @@ UI utilities for the Resume Analyzer application.
 Contains functions for styling and UI setup.
 """
 
+import base64
+import functools
 import os
+
 import streamlit as st
 
+STATIC_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static"
+)
+STYLES_PATH = os.path.join(STATIC_DIR, "styles.css")
+LOGO_PATH = os.path.join(STATIC_DIR, "logo.png")
+
+# Animated gradient background for the whole app
+GRADIENT_CSS = """
+.stApp {
+    background: linear-gradient(135deg, #4361ee, #3a0ca3, #4cc9f0);
+    background-size: 400% 400%;
+    animation: gradientBG 15s ease infinite;
+}
+"""
+
+# Spinner in the app's colours
+SPINNER_CSS = """
+.stSpinner > div {
+    border-top-color: #4361ee !important;
+    border-right-color: #4cc9f0 !important;
+    border-bottom-color: #3a0ca3 !important;
+    border-left-color: rgba(255, 255, 255, 0.2) !important;
+}
+"""
+
+HEADER_HTML = """
+<div class="main-header">
+    <h1>📃 AI Resume Analyzer</h1>
+    <p>Upload your resume and get AI-powered feedback tailored to your needs!</p>
+</div>
+"""
+
+SIDEBAR_MARKDOWN = """
+---
+### About
+This tool uses AI to analyze your resume and provide actionable feedback to help you improve it.
+
+Powered by Google Gemini 2.0 Flash via OpenRouter.
+
+---
+### Features
+- 📄 Supports PDF, DOCX, and TXT formats
+- 🎯 Job-specific analysis
+- 🤖 AI-powered feedback
+- 📊 Comprehensive insights
+- 🔒 Privacy-focused
 
-def set_gradient_background():
+---
+### Need Help?
+[Documentation](https://github.com/RYZHAIEV-SERHII/resume-analyzer) | [Report Issues](https://github.com/RYZHAIEV-SERHII/resume-analyzer/issues)
+"""
+
+FOOTER_HTML = """
+<div class="footer">
+    <p>Made with ❤️ by <a href="https://github.com/RYZHAIEV-SERHII" target="_blank">Serhii Ryzhaiev</a></p>
+    <p>Powered by <a href="https://streamlit.io" target="_blank">Streamlit</a> and
+    <a href="https://openrouter.ai" target="_blank">OpenRouter</a> (Gemini 2.0)</p>
+    <p><a href="https://github.com/RYZHAIEV-SERHII/resume-analyzer" target="_blank">GitHub Repository</a></p>
+</div>
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def read_static_file(path):
     """
-    Set a gradient background for the Streamlit app.
+    Read a static asset, from disk only the first time in the process.
+
+    Args:
+        path (str): Path to the asset
+
+    Returns:
+        bytes: The file contents
     """
-    st.markdown(
-        """
-        <style>
-        .stApp {
-            background: linear-gradient(135deg, #4361ee, #3a0ca3, #4cc9f0);
-            background-size: 400% 400%;
-            animation: gradientBG 15s ease infinite;
-        }
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
+    with open(path, "rb") as f:
+        return f.read()
 
 
-def load_css_file(file_name):
+@functools.lru_cache(maxsize=None)
+def logo_data_url():
     """
-    Load and apply a CSS file.
+    Embed the bundled logo in a data URL, built once per process.
 
-    Args:
-        file_name (str): Path to the CSS file
+    Streamlit passes URLs through untouched, whereas image bytes are decoded,
+    resized and re-encoded with Pillow on every rerun, and the browser needs
+    no extra request for an embedded image.
+
+    Returns:
+        str: A data:image/png URL
     """
-    with open(file_name) as f:
-        st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+    encoded = base64.b64encode(read_static_file(LOGO_PATH)).decode("ascii")
+    return f"data:image/png;base64,{encoded}"
 
 
-def setup_custom_spinner():
+@functools.lru_cache(maxsize=None)
+def page_style():
     """
-    Set up a custom spinner animation.
+    Build the app's stylesheet once per process.
+
+    Streamlit drops elements a rerun does not emit again, so the styles are
+    still sent on every rerun, but as one element built from cached strings
+    instead of three, one of them re-read from disk each time.
+
+    Returns:
+        str: A <style> block with the gradient, spinner and styles.css rules
     """
-    st.markdown(
-        """
-        <style>
-        .stSpinner > div {
-            border-top-color: #4361ee !important;
-            border-right-color: #4cc9f0 !important;
-            border-bottom-color: #3a0ca3 !important;
-            border-left-color: rgba(255, 255, 255, 0.2) !important;
-        }
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
+    rules = [GRADIENT_CSS, SPINNER_CSS]
+    if os.path.exists(STYLES_PATH):
+        rules.append(read_static_file(STYLES_PATH).decode("utf-8"))
+    return f"<style>{''.join(rules)}</style>"
 
 
 def setup_page_config():
@@ -87,20 +152,27 @@ def setup_ui():
     # Set up page config
     setup_page_config()
 
-    # Set gradient background
-    set_gradient_background()
-
-    # Set up custom spinner
-    setup_custom_spinner()
-
-    # Load custom CSS
-    if os.path.exists("src/static/styles.css"):
-        load_css_file("src/static/styles.css")
+    # Gradient background, custom spinner and styles.css in one cached block
+    st.markdown(page_style(), unsafe_allow_html=True)
 
     # Setup sidebar
     setup_sidebar()
 
 
+def show_header():
+    """
+    Show the page header.
+    """
+    st.markdown(HEADER_HTML, unsafe_allow_html=True)
+
+
+def show_footer():
+    """
+    Show the page footer.
+    """
+    st.markdown(FOOTER_HTML, unsafe_allow_html=True)
+
+
 def setup_sidebar():
     """
     Set up the sidebar for the Streamlit app.
@@ -109,29 +181,8 @@ def setup_sidebar():
     sidebar = st.sidebar
 
     # Add logo and title
-    sidebar.image("https://img.icons8.com/fluency/96/resume.png", width=80)
+    sidebar.image(logo_data_url(), width=80)
     sidebar.title("Resume Analyzer")
 
-    sidebar.markdown("---")
-    sidebar.markdown("### About")
-    sidebar.markdown("""
-    This tool uses AI to analyze your resume and provide actionable feedback to help you improve it.
-
-    Powered by Google Gemini 2.0 Flash via OpenRouter.
-    """)
-
-    sidebar.markdown("---")
-    sidebar.markdown("### Features")
-    sidebar.markdown("""
-    - 📄 Supports PDF, DOCX, and TXT formats
-    - 🎯 Job-specific analysis
-    - 🤖 AI-powered feedback
-    - 📊 Comprehensive insights
-    - 🔒 Privacy-focused
-    """)
-
-    sidebar.markdown("---")
-    sidebar.markdown("### Need Help?")
-    sidebar.markdown(
-        "[Documentation](https://github.com/RYZHAIEV-SERHII/resume-analyzer) | [Report Issues](https://github.com/RYZHAIEV-SERHII/resume-analyzer/issues)"
-    )
+    # About, features and help links as one element
+    sidebar.markdown(SIDEBAR_MARKDOWN)
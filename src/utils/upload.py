@@ -0,0 +1,329 @@
+"""
+Upload ingestion: size limits, zero-copy buffers and spooling to disk.
+
+Streamlit hands uploads over as in-memory ``BytesIO`` objects. Reading them
+with ``read()`` and wrapping the result in another ``BytesIO`` costs two extra
+copies per upload. ``open_upload`` instead exposes the upload through a
+memoryview of its existing buffer. Large uploads are spooled to a temporary
+file that is read through mmap, which keeps them out of the Python heap and
+lets extraction workers map the same file instead of each receiving a
+pickled copy.
+"""
+
+import io
+import mmap
+import os
+import tempfile
+import tracemalloc
+
+from src.config import env_bool, env_float
+
+DEFAULT_MAX_UPLOAD_MB = 10.0
+DEFAULT_SPOOL_THRESHOLD_MB = 2.0
+
+_MB = 1024 * 1024
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds the configured maximum size."""
+
+    def __init__(self, size, max_bytes):
+        """
+        Args:
+            size (int): Size of the upload in bytes
+            max_bytes (int): Configured limit in bytes
+        """
+        super().__init__(
+            f"File is too large ({size / _MB:.1f} MB); "
+            f"the maximum upload size is {max_bytes / _MB:.1f} MB."
+        )
+        self.size = size
+        self.max_bytes = max_bytes
+
+
+class BufferedUpload(io.BytesIO):
+    """
+    An upload's bytes, detached from the script run that received them.
+
+    Background jobs outlive the Streamlit rerun that submitted them, so they
+    hold one of these instead of the session's UploadedFile. Built from an
+    in-memory upload it shares the upload's bytes object instead of copying.
+
+    Attributes:
+        name (str): Original file name
+        type (str): MIME type reported by the uploader
+        size (int): Length of the data in bytes
+    """
+
+    def __init__(self, data, name=None, type=None):
+        """
+        Args:
+            data (bytes): File contents
+            name (str, optional): Original file name
+            type (str, optional): MIME type
+        """
+        super().__init__(data)
+        self.name = name
+        self.type = type
+        self.size = len(data)
+
+    @classmethod
+    def from_upload(cls, uploaded_file):
+        """
+        Capture a Streamlit upload or other file-like object.
+
+        Args:
+            uploaded_file: The upload to capture
+
+        Returns:
+            BufferedUpload: A copy of the upload that is safe to hand to
+            another thread
+        """
+        if isinstance(uploaded_file, io.BytesIO):
+            data = uploaded_file.getvalue()
+        else:
+            data = uploaded_file.read()
+            if hasattr(uploaded_file, "seek"):
+                uploaded_file.seek(0)
+        return cls(
+            data,
+            name=getattr(uploaded_file, "name", None),
+            type=getattr(uploaded_file, "type", None),
+        )
+
+
+def get_max_upload_bytes():
+    """
+    Return the largest accepted upload size.
+
+    Controlled by UPLOAD_MAX_MB (0 means unlimited).
+
+    Returns:
+        int: Limit in bytes (0 for no limit)
+    """
+    return int(max(0.0, env_float("UPLOAD_MAX_MB", DEFAULT_MAX_UPLOAD_MB)) * _MB)
+
+
+def get_spool_threshold_bytes():
+    """
+    Return the size above which uploads are spooled to a temporary file.
+
+    Controlled by UPLOAD_SPOOL_MB (0 disables spooling).
+
+    Returns:
+        int: Threshold in bytes (0 when spooling is disabled)
+    """
+    threshold = env_float("UPLOAD_SPOOL_MB", DEFAULT_SPOOL_THRESHOLD_MB)
+    return int(max(0.0, threshold) * _MB)
+
+
+def upload_size(uploaded_file):
+    """
+    Determine the size of an upload without reading it.
+
+    Args:
+        uploaded_file: A Streamlit upload, LocalFile or other file-like object
+
+    Returns:
+        int or None: Size in bytes, or None if it cannot be known up front
+    """
+    size = getattr(uploaded_file, "size", None)
+    if isinstance(size, int):
+        return size
+    if isinstance(uploaded_file, io.BytesIO):
+        with uploaded_file.getbuffer() as view:
+            return view.nbytes
+    return None
+
+
+def _check_size(size, max_bytes):
+    if max_bytes and size > max_bytes:
+        raise UploadTooLargeError(size, max_bytes)
+
+
+class Upload:
+    """
+    Read-only access to the bytes of an upload, valid until close().
+
+    Attributes:
+        buffer (memoryview): The upload's bytes
+        size (int): Length of the data in bytes
+        path (str or None): File holding the same bytes, when file-backed
+        spooled (bool): Whether the data was copied to a temporary file
+        copied_bytes (int): Bytes copied into the Python heap to build the view
+        peak_memory_bytes (int or None): Peak traced allocation while the
+            upload was open (only when tracemalloc is tracing)
+    """
+
+    def __init__(
+        self,
+        buffer,
+        stream,
+        path=None,
+        spooled=False,
+        copied_bytes=0,
+        data=None,
+        on_close=(),
+    ):
+        self.buffer = buffer
+        self.size = buffer.nbytes
+        self.path = path
+        self.spooled = spooled
+        self.copied_bytes = copied_bytes
+        self.peak_memory_bytes = None
+        self._stream = stream
+        self._data = data
+        self._on_close = list(on_close)
+        self._memory_baseline = None
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            self._memory_baseline = tracemalloc.get_traced_memory()[0]
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Wrap bytes that are already in memory.
+
+        Args:
+            data (bytes): File contents
+
+        Returns:
+            Upload: A view over the bytes (no copy is made)
+        """
+        return cls(memoryview(data), io.BytesIO(data), data=data)
+
+    def stream(self):
+        """
+        Return a seekable binary stream over the data, rewound to the start.
+
+        The stream shares memory with the upload, so parsers read it without
+        another copy. It is shared between calls and must not be closed.
+
+        Returns:
+            file-like: The stream
+        """
+        self._stream.seek(0)
+        return self._stream
+
+    def tobytes(self):
+        """
+        Returns:
+            bytes: The data as a bytes object (copied only if not already bytes)
+        """
+        if isinstance(self._data, bytes):
+            return self._data
+        return self.buffer.tobytes()
+
+    def close(self):
+        """Release the buffer and remove any temporary file."""
+        if self._memory_baseline is not None and tracemalloc.is_tracing():
+            peak = tracemalloc.get_traced_memory()[1]
+            self.peak_memory_bytes = max(0, peak - self._memory_baseline)
+            self._memory_baseline = None
+        self.buffer.release()
+        for callback in reversed(self._on_close):
+            callback()
+        self._on_close = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _map_file(path, **kwargs):
+    """Open a file read-only through mmap and wrap it in an Upload."""
+    f = open(path, "rb")
+    try:
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except BaseException:
+        f.close()
+        raise
+    return Upload(
+        memoryview(mapping),
+        mapping,
+        path=path,
+        on_close=[f.close, mapping.close],
+        **kwargs,
+    )
+
+
+def _spool(view):
+    """Copy a buffer to a temporary file and map it back in."""
+    fd, path = tempfile.mkstemp(prefix="resume-upload-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(view)
+        upload = _map_file(path, spooled=True)
+    except BaseException:
+        os.unlink(path)
+        raise
+    upload._on_close.insert(0, lambda: os.unlink(path))
+    return upload
+
+
+def open_upload(uploaded_file, max_bytes=None, spool_threshold=None):
+    """
+    Give extractors access to an upload's bytes with as few copies as possible.
+
+    The size limit is checked before anything is read whenever the size is
+    known up front (Streamlit uploads, in-memory buffers, local files).
+
+    - In-memory buffers (Streamlit's UploadedFile is a BytesIO) are exposed
+      through a memoryview of their existing storage.
+    - Files on disk (LocalFile) are mapped directly.
+    - Anything at or above the spool threshold is backed by a file read
+      through mmap; in-memory buffers are spooled to a temporary file.
+    - Other file-like objects are read once.
+
+    Args:
+        uploaded_file: A Streamlit upload, LocalFile or other file-like object
+        max_bytes (int, optional): Size limit; defaults to UPLOAD_MAX_MB
+            (0 means unlimited)
+        spool_threshold (int, optional): Spooling threshold; defaults to
+            UPLOAD_SPOOL_MB (0 disables spooling)
+
+    Returns:
+        Upload: The upload's data; close it (or use it as a context manager)
+        once extraction is done
+
+    Raises:
+        UploadTooLargeError: If the upload is larger than max_bytes
+    """
+    if max_bytes is None:
+        max_bytes = get_max_upload_bytes()
+    if spool_threshold is None:
+        spool_threshold = get_spool_threshold_bytes()
+    if env_bool("UPLOAD_TRACE_MEMORY", False) and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+    size = upload_size(uploaded_file)
+    if size is not None:
+        _check_size(size, max_bytes)
+    spool = bool(spool_threshold) and size is not None and size >= spool_threshold
+
+    path = getattr(uploaded_file, "path", None)
+    if spool and isinstance(path, str):
+        return _map_file(path)
+
+    if isinstance(uploaded_file, io.BytesIO):
+        view = uploaded_file.getbuffer()
+        if spool:
+            try:
+                return _spool(view)
+            finally:
+                view.release()
+        return Upload(view, uploaded_file)
+
+    # Get the file content
+    data = uploaded_file.read()
+
+    # Reset the file pointer for potential reuse
+    if hasattr(uploaded_file, "seek"):
+        uploaded_file.seek(0)
+
+    _check_size(len(data), max_bytes)
+    upload = Upload.from_bytes(data)
+    upload.copied_bytes = len(data)
+    return upload
@@ -0,0 +1,90 @@
+"""
+Tests for the extractor benchmark suite and its regression gate.
+"""
+
+import pytest
+
+from benchmarks.bench_extractors import (
+    DEFAULT_SIZES,
+    compare,
+    load_baselines,
+    main,
+    run_suite,
+    save_baselines,
+)
+
+
+def _result(seconds, peak_bytes=1_000_000):
+    return {"seconds": seconds, "peak_bytes": peak_bytes}
+
+
+class TestRegressionGate:
+    def test_slowdown_past_threshold_regresses(self):
+        """Test that only increases beyond the threshold are reported."""
+        baselines = {"a": _result(1.0), "b": _result(1.0)}
+        results = {"a": _result(1.2), "b": _result(1.3)}
+
+        assert compare(results, baselines, threshold=0.25) == [
+            ("b", "seconds", 1.3, 1.0)
+        ]
+
+    def test_memory_growth_regresses(self):
+        """Test that peak memory is gated like time."""
+        regressions = compare(
+            {"a": _result(1.0, 4_000_000)}, {"a": _result(1.0, 2_000_000)}
+        )
+        assert regressions == [("a", "peak_bytes", 4_000_000, 2_000_000)]
+
+    def test_noise_on_tiny_cases_is_ignored(self):
+        """Test the absolute floor under the relative threshold."""
+        results = {"a": _result(0.002, 30_000)}
+        baselines = {"a": _result(0.001, 10_000)}
+        assert compare(results, baselines) == []
+
+    def test_cases_without_baseline_are_skipped(self):
+        """Test that new cases do not fail the run."""
+        assert compare({"new": _result(5.0)}, {}) == []
+
+
+class TestSuite:
+    @pytest.fixture(autouse=True)
+    def restore_environment(self, monkeypatch):
+        """Undo the extraction settings run_suite applies for its run."""
+        monkeypatch.setenv("EXTRACTION_CACHE_MAX_CHARS", "0")
+        monkeypatch.setenv("EXTRACTION_POOL_SIZE", "0")
+
+    def test_suite_measures_every_extractor(self):
+        """Test the generated cases and their measurements."""
+        results = run_suite(sizes=[1], repeat=1)
+
+        assert list(results) == [
+            "extract_text_from_pdf[1p]",
+            "extract_text_from_docx[1p]",
+            "extract_text_from_file[pdf,1p]",
+            "extract_text_from_file[docx,1p]",
+            "extract_text_from_file[txt,1p]",
+        ]
+        for result in results.values():
+            assert result["seconds"] > 0
+            assert result["peak_bytes"] > 0
+
+    def test_committed_baselines_cover_the_default_sizes(self):
+        """Test that the stored baselines match the suite's cases."""
+        baselines = load_baselines()
+        for pages in DEFAULT_SIZES:
+            assert f"extract_text_from_pdf[{pages}p]" in baselines
+            assert f"extract_text_from_file[txt,{pages}p]" in baselines
+
+    def test_main_fails_on_regression(self, tmp_path, capsys, monkeypatch):
+        """Test the exit status against an impossibly fast baseline."""
+        monkeypatch.setattr("benchmarks.bench_extractors.MIN_SECONDS_DELTA", 0)
+        path = str(tmp_path / "baseline.json")
+        main(["--sizes", "1", "--repeat", "1", "--baseline", path, "--update"])
+        assert load_baselines(path)["extract_text_from_pdf[1p]"]["seconds"] > 0
+
+        save_baselines({"extract_text_from_pdf[1p]": _result(1e-9, 1)}, path)
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--sizes", "1", "--repeat", "1", "--baseline", path])
+
+        assert exc_info.value.code == 1
+        assert "REGRESSION extract_text_from_pdf[1p]" in capsys.readouterr().err
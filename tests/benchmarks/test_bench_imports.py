@@ -0,0 +1,112 @@
+"""
+Tests for the import-time benchmark and its regression gate.
+"""
+
+import pytest
+
+from benchmarks.bench_imports import (
+    DEFAULT_MODULES,
+    compare,
+    load_baselines,
+    main,
+    measure,
+    parse_importtime,
+    profile_import,
+    save_baselines,
+)
+
+REPORT = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 | site
+import time:        10 |         10 | src
+import time:        20 |         20 |     pypdf._crypt
+import time:        30 |         50 |   pypdf
+import time:         5 |          5 |   json
+import time:        40 |         95 | src.reader
+"""
+
+
+def _result(seconds, modules=100, deferred=()):
+    return {
+        "seconds": seconds,
+        "modules": modules,
+        "imports": {},
+        "deferred": list(deferred),
+    }
+
+
+class TestReport:
+    def test_parse_importtime(self):
+        """Test that names, nesting and timings are read from the report."""
+        entries = parse_importtime(REPORT + "Traceback noise\n")
+
+        assert entries[0] == ("site", 0, 100, 100)
+        assert entries[2] == ("pypdf._crypt", 2, 20, 20)
+        assert entries[-1] == ("src.reader", 0, 40, 95)
+
+    def test_profile_counts_the_module_and_its_parents_only(self):
+        """Test that interpreter startup is excluded from the profile."""
+        profile = profile_import(parse_importtime(REPORT), "src.reader")
+
+        assert profile["seconds"] == pytest.approx(105e-6)
+        assert profile["modules"] == 5
+        assert profile["imports"] == {"pypdf": 50e-6, "json": 5e-6}
+        assert profile["deferred"] == ["pypdf"]
+
+    def test_profile_of_a_module_that_was_not_imported(self):
+        """Test that a missing module is an error rather than a zero."""
+        with pytest.raises(ValueError):
+            profile_import(parse_importtime(REPORT), "main")
+
+
+class TestRegressionGate:
+    def test_slowdown_past_threshold_regresses(self):
+        """Test that only increases beyond the threshold are reported."""
+        baselines = {"a": _result(0.2), "b": _result(0.2)}
+        results = {"a": _result(0.24), "b": _result(0.3, modules=200)}
+
+        assert compare(results, baselines, threshold=0.25) == [
+            ("b", "seconds", 0.3, 0.2),
+            ("b", "modules", 200, 100),
+        ]
+
+    def test_noise_is_ignored(self):
+        """Test the absolute floors under the relative threshold."""
+        results = {"a": _result(0.02, modules=6)}
+        baselines = {"a": _result(0.01, modules=3)}
+        assert compare(results, baselines) == []
+
+    def test_deferred_package_regresses_without_baseline(self):
+        """Test that eagerly importing a deferred package always fails."""
+        results = {"new": _result(0.1, deferred=["openai"])}
+        assert compare(results, {}) == [("new", "imports openai", 1, 0)]
+
+
+class TestSuite:
+    def test_entry_points_defer_heavy_packages(self):
+        """Test that no entry point imports a parser or the SDK at startup."""
+        for module in DEFAULT_MODULES:
+            result = measure(module, repeat=1)
+            assert result["deferred"] == [], module
+            assert result["seconds"] > 0
+
+    def test_committed_baselines_cover_the_entry_points(self):
+        """Test that the stored baselines match the suite's modules."""
+        baselines = load_baselines()
+        for module in DEFAULT_MODULES:
+            assert baselines[module]["modules"] > 0
+
+    def test_main_fails_on_regression(self, tmp_path, capsys, monkeypatch):
+        """Test the exit status against an impossibly small baseline."""
+        monkeypatch.setattr("benchmarks.bench_imports.MIN_MODULES_DELTA", 0)
+        module = "src.utils.text_extractor"
+        path = str(tmp_path / "baseline.json")
+        main(["--modules", module, "--repeat", "1", "--baseline", path, "--update"])
+        assert load_baselines(path)[module]["modules"] > 0
+
+        save_baselines({module: _result(1.0, modules=1)}, path)
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--modules", module, "--repeat", "1", "--baseline", path])
+
+        assert exc_info.value.code == 1
+        assert f"REGRESSION {module} modules" in capsys.readouterr().err
@@ -0,0 +1,28 @@
+"""
+Tests for the Streamlit rerun benchmark.
+"""
+
+import pytest
+
+from benchmarks.bench_rerun import SCENARIOS, run_benchmark
+
+
+class TestRerunBenchmark:
+    @pytest.fixture(autouse=True)
+    def restore_environment(self, monkeypatch):
+        """Undo the settings run_benchmark applies for its run."""
+        for name in (
+            "JOB_WORKERS",
+            "OPENROUTER_API_KEY",
+            "OPENROUTER_REQUESTS_PER_MINUTE",
+            "OPENROUTER_BASE_URL",
+        ):
+            monkeypatch.setenv(name, "")
+
+    def test_every_scenario_is_timed(self):
+        """Test that the app script runs cleanly in each measured state."""
+        results = run_benchmark(reruns=2)
+
+        assert list(results) == list(SCENARIOS)
+        for result in results.values():
+            assert 0 < result["min"] <= result["median"]
@@ -0,0 +1,74 @@
+"""
+Tests for the local OpenRouter stand-in and the load-test driver.
+"""
+
+import pytest
+
+from benchmarks.load_test import run_load_test
+from benchmarks.mock_openrouter import MockBehaviour, MockOpenRouter
+from src.services.ai_analyzer import analyze_resume, analyze_resume_stream
+
+
+@pytest.fixture
+def mock_server(monkeypatch):
+    """Start a fast mock server and point the analyzer at it."""
+    server = MockOpenRouter(MockBehaviour(latency=0, completion_tokens=12))
+    server.start()
+    monkeypatch.setenv("OPENROUTER_BASE_URL", server.base_url)
+    monkeypatch.setenv("OPENROUTER_API_KEY", "mock-key")
+    monkeypatch.setenv("OPENROUTER_REQUESTS_PER_MINUTE", "0")
+    monkeypatch.setenv("RESUME_CACHE_ENABLED", "false")
+    monkeypatch.setenv("ANALYSIS_SINGLE_FLIGHT", "false")
+    yield server
+    server.stop()
+
+
+class TestMockOpenRouter:
+    def test_non_streamed_analysis(self, mock_server):
+        """Test the real client path against the mock completion endpoint."""
+        result = analyze_resume("Senior engineer with Python experience")
+
+        assert result.startswith("## Strengths")
+        assert len(result.split()) == 12
+        assert mock_server.stats() == {"requests": 1, "streamed": 0, "errors": 0}
+
+    def test_streamed_analysis(self, mock_server):
+        """Test that server-sent events arrive as separate chunks."""
+        metrics = {}
+        chunks = list(analyze_resume_stream("Data analyst resume", metrics=metrics))
+
+        assert len(chunks) == 12
+        assert "".join(chunks).startswith("## Strengths")
+        assert metrics["time_to_first_token"] <= metrics["total_time"]
+        assert mock_server.stats()["streamed"] == 1
+
+    def test_injected_errors(self, mock_server, monkeypatch):
+        """Test that the configured error status reaches the client."""
+        monkeypatch.setenv("OPENROUTER_MODELS", "mock/a")
+        mock_server.behaviour.error_rate = 1.0
+        mock_server.behaviour.error_status = 400
+
+        with pytest.raises(Exception, match="Injected mock error"):
+            analyze_resume("Product manager resume")
+        assert mock_server.stats()["errors"] == 1
+
+    def test_latency_distribution(self):
+        """Test the log-normal latency spread around the median."""
+        fixed = MockBehaviour(latency=0.2)
+        assert fixed.first_token_delay() == 0.2
+
+        spread = MockBehaviour(latency=0.2, latency_sigma=0.5, seed=7)
+        delays = sorted(spread.first_token_delay() for _ in range(1001))
+        assert delays[0] < 0.2 < delays[-1]
+        assert delays[500] == pytest.approx(0.2, rel=0.2)
+
+    def test_load_test_reports_percentiles(self, mock_server):
+        """Test the load-test driver end to end."""
+        result = run_load_test(requests=8, concurrency=4, stream=True)
+
+        assert result["succeeded"] == 8
+        assert result["errors"] == {}
+        assert result["throughput"] > 0
+        assert set(result["latency"]) == {"p50", "p90", "p99"}
+        assert result["first_token"]["p50"] <= result["latency"]["p99"]
+        assert mock_server.stats()["requests"] == 8
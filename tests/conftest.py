@@ -5,6 +5,79 @@ Pytest configuration and shared fixtures.
 import pytest
 from unittest.mock import MagicMock, patch
 
+from src.services.cache import reset_analysis_cache
+from src.services.client_pool import reset_client_manager
+from src.services.jobs import reset_job_queue
+from src.services.rate_limiter import reset_rate_limiter
+from src.services.single_flight import reset_single_flight
+from src.utils.extraction_cache import reset_extraction_cache
+from src.utils.metrics import reset_latency_stats, reset_stage_timings
+
+
+@pytest.fixture(autouse=True)
+def isolated_analysis_cache(tmp_path, monkeypatch):
+    """Point the analysis cache at a per-test directory so results never leak."""
+    monkeypatch.setenv("RESUME_CACHE_DIR", str(tmp_path / "analysis-cache"))
+    reset_analysis_cache()
+    yield
+    reset_analysis_cache()
+
+
+@pytest.fixture(autouse=True)
+def isolated_extraction_cache():
+    """Start every test with an empty extraction cache."""
+    reset_extraction_cache()
+    yield
+    reset_extraction_cache()
+
+
+@pytest.fixture(autouse=True)
+def isolated_client_manager():
+    """Drop the shared OpenRouter client between tests."""
+    reset_client_manager()
+    yield
+    reset_client_manager()
+
+
+@pytest.fixture(autouse=True)
+def isolated_single_flight():
+    """Start every test without in-flight analyses or coalescing counters."""
+    reset_single_flight()
+    yield
+    reset_single_flight()
+
+
+@pytest.fixture(autouse=True)
+def isolated_rate_limiter():
+    """Give every test a fresh rate limiter with full buckets."""
+    reset_rate_limiter()
+    yield
+    reset_rate_limiter()
+
+
+@pytest.fixture(autouse=True)
+def isolated_latency_stats():
+    """Start every test without per-model latency samples."""
+    reset_latency_stats()
+    yield
+    reset_latency_stats()
+
+
+@pytest.fixture(autouse=True)
+def isolated_stage_timings():
+    """Start every test without stage histograms or a metrics endpoint."""
+    reset_stage_timings()
+    yield
+    reset_stage_timings()
+
+
+@pytest.fixture(autouse=True)
+def isolated_job_queue():
+    """Start every test with an empty job queue and no running workers."""
+    reset_job_queue()
+    yield
+    reset_job_queue()
+
 
 @pytest.fixture
 def mock_uploaded_file():
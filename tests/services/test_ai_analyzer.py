@@ -2,10 +2,27 @@
 Tests for the AI-powered resume analysis services.
 """
 
+import asyncio
 import os
 import pytest
-from unittest.mock import patch, MagicMock
-from src.services.ai_analyzer import analyze_resume, get_openai_client
+from unittest.mock import patch, AsyncMock, MagicMock
+from src.services.ai_analyzer import (
+    DEFAULT_ANALYSIS,
+    analyze_resume,
+    analyze_resume_async,
+    analyze_resume_multi_role,
+    analyze_resume_multi_role_async,
+    analyze_resume_stream,
+    analyze_resume_stream_async,
+    get_coalescing_stats,
+    get_latency_report,
+    get_models,
+    get_openai_client,
+    normalize_job_roles,
+)
+from src.services.rate_limiter import get_rate_limiter
+from src.utils.deadline import Deadline, DeadlineExceeded
+from src.utils.metrics import get_stage_timings
 
 
 class TestAIAnalyzer:
@@ -18,8 +35,11 @@ class TestAIAnalyzer:
 
     def test_analyze_resume_with_job_role(self):
         """Test resume analysis with a specified job role."""
-        with patch("src.services.ai_analyzer.get_openai_client") as mock_get_client:
+        with patch(
+            "src.services.ai_analyzer.get_async_openai_client"
+        ) as mock_get_client:
             mock_client = MagicMock()
+            mock_client.chat.completions.create = AsyncMock()
             mock_get_client.return_value = mock_client
 
             mock_response = MagicMock()
@@ -36,8 +56,11 @@ class TestAIAnalyzer:
 
     def test_analyze_resume_without_job_role(self):
         """Test resume analysis without a job role."""
-        with patch("src.services.ai_analyzer.get_openai_client") as mock_get_client:
+        with patch(
+            "src.services.ai_analyzer.get_async_openai_client"
+        ) as mock_get_client:
             mock_client = MagicMock()
+            mock_client.chat.completions.create = AsyncMock()
             mock_get_client.return_value = mock_client
 
             mock_response = MagicMock()
@@ -62,11 +85,12 @@ class TestAIAnalyzer:
         with pytest.raises(ValueError, match="Resume text is empty"):
             analyze_resume("   \n   \t   ")
 
-    @patch("src.services.ai_analyzer.get_openai_client")
+    @patch("src.services.ai_analyzer.get_async_openai_client")
     def test_analyze_resume_api_integration(self, mock_get_client):
         """Test the complete API integration flow."""
         # Mock the OpenAI client and response
         mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock()
         mock_response = MagicMock()
         mock_response.choices = [
             MagicMock(message=MagicMock(content="AI Analysis Result"))
@@ -95,13 +119,928 @@ class TestAIAnalyzer:
         # Verify result
         assert result == "AI Analysis Result"
 
-    @patch("src.services.ai_analyzer.get_openai_client")
+    @patch("src.services.ai_analyzer.get_async_openai_client")
     def test_analyze_resume_api_error(self, mock_get_client):
         """Test handling of API errors."""
         # Mock the client to raise an exception
         mock_client = MagicMock()
-        mock_client.chat.completions.create.side_effect = Exception("API Error")
+        mock_client.chat.completions.create = AsyncMock(
+            side_effect=Exception("API Error")
+        )
         mock_get_client.return_value = mock_client
 
         with pytest.raises(Exception, match="API Error"):
             analyze_resume("Valid resume text")
+
+
+def _stream_chunk(content):
+    """Build a streamed chat completion chunk carrying the given text."""
+    return MagicMock(choices=[MagicMock(delta=MagicMock(content=content))])
+
+
+async def _async_stream(chunks):
+    """Async iterator standing in for an AsyncStream of chunks."""
+    for chunk in chunks:
+        yield chunk
+
+
+class TestAnalyzeResumeStream:
+    @patch("src.services.ai_analyzer.get_async_openai_client")
+    def test_stream_yields_chunks_and_metrics(self, mock_get_client):
+        """Test that chunks are yielded as they arrive with timing metrics."""
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(
+            return_value=_async_stream(
+                [_stream_chunk("Strong "), _stream_chunk(None), _stream_chunk("resume")]
+            )
+        )
+        mock_get_client.return_value = mock_client
+
+        metrics = {}
+        chunks = list(analyze_resume_stream("Resume text", "Engineer", metrics))
+
+        assert chunks == ["Strong ", "resume"]
+        assert mock_client.chat.completions.create.call_args[1]["stream"] is True
+        assert metrics["cached"] is False
+        assert 0 <= metrics["time_to_first_token"] <= metrics["total_time"]
+
+    @patch("src.services.ai_analyzer.get_async_openai_client")
+    def test_stream_stages_are_timed(self, mock_get_client):
+        """Test the prompt, first-token and generation stage histograms."""
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(
+            return_value=_async_stream([_stream_chunk("Good "), _stream_chunk("fit")])
+        )
+        mock_get_client.return_value = mock_client
+
+        list(analyze_resume_stream("Resume text"))
+        list(analyze_resume_stream("Resume text"))
+
+        snapshot = get_stage_timings().snapshot()
+        for stage in ("prompt_build", "first_token", "generation"):
+            assert snapshot["stages"][stage]["count"] >= 1
+        assert snapshot["stages"]["generation"]["count"] == 1
+        assert snapshot["events"]["analysis_cached"] == 1
+
+    @patch("src.services.ai_analyzer.get_async_openai_client")
+    def test_stream_result_is_cached(self, mock_get_client):
+        """Test that the assembled text is cached and replayed in one chunk."""
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(
+            return_value=_async_stream(
+                [_stream_chunk("Part one, "), _stream_chunk("part two")]
+            )
+        )
+        mock_get_client.return_value = mock_client
+
+        list(analyze_resume_stream("Resume text"))
+        metrics = {}
+        chunks = list(analyze_resume_stream("Resume text", metrics=metrics))
+
+        assert chunks == ["Part one, part two"]
+        assert metrics["cached"] is True
+        assert analyze_resume("Resume text") == "Part one, part two"
+        mock_client.chat.completions.create.assert_called_once()
+
+    @patch("src.services.ai_analyzer.get_async_openai_client")
+    def test_empty_stream_yields_default_analysis(self, mock_get_client):
+        """Test the fallback when the stream carries no content."""
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(return_value=_async_stream([]))
+        mock_get_client.return_value = mock_client
+
+        assert list(analyze_resume_stream("Resume text")) == [DEFAULT_ANALYSIS]
+
+    def test_stream_empty_text(self):
+        """Test handling of empty resume text."""
+        with pytest.raises(ValueError, match="Resume text is empty"):
+            list(analyze_resume_stream("  "))
+
+
+class TestAnalyzeResumeAsync:
+    @patch("src.services.ai_analyzer.get_async_openai_client")
+    def test_async_analysis_records_usage(self, mock_get_client):
+        """Test the coroutine returns content and token usage."""
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(
+            return_value=MagicMock(
+                choices=[MagicMock(message=MagicMock(content="Async Result"))],
+                usage=MagicMock(
+                    prompt_tokens=120, completion_tokens=30, total_tokens=150
+                ),
+            )
+        )
+        mock_get_client.return_value = mock_client
+
+        metrics = {}
+        result = asyncio.run(
+            analyze_resume_async("Resume text", "Engineer", metrics=metrics)
+        )
+
+        assert result == "Async Result"
+        assert metrics["cached"] is False
+        assert metrics["prompt_tokens"] == 120
+        assert metrics["completion_tokens"] == 30
+
+    @patch("src.services.ai_analyzer.get_async_openai_client")
+    def test_long_resume_is_trimmed_to_budget(self, mock_get_client, monkeypatch):
+        """Test that oversized resumes are trimmed before the request is sent."""
+        monkeypatch.setenv("PROMPT_MAX_INPUT_TOKENS", "300")
+        monkeypatch.setenv("LONG_RESUME_MIN_TOKENS", "0")
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(
+            return_value=MagicMock(
+                choices=[MagicMock(message=MagicMock(content="Trimmed Result"))]
+            )
+        )
+        mock_get_client.return_value = mock_client
+        resume = "\n".join(f"Led migration number {i}" for i in range(1000))
+
+        metrics = {}
+        asyncio.run(analyze_resume_async(resume, metrics=metrics))
+
+        sent = mock_client.chat.completions.create.call_args[1]["messages"]
+        assert "lines omitted" in sent[1]["content"]
+        assert metrics["input_trimmed"] is True
+        assert metrics["input_tokens_after_trim"] <= 300
+        assert metrics["input_tokens_before_trim"] > 3000
+
+    @patch("src.services.ai_analyzer.get_async_openai_client")
+    def test_concurrency_is_capped(self, mock_get_client, monkeypatch):
+        """Test that the semaphore bounds in-flight upstream requests."""
+        monkeypatch.setenv("OPENROUTER_MAX_CONCURRENCY", "2")
+        in_flight = 0
+        peak = 0
+
+        async def create(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return MagicMock(choices=[MagicMock(message=MagicMock(content="ok"))])
+
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = create
+        mock_get_client.return_value = mock_client
+
+        async def run_many():
+            return await asyncio.gather(
+                *(analyze_resume_async(f"Resume {i}") for i in range(6))
+            )
+
+        assert asyncio.run(run_many()) == ["ok"] * 6
+        assert peak == 2
+
+    @patch("src.services.ai_analyzer.get_async_openai_client")
+    def test_cancellation_releases_slot(self, mock_get_client, monkeypatch):
+        """Test that a cancelled analysis frees its concurrency slot."""
+        monkeypatch.setenv("OPENROUTER_MAX_CONCURRENCY", "1")
+        started = asyncio.Event()
+
+        async def slow_create(**kwargs):
+            started.set()
+            await asyncio.sleep(10)
+
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = slow_create
+        mock_get_client.return_value = mock_client
+
+        async def cancel_then_retry():
+            task = asyncio.create_task(analyze_resume_async("Resume text"))
+            await started.wait()
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+            mock_client.chat.completions.create = AsyncMock(
+                return_value=MagicMock(
+                    choices=[MagicMock(message=MagicMock(content="after cancel"))]
+                )
+            )
+            return await asyncio.wait_for(analyze_resume_async("Resume text"), 1)
+
+        assert asyncio.run(cancel_then_retry()) == "after cancel"
+
+
+class TestCoalescing:
+    @patch("src.services.ai_analyzer.get_async_openai_client")
+    def test_identical_concurrent_analyses_share_a_request(self, mock_get_client):
+        """Test that concurrent identical analyses send one upstream request."""
+        calls = 0
+
+        async def create(**kwargs):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return MagicMock(choices=[MagicMock(message=MagicMock(content="ok"))])
+
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = create
+        mock_get_client.return_value = mock_client
+        metrics = [{} for _ in range(3)]
+
+        async def run_many():
+            return await asyncio.gather(
+                *(analyze_resume_async("Resume", "Dev", metrics=m) for m in metrics)
+            )
+
+        assert asyncio.run(run_many()) == ["ok"] * 3
+        assert calls == 1
+        assert [m["coalesced"] for m in metrics] == [False, True, True]
+        assert get_coalescing_stats()["coalesced"] == 2
+
+    @patch("src.services.ai_analyzer.get_async_openai_client")
+    def test_follower_outlives_leader_deadline(self, mock_get_client):
+        """Test that a leader's deadline does not fail a follower without one."""
+        calls = 0
+
+        async def create(**kwargs):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.2 if calls == 1 else 0)
+            return MagicMock(choices=[MagicMock(message=MagicMock(content="ok"))])
+
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = create
+        mock_get_client.return_value = mock_client
+
+        async def scenario():
+            leader = asyncio.create_task(
+                analyze_resume_async("Resume", "Dev", deadline=Deadline(0.05))
+            )
+            await asyncio.sleep(0.01)
+            follower = asyncio.create_task(analyze_resume_async("Resume", "Dev"))
+            return await asyncio.gather(leader, follower, return_exceptions=True)
+
+        leader_result, follower_result = asyncio.run(scenario())
+        assert isinstance(leader_result, DeadlineExceeded)
+        assert follower_result == "ok"
+        assert calls == 2
+
+    @patch("src.services.ai_analyzer.get_async_openai_client")
+    def test_stream_follower_receives_leader_result(self, mock_get_client):
+        """Test that a stream waiting on an in-flight analysis gets one chunk."""
+        release = asyncio.Event()
+
+        async def create(**kwargs):
+            async def chunks():
+                yield _stream_chunk("Hello ")
+                await release.wait()
+                yield _stream_chunk("world")
+
+            return chunks()
+
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = create
+        mock_get_client.return_value = mock_client
+
+        async def collect(metrics):
+            return [
+                chunk
+                async for chunk in analyze_resume_stream_async(
+                    "Resume", metrics=metrics
+                )
+            ]
+
+        async def scenario():
+            leader_metrics, follower_metrics = {}, {}
+            leader = asyncio.create_task(collect(leader_metrics))
+            await asyncio.sleep(0.01)
+            follower = asyncio.create_task(collect(follower_metrics))
+            await asyncio.sleep(0.01)
+            release.set()
+            results = await asyncio.gather(leader, follower)
+            return results, follower_metrics
+
+        (leader_chunks, follower_chunks), follower_metrics = asyncio.run(scenario())
+        assert leader_chunks == ["Hello ", "world"]
+        assert follower_chunks == ["Hello world"]
+        assert follower_metrics["coalesced"] is True
+
+
+def _api_error(status, headers=None):
+    error = Exception(f"HTTP {status}")
+    error.status_code = status
+    error.response = MagicMock(headers=headers or {})
+    return error
+
+
+class TestModelChain:
+    @pytest.fixture(autouse=True)
+    def chain(self, monkeypatch):
+        monkeypatch.setenv("OPENROUTER_MODELS", "primary, fallback")
+        monkeypatch.setenv("OPENROUTER_HEDGE_AFTER", "0.05")
+        monkeypatch.setenv("OPENROUTER_HEDGE_AFTER_RESPONSE", "0.05")
+
+    def test_models_default_to_the_builtin_model(self, monkeypatch):
+        """Test the configured chain and its default."""
+        assert get_models() == ["primary", "fallback"]
+        monkeypatch.delenv("OPENROUTER_MODELS")
+        assert get_models() == ["google/gemini-2.0-flash-exp:free"]
+
+    @patch("src.services.ai_analyzer.get_async_openai_client")
+    def test_fast_primary_is_not_hedged(self, mock_get_client):
+        """Test that a prompt primary serves the request alone."""
+        models = []
+
+        async def create(**kwargs):
+            models.append(kwargs["model"])
+            return _async_stream([_stream_chunk("ok")])
+
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = create
+        mock_get_client.return_value = mock_client
+
+        metrics = {}
+        assert list(analyze_resume_stream("Resume", metrics=metrics)) == ["ok"]
+
+        assert models == ["primary"]
+        assert metrics["model"] == "primary"
+        assert metrics["hedged"] is False
+        report = get_latency_report()["primary"]
+        assert report["served"] == 1
+        assert report["first_token"]["count"] == 1
+        assert report["total"]["count"] == 1
+
+    @patch("src.services.ai_analyzer.get_async_openai_client")
+    def test_slow_first_token_is_hedged(self, mock_get_client):
+        """Test that a stalled primary stream loses to the hedged request."""
+        primary_closed = asyncio.Event()
+
+        async def stalled():
+            try:
+                await asyncio.sleep(10)
+                yield _stream_chunk("too late")
+            finally:
+                primary_closed.set()
+
+        async def create(**kwargs):
+            if kwargs["model"] == "primary":
+                return stalled()
+            return _async_stream([_stream_chunk("fast "), _stream_chunk("answer")])
+
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = create
+        mock_get_client.return_value = mock_client
+
+        async def scenario():
+            metrics = {}
+            chunks = [
+                chunk
+                async for chunk in analyze_resume_stream_async(
+                    "Resume", metrics=metrics
+                )
+            ]
+            await asyncio.wait_for(primary_closed.wait(), 1)
+            return chunks, metrics
+
+        chunks, metrics = asyncio.run(scenario())
+
+        assert chunks == ["fast ", "answer"]
+        assert metrics["model"] == "fallback"
+        assert metrics["hedged"] is True
+        report = get_latency_report()
+        assert report["primary"]["hedged"] == 1
+        assert report["fallback"]["served"] == 1
+
+    @patch("src.services.ai_analyzer.get_async_openai_client")
+    def test_failed_primary_falls_back(self, mock_get_client):
+        """Test that an error from the primary moves on to the next model."""
+
+        async def create(**kwargs):
+            if kwargs["model"] == "primary":
+                raise _api_error(503)
+            return MagicMock(
+                choices=[MagicMock(message=MagicMock(content="From fallback"))]
+            )
+
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = create
+        mock_get_client.return_value = mock_client
+
+        metrics = {}
+        result = asyncio.run(analyze_resume_async("Resume", metrics=metrics))
+
+        assert result == "From fallback"
+        assert metrics["model"] == "fallback"
+        assert metrics["hedged"] is False
+        assert get_latency_report()["primary"]["failed"] == 1
+
+    @patch("src.services.ai_analyzer.get_async_openai_client")
+    def test_slow_response_is_hedged_and_loser_cancelled(self, mock_get_client):
+        """Test hedging of non-streamed requests."""
+        cancelled = []
+
+        async def create(**kwargs):
+            if kwargs["model"] == "primary":
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.append(kwargs["model"])
+                    raise
+            return MagicMock(
+                choices=[MagicMock(message=MagicMock(content=kwargs["model"]))]
+            )
+
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = create
+        mock_get_client.return_value = mock_client
+
+        async def scenario():
+            result = await analyze_resume_async("Resume")
+            await asyncio.sleep(0)
+            return result
+
+        assert asyncio.run(scenario()) == "fallback"
+        assert cancelled == ["primary"]
+
+    @patch("src.services.ai_analyzer.get_async_openai_client")
+    def test_every_model_failing_raises(self, mock_get_client, monkeypatch):
+        """Test that the last error surfaces when the whole chain fails."""
+        monkeypatch.setenv("OPENROUTER_MAX_RETRIES", "0")
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(side_effect=_api_error(500))
+        mock_get_client.return_value = mock_client
+
+        with pytest.raises(Exception, match="HTTP 500"):
+            analyze_resume("Resume")
+        assert mock_client.chat.completions.create.call_count == 2
+
+
+class TestRetries:
+    @patch("src.services.ai_analyzer.get_async_openai_client")
+    def test_last_model_retries_before_failing(self, mock_get_client):
+        """Test that overloads are retried, each through the rate limiter."""
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(side_effect=_api_error(503))
+        mock_get_client.return_value = mock_client
+
+        with (
+            patch("src.services.ai_analyzer.RETRY_BACKOFF_SECONDS", 0),
+            pytest.raises(Exception, match="HTTP 503"),
+        ):
+            analyze_resume("Resume")
+
+        assert mock_client.chat.completions.create.call_count == 3
+        assert get_rate_limiter().stats()["requests"] == 3
+        assert get_latency_report()[get_models()[0]]["retried"] == 2
+
+    @patch("src.services.ai_analyzer.get_async_openai_client")
+    def test_client_errors_are_not_retried(self, mock_get_client):
+        """Test that only 429 and 5xx responses are retried."""
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(side_effect=_api_error(400))
+        mock_get_client.return_value = mock_client
+
+        with pytest.raises(Exception, match="HTTP 400"):
+            analyze_resume("Resume")
+        mock_client.chat.completions.create.assert_called_once()
+
+    @patch("src.services.ai_analyzer.get_async_openai_client")
+    def test_stream_is_retried_before_its_first_chunk(self, mock_get_client):
+        """Test that a stream rejected with 429 is opened again."""
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(
+            side_effect=[
+                _api_error(429, {"retry-after-ms": "10"}),
+                _async_stream([_stream_chunk("ok")]),
+            ]
+        )
+        mock_get_client.return_value = mock_client
+
+        assert list(analyze_resume_stream("Resume")) == ["ok"]
+        assert mock_client.chat.completions.create.call_count == 2
+
+
+LONG_RESUME = "\n".join(
+    [
+        "Jane Doe",
+        "EXPERIENCE",
+        *(f"Led migration project number {i}" for i in range(20)),
+        "Education",
+        *(f"Course {i} in distributed systems" for i in range(20)),
+        "Publications:",
+        *(f"Paper {i} on consensus protocols" for i in range(20)),
+        "Skills",
+        "Python, Go, Kubernetes",
+    ]
+)
+
+
+def _completion(content):
+    return MagicMock(choices=[MagicMock(message=MagicMock(content=content))])
+
+
+def _is_merge(messages):
+    return "Section reviews:" in messages[1]["content"]
+
+
+class TestLongResumeAnalysis:
+    @pytest.fixture(autouse=True)
+    def long_mode(self, monkeypatch):
+        monkeypatch.setenv("LONG_RESUME_MIN_TOKENS", "100")
+
+    @patch("src.services.ai_analyzer.get_async_openai_client")
+    def test_sections_are_reviewed_concurrently_then_merged(self, mock_get_client):
+        """Test that section reviews overlap and are merged by a final call."""
+        in_flight = 0
+        peak = 0
+        merge_messages = []
+
+        async def create(**kwargs):
+            nonlocal in_flight, peak
+            if _is_merge(kwargs["messages"]):
+                merge_messages.append(kwargs["messages"])
+                return _completion("Merged report")
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return _completion("Section review")
+
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = create
+        mock_get_client.return_value = mock_client
+
+        metrics = {}
+        result = asyncio.run(analyze_resume_async(LONG_RESUME, metrics=metrics))
+
+        assert result == "Merged report"
+        assert metrics["long_resume"] is True
+        assert metrics["sections"] > 1
+        assert metrics["sections_failed"] == 0
+        assert peak == metrics["sections"]
+        assert len(merge_messages) == 1
+        assert "### Publications" in merge_messages[0][1]["content"]
+
+    @patch("src.services.ai_analyzer.get_async_openai_client")
+    def test_failed_section_is_skipped_and_not_cached(self, mock_get_client):
+        """Test that one failing section does not fail the whole analysis."""
+        calls = []
+
+        async def create(**kwargs):
+            calls.append(kwargs)
+            content = kwargs["messages"][1]["content"]
+            if _is_merge(kwargs["messages"]):
+                return _completion("Merged report")
+            if '"Education' in content:
+                raise RuntimeError("upstream error")
+            return _completion("Section review")
+
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = create
+        mock_get_client.return_value = mock_client
+
+        metrics = {}
+        assert analyze_resume(LONG_RESUME) == "Merged report"
+        first_run = len(calls)
+        asyncio.run(analyze_resume_async(LONG_RESUME, metrics=metrics))
+
+        assert metrics["sections_failed"] == 1
+        assert metrics["cached"] is False
+        assert len(calls) == 2 * first_run
+
+    @patch("src.services.ai_analyzer.get_async_openai_client")
+    def test_all_sections_failing_raises(self, mock_get_client):
+        """Test that the error surfaces when no section could be reviewed."""
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(
+            side_effect=RuntimeError("upstream error")
+        )
+        mock_get_client.return_value = mock_client
+
+        with pytest.raises(RuntimeError, match="upstream error"):
+            analyze_resume(LONG_RESUME)
+
+    @patch("src.services.ai_analyzer.get_async_openai_client")
+    def test_stream_streams_the_merge(self, mock_get_client):
+        """Test that the streaming path streams only the merge request."""
+
+        async def create(**kwargs):
+            if kwargs.get("stream"):
+                assert _is_merge(kwargs["messages"])
+                return _async_stream(
+                    [_stream_chunk("Merged "), _stream_chunk("report")]
+                )
+            return _completion("Section review")
+
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = create
+        mock_get_client.return_value = mock_client
+
+        metrics = {}
+        chunks = list(analyze_resume_stream(LONG_RESUME, metrics=metrics))
+
+        assert chunks == ["Merged ", "report"]
+        assert metrics["time_to_first_token"] >= metrics["section_time"]
+        assert list(analyze_resume_stream(LONG_RESUME)) == ["Merged report"]
+
+
+class TestRequestDeadline:
+    @patch("src.services.ai_analyzer.get_async_openai_client")
+    def test_remaining_budget_becomes_the_http_timeout(self, mock_get_client):
+        """Test that each call's timeout is bounded by the time left."""
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(
+            return_value=_completion("Result")
+        )
+        mock_get_client.return_value = mock_client
+
+        analyze_resume("Resume text", deadline=Deadline(30))
+        assert 0 < mock_client.chat.completions.create.call_args[1]["timeout"] <= 30
+
+        analyze_resume("Other resume")
+        assert "timeout" not in mock_client.chat.completions.create.call_args[1]
+
+    @patch("src.services.ai_analyzer.get_async_openai_client")
+    def test_slow_request_fails_fast(self, mock_get_client):
+        """Test that a hung request raises DeadlineExceeded, not a fallback."""
+
+        async def slow_create(**kwargs):
+            await asyncio.sleep(10)
+
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = slow_create
+        mock_get_client.return_value = mock_client
+
+        with pytest.raises(DeadlineExceeded) as exc_info:
+            asyncio.run(
+                asyncio.wait_for(
+                    analyze_resume_async("Resume text", deadline=Deadline(0.05)), 2
+                )
+            )
+        assert exc_info.value.stage == "analysis"
+
+    @patch("src.services.ai_analyzer.get_async_openai_client")
+    def test_stalled_stream_fails_fast(self, mock_get_client):
+        """Test that the budget also covers reading the stream."""
+
+        async def stalled_stream():
+            yield _stream_chunk("Partial ")
+            await asyncio.sleep(10)
+
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(return_value=stalled_stream())
+        mock_get_client.return_value = mock_client
+
+        chunks = []
+        with pytest.raises(DeadlineExceeded):
+            for chunk in analyze_resume_stream("Resume text", deadline=Deadline(0.1)):
+                chunks.append(chunk)
+
+        assert chunks == ["Partial "]
+        assert get_coalescing_stats()["in_flight"] == 0
+
+
+def _is_multi_role(messages):
+    return "=== ROLE 1 ===" in messages[1]["content"]
+
+
+def _role_response(messages):
+    """Answer a multi-role prompt with one marked section per listed role."""
+    content = messages[1]["content"]
+    count = content.count("=== ROLE ")
+    return "\n".join(f"=== ROLE {n} ===\nFeedback {n}" for n in range(1, count + 1))
+
+
+class TestMultiRoleAnalysis:
+    def test_roles_are_normalized(self):
+        """Test stripping, blank removal and case-insensitive deduplication."""
+        roles = [" Data Scientist", "", "SRE", "data scientist", None]
+        assert normalize_job_roles(roles) == ["Data Scientist", "SRE"]
+
+    @patch("src.services.ai_analyzer.get_async_openai_client")
+    def test_roles_share_one_request(self, mock_get_client):
+        """Test that three roles cost one upstream call, split by role."""
+        calls = []
+
+        async def create(**kwargs):
+            calls.append(kwargs)
+            return MagicMock(
+                choices=[
+                    MagicMock(
+                        message=MagicMock(content=_role_response(kwargs["messages"]))
+                    )
+                ],
+                usage=MagicMock(
+                    prompt_tokens=300, completion_tokens=90, total_tokens=390
+                ),
+            )
+
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = create
+        mock_get_client.return_value = mock_client
+
+        metrics = {}
+        result = asyncio.run(
+            analyze_resume_multi_role_async(
+                "Resume text", ["Data Scientist", "SRE", "PM"], metrics=metrics
+            )
+        )
+
+        assert result == {
+            "Data Scientist": "Feedback 1",
+            "SRE": "Feedback 2",
+            "PM": "Feedback 3",
+        }
+        assert len(calls) == 1
+        assert calls[0]["max_tokens"] == 3000
+        assert metrics["role_requests"] == 1
+        assert metrics["role_fallbacks"] == 0
+        assert metrics["total_tokens"] == 390
+
+    @patch("src.services.ai_analyzer.get_async_openai_client")
+    def test_roles_are_cached_individually(self, mock_get_client):
+        """Test that single-role analyses reuse multi-role results."""
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(
+            side_effect=lambda **kwargs: _completion(_role_response(kwargs["messages"]))
+        )
+        mock_get_client.return_value = mock_client
+        analyze_resume_multi_role("Resume text", ["Data Scientist", "SRE"])
+        mock_client.chat.completions.create.reset_mock()
+
+        metrics = {}
+        assert analyze_resume("Resume text", "SRE") == "Feedback 2"
+        result = analyze_resume_multi_role(
+            "Resume text", ["SRE", "Data Scientist"], metrics=metrics
+        )
+
+        assert result == {"SRE": "Feedback 2", "Data Scientist": "Feedback 1"}
+        assert metrics["cached_roles"] == 2
+        mock_client.chat.completions.create.assert_not_called()
+
+    @patch("src.services.ai_analyzer.get_async_openai_client")
+    def test_missing_role_falls_back_to_its_own_request(self, mock_get_client):
+        """Test that a role the model skipped is analyzed separately."""
+
+        async def create(**kwargs):
+            if _is_multi_role(kwargs["messages"]):
+                return _completion("=== ROLE 1 ===\nFeedback for DS")
+            return _completion("Separate SRE analysis")
+
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = create
+        mock_get_client.return_value = mock_client
+
+        metrics = {}
+        result = analyze_resume_multi_role(
+            "Resume text", ["Data Scientist", "SRE"], metrics=metrics
+        )
+
+        assert result == {
+            "Data Scientist": "Feedback for DS",
+            "SRE": "Separate SRE analysis",
+        }
+        assert metrics["role_fallbacks"] == 1
+
+    @patch("src.services.ai_analyzer.get_async_openai_client")
+    def test_cut_off_response_is_not_cached(self, mock_get_client):
+        """Test that sections of a response cut off by max_tokens are not cached."""
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(
+            side_effect=lambda **kwargs: MagicMock(
+                choices=[
+                    MagicMock(
+                        message=MagicMock(content=_role_response(kwargs["messages"])),
+                        finish_reason="length",
+                    )
+                ]
+            )
+        )
+        mock_get_client.return_value = mock_client
+
+        result = analyze_resume_multi_role("Resume text", ["Data Scientist", "SRE"])
+        assert result == {"Data Scientist": "Feedback 1", "SRE": "Feedback 2"}
+
+        mock_client.chat.completions.create.reset_mock()
+        analyze_resume("Resume text", "SRE")
+        mock_client.chat.completions.create.assert_called_once()
+
+    @patch("src.services.ai_analyzer.get_async_openai_client")
+    def test_single_role_waits_for_multi_role_request(self, mock_get_client):
+        """Test that a single-role analysis joins an in-flight multi-role one."""
+        calls = []
+
+        async def create(**kwargs):
+            calls.append(kwargs)
+            await asyncio.sleep(0.02)
+            return _completion(_role_response(kwargs["messages"]))
+
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = create
+        mock_get_client.return_value = mock_client
+        single_metrics = {}
+
+        async def scenario():
+            multi = asyncio.create_task(
+                analyze_resume_multi_role_async(
+                    "Resume text", ["Data Scientist", "SRE"]
+                )
+            )
+            await asyncio.sleep(0.005)
+            single = await analyze_resume_async(
+                "Resume text", "SRE", metrics=single_metrics
+            )
+            return await multi, single
+
+        multi_result, single_result = asyncio.run(scenario())
+        assert single_result == multi_result["SRE"] == "Feedback 2"
+        assert single_metrics["coalesced"] is True
+        assert len(calls) == 1
+
+    @patch("src.services.ai_analyzer.get_async_openai_client")
+    def test_in_flight_role_is_not_requested_again(self, mock_get_client):
+        """Test that a role another caller is analyzing is waited for."""
+        calls = []
+
+        async def create(**kwargs):
+            calls.append(kwargs)
+            await asyncio.sleep(0.02)
+            if _is_multi_role(kwargs["messages"]):
+                return _completion(_role_response(kwargs["messages"]))
+            return _completion("SRE on its own")
+
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = create
+        mock_get_client.return_value = mock_client
+        metrics = {}
+
+        async def scenario():
+            single = asyncio.create_task(analyze_resume_async("Resume text", "SRE"))
+            await asyncio.sleep(0.005)
+            return await asyncio.gather(
+                single,
+                analyze_resume_multi_role_async(
+                    "Resume text", ["Data Scientist", "SRE", "PM"], metrics=metrics
+                ),
+            )
+
+        _, result = asyncio.run(scenario())
+        assert result == {
+            "Data Scientist": "Feedback 1",
+            "SRE": "SRE on its own",
+            "PM": "Feedback 2",
+        }
+        assert len(calls) == 2
+        assert metrics["coalesced_roles"] == 1
+
+    @patch("src.services.ai_analyzer.get_async_openai_client")
+    def test_large_role_lists_are_batched(self, mock_get_client, monkeypatch):
+        """Test that roles beyond the batch size go in concurrent requests."""
+        monkeypatch.setenv("MULTI_ROLE_BATCH_SIZE", "2")
+        in_flight = 0
+        peak = 0
+
+        async def create(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return _completion(_role_response(kwargs["messages"]))
+
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = create
+        mock_get_client.return_value = mock_client
+
+        metrics = {}
+        result = analyze_resume_multi_role(
+            "Resume text", ["A", "B", "C", "D", "E"], metrics=metrics
+        )
+
+        assert list(result) == ["A", "B", "C", "D", "E"]
+        assert metrics["role_requests"] == 3
+        assert peak == 3
+
+    @patch("src.services.ai_analyzer.get_async_openai_client")
+    def test_failed_request_cancels_the_others(self, mock_get_client, monkeypatch):
+        """Test that one failing batch does not leave the others running."""
+        monkeypatch.setenv("MULTI_ROLE_BATCH_SIZE", "1")
+        monkeypatch.setenv("OPENROUTER_MAX_RETRIES", "0")
+        cancelled = []
+
+        async def create(**kwargs):
+            if "Broken" in kwargs["messages"][1]["content"]:
+                raise _api_error(400)
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(kwargs["model"])
+                raise
+
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = create
+        mock_get_client.return_value = mock_client
+
+        with pytest.raises(Exception, match="HTTP 400"):
+            analyze_resume_multi_role("Resume text", ["Broken", "SRE"])
+        assert cancelled
+
+    def test_requires_text_and_roles(self):
+        """Test the input validation."""
+        with pytest.raises(ValueError):
+            analyze_resume_multi_role("   ", ["SRE"])
+        with pytest.raises(ValueError):
+            analyze_resume_multi_role("Resume text", [" ", ""])
@@ -0,0 +1,140 @@
+"""
+Tests for the analysis result cache.
+"""
+
+import os
+import time
+from unittest.mock import patch, AsyncMock, MagicMock
+from src.services.ai_analyzer import analyze_resume
+from src.services.cache import (
+    AnalysisCache,
+    get_analysis_cache,
+    make_cache_key,
+    normalize_resume_text,
+)
+
+
+class TestCacheKey:
+    def test_key_ignores_cosmetic_whitespace(self):
+        """Test that whitespace-only differences share a key."""
+        key_a = make_cache_key("John  Doe\r\n\nPython", "Dev", "m", 0.7, "1")
+        key_b = make_cache_key("John Doe\nPython  ", "dev ", "m", 0.7, "1")
+        assert key_a == key_b
+
+    def test_key_depends_on_request_parameters(self):
+        """Test that model, temperature and prompt version change the key."""
+        base = make_cache_key("text", "Dev", "m", 0.7, "1")
+        assert base != make_cache_key("text", "Dev", "other", 0.7, "1")
+        assert base != make_cache_key("text", "Dev", "m", 0.2, "1")
+        assert base != make_cache_key("text", "Dev", "m", 0.7, "2")
+        assert base != make_cache_key("text", "QA", "m", 0.7, "1")
+
+    def test_normalize_resume_text(self):
+        """Test whitespace normalization."""
+        assert normalize_resume_text("  a \t b \n\n c  ") == "a b\nc"
+
+
+class TestAnalysisCache:
+    def test_memory_hit_and_miss_counters(self, tmp_path):
+        """Test hit/miss accounting for the memory tier."""
+        cache = AnalysisCache(cache_dir=str(tmp_path))
+        assert cache.get("key") is None
+        cache.set("key", "value")
+        assert cache.get("key") == "value"
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["memory_hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["writes"] == 1
+
+    def test_lru_eviction(self):
+        """Test that the memory tier evicts the least recently used entry."""
+        cache = AnalysisCache(max_entries=2, cache_dir=None)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "1"
+        assert cache.get("c") == "3"
+        assert cache.stats()["evictions"] == 1
+
+    def test_disk_tier_survives_restart(self, tmp_path):
+        """Test that a new cache instance reads results written by an old one."""
+        AnalysisCache(cache_dir=str(tmp_path)).set("key", "value")
+
+        cache = AnalysisCache(cache_dir=str(tmp_path))
+        assert cache.get("key") == "value"
+        assert cache.stats()["disk_hits"] == 1
+        # The disk hit is promoted into memory
+        assert cache.get("key") == "value"
+        assert cache.stats()["memory_hits"] == 1
+
+    def test_ttl_expiry(self, tmp_path):
+        """Test that expired entries are treated as misses in both tiers."""
+        cache = AnalysisCache(cache_dir=str(tmp_path), ttl_seconds=10)
+        cache.set("key", "value")
+
+        with patch("src.services.cache.time.time", return_value=time.time() + 60):
+            assert cache.get("key") is None
+        assert not os.listdir(tmp_path)
+
+    def test_disk_size_eviction(self, tmp_path):
+        """Test that the disk tier stays within its size bound."""
+        cache = AnalysisCache(cache_dir=str(tmp_path), max_disk_bytes=300)
+        for i in range(10):
+            cache.set(f"key{i}", "x" * 100)
+
+        total = sum(os.path.getsize(tmp_path / name) for name in os.listdir(tmp_path))
+        assert total <= 300
+        assert os.path.exists(tmp_path / "key9.json")
+
+    def test_disabled_cache(self, tmp_path):
+        """Test that a disabled cache never stores anything."""
+        cache = AnalysisCache(cache_dir=str(tmp_path), enabled=False)
+        cache.set("key", "value")
+        assert cache.get("key") is None
+        assert not os.listdir(tmp_path)
+
+    def test_clear(self, tmp_path):
+        """Test clearing both tiers."""
+        cache = AnalysisCache(cache_dir=str(tmp_path))
+        cache.set("key", "value")
+        cache.clear()
+        assert cache.get("key") is None
+
+
+class TestAnalyzeResumeCaching:
+    @patch("src.services.ai_analyzer.get_async_openai_client")
+    def test_repeat_analysis_is_served_from_cache(self, mock_get_client):
+        """Test that a repeated analysis does not call the API again."""
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(
+            return_value=MagicMock(
+                choices=[MagicMock(message=MagicMock(content="Cached Analysis"))]
+            )
+        )
+        mock_get_client.return_value = mock_client
+
+        first = analyze_resume("Resume text", "Engineer")
+        second = analyze_resume("Resume   text\n", "engineer")
+
+        assert first == second == "Cached Analysis"
+        mock_client.chat.completions.create.assert_called_once()
+        assert get_analysis_cache().stats()["hits"] == 1
+
+    @patch("src.services.ai_analyzer.get_async_openai_client")
+    def test_fallback_analysis_is_not_cached(self, mock_get_client):
+        """Test that empty API responses are not cached."""
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(
+            return_value=MagicMock(choices=[MagicMock(message=MagicMock(content=""))])
+        )
+        mock_get_client.return_value = mock_client
+
+        analyze_resume("Resume text")
+        analyze_resume("Resume text")
+
+        assert mock_client.chat.completions.create.call_count == 2
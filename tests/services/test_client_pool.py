@@ -0,0 +1,183 @@
+"""
+Tests for the pooled OpenRouter client manager.
+"""
+
+import asyncio
+import os
+import httpx
+import openai
+from unittest.mock import patch, AsyncMock, MagicMock
+from src.services.ai_analyzer import (
+    analyze_resume,
+    get_openai_client,
+    warm_up_openai_client,
+)
+from src.services.client_pool import (
+    OpenRouterClientManager,
+    get_client_manager,
+    get_pool_stats,
+)
+from src.services.rate_limiter import get_rate_limiter
+
+
+class TestClientManager:
+    def test_client_is_reused_across_calls(self):
+        """Test that the same client is returned for every call."""
+        with patch.dict(os.environ, {"OPENROUTER_API_KEY": "test-key"}):
+            assert get_openai_client() is get_openai_client()
+
+    def test_client_is_rebuilt_when_key_changes(self):
+        """Test that a new API key produces a new client."""
+        with patch.dict(os.environ, {"OPENROUTER_API_KEY": "key-one"}):
+            first = get_openai_client()
+        with patch.dict(os.environ, {"OPENROUTER_API_KEY": "key-two"}):
+            second = get_openai_client()
+        assert first is not second
+        assert second.api_key == "key-two"
+
+    def test_base_url_from_environment(self):
+        """Test that the API base URL can point at another server."""
+        with patch.dict(os.environ, {"OPENROUTER_API_KEY": "test-key"}):
+            default = get_openai_client()
+            with patch.dict(
+                os.environ, {"OPENROUTER_BASE_URL": "http://127.0.0.1:8999/v1/"}
+            ):
+                local = get_openai_client()
+        assert str(default.base_url) == "https://openrouter.ai/api/v1/"
+        assert local is not default
+        assert str(local.base_url) == "http://127.0.0.1:8999/v1/"
+
+    def test_pool_limits_from_environment(self):
+        """Test that connection pool settings are read from the environment."""
+        env = {
+            "OPENROUTER_MAX_CONNECTIONS": "5",
+            "OPENROUTER_MAX_KEEPALIVE": "3",
+            "OPENROUTER_KEEPALIVE_EXPIRY": "15",
+            "OPENROUTER_TIMEOUT": "30",
+        }
+        with patch.dict(os.environ, env):
+            manager = get_client_manager("test-key")
+        assert manager.limits.max_connections == 5
+        assert manager.limits.max_keepalive_connections == 3
+        assert manager.limits.keepalive_expiry == 15
+        assert manager.timeout.read == 30
+
+    def test_rate_limited_request_is_retried(self):
+        """Test that a 429 is retried through the limiter, not by the SDK."""
+        request = httpx.Request("POST", "https://openrouter.ai/api/v1/chat")
+        rate_limited = openai.RateLimitError(
+            "rate limited",
+            response=httpx.Response(
+                429, headers={"retry-after-ms": "10"}, request=request
+            ),
+            body=None,
+        )
+        success = MagicMock(choices=[MagicMock(message=MagicMock(content="ok"))])
+
+        with patch.dict(os.environ, {"OPENROUTER_API_KEY": "test-key"}):
+            client = get_openai_client()
+            with patch(
+                "src.services.ai_analyzer.get_async_openai_client"
+            ) as mock_get_client:
+                mock_client = MagicMock()
+                mock_client.chat.completions.create = AsyncMock(
+                    side_effect=[rate_limited, success]
+                )
+                mock_get_client.return_value = mock_client
+
+                assert analyze_resume("Resume text") == "ok"
+
+        assert client.max_retries == 0
+        assert mock_client.chat.completions.create.call_count == 2
+        assert get_rate_limiter().stats()["throttled"] == 1
+
+    def test_pool_stats_before_first_use(self):
+        """Test statistics for a manager that has not created a client yet."""
+        manager = OpenRouterClientManager("test-key", max_connections=7)
+        stats = manager.pool_stats()
+        assert stats == {
+            "open": 0,
+            "idle": 0,
+            "in_use": 0,
+            "max_connections": 7,
+            "requests": 0,
+        }
+        assert get_pool_stats() == {}
+
+    def test_pool_stats_counts_connections(self):
+        """Test open/idle/in-use accounting from the underlying pool."""
+        manager = OpenRouterClientManager("test-key")
+        manager.get_client()
+
+        def connection(closed, idle):
+            conn = MagicMock()
+            conn.is_closed.return_value = closed
+            conn.is_idle.return_value = idle
+            return conn
+
+        pool = MagicMock()
+        pool.connections = [
+            connection(False, True),
+            connection(False, False),
+            connection(True, False),
+        ]
+        with patch.object(manager._http_client, "_transport", MagicMock(_pool=pool)):
+            stats = manager.pool_stats()
+
+        assert stats["open"] == 2
+        assert stats["idle"] == 1
+        assert stats["in_use"] == 1
+
+    def test_warm_up_opens_connection_once(self):
+        """Test that warm-up issues a single request on the background loop."""
+        manager = OpenRouterClientManager(
+            "test-key", base_url="https://example.invalid/api/v1"
+        )
+        with patch.object(httpx.AsyncClient, "get", new_callable=AsyncMock) as mock_get:
+            assert manager.warm_up(background=False) is True
+            assert manager.warm_up(background=False) is True
+        mock_get.assert_called_once()
+        assert mock_get.call_args[0][0] == "https://example.invalid/api/v1/models"
+
+    def test_warm_up_in_background_returns_future(self):
+        """Test that a background warm-up does not block the caller."""
+        manager = OpenRouterClientManager("test-key")
+        with patch.object(httpx.AsyncClient, "get", new_callable=AsyncMock):
+            future = manager.warm_up()
+            assert future.result(timeout=5) is True
+
+    def test_warm_up_failure_is_not_fatal(self):
+        """Test that network errors during warm-up are swallowed."""
+        manager = OpenRouterClientManager("test-key")
+        with patch.object(
+            httpx.AsyncClient,
+            "get",
+            new_callable=AsyncMock,
+            side_effect=httpx.ConnectError("down"),
+        ):
+            assert manager.warm_up(background=False) is False
+
+    def test_async_clients_are_pooled_per_loop(self):
+        """Test that each event loop gets one reusable async client."""
+        manager = OpenRouterClientManager("test-key")
+
+        async def get_twice():
+            return manager.get_async_client(), manager.get_async_client()
+
+        first, second = asyncio.run(get_twice())
+        other, _ = asyncio.run(get_twice())
+        assert first is second
+        assert other is not first
+
+    def test_warm_up_disabled_without_setting(self):
+        """Test that warm-up is a no-op unless OPENROUTER_WARMUP is enabled."""
+        with (
+            patch.dict(os.environ, {"OPENROUTER_API_KEY": "test-key"}),
+            patch("src.services.ai_analyzer.get_client_manager") as mock_manager,
+        ):
+            warm_up_openai_client()
+            mock_manager.assert_not_called()
+
+            with patch.dict(os.environ, {"OPENROUTER_WARMUP": "true"}):
+                warm_up_openai_client()
+            mock_manager.assert_called_once_with("test-key")
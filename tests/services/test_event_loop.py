@@ -0,0 +1,74 @@
+"""
+Tests for the shared background event loop helpers.
+"""
+
+import asyncio
+import threading
+import pytest
+from src.services.event_loop import get_background_loop, iterate_sync, run_sync
+
+
+class TestEventLoop:
+    def test_background_loop_is_shared(self):
+        """Test that the same running loop is returned every time."""
+        loop = get_background_loop()
+        assert loop is get_background_loop()
+        assert loop.is_running()
+
+    def test_run_sync_returns_result(self):
+        """Test running a coroutine from synchronous code."""
+
+        async def add(a, b):
+            await asyncio.sleep(0)
+            return a + b
+
+        assert run_sync(add(2, 3)) == 5
+
+    def test_run_sync_propagates_errors(self):
+        """Test that coroutine exceptions reach the caller."""
+
+        async def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            run_sync(fail())
+
+    def test_run_sync_timeout_cancels_coroutine(self):
+        """Test that a timed-out coroutine is cancelled on the loop."""
+        cancelled = threading.Event()
+
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with pytest.raises(TimeoutError):
+            run_sync(slow(), timeout=0.05)
+        assert cancelled.wait(1)
+
+    def test_iterate_sync_yields_items(self):
+        """Test consuming an async generator synchronously."""
+
+        async def numbers():
+            for i in range(3):
+                yield i
+
+        assert list(iterate_sync(numbers())) == [0, 1, 2]
+
+    def test_iterate_sync_closes_async_generator(self):
+        """Test that closing early closes the underlying async generator."""
+        closed = threading.Event()
+
+        async def numbers():
+            try:
+                for i in range(10):
+                    yield i
+            finally:
+                closed.set()
+
+        iterator = iterate_sync(numbers())
+        assert next(iterator) == 0
+        iterator.close()
+        assert closed.is_set()
@@ -0,0 +1,167 @@
+"""
+Tests for the background job queue.
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.services.jobs import (
+    DONE,
+    FAILED,
+    QUEUED,
+    RUNNING,
+    JobQueue,
+    get_job_queue,
+    make_job_key,
+)
+from src.utils.metrics import get_stage_timings
+
+
+class FakeClock:
+    """Monotonic clock advanced by hand."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _wait(job, timeout=5):
+    """Wait until a job run by a worker has finished."""
+    end = time.monotonic() + timeout
+    while not job.finished:
+        assert time.monotonic() < end, "job did not finish"
+        time.sleep(0.01)
+    return job
+
+
+class TestJobKey:
+    def test_key_depends_on_content_and_parameters(self):
+        """Test that identical work maps to one ID and different work does not."""
+        key = make_job_key(b"resume", "text/plain", "Engineer")
+
+        assert make_job_key(b"resume", "text/plain", "Engineer") == key
+        assert make_job_key(b"resume!", "text/plain", "Engineer") != key
+        assert make_job_key(b"resume", "text/plain", "Designer") != key
+        assert make_job_key(b"resume", "text/plain", None) == make_job_key(
+            b"resume", "text/plain", ""
+        )
+
+
+class TestJobQueue:
+    def test_job_runs_on_a_worker(self):
+        """Test that submit returns at once and the result arrives later."""
+        queue = JobQueue(max_workers=2)
+        release = threading.Event()
+        script_thread = threading.current_thread()
+
+        def work(job, value):
+            job.append("partial ")
+            release.wait(5)
+            return (value, threading.current_thread() is script_thread)
+
+        job = queue.submit("a", work, 42)
+        assert job.status in (QUEUED, RUNNING)
+        release.set()
+
+        assert _wait(job).status == DONE
+        assert job.result == (42, False)
+        assert job.partial() == "partial "
+        assert get_stage_timings().snapshot()["stages"]["job_queue"]["count"] == 1
+        queue.shutdown(wait=True)
+
+    def test_identical_submissions_share_one_job(self):
+        """Test deduplication of queued, running and finished jobs."""
+        queue = JobQueue(max_workers=0)
+        calls = []
+
+        first = queue.submit("key", lambda job: calls.append(1) or "result")
+        second = queue.submit("key", lambda job: calls.append(2) or "other")
+
+        assert second is first
+        assert second.result == "result"
+        assert calls == [1]
+        assert queue.stats()["deduplicated"] == 1
+        assert get_stage_timings().snapshot()["events"]["job_deduplicated"] == 1
+
+    def test_failed_job_is_retried_on_resubmission(self):
+        """Test that errors are kept on the job and a resubmission runs again."""
+        queue = JobQueue(max_workers=0)
+
+        def fail(job):
+            raise RuntimeError("upstream down")
+
+        failed = queue.submit("key", fail)
+        assert failed.status == FAILED
+        assert str(failed.error) == "upstream down"
+
+        retried = queue.submit("key", lambda job: "ok")
+        assert retried is not failed
+        assert retried.result == "ok"
+
+    def test_finished_jobs_expire_after_ttl(self):
+        """Test result retention and expiry."""
+        clock = FakeClock()
+        queue = JobQueue(max_workers=0, ttl_seconds=60, clock=clock)
+        job = queue.submit("key", lambda job: "result")
+
+        clock.now = 59
+        assert queue.get("key") is job
+
+        clock.now = 61
+        assert queue.get("key") is None
+        assert queue.stats()["expired"] == 1
+        assert queue.submit("key", lambda job: "fresh").result == "fresh"
+
+    def test_running_jobs_never_expire(self):
+        """Test that the TTL only applies to finished jobs."""
+        clock = FakeClock()
+        queue = JobQueue(max_workers=1, ttl_seconds=1, clock=clock)
+        release = threading.Event()
+        job = queue.submit("key", lambda job: release.wait(5))
+
+        clock.now = 100
+        assert queue.get("key") is job
+        release.set()
+        _wait(job)
+        queue.shutdown(wait=True)
+
+    def test_pool_bounds_concurrent_jobs(self):
+        """Test that jobs beyond the pool size wait in the queue."""
+        queue = JobQueue(max_workers=2)
+        release = threading.Event()
+        running = []
+        lock = threading.Lock()
+
+        def work(job):
+            with lock:
+                running.append(job.id)
+            release.wait(5)
+
+        jobs = [queue.submit(str(i), work) for i in range(5)]
+        while len(running) < 2:
+            time.sleep(0.01)
+
+        stats = queue.stats()
+        assert stats[RUNNING] == 2
+        assert stats[QUEUED] == 3
+        release.set()
+        for job in jobs:
+            _wait(job)
+        assert queue.stats()[DONE] == 5
+        queue.shutdown(wait=True)
+
+
+class TestSharedQueue:
+    def test_configuration_from_environment(self, monkeypatch):
+        """Test that the shared queue reads its settings once."""
+        monkeypatch.setenv("JOB_WORKERS", "0")
+        monkeypatch.setenv("JOB_RESULT_TTL_SECONDS", "30")
+
+        queue = get_job_queue()
+        assert queue.max_workers == 0
+        assert queue.ttl_seconds == pytest.approx(30)
+        assert get_job_queue() is queue
@@ -0,0 +1,245 @@
+"""
+Tests for token-budgeted prompt construction.
+"""
+
+import pytest
+
+from src.services.prompt_builder import (
+    DEFAULT_INPUT_BUDGET,
+    MODEL_INPUT_BUDGETS,
+    build_merge_prompt,
+    build_messages,
+    build_multi_role_prompt,
+    build_prompt,
+    build_section_prompts,
+    estimate_message_tokens,
+    estimate_tokens,
+    get_input_budget,
+    plan_sections,
+    split_role_sections,
+    trim_to_budget,
+)
+
+MODEL = "google/gemini-2.0-flash-exp:free"
+
+
+class TestEstimateTokens:
+    def test_words_and_punctuation(self):
+        """Test the per-word and per-symbol estimate."""
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("Python, Go.") == 5
+        assert estimate_tokens("Kubernetes") == 2
+
+    def test_non_ascii_counts_per_character(self):
+        """Test that CJK text is not underestimated."""
+        assert estimate_tokens("软件工程师") == 5
+
+    def test_message_overhead(self):
+        """Test that chat formatting overhead is included."""
+        messages = [{"role": "user", "content": "hello"}]
+        assert estimate_message_tokens(messages) == estimate_tokens("hello") + 6
+
+
+class TestInputBudget:
+    def test_builtin_and_default_budgets(self):
+        """Test the built-in per-model budgets."""
+        assert get_input_budget(MODEL) == MODEL_INPUT_BUDGETS[MODEL]
+        assert get_input_budget("unknown/model") == DEFAULT_INPUT_BUDGET
+
+    def test_environment_overrides(self, monkeypatch):
+        """Test the global and per-model overrides and their precedence."""
+        monkeypatch.setenv("PROMPT_MAX_INPUT_TOKENS", "500")
+        assert get_input_budget(MODEL) == 500
+        monkeypatch.setenv("PROMPT_MODEL_INPUT_BUDGETS", f"other=1, {MODEL}=300")
+        assert get_input_budget(MODEL) == 300
+        assert get_input_budget("unknown/model") == 500
+
+
+class TestTrimToBudget:
+    def test_text_within_budget_is_untouched(self):
+        """Test that nothing is trimmed when the text fits."""
+        text = "Line one\n\n\n\nLine two   with   spaces"
+        assert trim_to_budget(text, 100) == text
+        assert trim_to_budget(text, 0) == text
+
+    def test_low_value_content_goes_first(self):
+        """Test that repeated headers and noise are removed before any cut."""
+        lines = []
+        for page in range(5):
+            lines += ["Jane Doe - Curriculum Vitae", f"- {page + 1} -", "-----"]
+            lines.append(f"Built service number {page} in Python")
+        text = "\n".join(lines)
+
+        trimmed = trim_to_budget(text, 60)
+
+        assert trimmed.count("Jane Doe") == 1
+        assert "-----" not in trimmed
+        for page in range(5):
+            assert f"Built service number {page} in Python" in trimmed
+        assert "omitted" not in trimmed
+
+    def test_middle_is_cut_keeping_start_and_end(self):
+        """Test the last resort keeps the head and tail of the resume."""
+        text = "\n".join(f"Experience entry {i} at Example Corp" for i in range(200))
+
+        trimmed = trim_to_budget(text, 150)
+
+        assert estimate_tokens(trimmed) <= 150
+        assert trimmed.startswith("Experience entry 0 ")
+        assert trimmed.endswith("Experience entry 199 at Example Corp")
+        assert "lines omitted to fit the input budget" in trimmed
+
+    def test_text_without_line_breaks_is_cut_by_words(self):
+        """Test that a single enormous line is still trimmed."""
+        text = " ".join(f"word{i}" for i in range(2000))
+        trimmed = trim_to_budget(text, 100)
+        assert estimate_tokens(trimmed) <= 100
+        assert trimmed.startswith("word0 word1")
+
+
+class TestBuildPrompt:
+    def test_short_resume_is_sent_whole(self):
+        """Test that a resume within budget is not changed."""
+        prompt = build_prompt("Python developer", "Engineer", MODEL)
+        assert prompt.messages == build_messages("Python developer", "Engineer")
+        assert not prompt.trimmed
+        assert prompt.tokens_after_trim == prompt.tokens_before_trim
+
+    @pytest.mark.parametrize("budget", [200, 400])
+    def test_long_resume_fits_budget(self, monkeypatch, budget):
+        """Test that the whole prompt, not just the resume, fits the budget."""
+        monkeypatch.setenv("PROMPT_MAX_INPUT_TOKENS", str(budget))
+        text = "\n".join(f"Delivered project {i} for a client" for i in range(500))
+
+        prompt = build_prompt(text, None, MODEL)
+        metrics = {}
+        prompt.record(metrics)
+
+        assert prompt.trimmed
+        assert estimate_message_tokens(prompt.messages) <= budget
+        assert prompt.resume_text in prompt.messages[1]["content"]
+        assert metrics == {
+            "input_tokens_before_trim": prompt.tokens_before_trim,
+            "input_tokens_after_trim": prompt.tokens_after_trim,
+            "input_trimmed": True,
+        }
+        assert metrics["input_tokens_before_trim"] > budget
+
+
+def _section(heading, count, words="distributed systems work"):
+    return "\n".join([heading, *(f"{words} {i}" for i in range(count))])
+
+
+class TestPlanSections:
+    def test_each_section_is_a_part(self):
+        """Test that sections map to parts in document order."""
+        text = "\n".join(["Jane Doe", _section("Experience", 5), _section("Skills", 5)])
+
+        parts = plan_sections(text, max_parts=6)
+
+        assert [title for title, _ in parts] == ["Overview", "Experience", "Skills"]
+        assert parts[1][1].startswith("Experience\n")
+
+    def test_small_sections_are_packed_up_to_max_parts(self):
+        """Test that the smallest adjacent sections are merged first."""
+        text = "\n".join(
+            [
+                _section("Experience", 40),
+                _section("Education", 3),
+                _section("Awards", 3),
+                _section("Skills", 40),
+            ]
+        )
+
+        parts = plan_sections(text, max_parts=3)
+
+        assert [title for title, _ in parts] == [
+            "Experience",
+            "Education / Awards",
+            "Skills",
+        ]
+
+    def test_large_sections_are_split(self):
+        """Test that a section over the size limit is split at line breaks."""
+        text = _section("Publications", 60)
+
+        parts = plan_sections(text, max_parts=6, max_tokens=100)
+
+        assert len(parts) > 1
+        assert parts[0][0] == "Publications (part 1)"
+        assert all(estimate_tokens(part) <= 100 for _, part in parts)
+        joined = "\n".join(part for _, part in parts)
+        assert joined == text
+
+
+class TestSectionPrompts:
+    def test_section_prompts_fit_budget(self, monkeypatch):
+        """Test that every section request stays within the input budget."""
+        monkeypatch.setenv("PROMPT_MAX_INPUT_TOKENS", "200")
+        text = "\n".join([_section("Experience", 80), _section("Skills", 10)])
+
+        prompts = build_section_prompts(text, "Engineer", MODEL, max_parts=4)
+
+        assert len(prompts) > 1
+        for title, prompt in prompts:
+            assert f'"{title}"' in prompt.messages[1]["content"]
+            assert "Engineer" in prompt.messages[1]["content"]
+            assert prompt.tokens_after_trim <= 200
+
+    def test_merge_prompt_lists_reviews(self):
+        """Test that the merge request carries every section review."""
+        prompt = build_merge_prompt(
+            [("Experience", "Strong impact."), ("Skills", "Add Go.")], None, MODEL
+        )
+
+        content = prompt.messages[1]["content"]
+        assert "### Experience\nStrong impact." in content
+        assert "### Skills\nAdd Go." in content
+        assert "general job applications" in content
+
+
+class TestMultiRolePrompt:
+    def test_one_prompt_carries_every_role(self):
+        """Test that the resume is sent once with a marker per role."""
+        resume = "Jane Doe\nSenior Engineer\nPython, Go, Kubernetes"
+        prompt = build_multi_role_prompt(resume, ["Data Scientist", "SRE"], MODEL)
+
+        content = prompt.messages[1]["content"]
+        assert content.count(resume) == 1
+        assert "1. Data Scientist" in content
+        assert "2. SRE" in content
+        assert "=== ROLE 1 ===" in content
+        assert "=== ROLE 2 ===" in content
+
+    def test_multi_role_prompt_fits_budget(self, monkeypatch):
+        """Test that the shared prompt is trimmed like a single one."""
+        monkeypatch.setenv("PROMPT_MAX_INPUT_TOKENS", "300")
+        resume = "\n".join(f"Line {i} about a project" for i in range(500))
+
+        prompt = build_multi_role_prompt(resume, ["A", "B", "C"], MODEL)
+
+        assert prompt.trimmed
+        assert prompt.tokens_after_trim <= 300
+
+    def test_response_is_split_by_role(self):
+        """Test marker parsing, including the variations models produce."""
+        response = (
+            "Here is the analysis.\n"
+            "**=== ROLE 1 ===**\nGood fit for data work.\n"
+            "## === ROLE 2: SRE ===\nAdd on-call experience.\n"
+            "=== ROLE 3 ===\n"
+        )
+
+        sections = split_role_sections(response, ["Data Scientist", "SRE", "PM"])
+
+        assert sections == {
+            "Data Scientist": "Good fit for data work.",
+            "SRE": "Add on-call experience.",
+        }
+
+    def test_unknown_and_repeated_markers_are_ignored(self):
+        """Test that stray markers cannot overwrite or invent roles."""
+        response = "=== ROLE 1 ===\nFirst\n=== ROLE 1 ===\nAgain\n=== ROLE 7 ===\nX"
+
+        assert split_role_sections(response, ["A"]) == {"A": "First"}
+        assert split_role_sections("No markers at all", ["A"]) == {}
@@ -0,0 +1,263 @@
+"""
+Tests for the client-side rate limiter.
+"""
+
+import asyncio
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.services.rate_limiter import (
+    RateLimiter,
+    RateLimitTimeout,
+    TokenBucket,
+    get_rate_limiter,
+    is_overload_error,
+    retry_after_seconds,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _api_error(status, headers=None):
+    error = Exception(f"HTTP {status}")
+    error.status_code = status
+    error.response = MagicMock(headers=headers or {})
+    return error
+
+
+class TestTokenBucket:
+    def test_burst_then_refill(self):
+        """Test that a full bucket allows a burst and refills over time."""
+        bucket = TokenBucket(60, now=0.0)
+        assert bucket.delay(60, 0.0) == 0
+        bucket.take(60, 0.0)
+        assert bucket.delay(1, 0.0) == pytest.approx(1.0)
+        assert bucket.delay(1, 1.0) == 0
+
+    def test_zero_rate_is_unlimited(self):
+        """Test that a rate of 0 never delays."""
+        bucket = TokenBucket(0, now=0.0)
+        bucket.take(10**9, 0.0)
+        assert bucket.delay(10**9, 0.0) == 0
+
+    def test_overuse_is_repaid(self):
+        """Test that a negative balance delays later requests."""
+        bucket = TokenBucket(60, now=0.0)
+        bucket.take(60, 0.0)
+        bucket.take(30, 0.0)
+        assert bucket.delay(1, 0.0) == pytest.approx(31.0)
+
+
+class TestErrorClassification:
+    def test_retry_after_header_forms(self):
+        """Test seconds, milliseconds and missing Retry-After headers."""
+        assert retry_after_seconds(_api_error(429, {"retry-after": "7"})) == 7
+        assert retry_after_seconds(_api_error(429, {"retry-after-ms": "250"})) == 0.25
+        assert retry_after_seconds(_api_error(429, {"retry-after": "3600"})) == 120
+        assert retry_after_seconds(_api_error(429)) is None
+        assert retry_after_seconds(ValueError("no response")) is None
+
+    def test_overload_errors(self):
+        """Test that only 429 and 5xx responses count as overload."""
+        assert is_overload_error(_api_error(429))
+        assert is_overload_error(_api_error(503))
+        assert not is_overload_error(_api_error(400))
+        assert not is_overload_error(asyncio.CancelledError())
+
+
+class TestRateLimiter:
+    def test_requests_are_paced(self):
+        """Test that requests beyond the per-minute rate queue."""
+        limiter = RateLimiter(requests_per_minute=600, max_wait=5)
+
+        async def scenario():
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            for _ in range(602):
+                (await limiter.acquire()).release()
+            return loop.time() - start
+
+        # 600 requests burst, the next two wait 0.1s each
+        assert asyncio.run(scenario()) >= 0.15
+
+    def test_queue_wait_is_bounded(self):
+        """Test that a caller gives up instead of waiting past max_wait."""
+        limiter = RateLimiter(requests_per_minute=1, max_wait=1)
+
+        async def scenario():
+            (await limiter.acquire()).release()
+            await limiter.acquire()
+
+        with pytest.raises(RateLimitTimeout, match="try again in about 60 seconds"):
+            asyncio.run(scenario())
+        assert limiter.stats()["timeouts"] == 1
+
+    def test_rate_waiters_are_served_in_arrival_order(self):
+        """Test that queued callers are paced FIFO, not left to race."""
+        limiter = RateLimiter(requests_per_minute=1200, max_wait=0.3)
+        order = []
+
+        async def caller(index):
+            for round in range(4):
+                permit = await limiter.acquire()
+                order.append((round, index))
+                permit.release()
+
+        async def scenario():
+            # Drain the burst so every caller is paced at 20 per second
+            for _ in range(1200):
+                (await limiter.acquire()).release()
+            await asyncio.gather(*(caller(index) for index in range(4)))
+
+        asyncio.run(scenario())
+        assert limiter.stats()["timeouts"] == 0
+        assert [round for round, _ in order] == sorted(round for round, _ in order)
+
+    def test_cancelled_waiter_returns_its_reservation(self):
+        """Test that a caller giving up does not delay the callers after it."""
+        limiter = RateLimiter(requests_per_minute=60, max_wait=5)
+
+        async def scenario():
+            for _ in range(60):
+                (await limiter.acquire()).release()
+            waiter = asyncio.create_task(limiter.acquire())
+            await asyncio.sleep(0)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+            return limiter._requests.delay(1, limiter._clock())
+
+        # Only the drained burst is left to refill, not the cancelled slot
+        assert asyncio.run(scenario()) == pytest.approx(1.0, abs=0.1)
+
+    def test_token_reservation_is_corrected(self):
+        """Test that unused reserved tokens return to the bucket."""
+        clock = FakeClock()
+        limiter = RateLimiter(
+            requests_per_minute=0, tokens_per_minute=1000, clock=clock, max_wait=0
+        )
+
+        async def scenario():
+            permit = await limiter.acquire(900)
+            permit.record_usage(100)
+            permit.release()
+            (await limiter.acquire(900)).release()
+
+        asyncio.run(scenario())
+
+    def test_retry_after_pauses_all_requests(self):
+        """Test that a 429 with Retry-After blocks new requests until then."""
+        clock = FakeClock()
+        limiter = RateLimiter(requests_per_minute=0, clock=clock, max_wait=5)
+
+        async def scenario():
+            permit = await limiter.acquire()
+            permit.release(_api_error(429, {"retry-after": "30"}))
+            with pytest.raises(RateLimitTimeout):
+                await limiter.acquire()
+            clock.now += 30
+            (await limiter.acquire()).release()
+
+        asyncio.run(scenario())
+        assert limiter.stats()["throttled"] == 1
+
+    def test_concurrency_backs_off_and_recovers(self):
+        """Test AIMD: halve on overload, grow back with successes."""
+        clock = FakeClock()
+        limiter = RateLimiter(requests_per_minute=0, max_concurrency=8, clock=clock)
+
+        async def scenario():
+            permits = [await limiter.acquire() for _ in range(3)]
+            for permit in permits:
+                # One round of failures only decreases the limit once
+                permit.release(_api_error(503))
+            assert limiter.limit == 4
+            clock.now += 2
+            (await limiter.acquire()).release(_api_error(500))
+            assert limiter.limit == 2
+            # About one slot per round of successes at the current limit
+            for _ in range(40):
+                (await limiter.acquire()).release()
+            assert limiter.limit == 8
+
+        asyncio.run(scenario())
+
+    def test_waiters_are_woken_across_event_loops(self):
+        """Test that a slot freed on one loop is handed to a caller on another."""
+        limiter = RateLimiter(requests_per_minute=0, max_concurrency=1, max_wait=5)
+        acquired = threading.Event()
+        release = threading.Event()
+        results = []
+
+        async def holder():
+            permit = await limiter.acquire()
+            acquired.set()
+            await asyncio.to_thread(release.wait, 5)
+            permit.release()
+
+        async def waiter():
+            permit = await limiter.acquire()
+            results.append(permit.waited)
+            permit.release()
+
+        first = threading.Thread(target=asyncio.run, args=(holder(),))
+        first.start()
+        assert acquired.wait(5)
+        second = threading.Thread(target=asyncio.run, args=(waiter(),))
+        second.start()
+        release.set()
+        first.join(5)
+        second.join(5)
+
+        assert len(results) == 1
+        assert limiter.stats()["in_flight"] == 0
+
+    def test_cancelled_waiter_does_not_leak_a_slot(self):
+        """Test that cancelling a queued caller keeps the slot count right."""
+        limiter = RateLimiter(requests_per_minute=0, max_concurrency=1, max_wait=5)
+
+        async def scenario():
+            permit = await limiter.acquire()
+            waiter = asyncio.create_task(limiter.acquire())
+            await asyncio.sleep(0)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+            permit.release()
+            (await asyncio.wait_for(limiter.acquire(), 1)).release()
+
+        asyncio.run(scenario())
+        assert limiter.stats()["queued"] == 0
+        assert limiter.stats()["in_flight"] == 0
+
+    def test_limit_request_releases_on_error(self):
+        """Test that the context manager feeds errors to the adaptive limit."""
+        limiter = RateLimiter(requests_per_minute=0, max_concurrency=4)
+
+        async def scenario():
+            with pytest.raises(Exception, match="HTTP 429"):
+                async with limiter.limit_request():
+                    raise _api_error(429, {"retry-after": "0"})
+
+        asyncio.run(scenario())
+        assert limiter.stats()["in_flight"] == 0
+        assert limiter.limit == 2
+
+    def test_configuration_from_environment(self, monkeypatch):
+        """Test that the shared limiter reads its settings from the environment."""
+        monkeypatch.setenv("OPENROUTER_MAX_CONCURRENCY", "3")
+        monkeypatch.setenv("OPENROUTER_MAX_QUEUE_WAIT", "2.5")
+
+        limiter = get_rate_limiter()
+
+        assert limiter.max_concurrency == 3
+        assert limiter.max_wait == 2.5
+        assert get_rate_limiter() is limiter
@@ -0,0 +1,211 @@
+"""
+Tests for single-flight coalescing of in-flight requests.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.services.single_flight import SingleFlight, get_single_flight
+
+
+async def _lead(flight_group, key, result, release, calls):
+    """Acquire the key and, when leading, publish result once released."""
+    flight, shared = await flight_group.acquire(key)
+    if flight is None:
+        return shared
+    with flight:
+        calls.append(key)
+        await release.wait()
+        flight.set_result(result)
+    return result
+
+
+class TestSingleFlight:
+    def test_concurrent_callers_share_one_request(self):
+        """Test that followers receive the leader's result."""
+        group = SingleFlight()
+        calls = []
+
+        async def scenario():
+            release = asyncio.Event()
+            tasks = [
+                asyncio.create_task(_lead(group, "key", "result", release, calls))
+                for _ in range(4)
+            ]
+            await asyncio.sleep(0)
+            assert group.stats()["in_flight"] == 1
+            release.set()
+            return await asyncio.gather(*tasks)
+
+        assert asyncio.run(scenario()) == ["result"] * 4
+        assert calls == ["key"]
+        assert group.stats() == {"leaders": 1, "coalesced": 3, "in_flight": 0}
+
+    def test_different_keys_are_independent(self):
+        """Test that only identical requests are coalesced."""
+        group = SingleFlight()
+        calls = []
+
+        async def scenario():
+            release = asyncio.Event()
+            release.set()
+            return await asyncio.gather(
+                _lead(group, "a", 1, release, calls),
+                _lead(group, "b", 2, release, calls),
+            )
+
+        assert asyncio.run(scenario()) == [1, 2]
+        assert sorted(calls) == ["a", "b"]
+
+    def test_leader_error_is_shared(self):
+        """Test that followers see the error the request failed with."""
+        group = SingleFlight()
+
+        async def fail():
+            flight, _ = await group.acquire("key")
+            with flight:
+                await asyncio.sleep(0.01)
+                raise RuntimeError("upstream error")
+
+        async def scenario():
+            leader = asyncio.create_task(fail())
+            await asyncio.sleep(0)
+            follower = asyncio.create_task(group.acquire("key"))
+            return await asyncio.gather(leader, follower, return_exceptions=True)
+
+        results = asyncio.run(scenario())
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert group.stats()["coalesced"] == 1
+
+    def test_follower_takes_over_from_cancelled_leader(self):
+        """Test that cancelling the leader does not fail its followers."""
+        group = SingleFlight()
+        calls = []
+
+        async def scenario():
+            never = asyncio.Event()
+            release = asyncio.Event()
+            release.set()
+            leader = asyncio.create_task(_lead(group, "key", "first", never, calls))
+            await asyncio.sleep(0)
+            follower = asyncio.create_task(
+                _lead(group, "key", "second", release, calls)
+            )
+            await asyncio.sleep(0)
+            leader.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await leader
+            return await follower
+
+        assert asyncio.run(scenario()) == "second"
+        assert calls == ["key", "key"]
+        assert group.stats()["in_flight"] == 0
+
+    def test_follower_takes_over_from_caller_error(self):
+        """Test that an error of the leader's own is not shared."""
+        group = SingleFlight(caller_errors=(TimeoutError,))
+        calls = []
+
+        async def time_out():
+            flight, _ = await group.acquire("key")
+            with flight:
+                await asyncio.sleep(0.01)
+                raise TimeoutError("leader budget")
+
+        async def scenario():
+            release = asyncio.Event()
+            release.set()
+            leader = asyncio.create_task(time_out())
+            await asyncio.sleep(0)
+            follower = asyncio.create_task(
+                _lead(group, "key", "result", release, calls)
+            )
+            return await asyncio.gather(leader, follower, return_exceptions=True)
+
+        leader_result, follower_result = asyncio.run(scenario())
+        assert isinstance(leader_result, TimeoutError)
+        assert follower_result == "result"
+        assert calls == ["key"]
+
+    def test_lead_never_waits(self):
+        """Test that lead() declines a key already in flight."""
+        group = SingleFlight()
+
+        async def scenario():
+            flight = group.lead("key")
+            assert group.lead("key") is None
+            follower = asyncio.create_task(group.acquire("key"))
+            await asyncio.sleep(0)
+            with flight:
+                flight.set_result("result")
+            return await follower
+
+        assert asyncio.run(scenario()) == (None, "result")
+        assert group.stats() == {"leaders": 1, "coalesced": 1, "in_flight": 0}
+
+    def test_cancelled_follower_leaves_flight_alone(self):
+        """Test that a follower giving up does not cancel the shared request."""
+        group = SingleFlight()
+        calls = []
+
+        async def scenario():
+            release = asyncio.Event()
+            leader = asyncio.create_task(_lead(group, "key", "result", release, calls))
+            await asyncio.sleep(0)
+            follower = asyncio.create_task(group.acquire("key"))
+            await asyncio.sleep(0)
+            follower.cancel()
+            release.set()
+            return await leader
+
+        assert asyncio.run(scenario()) == "result"
+
+    def test_callers_on_different_event_loops(self):
+        """Test coalescing across threads, as with separate Streamlit sessions."""
+        group = SingleFlight()
+        leading = threading.Event()
+        release = threading.Event()
+        results = []
+
+        async def leader():
+            flight, _ = await group.acquire("key")
+            with flight:
+                leading.set()
+                await asyncio.to_thread(release.wait, 5)
+                flight.set_result("result")
+
+        async def follower():
+            results.append(await group.acquire("key"))
+
+        thread = threading.Thread(target=asyncio.run, args=(leader(),))
+        thread.start()
+        assert leading.wait(5)
+        follower_thread = threading.Thread(target=asyncio.run, args=(follower(),))
+        follower_thread.start()
+        release.set()
+        thread.join(5)
+        follower_thread.join(5)
+
+        assert results == [(None, "result")]
+
+    def test_disabled_registry_never_coalesces(self, monkeypatch):
+        """Test that ANALYSIS_SINGLE_FLIGHT=false sends every request."""
+        monkeypatch.setenv("ANALYSIS_SINGLE_FLIGHT", "false")
+        group = get_single_flight()
+        calls = []
+
+        async def scenario():
+            release = asyncio.Event()
+            tasks = [
+                asyncio.create_task(_lead(group, "key", "result", release, calls))
+                for _ in range(3)
+            ]
+            await asyncio.sleep(0)
+            release.set()
+            return await asyncio.gather(*tasks)
+
+        assert asyncio.run(scenario()) == ["result"] * 3
+        assert len(calls) == 3
+        assert group.stats()["coalesced"] == 0
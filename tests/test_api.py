@@ -0,0 +1,231 @@
+"""
+Tests for the HTTP analysis service.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+pytest.importorskip("starlette")
+pytest.importorskip("multipart")
+
+from starlette.testclient import TestClient  # noqa: E402
+
+from src.api import create_app, main  # noqa: E402
+from src.services.rate_limiter import RateLimitTimeout  # noqa: E402
+from src.utils.deadline import DeadlineExceeded  # noqa: E402
+
+RESUME = "Jane Doe\nSenior Engineer\nPython, distributed systems"
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """A test client for the service with a small extraction pool."""
+    monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        with TestClient(create_app(executor=executor)) as test_client:
+            yield test_client
+
+
+@pytest.fixture
+def mock_analyze():
+    with patch("src.api.analyze_resume_async", new_callable=AsyncMock) as mock:
+        mock.return_value = "Great resume"
+        yield mock
+
+
+class TestAnalyze:
+    def test_multipart_upload(self, client, mock_analyze):
+        """Test that an uploaded file is extracted and analyzed."""
+        response = client.post(
+            "/v1/analyze",
+            files={"file": ("resume.txt", RESUME.encode(), "text/plain")},
+            data={"job_role": " Data Engineer "},
+        )
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["analysis"] == "Great resume"
+        assert body["job_role"] == "Data Engineer"
+        assert set(body["stages"]) == {"extraction", "analysis"}
+        text, job_role = mock_analyze.call_args.args
+        assert "Senior Engineer" in text
+        assert job_role == "Data Engineer"
+
+    def test_json_text(self, client, mock_analyze):
+        """Test that raw text is accepted without an upload."""
+        response = client.post("/v1/analyze", json={"text": RESUME})
+
+        assert response.status_code == 200
+        assert response.json()["text_chars"] > 0
+        assert mock_analyze.call_args.args[1] == ""
+
+    def test_several_roles_share_one_analysis(self, client):
+        """Test that a role list is answered per role from one call."""
+        analyses = {"Data Scientist": "DS feedback", "SRE": "SRE feedback"}
+        with patch(
+            "src.api.analyze_resume_multi_role_async",
+            new_callable=AsyncMock,
+            return_value=analyses,
+        ) as mock_multi:
+            response = client.post(
+                "/v1/analyze",
+                files={"file": ("resume.txt", RESUME.encode(), "text/plain")},
+                data={"job_roles": ["Data Scientist", "SRE", "sre"]},
+            )
+
+        assert response.status_code == 200
+        assert response.json()["analyses"] == analyses
+        assert response.json()["job_roles"] == ["Data Scientist", "SRE"]
+        mock_multi.assert_awaited_once()
+
+    def test_streaming_several_roles_is_rejected(self, client, mock_analyze):
+        """Test that streams are limited to a single role."""
+        response = client.post(
+            "/v1/analyze?stream=true",
+            json={"text": RESUME, "job_roles": ["Data Scientist", "SRE"]},
+        )
+        assert response.status_code == 400
+
+    def test_type_is_taken_from_the_extension(self, client, mock_analyze):
+        """Test that a generic content type does not defeat extraction."""
+        response = client.post(
+            "/v1/analyze",
+            files={"file": ("resume.txt", RESUME.encode(), "application/octet-stream")},
+        )
+        assert response.status_code == 200
+
+    @pytest.mark.parametrize(
+        "kwargs, status",
+        [
+            ({"files": {"file": ("resume.png", b"\x89PNG", "image/png")}}, 415),
+            ({"files": {"resume": ("resume.txt", b"text", "text/plain")}}, 400),
+            (
+                {
+                    "content": b"--x\r\n",
+                    "headers": {"content-type": "multipart/form-data"},
+                },
+                400,
+            ),
+            ({"json": {"text": 42}}, 400),
+            ({"json": {"text": "Resume", "job_roles": [1, 2]}}, 400),
+            ({"json": {"text": "Resume", "job_roles": "SRE"}}, 400),
+            ({"json": {"text": "Resume", "job_roles": 5}}, 400),
+            ({"json": {"text": "Resume", "job_role": 5}}, 400),
+            ({"json": {"text": "   "}}, 422),
+            ({"content": b"plain", "headers": {"content-type": "text/csv"}}, 415),
+        ],
+    )
+    def test_invalid_requests(self, client, mock_analyze, kwargs, status):
+        """Test that bad input is rejected before any analysis."""
+        response = client.post("/v1/analyze", **kwargs)
+
+        assert response.status_code == status
+        assert response.json()["error"]
+        mock_analyze.assert_not_called()
+
+    def test_upload_over_the_limit(self, client, mock_analyze, monkeypatch):
+        """Test that the upload size limit maps to 413."""
+        monkeypatch.setenv("UPLOAD_MAX_MB", "0.01")
+        data = b"x" * 200_000
+
+        response = client.post(
+            "/v1/analyze", files={"file": ("resume.txt", data, "text/plain")}
+        )
+        assert response.status_code == 413
+
+    @pytest.mark.parametrize(
+        "error, status",
+        [
+            (RateLimitTimeout(12.3), 429),
+            (DeadlineExceeded("analysis", 30), 504),
+            (ValueError("OPENROUTER_API_KEY environment variable is not set"), 503),
+            (RuntimeError("upstream down"), 502),
+        ],
+    )
+    def test_analysis_errors(self, client, mock_analyze, error, status):
+        """Test that analysis failures map to distinct statuses."""
+        mock_analyze.side_effect = error
+
+        response = client.post("/v1/analyze", json={"text": RESUME})
+
+        assert response.status_code == status
+        assert str(error) in response.json()["error"]
+        if status == 429:
+            assert response.headers["retry-after"] == "12"
+
+    def test_streamed_analysis(self, client):
+        """Test that ?stream=true returns the chunks as they are produced."""
+
+        async def stream(text, job_role, deadline=None):
+            for chunk in ("Good ", "resume"):
+                yield chunk
+
+        with patch("src.api.analyze_resume_stream_async", stream):
+            response = client.post(
+                "/v1/analyze?stream=true", json={"text": RESUME, "job_role": "QA"}
+            )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert response.text == "Good resume"
+
+    def test_stream_that_cannot_start_reports_an_error(self, client):
+        """Test that failures before the first chunk still get a status."""
+
+        async def stream(text, job_role, deadline=None):
+            raise RateLimitTimeout(5)
+            yield
+
+        with patch("src.api.analyze_resume_stream_async", stream):
+            response = client.post("/v1/analyze?stream=1", json={"text": RESUME})
+
+        assert response.status_code == 429
+
+
+class TestProbes:
+    def test_health(self, client):
+        """Test the liveness probe."""
+        assert client.get("/healthz").json() == {"status": "ok"}
+
+    def test_ready(self, client):
+        """Test the readiness probe with the API key configured."""
+        response = client.get("/readyz")
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
+
+    def test_not_ready_without_api_key(self, client, monkeypatch):
+        """Test that a replica without credentials is taken out of rotation."""
+        monkeypatch.delenv("OPENROUTER_API_KEY")
+
+        response = client.get("/readyz")
+
+        assert response.status_code == 503
+        assert "OPENROUTER_API_KEY is not set" in response.json()["reasons"]
+
+    def test_metrics(self, client, mock_analyze):
+        """Test that stage timings are exported after a request."""
+        client.post("/v1/analyze", json={"text": RESUME})
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert 'stage="request"' in response.text
+
+
+class TestMain:
+    def test_defaults_come_from_the_env_file(self, monkeypatch):
+        """Test that .env is loaded before the command-line defaults are read."""
+        monkeypatch.delenv("API_PORT", raising=False)
+
+        def load_environment():
+            monkeypatch.setenv("API_PORT", "9123")
+
+        with (
+            patch("src.api.load_environment", side_effect=load_environment),
+            patch("uvicorn.run") as mock_run,
+        ):
+            main([])
+
+        assert mock_run.call_args.kwargs["port"] == 9123
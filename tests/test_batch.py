@@ -0,0 +1,131 @@
+"""
+Tests for the headless batch analysis command.
+"""
+
+import asyncio
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, patch
+from src.batch import discover_inputs, extract_path, load_completed, main, run_batch
+
+
+def _write(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+    return str(path)
+
+
+async def _fake_analysis(text, job_role=None, metrics=None):
+    if not text.strip():
+        raise ValueError("Resume text is empty")
+    if metrics is not None:
+        metrics.update(cached=False, total_tokens=100)
+    return f"Analysis of {text}"
+
+
+class TestBatch:
+    def test_discover_directory(self, tmp_path):
+        """Test that supported files are found recursively in a stable order."""
+        _write(tmp_path / "b.txt", "B")
+        _write(tmp_path / "nested" / "a.pdf", "")
+        _write(tmp_path / "notes.md", "ignored")
+
+        items = discover_inputs(str(tmp_path), "Engineer")
+
+        assert [item["path"] for item in items] == [
+            str(tmp_path / "b.txt"),
+            str(tmp_path / "nested" / "a.pdf"),
+        ]
+        assert all(item["job_role"] == "Engineer" for item in items)
+
+    def test_discover_manifest(self, tmp_path):
+        """Test plain and JSON manifest lines with relative paths."""
+        manifest = _write(
+            tmp_path / "manifest.txt",
+            '# comment\none.txt\n{"path": "two.txt", "job_role": "Designer"}\n',
+        )
+
+        items = discover_inputs(manifest, "Engineer")
+
+        assert items == [
+            {"path": str(tmp_path / "one.txt"), "job_role": "Engineer"},
+            {"path": str(tmp_path / "two.txt"), "job_role": "Designer"},
+        ]
+
+    def test_extract_path_hashes_the_file(self, tmp_path):
+        """Test that the digest covers the whole file."""
+        data = "Resume line\n" * 100_000
+        path = _write(tmp_path / "resume.txt", data)
+
+        text, digest = extract_path(path)
+
+        assert text.startswith("Resume line")
+        assert digest == hashlib.sha256(data.encode()).hexdigest()
+
+    @patch("src.batch.analyze_resume_async", side_effect=_fake_analysis)
+    def test_run_batch_writes_jsonl(self, mock_analyze, tmp_path):
+        """Test that every resume produces one JSON line."""
+        items = [
+            {"path": _write(tmp_path / "a.txt", "Alice"), "job_role": None},
+            {"path": _write(tmp_path / "b.txt", "Bob"), "job_role": "QA"},
+            {"path": _write(tmp_path / "c.txt", "  "), "job_role": None},
+        ]
+        output = tmp_path / "results.jsonl"
+
+        with ThreadPoolExecutor(2) as executor:
+            stats = asyncio.run(
+                run_batch(items, str(output), concurrency=2, executor=executor)
+            )
+
+        records = {
+            r["path"]: r for r in map(json.loads, output.read_text().splitlines())
+        }
+        assert records[items[0]["path"]]["analysis"] == "Analysis of Alice"
+        assert records[items[1]["path"]]["job_role"] == "QA"
+        assert records[items[2]["path"]]["status"] == "error"
+        assert stats.succeeded == 2
+        assert stats.failed == 1
+        assert stats.summary()["tokens"] == 200
+
+    def test_run_batch_resumes_from_checkpoint(self, tmp_path):
+        """Test that completed items are skipped and failures are retried."""
+        done = _write(tmp_path / "done.txt", "Done")
+        retry = _write(tmp_path / "retry.txt", "Retry")
+        output = tmp_path / "results.jsonl"
+        output.write_text(
+            json.dumps({"path": done, "job_role": None, "status": "ok"})
+            + "\n"
+            + json.dumps({"path": retry, "job_role": None, "status": "error"})
+            + "\n"
+            + '{"path": "truncated'
+        )
+        items = [{"path": done, "job_role": None}, {"path": retry, "job_role": None}]
+
+        with (
+            patch("src.batch.analyze_resume_async", new_callable=AsyncMock) as mock,
+            ThreadPoolExecutor(1) as executor,
+        ):
+            mock.return_value = "Analysis"
+            stats = asyncio.run(run_batch(items, str(output), executor=executor))
+
+        mock.assert_awaited_once()
+        assert stats.skipped == 1
+        assert stats.succeeded == 1
+        assert (retry, None) in load_completed(str(output))
+
+    @patch("src.batch.analyze_resume_async", side_effect=_fake_analysis)
+    def test_main_prints_throughput(self, mock_analyze, tmp_path, capsys):
+        """Test the command-line entry point end to end."""
+        _write(tmp_path / "in" / "a.txt", "Alice")
+        output = tmp_path / "out.jsonl"
+
+        exit_code = main(
+            [str(tmp_path / "in"), "-o", str(output), "-w", "1", "-c", "1"]
+        )
+
+        assert exit_code == 0
+        assert len(output.read_text().splitlines()) == 1
+        printed = capsys.readouterr().out
+        assert "resumes/min" in printed
+        assert "tokens/s" in printed
@@ -0,0 +1,26 @@
+"""
+Tests for the configuration helpers.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from src.config import load_environment
+
+
+class TestLoadEnvironment:
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        """Let every test load the environment afresh."""
+        load_environment.cache_clear()
+        yield
+        load_environment.cache_clear()
+
+    @patch("dotenv.load_dotenv", return_value=True)
+    def test_loads_the_env_file_once(self, mock_load_dotenv):
+        """Test that repeated calls (e.g. on every rerun) read .env once."""
+        assert load_environment() is True
+        assert load_environment() is True
+
+        mock_load_dotenv.assert_called_once_with()
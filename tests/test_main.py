@@ -2,12 +2,26 @@
 Tests for the main application functionality.
 """
 
+import threading
+import time
+
 import pytest
 import streamlit as st
 from unittest.mock import patch, MagicMock
 
+from src.services.jobs import RUNNING, get_job_queue
+from src.services.rate_limiter import RateLimitTimeout
+from src.utils.deadline import DeadlineExceeded
+from src.utils.metrics import get_stage_timings
+from src.utils.upload import UploadTooLargeError
+
 
 class TestMainApp:
+    @pytest.fixture(autouse=True)
+    def inline_jobs(self, monkeypatch):
+        """Run analysis jobs in the script thread so results render at once."""
+        monkeypatch.setenv("JOB_WORKERS", "0")
+
     def test_file_uploader(self, mock_streamlit_components):
         """Test file uploader component."""
         mock_file_uploader, _, _ = mock_streamlit_components
@@ -29,13 +43,21 @@ class TestMainApp:
         analyze_button = st.button("Analyze Resume")
         assert analyze_button is True
 
+    @pytest.fixture(autouse=True)
+    def inline_fragments(self):
+        """Run fragments directly; outside `streamlit run` they are skipped."""
+        with patch(
+            "streamlit.fragment", side_effect=lambda func, run_every=None: func
+        ) as mock_fragment:
+            yield mock_fragment
+
     @pytest.fixture
     def mock_main_components(self):
         """Fixture for mocking main components."""
         with (
             patch("streamlit.file_uploader") as mock_uploader,
             patch("streamlit.text_input") as mock_input,
-            patch("streamlit.button") as mock_button,
+            patch("streamlit.form_submit_button") as mock_button,
             patch("streamlit.spinner") as mock_spinner,
             patch("streamlit.progress") as mock_progress,
             patch("streamlit.success") as mock_success,
@@ -83,12 +105,12 @@ class TestMainApp:
         mock_tabs.return_value = [MagicMock(), MagicMock(), MagicMock()]
 
         with (
-            patch("src.utils.text_extractor.extract_text_from_file") as mock_extract,
-            patch("src.services.ai_analyzer.analyze_resume") as mock_analyze,
+            patch("main.extract_text_from_file") as mock_extract,
+            patch("main.analyze_resume_stream") as mock_analyze,
         ):
             # Set up mock returns
             mock_extract.return_value = "Extracted resume text"
-            mock_analyze.return_value = "Analysis result"
+            mock_analyze.return_value = iter(["Analysis ", "result"])
 
             # Import and run main
             from main import main
@@ -97,11 +119,16 @@ class TestMainApp:
 
             # Verify the workflow
             mock_extract.assert_called_once()
-            mock_analyze.assert_called_once_with(
-                "Extracted resume text", "Software Engineer"
+            mock_analyze.assert_called_once()
+            assert mock_analyze.call_args[0] == (
+                "Extracted resume text",
+                "Software Engineer",
             )
+            mock_markdown.assert_any_call("Analysis result")
             mock_success.assert_called()
             mock_error.assert_not_called()
+            mock_download.assert_called_once()
+            assert mock_download.call_args[1]["data"] == "Analysis result"
 
     def test_empty_file_handling(self, mock_main_components, mock_empty_file):
         """Test handling of empty file upload."""
@@ -121,10 +148,14 @@ class TestMainApp:
 
         # Set up mocks before importing main
         mock_uploader.return_value = mock_empty_file  # Mock uploaded file
+        mock_input.return_value = ""
         mock_button.return_value = True  # Simulate button click
 
         # Direct patch of extract_text_from_file at the module level
-        with patch("main.extract_text_from_file", return_value=""):
+        with (
+            patch("main.extract_text_from_file", return_value=""),
+            patch("main.analyze_resume_stream"),
+        ):
             # Mock st.stop to prevent test termination
             with patch("streamlit.stop") as mock_stop:
                 # Now import and run main
@@ -166,7 +197,7 @@ class TestMainApp:
 
         with (
             patch("main.extract_text_from_file") as mock_extract,
-            patch("main.analyze_resume") as mock_analyze,
+            patch("main.analyze_resume_stream") as mock_analyze,
         ):
             mock_extract.side_effect = test_error
 
@@ -180,6 +211,188 @@ class TestMainApp:
             mock_success.assert_not_called()
             mock_error.assert_called_with("An error occurred: Test error")
 
+    def test_oversized_upload_is_rejected(
+        self, mock_main_components, mock_uploaded_file
+    ):
+        """Test that uploads over the size limit get a specific message."""
+        mock_uploader, mock_input, mock_button = mock_main_components[:3]
+        mock_error = mock_main_components[6]
+        mock_uploader.return_value = mock_uploaded_file
+        mock_input.return_value = ""
+        mock_button.return_value = True
+
+        with (
+            patch("main.extract_text_from_file") as mock_extract,
+            patch("main.analyze_resume_stream") as mock_analyze,
+        ):
+            mock_extract.side_effect = UploadTooLargeError(20 * 2**20, 10 * 2**20)
+
+            from main import main
+
+            main()
+
+            mock_analyze.assert_not_called()
+            mock_error.assert_called_once_with(
+                "⚠️ File is too large (20.0 MB); the maximum upload size is 10.0 MB."
+            )
+
+    def test_streaming_error_shows_fallback(
+        self, mock_main_components, mock_uploaded_file
+    ):
+        """Test that an upstream failure renders the offline fallback."""
+        (
+            mock_uploader,
+            mock_input,
+            mock_button,
+            mock_spinner,
+            mock_progress,
+            mock_success,
+            mock_error,
+            mock_info,
+            mock_markdown,
+            mock_tabs,
+            mock_download,
+        ) = mock_main_components
+
+        mock_uploader.return_value = mock_uploaded_file
+        mock_input.return_value = ""
+        mock_button.return_value = True
+        mock_progress.return_value = MagicMock()
+
+        with (
+            patch("main.extract_text_from_file", return_value="Resume text"),
+            patch("main.analyze_resume_stream", side_effect=Exception("Upstream down")),
+        ):
+            from main import main
+
+            main()
+
+        mock_error.assert_called_with(
+            "An error occurred during analysis: Upstream down"
+        )
+        assert "Offline Mode" in mock_download.call_args[1]["data"]
+
+    def test_rate_limit_timeout_asks_to_retry(
+        self, mock_main_components, mock_uploaded_file
+    ):
+        """Test that a saturated rate limiter is reported as a retryable state."""
+        (
+            mock_uploader,
+            mock_input,
+            mock_button,
+            mock_spinner,
+            mock_progress,
+            mock_success,
+            mock_error,
+            mock_info,
+            mock_markdown,
+            mock_tabs,
+            mock_download,
+        ) = mock_main_components
+
+        mock_uploader.return_value = mock_uploaded_file
+        mock_input.return_value = ""
+        mock_button.return_value = True
+        mock_progress.return_value = MagicMock()
+
+        with (
+            patch("main.extract_text_from_file", return_value="Resume text"),
+            patch("main.analyze_resume_stream", side_effect=RateLimitTimeout(12)),
+            patch("streamlit.warning") as mock_warning,
+        ):
+            from main import main
+
+            main()
+
+        mock_error.assert_not_called()
+        assert "try again in about 12 seconds" in mock_warning.call_args[0][0]
+        assert "Offline Mode" not in mock_download.call_args[1]["data"]
+
+    def test_analysis_exports_stage_metrics(
+        self, mock_main_components, mock_uploaded_file, monkeypatch, tmp_path
+    ):
+        """Test that render and request timings are recorded and exported."""
+        (
+            mock_uploader,
+            mock_input,
+            mock_button,
+            mock_spinner,
+            mock_progress,
+            mock_success,
+            mock_error,
+            mock_info,
+            mock_markdown,
+            mock_tabs,
+            mock_download,
+        ) = mock_main_components
+
+        metrics_file = tmp_path / "resume_analyzer.prom"
+        monkeypatch.setenv("METRICS_FILE", str(metrics_file))
+        mock_uploader.return_value = mock_uploaded_file
+        mock_input.return_value = ""
+        mock_button.return_value = True
+        mock_progress.return_value = MagicMock()
+
+        with (
+            patch("main.extract_text_from_file", return_value="Resume text"),
+            patch("main.analyze_resume_stream", return_value=iter(["A ", "B"])),
+        ):
+            from main import main
+
+            main()
+
+        stages = get_stage_timings().snapshot()["stages"]
+        assert stages["render"]["count"] == 1
+        assert stages["request"]["count"] == 1
+        assert 'stage="request"' in metrics_file.read_text()
+
+    def test_deadline_exceeded_reports_budget(
+        self, mock_main_components, mock_uploaded_file, monkeypatch
+    ):
+        """Test that running out of time is reported with the stage timings."""
+        (
+            mock_uploader,
+            mock_input,
+            mock_button,
+            mock_spinner,
+            mock_progress,
+            mock_success,
+            mock_error,
+            mock_info,
+            mock_markdown,
+            mock_tabs,
+            mock_download,
+        ) = mock_main_components
+
+        monkeypatch.setenv("REQUEST_TIMEOUT_SECONDS", "45")
+        mock_uploader.return_value = mock_uploaded_file
+        mock_input.return_value = ""
+        mock_button.return_value = True
+        mock_progress.return_value = MagicMock()
+
+        with (
+            patch(
+                "main.extract_text_from_file", return_value="Resume text"
+            ) as mock_extract,
+            patch(
+                "main.analyze_resume_stream",
+                side_effect=DeadlineExceeded("analysis", 45),
+            ),
+            patch("streamlit.caption") as mock_caption,
+        ):
+            from main import main
+
+            main()
+
+        deadline = mock_extract.call_args[1]["deadline"]
+        assert deadline.budget == 45
+        assert "timed out during analysis" in mock_error.call_args[0][0]
+        assert "Offline Mode" not in mock_download.call_args[1]["data"]
+        caption = mock_caption.call_args[0][0]
+        assert "extraction" in caption
+        assert "analysis" in caption
+        assert "budget 45s" in caption
+
     def test_no_file_uploaded(self, mock_main_components):
         """Test behavior when no file is uploaded."""
         (
@@ -210,3 +423,118 @@ class TestMainApp:
         mock_progress.assert_not_called()
         mock_success.assert_not_called()
         mock_error.assert_not_called()
+
+    def test_reruns_reuse_the_finished_job(
+        self, mock_main_components, mock_uploaded_file
+    ):
+        """Test that reruns and repeated clicks read the stored result back."""
+        mock_uploader, mock_input, mock_button = mock_main_components[:3]
+        mock_download = mock_main_components[10]
+        mock_uploader.return_value = mock_uploaded_file
+        mock_input.return_value = "Software Engineer"
+
+        with (
+            patch("main.extract_text_from_file", return_value="Resume text"),
+            patch(
+                "main.analyze_resume_stream", return_value=iter(["Done"])
+            ) as mock_analyze,
+        ):
+            from main import main
+
+            # Click, rerun without clicking, click again
+            for clicked in (True, False, True):
+                mock_button.return_value = clicked
+                main()
+
+        mock_analyze.assert_called_once()
+        assert mock_download.call_count == 3
+        assert mock_download.call_args[1]["data"] == "Done"
+        # Downloading must not rerun the page
+        assert mock_download.call_args[1]["on_click"] == "ignore"
+        assert get_job_queue().stats()["deduplicated"] == 1
+
+    def test_running_job_shows_progress(
+        self, mock_main_components, mock_uploaded_file, monkeypatch, inline_fragments
+    ):
+        """Test that a job on a worker is polled instead of awaited."""
+        mock_uploader, mock_input, mock_button = mock_main_components[:3]
+        mock_info, mock_markdown = mock_main_components[7:9]
+        monkeypatch.setenv("JOB_WORKERS", "1")
+        mock_uploader.return_value = mock_uploaded_file
+        mock_input.return_value = ""
+        mock_button.return_value = True
+        release = threading.Event()
+
+        def stream(*args, **kwargs):
+            yield "Partial "
+            release.wait(5)
+            yield "analysis"
+
+        with (
+            patch("main.extract_text_from_file", return_value="Resume text"),
+            patch("main.analyze_resume_stream", side_effect=stream),
+            patch("streamlit.rerun") as mock_rerun,
+        ):
+            from main import JOB_ID_KEY, main, show_job_panel
+
+            main()
+            job = get_job_queue().get(st.session_state[JOB_ID_KEY])
+            while job.status != RUNNING or not job.partial():
+                time.sleep(0.01)
+
+            mock_button.return_value = False
+            main()
+            assert inline_fragments.call_args[1]["run_every"] == 1.0
+            mock_info.assert_any_call("🧠 Analyzing your resume with AI...")
+            mock_markdown.assert_any_call("Partial ")
+
+            release.set()
+            while not job.finished:
+                time.sleep(0.01)
+            show_job_panel(job.id, polling=True)
+            mock_rerun.assert_called_once()
+
+        assert job.result == "Partial analysis"
+
+    def test_commas_stay_inside_a_role(self):
+        """Test that only semicolons and line breaks separate roles."""
+        from main import parse_job_roles
+
+        assert parse_job_roles("Engineer, Backend; VP, Sales\nSRE") == [
+            "Engineer, Backend",
+            "VP, Sales",
+            "SRE",
+        ]
+        assert parse_job_roles(None) == []
+
+    def test_several_roles_are_analyzed_together(
+        self, mock_main_components, mock_uploaded_file
+    ):
+        """Test that a semicolon-separated role list yields one tab per role."""
+        mock_uploader, mock_input, mock_button = mock_main_components[:3]
+        mock_markdown, mock_tabs, mock_download = mock_main_components[8:]
+        mock_uploader.return_value = mock_uploaded_file
+        mock_input.return_value = "Data Scientist; SRE; data scientist"
+        mock_button.return_value = True
+        mock_tabs.return_value = [MagicMock(), MagicMock()]
+        analyses = {"Data Scientist": "DS feedback", "SRE": "SRE feedback"}
+
+        with (
+            patch("main.extract_text_from_file", return_value="Resume text"),
+            patch("main.analyze_resume_stream") as mock_stream,
+            patch(
+                "main.analyze_resume_multi_role", return_value=analyses
+            ) as mock_multi,
+        ):
+            from main import main
+
+            main()
+
+        mock_stream.assert_not_called()
+        assert mock_multi.call_args[0] == ("Resume text", ["Data Scientist", "SRE"])
+        mock_tabs.assert_called_once_with(["Data Scientist", "SRE"])
+        mock_markdown.assert_any_call("DS feedback")
+        mock_markdown.assert_any_call("SRE feedback")
+        data = mock_download.call_args[1]["data"]
+        assert "# Data Scientist\n\nDS feedback" in data
+        assert "# SRE\n\nSRE feedback" in data
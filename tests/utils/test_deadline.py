@@ -0,0 +1,94 @@
+"""
+Tests for the request deadline.
+"""
+
+import pytest
+
+from src.utils.deadline import (
+    DEFAULT_REQUEST_TIMEOUT,
+    Deadline,
+    DeadlineExceeded,
+    check_deadline,
+    remaining_time,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestDeadline:
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    def test_remaining_time_counts_down(self, clock):
+        """Test that the remaining budget shrinks and never goes negative."""
+        deadline = Deadline(10, clock=clock)
+        clock.now = 4
+        assert deadline.remaining() == 6
+        assert not deadline.expired()
+        clock.now = 12
+        assert deadline.remaining() == 0
+        assert deadline.expired()
+
+    def test_unlimited_budget(self, clock):
+        """Test that a zero budget never expires."""
+        deadline = Deadline(0, clock=clock)
+        clock.now = 1e6
+        assert deadline.budget is None
+        assert deadline.remaining() is None
+        deadline.check("analysis")
+
+    def test_check_raises_with_stage(self, clock):
+        """Test the distinct error raised once the budget is used up."""
+        deadline = Deadline(5, clock=clock)
+        clock.now = 5
+        with pytest.raises(DeadlineExceeded) as exc_info:
+            deadline.check("extraction")
+        assert isinstance(exc_info.value, TimeoutError)
+        assert exc_info.value.stage == "extraction"
+        assert "during extraction" in str(exc_info.value)
+        assert "5s time budget" in str(exc_info.value)
+
+    def test_stages_are_timed(self, clock):
+        """Test that stage() records each stage's share of the budget."""
+        deadline = Deadline(10, clock=clock)
+        with deadline.stage("extraction"):
+            clock.now = 1
+        with pytest.raises(RuntimeError):
+            with deadline.stage("analysis"):
+                clock.now = 5
+                raise RuntimeError("boom")
+        assert deadline.report() == [("extraction", 1, 0.1), ("analysis", 4, 0.4)]
+
+    def test_stage_fails_fast_when_expired(self, clock):
+        """Test that a stage does not start once the budget is used up."""
+        deadline = Deadline(1, clock=clock)
+        clock.now = 2
+        with pytest.raises(DeadlineExceeded):
+            with deadline.stage("analysis"):
+                pytest.fail("stage should not run")
+        assert deadline.report() == []
+
+    def test_from_environment(self, monkeypatch):
+        """Test the configurable budget."""
+        assert Deadline.from_env().budget == DEFAULT_REQUEST_TIMEOUT
+        monkeypatch.setenv("REQUEST_TIMEOUT_SECONDS", "30")
+        assert Deadline.from_env().budget == 30
+        monkeypatch.setenv("REQUEST_TIMEOUT_SECONDS", "0")
+        assert Deadline.from_env().budget is None
+
+    def test_optional_deadline_helpers(self, clock):
+        """Test the helpers that accept a missing deadline."""
+        assert remaining_time(None) is None
+        check_deadline(None, "analysis")
+        deadline = Deadline(3, clock=clock)
+        assert remaining_time(deadline) == 3
+        clock.now = 3
+        with pytest.raises(DeadlineExceeded):
+            check_deadline(deadline, "analysis")
@@ -0,0 +1,62 @@
+"""
+Tests for the streaming DOCX reader.
+"""
+
+import io
+import zipfile
+
+import pytest
+from docx import Document
+
+from benchmarks.fixtures import make_docx
+from src.utils.docx_reader import iter_docx_xml_text
+from src.utils.text_extractor import extract_text_from_docx
+
+
+class TestDocxReader:
+    def test_matches_python_docx_paragraphs(self):
+        """Test that body paragraphs come out in order, as python-docx sees them."""
+        data = make_docx(20)
+        expected = "".join(p.text + "\n" for p in Document(io.BytesIO(data)).paragraphs)
+        text = "".join(iter_docx_xml_text(io.BytesIO(data)))
+        assert text == "Jane Doe - Resume\n" + expected
+
+    def test_includes_table_rows(self):
+        """Test that table cells are extracted and kept together per row."""
+        text = "".join(iter_docx_xml_text(io.BytesIO(make_docx(2, table_rows=2))))
+        assert text.endswith(
+            "Skill 0.0 | Skill 0.1 | Skill 0.2\nSkill 1.0 | Skill 1.1 | Skill 1.2\n"
+        )
+
+    def test_tabs_and_breaks(self):
+        """Test that tabs and line breaks inside runs are preserved."""
+        document = Document()
+        run = document.add_paragraph().add_run("Python")
+        run.add_tab()
+        run.add_text("5 years")
+        run.add_break()
+        run.add_text("Go")
+        buffer = io.BytesIO()
+        document.save(buffer)
+        buffer.seek(0)
+
+        assert list(iter_docx_xml_text(buffer))[-1] == "Python\t5 years\nGo\n"
+
+    def test_rejects_invalid_archive(self):
+        """Test that non-zip data fails before iteration starts."""
+        with pytest.raises(zipfile.BadZipFile):
+            iter_docx_xml_text(io.BytesIO(b"not a docx"))
+
+    def test_rejects_archive_without_document(self):
+        """Test that a zip without word/document.xml is rejected."""
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as archive:
+            archive.writestr("other.xml", "<x/>")
+        with pytest.raises(KeyError):
+            iter_docx_xml_text(buffer)
+
+    def test_extractor_uses_streaming_reader(self):
+        """Test that extract_text_from_docx picks up tables and headers."""
+        text = extract_text_from_docx(io.BytesIO(make_docx(1, table_rows=1)))
+        assert text.startswith("Jane Doe - Resume\n")
+        assert "Skill 0.0 | Skill 0.1 | Skill 0.2\n" in text
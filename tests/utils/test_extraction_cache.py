@@ -0,0 +1,81 @@
+"""
+Tests for the extraction cache.
+"""
+
+from unittest.mock import MagicMock, patch
+from src.utils.extraction_cache import (
+    ExtractionCache,
+    get_extraction_cache,
+    make_extraction_key,
+)
+from src.utils.text_extractor import EXTRACTOR_VERSION, extract_text_from_file
+
+
+class TestExtractionCache:
+    def test_key_depends_on_content_type_version_and_options(self):
+        """Test that every input that changes the output changes the key."""
+        key = make_extraction_key(b"data", "application/pdf", "1", 100, 0)
+        assert key == make_extraction_key(b"data", "application/pdf", "1", 100, 0)
+        assert key != make_extraction_key(b"other", "application/pdf", "1", 100, 0)
+        assert key != make_extraction_key(b"data", "text/plain", "1", 100, 0)
+        assert key != make_extraction_key(b"data", "application/pdf", "2", 100, 0)
+        assert key != make_extraction_key(b"data", "application/pdf", "1", 50, 0)
+
+    def test_lru_eviction_by_total_size(self):
+        """Test that least recently used texts are evicted to fit the bound."""
+        cache = ExtractionCache(max_chars=10)
+        cache.set("a", "aaaa")
+        cache.set("b", "bbbb")
+        cache.get("a")
+        cache.set("c", "cccc")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "aaaa"
+        assert cache.get("c") == "cccc"
+        stats = cache.stats()
+        assert stats["chars"] == 8
+        assert stats["evictions"] == 1
+
+    def test_oversized_text_is_not_cached(self):
+        """Test that a text larger than the cache is skipped."""
+        cache = ExtractionCache(max_chars=3)
+        cache.set("a", "abcd")
+        assert cache.get("a") is None
+
+    def test_disabled_cache(self):
+        """Test that a zero-sized cache stores nothing."""
+        cache = ExtractionCache(max_chars=0)
+        cache.set("a", "")
+        assert cache.get("a") is None
+
+
+class TestExtractTextFromFileCaching:
+    def _upload(self, content, file_type):
+        file = MagicMock()
+        file.type = file_type
+        file.read.return_value = content
+        return file
+
+    @patch("src.utils.text_extractor.extract_text_from_pdf_parallel")
+    def test_same_upload_is_parsed_once(self, mock_extract):
+        """Test that re-submitting the same bytes skips parsing."""
+        mock_extract.return_value = "PDF text"
+
+        first = extract_text_from_file(self._upload(b"%PDF", "application/pdf"))
+        second = extract_text_from_file(self._upload(b"%PDF", "application/pdf"))
+
+        assert first == second == "PDF text"
+        mock_extract.assert_called_once()
+        assert get_extraction_cache().stats()["hits"] == 1
+
+    @patch("src.utils.text_extractor.extract_text_from_pdf_parallel")
+    def test_different_content_is_parsed_again(self, mock_extract):
+        """Test that changed bytes miss the cache."""
+        mock_extract.side_effect = ["one", "two"]
+
+        assert extract_text_from_file(self._upload(b"1", "application/pdf")) == "one"
+        assert extract_text_from_file(self._upload(b"2", "application/pdf")) == "two"
+
+    def test_extractor_version_is_part_of_key(self):
+        """Test that the extractor version participates in the key."""
+        assert EXTRACTOR_VERSION in make_extraction_key(b"", "t", EXTRACTOR_VERSION)
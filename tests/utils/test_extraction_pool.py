@@ -0,0 +1,94 @@
+"""
+Tests for the shared extraction process pool and parallel PDF extraction.
+"""
+
+import io
+import pytest
+from unittest.mock import patch
+from benchmarks.fixtures import make_pdf
+from src.utils import extraction_pool
+from src.utils.extraction_pool import (
+    get_extraction_pool,
+    get_pool_size,
+    shutdown_extraction_pool,
+)
+from src.utils.text_extractor import (
+    extract_text_from_pdf,
+    extract_text_from_pdf_parallel,
+    split_page_ranges,
+)
+
+
+@pytest.fixture
+def small_pool(monkeypatch):
+    """Run the shared pool with two workers and tear it down afterwards."""
+    monkeypatch.setenv("EXTRACTION_POOL_SIZE", "2")
+    monkeypatch.setenv("PDF_POOL_MIN_PAGES", "2")
+    shutdown_extraction_pool()
+    yield
+    shutdown_extraction_pool()
+
+
+class TestExtractionPool:
+    def test_pool_size_from_environment(self, monkeypatch):
+        """Test the configurable pool size."""
+        monkeypatch.setenv("EXTRACTION_POOL_SIZE", "3")
+        assert get_pool_size() == 3
+
+    def test_pool_disabled(self, monkeypatch):
+        """Test that a pool size of zero disables the pool."""
+        monkeypatch.setenv("EXTRACTION_POOL_SIZE", "0")
+        shutdown_extraction_pool()
+        assert get_extraction_pool() is None
+
+    def test_no_nested_pool_in_workers(self, small_pool):
+        """Test that worker processes never create their own pool."""
+        with patch.object(extraction_pool, "_in_worker", True):
+            assert get_extraction_pool() is None
+
+    def test_pool_is_shared(self, small_pool):
+        """Test that the same pool is returned on every call."""
+        assert get_extraction_pool() is get_extraction_pool()
+
+    def test_split_page_ranges(self):
+        """Test that page ranges cover the document in order."""
+        assert split_page_ranges(10, 4) == [(0, 3), (3, 6), (6, 9), (9, 10)]
+        assert split_page_ranges(5, 2, pages_per_task=2) == [(0, 2), (2, 4), (4, 5)]
+        assert split_page_ranges(1, 8) == [(0, 1)]
+
+
+class TestParallelPdfExtraction:
+    def test_parallel_matches_serial(self, small_pool):
+        """Test that parallel extraction reassembles pages in order."""
+        data = make_pdf(7, lines_per_page=5)
+        expected = extract_text_from_pdf(io.BytesIO(data))
+
+        assert extract_text_from_pdf_parallel(data) == expected
+        assert expected.index("[0.0]") < expected.index("[6.0]")
+
+    def test_parallel_honours_budgets(self, small_pool, monkeypatch):
+        """Test page and character budgets on the pool path."""
+        monkeypatch.setenv("PDF_PAGES_PER_TASK", "1")
+        data = make_pdf(8, lines_per_page=5)
+        expected = extract_text_from_pdf(io.BytesIO(data))
+
+        assert extract_text_from_pdf_parallel(data, max_chars=150) == expected[:150]
+        text = extract_text_from_pdf_parallel(data, max_pages=3)
+        assert "[2.0]" in text
+        assert "[3.0]" not in text
+
+    def test_short_documents_are_extracted_inline(self, small_pool):
+        """Test that documents below the page threshold skip the pool."""
+        data = make_pdf(1, lines_per_page=3)
+        with patch("src.utils.text_extractor.get_extraction_pool") as mock_pool:
+            mock_pool.return_value.submit.side_effect = AssertionError("used pool")
+            assert "[0.0]" in extract_text_from_pdf_parallel(data)
+
+    def test_inline_when_pool_disabled(self, monkeypatch):
+        """Test the fallback when the pool is disabled."""
+        monkeypatch.setenv("EXTRACTION_POOL_SIZE", "0")
+        shutdown_extraction_pool()
+        data = make_pdf(4, lines_per_page=2)
+        assert extract_text_from_pdf_parallel(data) == extract_text_from_pdf(
+            io.BytesIO(data)
+        )
@@ -0,0 +1,174 @@
+"""
+Tests for latency statistics and the Prometheus export.
+"""
+
+import urllib.request
+from unittest.mock import patch
+
+import pytest
+
+from src.utils.metrics import (
+    LatencyStats,
+    StageTimings,
+    export_metrics,
+    get_latency_stats,
+    get_stage_timings,
+    percentile,
+    render_prometheus,
+    start_metrics_exporter,
+    start_metrics_server,
+)
+
+
+class TestPercentile:
+    def test_nearest_rank(self):
+        """Test nearest-rank percentiles on a small sample."""
+        samples = [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0]
+        assert percentile(samples, 50) == 5.0
+        assert percentile(samples, 90) == 9.0
+        assert percentile(samples, 99) == 10.0
+        assert percentile([3.0], 50) == 3.0
+
+
+class TestLatencyStats:
+    def test_snapshot_per_model_and_stage(self):
+        """Test that samples and counters are reported per model."""
+        stats = LatencyStats()
+        for seconds in (0.5, 1.0, 1.5, 2.0):
+            stats.record("primary", "first_token", seconds)
+        stats.record("fallback", "total", 3.0)
+        stats.count("primary", "served")
+        stats.count("primary", "hedged")
+
+        snapshot = stats.snapshot()
+
+        assert snapshot["primary"]["served"] == 1
+        assert snapshot["primary"]["hedged"] == 1
+        assert snapshot["primary"]["first_token"] == {
+            "count": 4,
+            "p50": 1.0,
+            "p90": 2.0,
+            "p99": 2.0,
+        }
+        assert snapshot["fallback"]["total"]["p50"] == 3.0
+
+    def test_window_keeps_recent_samples(self):
+        """Test that old samples fall out of the window."""
+        stats = LatencyStats(window=3)
+        for seconds in (10.0, 1.0, 2.0, 3.0):
+            stats.record("model", "total", seconds)
+
+        summary = stats.snapshot()["model"]["total"]
+
+        assert summary["count"] == 3
+        assert summary["p99"] == 3.0
+
+    def test_window_from_environment(self, monkeypatch):
+        """Test that the shared instance reads LATENCY_WINDOW."""
+        monkeypatch.setenv("LATENCY_WINDOW", "5")
+        assert get_latency_stats().window == 5
+
+
+class TestStageTimings:
+    def test_histogram_buckets_are_cumulative(self):
+        """Test bucket counts, sum and count for a stage."""
+        timings = StageTimings(buckets=(0.1, 1.0))
+        for seconds in (0.05, 0.5, 0.7, 5.0):
+            timings.observe("extraction", seconds)
+
+        stage = timings.snapshot()["stages"]["extraction"]
+
+        assert stage["buckets"] == [(0.1, 1), (1.0, 3)]
+        assert stage["count"] == 4
+        assert stage["sum"] == pytest.approx(6.25)
+        assert stage["errors"] == 0
+
+    def test_span_records_failures(self):
+        """Test that a failing block is timed and counted as an error."""
+        timings = StageTimings()
+        with timings.span("prompt_build"):
+            pass
+        with pytest.raises(RuntimeError):
+            with timings.span("prompt_build"):
+                raise RuntimeError("boom")
+
+        stage = timings.snapshot()["stages"]["prompt_build"]
+        assert stage["count"] == 2
+        assert stage["errors"] == 1
+
+
+class TestPrometheusExport:
+    @pytest.fixture
+    def populated(self):
+        timings = get_stage_timings()
+        timings.observe("extraction_page", 0.02)
+        timings.increment("analysis_cached")
+        get_latency_stats().count("primary", "served")
+
+    def test_exposition_format(self, populated):
+        """Test the histogram, counter and per-model lines."""
+        text = render_prometheus()
+
+        assert "# TYPE resume_analyzer_stage_duration_seconds histogram" in text
+        assert (
+            'resume_analyzer_stage_duration_seconds_bucket{stage="extraction_page",'
+            'le="0.025"} 1'
+        ) in text
+        assert (
+            'resume_analyzer_stage_duration_seconds_bucket{stage="extraction_page",'
+            'le="+Inf"} 1'
+        ) in text
+        assert (
+            'resume_analyzer_stage_duration_seconds_count{stage="extraction_page"} 1'
+        ) in text
+        assert 'resume_analyzer_events_total{event="analysis_cached"} 1' in text
+        assert (
+            'resume_analyzer_model_events_total{model="primary",event="served"} 1'
+        ) in text
+
+    def test_metrics_file(self, populated, tmp_path, monkeypatch):
+        """Test the textfile export."""
+        path = tmp_path / "resume_analyzer.prom"
+        monkeypatch.setenv("METRICS_FILE", str(path))
+
+        export_metrics()
+
+        assert path.read_text() == render_prometheus()
+        assert list(tmp_path.iterdir()) == [path]
+
+    def test_unwritable_metrics_file_is_logged(
+        self, populated, tmp_path, monkeypatch, caplog
+    ):
+        """Test that a failed export is logged instead of raised."""
+        path = tmp_path / "missing" / "resume_analyzer.prom"
+        monkeypatch.setenv("METRICS_FILE", str(path))
+
+        export_metrics()
+
+        assert "Could not write metrics" in caplog.text
+        assert not path.exists()
+
+    def test_metrics_endpoint(self, populated, monkeypatch):
+        """Test the /metrics endpoint started from the environment."""
+        assert start_metrics_exporter() is None
+
+        monkeypatch.setenv("METRICS_PORT", "1")
+        with patch("src.utils.metrics.start_metrics_server") as mock_start:
+            start_metrics_exporter()
+            start_metrics_exporter()
+        mock_start.assert_called_once_with(1, "127.0.0.1")
+
+    def test_metrics_server_serves_exposition(self, populated):
+        """Test a real HTTP scrape."""
+        server = start_metrics_server(0)
+        try:
+            port = server.server_address[1]
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as resp:
+                body = resp.read().decode()
+                content_type = resp.headers["Content-Type"]
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert content_type.startswith("text/plain; version=0.0.4")
+        assert body == render_prometheus()
@@ -0,0 +1,52 @@
+"""
+Tests for splitting resume text into sections.
+"""
+
+from src.utils.sections import PREAMBLE, section_name, split_sections
+
+
+class TestSectionName:
+    def test_recognised_headings(self):
+        """Test heading variants map to their canonical section."""
+        assert section_name("EXPERIENCE") == "experience"
+        assert section_name("Work History:") == "experience"
+        assert section_name("  Selected Publications  ") == "publications"
+        assert section_name("Awards & Honors") == "awards"
+        assert section_name("— Skills —") == "skills"
+
+    def test_body_text_is_not_a_heading(self):
+        """Test that ordinary lines are not mistaken for headings."""
+        assert section_name("Python, Go, Kubernetes") is None
+        assert section_name("Skills in leading cross-functional teams") is None
+        assert section_name("") is None
+
+
+class TestSplitSections:
+    def test_sections_keep_order_and_headings(self):
+        """Test that text is split at headings in document order."""
+        text = (
+            "Jane Doe\njane@example.com\n"
+            "Experience\nEngineer at Acme\n\n"
+            "Education\nBSc Computer Science\n"
+            "Skills\nPython\n"
+        )
+
+        sections = split_sections(text)
+
+        assert [name for name, _ in sections] == [
+            PREAMBLE,
+            "experience",
+            "education",
+            "skills",
+        ]
+        assert sections[1][1] == "Experience\nEngineer at Acme"
+
+    def test_text_without_headings_is_one_section(self):
+        """Test that unstructured text is returned whole."""
+        assert split_sections("Just some text\nmore text") == [
+            (PREAMBLE, "Just some text\nmore text")
+        ]
+
+    def test_empty_text(self):
+        """Test that empty input yields no sections."""
+        assert split_sections("") == []
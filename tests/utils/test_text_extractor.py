@@ -5,10 +5,17 @@ Tests for the text extraction utilities.
 import io
 import pytest
 from unittest.mock import MagicMock, patch
+from docx import Document
+from benchmarks.fixtures import make_pdf
+from src.utils.deadline import Deadline, DeadlineExceeded
+from src.utils.metrics import get_stage_timings
 from src.utils.text_extractor import (
     extract_text_from_file,
     extract_text_from_pdf,
     extract_text_from_docx,
+    iter_docx_text,
+    iter_pdf_text,
+    limit_chunks,
 )
 
 
@@ -62,14 +69,17 @@ class TestTextExtractor:
             mock_reader.stream.tell.return_value = 1000
 
             # Test the function directly to ensure mock is used properly
-            with patch("src.utils.text_extractor.extract_text_from_pdf", return_value="Page 1 content\n"):
+            with patch(
+                "src.utils.text_extractor.extract_text_from_pdf",
+                return_value="Page 1 content\n",
+            ):
                 # Execute the test
                 result = extract_text_from_file(mock_pdf_file)
-                
+
                 # Verify the text was extracted
                 assert "Page 1 content\n" in result
 
-    @patch("src.utils.text_extractor.Document")
+    @patch("docx.Document")
     def test_extract_text_from_docx(self, mock_document_class, mock_docx_file):
         """Test DOCX text extraction."""
         # Set up mock document
@@ -114,3 +124,140 @@ class TestTextExtractor:
 
         with pytest.raises(Exception):
             extract_text_from_docx(io.BytesIO(file.read()))
+
+
+class TestExtractionBudgets:
+    @pytest.fixture
+    def pdf_bytes(self):
+        """Five-page PDF with three lines of text per page."""
+        return make_pdf(5, lines_per_page=3)
+
+    def test_limit_chunks_truncates_last_chunk(self):
+        """Test that the budget is enforced exactly."""
+        assert list(limit_chunks(["abc", "def", "ghi"], 5)) == ["abc", "de"]
+        assert list(limit_chunks(["abc", "def"], None)) == ["abc", "def"]
+
+    def test_iter_pdf_text_yields_pages_lazily(self, pdf_bytes):
+        """Test that pages are only parsed as the iterator advances."""
+        with patch(
+            "pypdf.PageObject.extract_text", autospec=True, return_value="page"
+        ) as mock_extract:
+            chunks = iter_pdf_text(io.BytesIO(pdf_bytes))
+            assert next(chunks) == "page\n"
+            assert mock_extract.call_count == 1
+
+    def test_pdf_page_breaks_are_opt_in(self, pdf_bytes):
+        """Test that PAGE_BREAK only ends pages when asked for."""
+        with patch("pypdf.PageObject.extract_text", autospec=True, return_value="page"):
+            assert "\f" not in extract_text_from_pdf(io.BytesIO(pdf_bytes))
+            text = extract_text_from_pdf(io.BytesIO(pdf_bytes), page_breaks=True)
+            assert text.startswith("page\n\f")
+
+    def test_pdf_page_budget(self, pdf_bytes):
+        """Test that max_pages stops parsing after the given page."""
+        text = extract_text_from_pdf(io.BytesIO(pdf_bytes), max_pages=2)
+        assert "[1.0]" in text
+        assert "[2.0]" not in text
+
+    def test_pdf_char_budget(self, pdf_bytes):
+        """Test that max_chars bounds the extracted text."""
+        full = extract_text_from_pdf(io.BytesIO(pdf_bytes))
+        text = extract_text_from_pdf(io.BytesIO(pdf_bytes), max_chars=100)
+        assert text == full[:100]
+
+    def test_docx_char_budget(self):
+        """Test that DOCX extraction honours the character budget."""
+        document = Document()
+        for i in range(50):
+            document.add_paragraph(f"Paragraph {i}")
+        buffer = io.BytesIO()
+        document.save(buffer)
+        buffer.seek(0)
+
+        text = extract_text_from_docx(buffer, max_chars=30)
+        assert text == "Paragraph 0\nParagraph 1\nParagr"
+
+    def test_file_budget_from_environment(self, monkeypatch, mock_uploaded_file):
+        """Test the configurable default budget for uploads."""
+        monkeypatch.setenv("EXTRACTION_MAX_CHARS", "7")
+        assert extract_text_from_file(mock_uploaded_file) == "This is"
+        assert extract_text_from_file(mock_uploaded_file, max_chars=0) == (
+            "This is a sample resume content."
+        )
+
+
+class TestExtractionDeadline:
+    @pytest.fixture
+    def clock(self):
+        """Manually advanced clock, in seconds."""
+        return [0.0]
+
+    @pytest.fixture
+    def deadline(self, clock):
+        """Ten-second deadline driven by the clock fixture."""
+        return Deadline(10, clock=lambda: clock[0])
+
+    def test_pdf_checks_deadline_between_pages(self, clock, deadline):
+        """Test that PDF extraction stops at the page where time runs out."""
+
+        def slow_page(page):
+            clock[0] += 4
+            return "page"
+
+        pdf_bytes = make_pdf(5, lines_per_page=3)
+        with patch(
+            "pypdf.PageObject.extract_text", autospec=True, side_effect=slow_page
+        ) as mock_extract:
+            with pytest.raises(DeadlineExceeded) as exc_info:
+                extract_text_from_pdf(io.BytesIO(pdf_bytes), deadline=deadline)
+        assert mock_extract.call_count == 3
+        assert exc_info.value.stage == "extraction"
+
+    def test_docx_checks_deadline_between_paragraphs(self, clock, deadline):
+        """Test that DOCX extraction fails fast once time runs out."""
+        document = Document()
+        for i in range(50):
+            document.add_paragraph(f"Paragraph {i}")
+        buffer = io.BytesIO()
+        document.save(buffer)
+        buffer.seek(0)
+
+        chunks = iter_docx_text(buffer, deadline=deadline)
+        assert next(chunks) == "Paragraph 0\n"
+        clock[0] = 10
+        with pytest.raises(DeadlineExceeded):
+            next(chunks)
+
+    def test_file_within_budget(self, mock_uploaded_file, deadline):
+        """Test that a deadline with time left does not change the result."""
+        text = extract_text_from_file(mock_uploaded_file, deadline=deadline)
+        assert text == "This is a sample resume content."
+
+    def test_expired_deadline_fails_file_extraction(
+        self, mock_uploaded_file, clock, deadline
+    ):
+        """Test that extraction reports the deadline rather than partial text."""
+        clock[0] = 10
+        with pytest.raises(DeadlineExceeded):
+            extract_text_from_file(mock_uploaded_file, deadline=deadline)
+
+
+class TestExtractionTimings:
+    def test_stages_are_timed(self, monkeypatch):
+        """Test the upload, per-page, extraction and normalization spans."""
+        # Extract inline, where each page is parsed in this process
+        monkeypatch.setenv("PDF_POOL_MIN_PAGES", "100")
+        upload = MagicMock()
+        upload.type = "application/pdf"
+        upload.read.return_value = make_pdf(4, lines_per_page=3)
+
+        assert "[3.2]" in extract_text_from_file(upload)
+        extract_text_from_file(upload)
+
+        snapshot = get_stage_timings().snapshot()
+        stages = snapshot["stages"]
+        assert stages["extraction_page"]["count"] == 4
+        assert stages["upload_read"]["count"] == 2
+        assert stages["extraction"]["count"] == 1
+        assert stages["normalization"]["count"] == 1
+        assert snapshot["events"]["extraction_cached"] == 1
@@ -0,0 +1,104 @@
+"""
+Tests for extracted-text normalization.
+"""
+
+import io
+
+from benchmarks.fixtures import CONTACT_HEADER, make_pdf, noisy_resume_text
+from src.services.prompt_builder import estimate_tokens
+from src.utils.text_extractor import PDF_MIME_TYPE, extract_text_from_file
+from src.utils.text_normalizer import normalize_text
+
+
+class TestNormalizeText:
+    def test_repeated_header_kept_once_and_page_numbers_dropped(self):
+        """Test removal of per-page boilerplate."""
+        text = "\f".join(
+            f"{CONTACT_HEADER}\nExperience line {page}\nPage {page} of 3\n"
+            for page in (1, 2, 3)
+        )
+        assert normalize_text(text) == (
+            f"{CONTACT_HEADER}\nExperience line 1\nExperience line 2\n"
+            "Experience line 3\n"
+        )
+
+    def test_footer_with_page_numbers_is_recognized(self):
+        """Test that footers differing only by page number are boilerplate."""
+        text = "\f".join(
+            f"Line {page}\nJane Doe - Resume - Page {page}\n" for page in (1, 2)
+        )
+        assert normalize_text(text) == "Line 1\nJane Doe - Resume - Page 1\nLine 2\n"
+
+    def test_lines_repeated_in_the_body_are_kept(self):
+        """Test that only lines at page edges are treated as boilerplate."""
+        body = "Intro\nMore\nAgain\nResponsibilities:\nThe end\nReally\nDone"
+        text = f"{body}\n\f{body}\n"
+        assert normalize_text(text).count("Responsibilities:") == 2
+
+    def test_single_page_keeps_repeated_lines(self):
+        """Test that boilerplate detection needs at least two pages."""
+        assert normalize_text("Skills\nSkills\n") == "Skills\nSkills\n"
+
+    def test_years_are_not_page_numbers(self):
+        """Test that a standalone year survives page-number removal."""
+        assert normalize_text("Education\n2019\n- 2 -\n\f") == "Education\n2019\n"
+
+    def test_page_numbers_only_dropped_at_pdf_page_edges(self):
+        """Test that bare numbers in the body or in page-less text are kept."""
+        assert normalize_text("Languages\n3\nTeams\n") == "Languages\n3\nTeams\n"
+        text = "1\nLanguages\n3\nTeams\n2/2\n\f"
+        assert normalize_text(text) == "Languages\n3\nTeams\n"
+
+    def test_hyphenation_bullets_and_whitespace(self):
+        """Test rejoining of hyphenated words and cleanup of formatting noise."""
+        text = (
+            "•  Led  a team of engi-\nneers\t on   payments\n"
+            " Mentored juniors​\n▪\n\n\n\nSelf-\nStarter\n"
+        )
+        assert normalize_text(text) == (
+            "- Led a team of engineers on payments\n"
+            "- Mentored juniors\n\nSelf-\nStarter\n"
+        )
+
+    def test_date_ranges_are_not_rejoined(self):
+        """Test that a hyphen after a digit is not treated as hyphenation."""
+        assert normalize_text("2019-\npresent\n") == "2019-\npresent\n"
+
+    def test_plain_text_is_unchanged(self):
+        """Test that clean text passes through untouched."""
+        assert normalize_text("Clean resume") == "Clean resume"
+        assert normalize_text("") == ""
+
+    def test_noisy_corpus_loses_tokens(self):
+        """Test that the benchmark corpus actually shrinks."""
+        text = noisy_resume_text(3, lines_per_page=10)
+        normalized = normalize_text(text)
+        assert estimate_tokens(normalized) < estimate_tokens(text)
+        assert normalized.count(CONTACT_HEADER) == 1
+        assert "Page 2 of 3" not in normalized
+
+
+class TestExtractionNormalization:
+    def _upload(self, data):
+        upload = io.BytesIO(data)
+        upload.type = PDF_MIME_TYPE
+        return upload
+
+    def test_pdf_boilerplate_is_removed_on_extraction(self):
+        """Test that extract_text_from_file normalizes PDF text."""
+        data = make_pdf(
+            3, lines_per_page=2, header=CONTACT_HEADER, footer="Page {page} of {pages}"
+        )
+        text = extract_text_from_file(self._upload(data))
+        assert text.count(CONTACT_HEADER) == 1
+        assert "of 3" not in text
+        assert "\f" not in text
+
+    def test_normalization_can_be_disabled(self, monkeypatch):
+        """Test the TEXT_NORMALIZATION switch."""
+        monkeypatch.setenv("TEXT_NORMALIZATION", "false")
+        data = make_pdf(2, lines_per_page=2, header=CONTACT_HEADER)
+        text = extract_text_from_file(self._upload(data))
+        assert text.count(CONTACT_HEADER) == 2
+        # Page breaks are only kept for the normalizer
+        assert "\f" not in text
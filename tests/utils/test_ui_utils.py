@@ -2,49 +2,77 @@
 Tests for the UI utilities.
 """
 
+import base64
+
 import pytest
-from unittest.mock import patch, mock_open, MagicMock
+from unittest.mock import patch, MagicMock
 from src.utils.ui_utils import (
-    set_gradient_background,
-    load_css_file,
-    setup_custom_spinner,
+    LOGO_PATH,
+    logo_data_url,
+    page_style,
+    read_static_file,
     setup_page_config,
     setup_ui,
     setup_sidebar,
+    show_footer,
+    show_header,
 )
 
 
+@pytest.fixture(autouse=True)
+def fresh_static_cache():
+    """Make every test read static assets from disk again."""
+    for cached in (read_static_file, logo_data_url, page_style):
+        cached.cache_clear()
+    yield
+    for cached in (read_static_file, logo_data_url, page_style):
+        cached.cache_clear()
+
+
 class TestUIUtils:
-    def test_set_gradient_background(self):
-        """Test setting gradient background."""
+    def test_page_style(self):
+        """Test the combined stylesheet."""
+        style = page_style()
+        assert style.startswith("<style>")
+        assert "background: linear-gradient" in style
+        assert ".stSpinner" in style
+        assert ".main-header" in style  # from styles.css
+
+    def test_page_style_without_css_file(self, tmp_path):
+        """Test that a missing styles.css leaves the built-in rules."""
+        with patch("src.utils.ui_utils.STYLES_PATH", str(tmp_path / "none.css")):
+            style = page_style()
+        assert ".stSpinner" in style
+        assert ".main-header" not in style
+
+    def test_static_assets_are_read_once(self, tmp_path):
+        """Test that reruns are served from the in-process cache."""
+        path = tmp_path / "styles.css"
+        path.write_text("body { background: blue; }")
+        with patch("src.utils.ui_utils.STYLES_PATH", str(path)):
+            with patch("builtins.open", wraps=open) as mock_file:
+                first = page_style()
+                assert page_style() is first
+                assert read_static_file(str(path)) == b"body { background: blue; }"
+            mock_file.assert_called_once_with(str(path), "rb")
+        assert "body { background: blue; }" in first
+
+    def test_read_static_file_not_found(self):
+        """Test handling of missing static files."""
+        with pytest.raises(FileNotFoundError):
+            read_static_file("nonexistent.css")
+
+    def test_header_and_footer(self):
+        """Test that header and footer are single HTML elements."""
         with patch("streamlit.markdown") as mock_markdown:
-            set_gradient_background()
-            mock_markdown.assert_called_once()
-            style_content = mock_markdown.call_args[0][0]
-            assert "background: linear-gradient" in style_content
-            assert mock_markdown.call_args[1]["unsafe_allow_html"] is True
-
-    def test_load_css_file(self):
-        """Test loading CSS file."""
-        css_content = "body { background: blue; }"
-        with (
-            patch("builtins.open", mock_open(read_data=css_content)) as mock_file,
-            patch("streamlit.markdown") as mock_markdown,
-        ):
-            load_css_file("test.css")
-            mock_file.assert_called_once_with("test.css")
-            mock_markdown.assert_called_once()
-            assert css_content in mock_markdown.call_args[0][0]
-            assert mock_markdown.call_args[1]["unsafe_allow_html"] is True
-
-    def test_setup_custom_spinner(self):
-        """Test setting up custom spinner."""
-        with patch("streamlit.markdown") as mock_markdown:
-            setup_custom_spinner()
-            mock_markdown.assert_called_once()
-            style_content = mock_markdown.call_args[0][0]
-            assert ".stSpinner" in style_content
-            assert mock_markdown.call_args[1]["unsafe_allow_html"] is True
+            show_header()
+            show_footer()
+        header, footer = [call[0][0] for call in mock_markdown.call_args_list]
+        assert '<div class="main-header">' in header and "</div>" in header
+        assert '<div class="footer">' in footer and "</div>" in footer
+        assert all(
+            call[1]["unsafe_allow_html"] for call in mock_markdown.call_args_list
+        )
 
     def test_setup_page_config(self):
         """Test setting up page configuration."""
@@ -71,65 +99,34 @@ class TestUIUtils:
             setup_sidebar()
 
             # Verify sidebar content was added correctly
-            mock_sidebar.image.assert_called_once_with(
-                "https://img.icons8.com/fluency/96/resume.png", width=80
-            )
+            mock_sidebar.image.assert_called_once_with(logo_data_url(), width=80)
             mock_sidebar.title.assert_called_once_with("Resume Analyzer")
 
-            # Verify markdown calls
-            markdown_calls = mock_sidebar.markdown.call_args_list
-            markdown_texts = [args[0][0] for args in markdown_calls]
+            # Verify the static sections are sent as one element
+            mock_sidebar.markdown.assert_called_once()
+            markdown_text = mock_sidebar.markdown.call_args[0][0]
 
-            assert "---" in markdown_texts
-            assert "### About" in markdown_texts
-            assert "### Features" in markdown_texts
-            assert "### Need Help?" in markdown_texts
+            assert "---" in markdown_text
+            assert "### About" in markdown_text
+            assert "### Features" in markdown_text
+            assert "### Need Help?" in markdown_text
 
-    @patch("os.path.exists")
-    def test_setup_ui_with_css(self, mock_exists):
-        """Test UI setup with existing CSS file."""
-        mock_exists.return_value = True
+    def test_logo_is_bundled(self):
+        """Test that the logo is embedded instead of fetched from a CDN."""
+        url = logo_data_url()
+        assert url.startswith("data:image/png;base64,")
+        assert base64.b64decode(url.split(",", 1)[1]) == read_static_file(LOGO_PATH)
+        assert read_static_file(LOGO_PATH).startswith(b"\x89PNG")
 
+    def test_setup_ui(self):
+        """Test that the UI setup emits the cached stylesheet once."""
         with (
             patch("src.utils.ui_utils.setup_page_config") as mock_page_config,
-            patch("src.utils.ui_utils.set_gradient_background") as mock_gradient,
-            patch("src.utils.ui_utils.setup_custom_spinner") as mock_spinner,
-            patch("src.utils.ui_utils.load_css_file") as mock_css,
-            patch("src.utils.ui_utils.setup_sidebar") as mock_sidebar,
-        ):
-            setup_ui()
-
-            mock_page_config.assert_called_once()
-            mock_gradient.assert_called_once()
-            mock_spinner.assert_called_once()
-            mock_css.assert_called_once_with("src/static/styles.css")
-            mock_sidebar.assert_called_once()
-
-    @patch("os.path.exists")
-    def test_setup_ui_without_css(self, mock_exists):
-        """Test UI setup without CSS file."""
-        mock_exists.return_value = False
-
-        with (
-            patch("src.utils.ui_utils.setup_page_config") as mock_page_config,
-            patch("src.utils.ui_utils.set_gradient_background") as mock_gradient,
-            patch("src.utils.ui_utils.setup_custom_spinner") as mock_spinner,
-            patch("src.utils.ui_utils.load_css_file") as mock_css,
             patch("src.utils.ui_utils.setup_sidebar") as mock_sidebar,
+            patch("streamlit.markdown") as mock_markdown,
         ):
             setup_ui()
 
             mock_page_config.assert_called_once()
-            mock_gradient.assert_called_once()
-            mock_spinner.assert_called_once()
-            mock_css.assert_not_called()
+            mock_markdown.assert_called_once_with(page_style(), unsafe_allow_html=True)
             mock_sidebar.assert_called_once()
-
-    def test_load_css_file_not_found(self):
-        """Test handling of missing CSS file."""
-        with (
-            pytest.raises(FileNotFoundError),
-            patch("builtins.open", mock_open()) as mock_file,
-        ):
-            mock_file.side_effect = FileNotFoundError()
-            load_css_file("nonexistent.css")
@@ -0,0 +1,180 @@
+"""
+Tests for upload ingestion.
+"""
+
+import io
+import os
+import tracemalloc
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from benchmarks.fixtures import make_pdf
+from src.utils.text_extractor import (
+    PDF_MIME_TYPE,
+    LocalFile,
+    _extract_pdf_page_range,
+    extract_text_from_file,
+    extract_text_from_pdf,
+)
+from src.utils.upload import (
+    BufferedUpload,
+    Upload,
+    UploadTooLargeError,
+    get_max_upload_bytes,
+    get_spool_threshold_bytes,
+    open_upload,
+    upload_size,
+)
+
+
+class InMemoryUpload(io.BytesIO):
+    """Stand-in for Streamlit's UploadedFile, which subclasses BytesIO."""
+
+    def __init__(self, data, name="resume.txt", file_type="text/plain"):
+        super().__init__(data)
+        self.name = name
+        self.type = file_type
+        self.size = len(data)
+
+
+class TestOpenUpload:
+    def test_in_memory_upload_is_not_copied(self):
+        """Test that BytesIO uploads are exposed through their own buffer."""
+        source = InMemoryUpload(b"resume text")
+        with open_upload(source, spool_threshold=0) as upload:
+            assert upload.buffer == b"resume text"
+            assert upload.copied_bytes == 0
+            assert not upload.spooled
+            assert upload.stream() is source
+        # The export is released, so the upload can be written to again
+        source.write(b"more")
+
+    def test_large_in_memory_upload_is_spooled(self):
+        """Test that uploads over the threshold are backed by a temp file."""
+        source = InMemoryUpload(b"x" * 100)
+        with open_upload(source, spool_threshold=50) as upload:
+            path = upload.path
+            assert upload.spooled
+            assert os.path.exists(path)
+            assert upload.buffer == b"x" * 100
+            assert upload.stream().read(3) == b"xxx"
+        assert not os.path.exists(path)
+
+    def test_large_local_file_is_mapped_in_place(self, tmp_path):
+        """Test that files on disk are mapped rather than read or spooled."""
+        path = tmp_path / "resume.txt"
+        path.write_bytes(b"y" * 100)
+        with open_upload(LocalFile(str(path)), spool_threshold=50) as upload:
+            assert upload.path == str(path)
+            assert not upload.spooled
+            assert upload.buffer == b"y" * 100
+        assert path.exists()
+
+    def test_generic_file_objects_are_read_once(self, mock_uploaded_file):
+        """Test the fallback for objects without a buffer or a size."""
+        with open_upload(mock_uploaded_file) as upload:
+            assert upload.buffer == b"This is a sample resume content."
+            assert upload.copied_bytes == upload.size
+        mock_uploaded_file.read.assert_called_once_with()
+        mock_uploaded_file.seek.assert_called_once_with(0)
+
+    def test_size_limit_is_checked_before_reading(self):
+        """Test that oversized uploads are rejected without being read."""
+        source = MagicMock()
+        source.size = 2048
+        with pytest.raises(UploadTooLargeError, match="too large"):
+            open_upload(source, max_bytes=1024)
+        source.read.assert_not_called()
+
+    def test_size_limit_for_unsized_uploads(self, mock_uploaded_file):
+        """Test that the limit also applies once the data has been read."""
+        with pytest.raises(UploadTooLargeError):
+            open_upload(mock_uploaded_file, max_bytes=10)
+        assert open_upload(mock_uploaded_file, max_bytes=0).size == 32
+
+    def test_upload_size(self, tmp_path):
+        """Test size detection for the supported upload kinds."""
+        path = tmp_path / "resume.txt"
+        path.write_bytes(b"12345")
+        assert upload_size(InMemoryUpload(b"123")) == 3
+        assert upload_size(io.BytesIO(b"1234")) == 4
+        assert upload_size(LocalFile(str(path))) == 5
+        assert upload_size(MagicMock()) is None
+
+    def test_settings_from_environment(self, monkeypatch):
+        """Test the environment-based limits."""
+        monkeypatch.setenv("UPLOAD_MAX_MB", "0.5")
+        monkeypatch.setenv("UPLOAD_SPOOL_MB", "0")
+        assert get_max_upload_bytes() == 512 * 1024
+        assert get_spool_threshold_bytes() == 0
+
+    def test_buffered_upload_detaches_from_the_session(self, mock_uploaded_file):
+        """Test capturing uploads for background jobs."""
+        source = InMemoryUpload(b"resume text", file_type="text/plain")
+        copy = BufferedUpload.from_upload(source)
+        source.close()
+
+        assert copy.read() == b"resume text"
+        assert (copy.name, copy.type, copy.size) == ("resume.txt", "text/plain", 11)
+        with open_upload(copy, spool_threshold=0) as upload:
+            assert upload.copied_bytes == 0
+
+        captured = BufferedUpload.from_upload(mock_uploaded_file)
+        assert captured.getvalue() == b"This is a sample resume content."
+        assert captured.name == "sample_resume.txt"
+        mock_uploaded_file.seek.assert_called_once_with(0)
+
+    def test_peak_memory_is_recorded_when_tracing(self):
+        """Test per-upload peak memory tracking through tracemalloc."""
+        tracemalloc.start()
+        try:
+            with Upload.from_bytes(b"abc") as upload:
+                bytearray(100_000)
+            assert upload.peak_memory_bytes >= 100_000
+        finally:
+            tracemalloc.stop()
+
+
+class TestExtractionFromUploads:
+    def test_metrics_are_reported(self):
+        """Test that extract_text_from_file reports how the upload was held."""
+        metrics = {}
+        text = extract_text_from_file(InMemoryUpload(b"hello"), metrics=metrics)
+        assert text == "hello"
+        assert metrics == {"upload_bytes": 5, "spooled": False, "copied_bytes": 0}
+
+    def test_oversized_upload_is_rejected(self, monkeypatch):
+        """Test that the configured maximum stops extraction."""
+        monkeypatch.setenv("UPLOAD_MAX_MB", "0.001")
+        with pytest.raises(UploadTooLargeError):
+            extract_text_from_file(InMemoryUpload(b"x" * 2000))
+
+    def test_spooled_pdf_is_sent_to_workers_by_path(self, monkeypatch):
+        """Test that pool workers receive the spool path, not the PDF bytes."""
+        monkeypatch.setenv("UPLOAD_SPOOL_MB", "0.0001")
+        monkeypatch.setenv("PDF_POOL_MIN_PAGES", "1")
+        data = make_pdf(2, lines_per_page=3)
+        pool = MagicMock()
+        pool.submit.return_value.result.return_value = [("page", 0.01)]
+
+        with (
+            patch("src.utils.text_extractor.get_extraction_pool", return_value=pool),
+            patch("src.utils.text_extractor.get_pool_size", return_value=1),
+        ):
+            upload = InMemoryUpload(data, "resume.pdf", PDF_MIME_TYPE)
+            assert extract_text_from_file(upload) == "page\n"
+
+        source = pool.submit.call_args.args[1]
+        assert isinstance(source, str)
+        assert not os.path.exists(source)
+
+    def test_worker_reads_mapped_file(self, tmp_path):
+        """Test page-range extraction from a file path."""
+        data = make_pdf(3, lines_per_page=3)
+        path = tmp_path / "resume.pdf"
+        path.write_bytes(data)
+        pages = _extract_pdf_page_range(str(path), 0, 3)
+        assert "".join(p + "\n" for p in pages) == extract_text_from_pdf(
+            io.BytesIO(data)
+        )